@@ -4,6 +4,7 @@ Serves the admin HTML interface securely with eventlet SSL
 """
 
 import os
+import re
 import sys
 import yaml
 import logging
@@ -13,7 +14,6 @@ import time
 import requests
 from datetime import datetime, timedelta
 from functools import wraps
-from collections import defaultdict
 
 # ──────────────────────────────────────────
 # Path Setup (BEFORE any app imports)
@@ -29,12 +29,16 @@ if BASE_DIR not in sys.path:
 try:
     # Try relative import (works when imported as module)
     from .oem_manager import init_oem_config
+    from . import header_policy, expiring_store, request_pipeline, static_assets, metrics
+    from .rate_limiting import SlidingWindowLimiter
 except ImportError:
     # Fallback for direct script execution
     from app.oem_manager import init_oem_config
+    from app import header_policy, expiring_store, request_pipeline, static_assets, metrics
+    from app.rate_limiting import SlidingWindowLimiter
 
 # Now import Flask and other app modules
-from flask import Flask, render_template, jsonify, redirect, url_for, request, session
+from flask import Flask, render_template, jsonify, redirect, url_for, request, session, Response
 from flask_cors import CORS
 from flask_socketio import SocketIO
 import eventlet
@@ -91,27 +95,9 @@ try:
 except ImportError as e:
     logger.warning(f"Secure loader not found ({e}), falling back to YAML config")
 
-    class ConfigFallback:
-        def __init__(self, config_path='config/config.yaml'):
-            try:
-                with open(config_path, 'r') as f:
-                    self.data = yaml.safe_load(f) or {}
-            except FileNotFoundError:
-                print(f"Error: Configuration file not found at {config_path}")
-                self.data = {}
-
-        def get(self, *keys, default=None):
-            val = self.data
-            for key in keys:
-                if isinstance(val, dict):
-                    val = val.get(key)
-                    if val is None:
-                        return default
-                else:
-                    return default
-            return val if val is not None else default
-
-    config_loader = ConfigFallback(config_file_path)
+    # Plain YAML (no secrets injection), same flattened snapshot and reload support
+    from config_snapshot import ReloadableConfig
+    config_loader = ReloadableConfig(config_file_path)
 
     def get_config(*keys, default=None):
         return config_loader.get(*keys, default=default)
@@ -119,7 +105,7 @@ except ImportError as e:
 # ──────────────────────────────────────────
 # Security Configuration
 # ──────────────────────────────────────────
-AUTH_ENABLED = get_config("authentication", "enabled", default=True)
+AUTH_ENABLED = config_loader.get_bool("authentication", "enabled", default=True)
 ADMIN_USERNAME = get_config("authentication", "admin_username", default="admin")
 ADMIN_PASSWORD = get_config("authentication", "admin_password", default="admin123")
 JWT_SECRET = get_config("authentication", "jwt_secret", default="change-this-secret")
@@ -140,14 +126,6 @@ if not ADMIN_PASSWORD:
 # Protocol configuration (HTTP/HTTPS)
 USE_HTTPS = get_config("admin_server", "use_https", default=True)
 
-# ──────────────────────────────────────────
-# Security Storage (In-Memory)
-# ──────────────────────────────────────────
-login_attempts = defaultdict(lambda: {"count": 0, "timestamp": 0})
-blocked_ips = {}
-request_history = defaultdict(list)
-websocket_connections = defaultdict(int)
-
 # ──────────────────────────────────────────
 # Flask App
 # ──────────────────────────────────────────
@@ -164,6 +142,9 @@ except Exception as e:
     logger.warning(f"⚠ OEM configuration initialization failed: {e}")
 
 socketio = SocketIO(app, cors_allowed_origins="*")
+# Count/time every Socket.IO event in and out (must wrap socketio.on before the handlers below)
+ADMIN_SOCKETS = metrics.gauge("admin_sockets", "Open admin Socket.IO connections")
+metrics.instrument_socketio(socketio, audience=lambda: int(ADMIN_SOCKETS.get()))
 
 # ──────────────────────────────────────────
 # Server Settings
@@ -181,6 +162,18 @@ LOCKOUT_DURATION = get_config("advanced", "security", "block_duration_minutes",
 MAX_REQUESTS_PER_MINUTE = get_config("advanced", "security", "max_requests_per_minute", default=60)
 RATE_LIMIT_ENABLED = get_config("advanced", "security", "rate_limit_enabled", default=True)
 MAX_WS_CONNECTIONS = get_config("advanced", "security", "max_ws_connections", default=5)
+MAX_TRACKED_CLIENTS = get_config("advanced", "security", "max_tracked_clients", default=10000)
+
+# ──────────────────────────────────────────
+# Security Storage (In-Memory, bounded and self-expiring)
+# ──────────────────────────────────────────
+login_attempts = expiring_store.ExpiringCounter(  # IP -> failures, reset after 1 quiet minute
+    "login_attempts", 60, max_items=MAX_TRACKED_CLIENTS, extend_on_hit=True)
+blocked_ips = expiring_store.TTLMap(  # IP -> True until the lockout ends
+    "blocked_ips", LOCKOUT_DURATION, max_items=MAX_TRACKED_CLIENTS)
+request_history = SlidingWindowLimiter(limit=MAX_REQUESTS_PER_MINUTE, window_seconds=60)
+websocket_connections = expiring_store.ExpiringCounter(  # IP -> open sockets (safety TTL for missed disconnects)
+    "websocket_connections", 24 * 3600, max_items=MAX_TRACKED_CLIENTS, extend_on_hit=True)
 
 # ──────────────────────────────────────────
 # Security Helper Functions
@@ -197,31 +190,19 @@ def hash_password(password):
 
 def is_ip_blocked(ip):
     """Check if IP is currently blocked"""
-    if ip in blocked_ips:
-        if time.time() < blocked_ips[ip]:
-            return True
-        else:
-            del blocked_ips[ip]
-    return False
+    return ip in blocked_ips
 
-def block_ip(ip, duration=LOCKOUT_DURATION):
-    """Block an IP for specified duration"""
-    blocked_ips[ip] = time.time() + duration
+def block_ip(ip, duration=None):
+    """Block an IP for specified duration (defaults to the configured lockout)"""
+    if duration is None:
+        duration = LOCKOUT_DURATION
+    blocked_ips.set(ip, True, ttl=duration)
     security_logger.warning(f"IP blocked: {ip} for {duration}s")
 
 def check_login_attempts(ip):
     """Check and update login attempts for IP"""
-    current_time = time.time()
-
-    # Reset counter if more than 1 minute has passed
-    if current_time - login_attempts[ip]["timestamp"] > 60:
-        login_attempts[ip] = {"count": 0, "timestamp": current_time}
-
-    login_attempts[ip]["count"] += 1
-    login_attempts[ip]["timestamp"] = current_time
-
-    # Block if exceeded max attempts
-    if login_attempts[ip]["count"] >= MAX_LOGIN_ATTEMPTS:
+    # Counter resets after 1 minute without attempts
+    if login_attempts.incr(ip) >= MAX_LOGIN_ATTEMPTS:
         block_ip(ip)
         return False
 
@@ -232,20 +213,8 @@ def check_rate_limit(ip):
     if not RATE_LIMIT_ENABLED:
         return True
 
-    current_time = time.time()
-
-    # Clean old requests (older than 1 minute)
-    request_history[ip] = [
-        timestamp for timestamp in request_history[ip]
-        if current_time - timestamp < 60
-    ]
-
-    # Check if exceeded limit
-    if len(request_history[ip]) >= MAX_REQUESTS_PER_MINUTE:
-        return False
-
-    request_history[ip].append(current_time)
-    return True
+    allowed, _ = request_history.hit(ip)
+    return allowed
 
 def sanitize_input(text):
     """Basic XSS protection"""
@@ -357,65 +326,62 @@ def rate_limit_check(f):
 # ──────────────────────────────────────────
 # Cache Control Middleware (prevent browser caching of JS/CSS)
 # ──────────────────────────────────────────
+ADMIN_CSP = {
+    'default-src': ["'self'"],
+    'script-src': ["'self'", "'unsafe-inline'", "https://cdnjs.cloudflare.com", "https://static.cloudflareinsights.com"],
+    'style-src': ["'self'", "'unsafe-inline'", "https://cdnjs.cloudflare.com", "https://fonts.googleapis.com"],
+    'media-src': ["'self'", "blob:"],
+    'connect-src': ["'self'", "http://localhost:*", "http://127.0.0.1:*",
+                    "ws://localhost:*", "ws://127.0.0.1:*",
+                    "https://cdnjs.cloudflare.com", "https://fonts.googleapis.com",
+                    "https://fonts.gstatic.com"],
+    'img-src': ["'self'", "data:"],
+    'font-src': ["'self'", "data:", "https://cdnjs.cloudflare.com", "https://fonts.gstatic.com"],
+}
+
+# Unversioned admin static files: cache for 1 hour, but always revalidate
+# (?v=<content hash> URLs keep the default immutable caching)
+ADMIN_CACHE_HEADERS = dict(header_policy.DEFAULT_CACHE_HEADERS)
+ADMIN_CACHE_HEADERS[header_policy.STATIC] = {'Cache-Control': 'public, max-age=3600, must-revalidate'}
+
+
+def build_header_policy_csp():
+    """Admin CSP with the configured external URL added to connect-src"""
+    directives = {name: list(sources) for name, sources in ADMIN_CSP.items()}
+    directives['connect-src'].extend(
+        header_policy.external_origins(get_config('server', 'external_url', default='')))
+    return directives
+
+
+# Compiled once; the after_request hook only applies the header set
+response_header_policy = header_policy.HeaderPolicy(build_header_policy_csp(), cache_headers=ADMIN_CACHE_HEADERS)
+
+
 @app.after_request
 def set_cache_headers(response):
-    """Set proper cache headers for static and dynamic content and CSP"""
-    # Disable caching for HTML pages (always fetch fresh version)
-    if response.content_type and 'text/html' in response.content_type:
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, public, max-age=0'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-    
-    # Disable caching for API responses
-    elif request.path.startswith('/api/'):
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, public, max-age=0'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-    
-    # For static files (JS, CSS, images), allow short-term caching but always validate
-    elif request.path.startswith('/static/'):
-        # Browser can cache these for 1 hour, but MUST revalidate with server
-        response.headers['Cache-Control'] = 'public, max-age=3600, must-revalidate'
-        # Add ETag for better cache validation
-        if not response.headers.get('ETag'):
-            response.set_etag()
-    
-    # ✅ Add dynamic CSP header that includes external URL if configured
-    if 'Content-Security-Policy' not in response.headers:
-        external_url = get_config('server', 'external_url', default='')
-        
-        # Build connect-src with local and external URLs
-        connect_src_list = ["'self'", "http://localhost:*", "http://127.0.0.1:*", 
-                           "ws://localhost:*", "ws://127.0.0.1:*",
-                           "https://cdnjs.cloudflare.com", "https://fonts.googleapis.com", 
-                           "https://fonts.gstatic.com"]
-        
-        # Add external URL if configured (for CF Tunnel or reverse proxy)
-        if external_url:
-            # Add both https:// and wss:// versions
-            if external_url.startswith('https://'):
-                external_host = external_url.replace('https://', '')
-                connect_src_list.append(f"https://{external_host}")
-                connect_src_list.append(f"wss://{external_host}")
-            elif external_url.startswith('http://'):
-                external_host = external_url.replace('http://', '')
-                connect_src_list.append(f"http://{external_host}")
-                connect_src_list.append(f"ws://{external_host}")
-        
-        connect_src = ' '.join(connect_src_list)
-        
-        response.headers['Content-Security-Policy'] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com https://static.cloudflareinsights.com; "
-            "style-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com https://fonts.googleapis.com; "
-            "media-src 'self' blob:; "
-            f"connect-src {connect_src}; "
-            "img-src 'self' data:; "
-            "font-src 'self' data: https://cdnjs.cloudflare.com https://fonts.gstatic.com"
-        )
-    
+    """Apply the precompiled cache headers and CSP for this route class"""
+    route_class = header_policy.classify(request.path, response.content_type, bool(request.args.get('v')))
+    response_header_policy.apply(response, route_class)
+
+    # Add ETag for better cache validation
+    if route_class in (header_policy.STATIC, header_policy.STATIC_VERSIONED) \
+            and response.status_code == 200 and not response.headers.get('ETag'):
+        response.add_etag()
+
     return response
 
+# ──────────────────────────────────────────
+# Static Files
+# ──────────────────────────────────────────
+# Every static file is hashed (and text assets precompressed) at startup; files changed
+# on disk later are picked up by static_manifest.watch() (started in __main__)
+static_manifest = static_assets.AssetManifest(STATIC_DIR).build()
+
+# Served from memory, gzip/brotli encoded when the client accepts it
+app.view_functions['static'] = static_manifest.response
+# Template usage: /static/js/admin.js?v={{ 'js/admin.js' | static_version }}
+app.jinja_env.filters['static_version'] = static_manifest.version
+
 # ──────────────────────────────────────────
 # Routes
 # ──────────────────────────────────────────
@@ -480,8 +446,7 @@ def login():
     
     if username == ADMIN_USERNAME and hash_password(password) == hash_password(ADMIN_PASSWORD):
         # Reset login attempts on successful login
-        if ip in login_attempts:
-            del login_attempts[ip]
+        login_attempts.discard(ip)
         
         # Generate JWT token
         token = jwt.encode(
@@ -704,6 +669,73 @@ def clear_tts_cache():
             'error': str(e)
         }), 500
 
+# ──────────────────────────────────────────
+# Sampling Profiler (proxied to the user server)
+# ──────────────────────────────────────────
+def user_server_request(method, path, **kwargs):
+    """Call an admin-only user server endpoint on localhost with a short-lived admin JWT"""
+    scheme = 'https' if get_config('server', 'use_https', default=False) else 'http'
+    user_server_port = get_config('server', 'port', default=1915)
+    admin_username = get_config('authentication', 'admin_username', default='admin')
+    headers = {'Authorization': f'Bearer {generate_token(admin_username)}'}
+    return requests.request(method, f'{scheme}://localhost:{user_server_port}{path}',
+                            headers=headers, timeout=10, verify=False, **kwargs)
+
+def relay_json(response):
+    """User server JSON reply passed through with its status"""
+    try:
+        data = response.json()
+    except ValueError:
+        data = {'success': False, 'error': f'User server error: {response.status_code}'}
+    return jsonify(data), response.status_code
+
+def proxy_profiler_json(method, path, **kwargs):
+    try:
+        return relay_json(user_server_request(method, path, **kwargs))
+    except Exception as e:
+        logger.error(f"❌ Profiler request to user server failed: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 502
+
+@app.route("/api/profiler/start", methods=["POST"])
+@require_admin_auth
+@rate_limit_check
+def start_profiler():
+    """Start a time-boxed sampling profile of the user server (admin only)"""
+    data = request.get_json(silent=True) or {}
+    payload = {'duration': data.get('duration', 30), 'interval_ms': data.get('interval_ms')}
+    security_logger.info(f"🔥 ADMIN_ACTION: profiler start | Admin: {session.get('username', 'unknown')} | "
+                         f"IP: {get_client_ip()} | Duration: {payload['duration']}s")
+    return proxy_profiler_json('POST', '/api/profiler/start', json=payload)
+
+@app.route("/api/profiler/stop", methods=["POST"])
+@require_admin_auth
+@rate_limit_check
+def stop_profiler():
+    """Finish the running profile early (admin only)"""
+    return proxy_profiler_json('POST', '/api/profiler/stop')
+
+@app.route("/api/profiler/status", methods=["GET"])
+@require_admin_auth
+def profiler_status():
+    """Progress of the running profile and the last one's summary (admin only)"""
+    return proxy_profiler_json('GET', '/api/profiler/status')
+
+@app.route("/api/profiler/profile", methods=["GET"])
+@require_admin_auth
+@rate_limit_check
+def download_profile():
+    """Last profile as a collapsed-stack file for flame graph tools (admin only)"""
+    try:
+        response = user_server_request('GET', '/api/profiler/profile')
+    except Exception as e:
+        logger.error(f"❌ Profile download from user server failed: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 502
+    if response.status_code != 200:
+        return relay_json(response)
+    return Response(response.content, content_type=response.headers.get('Content-Type', 'text/plain'), headers={
+        'Content-Disposition': response.headers.get('Content-Disposition', 'attachment; filename=ezy-profile.folded')
+    })
+
 @app.route("/api/protected-endpoint")
 @require_auth
 @rate_limit_check
@@ -711,6 +743,17 @@ def protected_endpoint():
     """Example protected endpoint"""
     return jsonify({"message": "Access granted"})
 
+@app.route("/api/security/state-stats")
+@require_auth
+def security_state_stats():
+    """Size and churn of the in-memory security tables"""
+    return jsonify({
+        "success": True,
+        "tables": expiring_store.all_stats(),
+        "rate_limiters": {"request_history": request_history.stats()},
+        "middleware": security_pipeline.stats()
+    })
+
 @app.route("/health")
 def health():
     """Health check endpoint"""
@@ -744,39 +787,126 @@ def handle_connect(auth):
         return False
 
     # Check WebSocket connection limit
-    if websocket_connections[ip] >= MAX_WS_CONNECTIONS:
+    if websocket_connections.count(ip) >= MAX_WS_CONNECTIONS:
         security_logger.warning(f"Too many WebSocket connections from {ip}")
         return False
 
-    websocket_connections[ip] += 1
-    security_logger.info(f"WebSocket connected: {ip} (total: {websocket_connections[ip]})")
+    total = websocket_connections.incr(ip)
+    ADMIN_SOCKETS.inc()
+    security_logger.info(f"WebSocket connected: {ip} (total: {total})")
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle WebSocket disconnection"""
     ip = get_client_ip()
-    if websocket_connections[ip] > 0:
-        websocket_connections[ip] -= 1
+    websocket_connections.decr(ip)
+    ADMIN_SOCKETS.dec()
     security_logger.info(f"WebSocket disconnected: {ip}")
 
 # ──────────────────────────────────────────
 # Request Logging Middleware
 # ──────────────────────────────────────────
+SUSPICIOUS_REQUEST = re.compile(r'\.\.|<script>|DROP TABLE|SELECT \*|UNION SELECT', re.IGNORECASE)
+SUSPICIOUS_BODY_SCAN_LIMIT = 64 * 1024  # Larger (or chunked) bodies are not inspected
+
+# Static assets and health checks skip request inspection entirely
+security_pipeline = request_pipeline.RequestPipeline(health_paths=("/health", "/metrics"))
+
+@security_pipeline.stage("suspicious_url", request_pipeline.DYNAMIC_ROUTES)
+def log_suspicious_url():
+    if SUSPICIOUS_REQUEST.search(request.path) or (
+            request.query_string and SUSPICIOUS_REQUEST.search(request.query_string.decode("utf-8", "ignore"))):
+        security_logger.warning(f"Suspicious request from {get_client_ip()}: {request.method} {request.path}")
+        request.suspicious_logged = True
+
+@security_pipeline.stage("suspicious_body", request_pipeline.DYNAMIC_ROUTES)
+def log_suspicious_body():
+    length = request.content_length
+    if not length or length > SUSPICIOUS_BODY_SCAN_LIMIT or getattr(request, "suspicious_logged", False):
+        return None
+    # get_data() caches the bytes, so request.json later reuses them instead of re-reading
+    body = request.get_data(cache=True).decode("utf-8", "ignore")
+    if SUSPICIOUS_REQUEST.search(body):
+        security_logger.warning(f"Suspicious request from {get_client_ip()}: {request.method} {request.path}")
+
+HTTP_REQUESTS = metrics.counter("http_requests_total", "HTTP requests", ("route", "method", "status"))
+HTTP_SECONDS = metrics.histogram("http_request_duration_seconds", "HTTP request duration (to first byte)", ("route", "method"))
+
 @app.before_request
 def log_request():
-    """Log all requests for security monitoring"""
-    ip = get_client_ip()
+    """Log suspicious requests for security monitoring"""
+    request.started_at = time.perf_counter()
+    return security_pipeline.run(request.path)
 
-    # Log suspicious patterns
-    suspicious_patterns = ['..', '<script>', 'DROP TABLE', 'SELECT *', 'UNION SELECT']
-    request_str = str(request.path) + str(request.args) + str(request.get_data())
+@app.after_request
+def record_request_metrics(response):
+    # Route template (not the raw path) and known methods keep the label set bounded
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    method = metrics.method_label(request.method)
+    HTTP_REQUESTS.inc(route, method, response.status_code)
+    if hasattr(request, "started_at"):
+        HTTP_SECONDS.observe(time.perf_counter() - request.started_at, route, method)
+    return response
+
+def collect_server_metrics():
+    """Scrape-time gauges for state that already keeps its own stats"""
+    yield from metrics.stats_families(
+        "state_table", "Expiring state tables", [((s["name"],), s) for s in expiring_store.all_stats()],
+        ("table",), {"items": "items", "evictions": "evictions", "expirations": "expirations"})
+    yield from metrics.stats_families(
+        "rate_limiter", "Sliding-window limiters", [(("request_history",), request_history.stats())],
+        ("limiter",), {"clients": "clients", "rejected": "rejected"})
+    yield from metrics.stats_families(
+        "middleware_stage", "Request pipeline stages",
+        [((name,), counter) for name, counter in security_pipeline.stats()["stages"].items()],
+        ("stage",), {"calls": "calls", "rejections": "rejections", "total_ms": "total_ms"})
+    yield from metrics.stats_families(
+        "static_assets", "In-memory static assets", [((), static_manifest.stats())], (),
+        {"files": "files", "in_memory": "in_memory", "identity_bytes": "identity_bytes", "gzip_bytes": "gzip_bytes"})
+
+metrics.register_collector("admin_server", collect_server_metrics)
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """Prometheus scrape endpoint (advanced.metrics.enabled; bearer token if advanced.metrics.token is set, else localhost only)"""
+    if not config_loader.get_bool("advanced", "metrics", "enabled", default=True):
+        return {"error": "Not found"}, 404
+    allowed, status = metrics.scrape_allowed(config_loader.get_str("advanced", "metrics", "token", default=""),
+                                             request.headers.get("Authorization"), request.remote_addr, request.headers)
+    if not allowed:
+        return {"error": "Unauthorized" if status == 401 else "Forbidden"}, status
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+# ──────────────────────────────────────────
+# Config Hot Reload (SIGHUP or config.yaml change)
+# ──────────────────────────────────────────
+@config_loader.subscribe_to("authentication")
+def on_auth_config_reload(snapshot, changed):
+    global AUTH_ENABLED, ADMIN_USERNAME, ADMIN_PASSWORD, JWT_SECRET, SESSION_TIMEOUT
+    AUTH_ENABLED = snapshot.get_bool("authentication", "enabled", default=True)
+    ADMIN_USERNAME = snapshot.get("authentication", "admin_username", default="admin")
+    ADMIN_PASSWORD = snapshot.get("authentication", "admin_password", default="admin123")
+    JWT_SECRET = snapshot.get("authentication", "jwt_secret", default="change-this-secret")
+    SESSION_TIMEOUT = snapshot.get_int("authentication", "session_timeout", default=7200)
+    security_logger.warning(f"Authentication config reloaded (enabled={AUTH_ENABLED})")
+
+
+@config_loader.subscribe_to("advanced", "security")
+def on_security_config_reload(snapshot, changed):
+    global MAX_LOGIN_ATTEMPTS, LOCKOUT_DURATION, MAX_REQUESTS_PER_MINUTE, RATE_LIMIT_ENABLED, MAX_WS_CONNECTIONS
+    MAX_LOGIN_ATTEMPTS = snapshot.get_int("advanced", "security", "max_login_attempts", default=10)
+    LOCKOUT_DURATION = snapshot.get_int("advanced", "security", "block_duration_minutes", default=60) * 60
+    MAX_REQUESTS_PER_MINUTE = snapshot.get_int("advanced", "security", "max_requests_per_minute", default=60)
+    RATE_LIMIT_ENABLED = snapshot.get_bool("advanced", "security", "rate_limit_enabled", default=True)
+    MAX_WS_CONNECTIONS = snapshot.get_int("advanced", "security", "max_ws_connections", default=5)
+    blocked_ips.ttl = LOCKOUT_DURATION
+    request_history.limit = MAX_REQUESTS_PER_MINUTE
+
+
+@config_loader.subscribe_to("server", "external_url")
+def on_external_url_reload(snapshot, changed):
+    response_header_policy.rebuild(build_header_policy_csp(), cache_headers=ADMIN_CACHE_HEADERS)
 
-    for pattern in suspicious_patterns:
-        if pattern.lower() in request_str.lower():
-            security_logger.warning(
-                f"Suspicious request from {ip}: {request.method} {request.path}"
-            )
-            break
 
 # ──────────────────────────────────────────
 # Main Entry
@@ -798,6 +928,20 @@ if __name__ == "__main__":
     else:
         logger.info(f"User Client expected at: {protocol}://{ADMIN_HOST}:{MAIN_SERVER_PORT}")
 
+    # Expire stale security state in the background (lookups also expire lazily)
+    expiring_store.start_reaper(interval_seconds=60)
+
+    # Event loop lag for /metrics
+    socketio.start_background_task(metrics.HubLagProbe().run, socketio.sleep)
+
+    # Config hot reload: `kill -HUP <pid>`, or automatically when config.yaml changes
+    config_loader.install_sighup_handler()
+    if config_loader.get_bool("advanced", "config_reload", "watch_file", default=True):
+        config_loader.watch(interval=config_loader.get_float("advanced", "config_reload", "interval_seconds", default=2.0))
+    # Static files replaced on disk (e.g. an OEM logo) are served without a restart
+    if config_loader.get_bool("advanced", "static_assets", "watch", default=True):
+        static_manifest.watch(interval=config_loader.get_float("advanced", "static_assets", "interval_seconds", default=5.0))
+
     try:
         listener = eventlet.listen((ADMIN_HOST, ADMIN_PORT))
 
@@ -0,0 +1,122 @@
+"""
+Connection Admission Control
+Token bucket with a short wait queue for Socket.IO connection storms
+
+Features:
+- Steady connect rate with a burst allowance (token bucket)
+- Connections beyond the burst are queued: each one reserves the next free
+  slot and waits for it, up to max_wait_seconds
+- Beyond the queue, connections are refused with a retry_after hint sized to
+  the current backlog
+- Stagger hint for the client's first history fetch, scaled by how busy the
+  bucket is (zero when calm)
+- No Flask dependency; the server does the waiting and the emitting
+"""
+
+import random
+import time
+from threading import Lock
+from typing import Dict, NamedTuple
+
+
+class Admission(NamedTuple):
+    """Outcome of one connection attempt"""
+    admitted: bool
+    wait: float          # Seconds to hold the connection before accepting it (admitted only)
+    retry_after: float   # Seconds the client should wait before reconnecting (refused only)
+    stagger: float       # Suggested delay before the client's first history fetch
+
+
+class AdmissionController:
+    """Token bucket where a negative balance is the wait queue"""
+
+    def __init__(self, rate_per_second: float = 50.0, burst: int = 100, max_wait_seconds: float = 5.0,
+                 stagger_seconds: float = 3.0, clock=time.monotonic, rng=random.random):
+        """
+        Args:
+            rate_per_second: Sustained connections admitted per second
+            burst: Connections admitted immediately from a full bucket
+            max_wait_seconds: Longest a connection may be queued before it is refused
+            stagger_seconds: Upper bound of the history-fetch stagger hint under full load
+            clock: Monotonic time source (injectable for tests)
+            rng: Random source in [0, 1) for the stagger hint (injectable for tests)
+        """
+        self.clock = clock
+        self.rng = rng
+        self.lock = Lock()
+        self.rate = rate_per_second
+        self.burst = burst
+        self.max_wait = max_wait_seconds
+        self.stagger_seconds = stagger_seconds
+        self.tokens = float(burst)
+        self.updated = clock()
+
+        self.admitted = 0
+        self.queued = 0
+        self.refused = 0
+        self.max_wait_seen = 0.0
+
+    def configure(self, rate_per_second: float, burst: int, max_wait_seconds: float, stagger_seconds: float):
+        """Apply new limits (config reload); the current balance is kept, capped at the new burst"""
+        with self.lock:
+            self._refill(self.clock())
+            self.rate = rate_per_second
+            self.burst = burst
+            self.max_wait = max_wait_seconds
+            self.stagger_seconds = stagger_seconds
+            self.tokens = min(self.tokens, float(burst))
+
+    def admit(self) -> Admission:
+        """Reserve a connection slot (call once per connection attempt)"""
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+
+            # Taking a token from an empty bucket puts the balance in debt; the debt,
+            # paid back at `rate`, is how long this connection must wait its turn
+            wait = max(0.0, (1.0 - self.tokens) / self.rate)
+            if wait > self.max_wait:
+                self.refused += 1
+                # By then the backlog has drained enough for the retry to fit in the queue
+                retry_after = wait - self.max_wait + 1.0 / self.rate
+                return Admission(False, 0.0, round(retry_after, 2), 0.0)
+
+            self.tokens -= 1.0
+            self.admitted += 1
+            if wait > 0:
+                self.queued += 1
+                self.max_wait_seen = max(self.max_wait_seen, wait)
+            return Admission(True, wait, 0.0, self._stagger())
+
+    def pressure(self) -> float:
+        """0 = bucket full, 1 = burst used up, >1 = connections queued"""
+        with self.lock:
+            self._refill(self.clock())
+            return (self.burst - self.tokens) / self.burst if self.burst else 0.0
+
+    def stats(self) -> Dict:
+        with self.lock:
+            self._refill(self.clock())
+            return {
+                'rate_per_second': self.rate,
+                'burst': self.burst,
+                'max_wait_seconds': self.max_wait,
+                'tokens': round(self.tokens, 2),
+                'queue_seconds': round(max(0.0, -self.tokens) / self.rate, 2),
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'refused': self.refused,
+                'max_wait_seen': round(self.max_wait_seen, 2),
+            }
+
+    def _refill(self, now: float):
+        """Add the tokens earned since the last update (caller holds the lock)"""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(float(self.burst), self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def _stagger(self) -> float:
+        # Spread first history fetches over a window that grows with load (caller holds the lock)
+        pressure = (self.burst - self.tokens) / self.burst if self.burst else 1.0
+        return round(self.rng() * self.stagger_seconds * min(1.0, max(0.0, pressure)), 3)
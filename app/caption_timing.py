@@ -0,0 +1,143 @@
+"""
+Caption Timing
+Monotonic start/end offsets for captions, relative to the capture session start
+
+Features:
+- Session clock on time.monotonic (immune to wall-clock jumps / NTP steps);
+  the session starts with the first caption after startup or a history clear
+- Start = when the first interim result of an utterance was seen,
+  end = when its final result arrived
+- Finals without interims (pasted or pre-segmented text) get a start estimated
+  from the text length, never before the previous caption's end
+- Pending interim first-seen times live in a bounded TTL table, so abandoned
+  utterances don't accumulate
+- Cue builder for exporters: monotonic, non-overlapping cues across sessions,
+  with a fallback for items stored before timing existed
+"""
+
+import time
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    from . import expiring_store
+except ImportError:
+    from app import expiring_store
+
+SECONDS_PER_CHAR = 0.06       # Rough speaking rate used when no interim was seen
+MIN_CUE_SECONDS = 1.0
+MAX_ESTIMATED_SECONDS = 7.0
+FALLBACK_CUE_SECONDS = 5.0    # Items without offsets (imported, legacy history)
+SESSION_GAP_SECONDS = 2.0     # Pause inserted between sessions in an export
+
+
+def estimate_duration(text: str) -> float:
+    return min(MAX_ESTIMATED_SECONDS, max(MIN_CUE_SECONDS, len(text or '') * SECONDS_PER_CHAR))
+
+
+class CaptionClock:
+    """Session-relative timing for interim/final caption pairs"""
+
+    def __init__(self, clock=time.monotonic, pending_ttl_seconds: float = 120.0):
+        """
+        Args:
+            clock: Monotonic time source (injectable for tests)
+            pending_ttl_seconds: How long an interim's first-seen time is kept waiting for its final
+        """
+        self.clock = clock
+        self.lock = Lock()
+        self.first_seen = expiring_store.TTLMap('caption_first_seen', ttl_seconds=pending_ttl_seconds,
+                                                max_items=1000, clock=clock)
+        self.session_origin: Optional[float] = None
+        self.session_id: Optional[str] = None
+        self.last_end = 0.0
+
+    def reset(self):
+        """Start a new session with the next caption (history cleared)"""
+        with self.lock:
+            self.session_origin = None
+            self.session_id = None
+            self.last_end = 0.0
+        self.first_seen.clear()
+
+    def interim(self, temp_id) -> float:
+        """Record the first time an utterance was seen; returns its offset"""
+        now = self.clock()
+        with self.lock:
+            self._ensure_session(now)
+            origin = self.session_origin
+        if temp_id is not None and temp_id not in self.first_seen:
+            self.first_seen.set(temp_id, now)
+        return round(now - origin, 3)
+
+    def final(self, temp_id, text: str) -> Dict:
+        """Timing fields for a final caption: start_offset, end_offset, session"""
+        now = self.clock()
+        started = self.first_seen.pop(temp_id) if temp_id is not None else None
+        with self.lock:
+            self._ensure_session(started if started is not None else now)
+            end = now - self.session_origin
+            if started is not None:
+                start = started - self.session_origin
+            else:
+                start = max(self.last_end, end - estimate_duration(text))
+            start = max(0.0, min(start, end))
+            self.last_end = max(self.last_end, end)
+            return {
+                'start_offset': round(start, 3),
+                'end_offset': round(end, 3),
+                'session': self.session_id,
+            }
+
+    def _ensure_session(self, now: float):
+        # Caller holds the lock
+        if self.session_origin is None:
+            self.session_origin = now
+            self.session_id = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _has_timing(item: Dict) -> bool:
+    return isinstance(item.get('start_offset'), (int, float)) and isinstance(item.get('end_offset'), (int, float))
+
+
+def cue_times(items: Iterable[Dict]) -> Iterator[Tuple[Dict, float, float]]:
+    """
+    (item, start, end) in seconds from the start of the export
+
+    Sessions are laid end to end with a short gap, untimed items follow the
+    previous cue, and each cue's end is clipped to the next cue's start.
+    """
+    pending = None  # (item, start, end) waiting for the next start to clip against
+    session = None
+    base = 0.0
+    last_end = 0.0
+    last_start = 0.0
+
+    for item in items:
+        if _has_timing(item):
+            if item.get('session') != session:
+                # New session: its offsets restart at zero, so shift it past what came before
+                base = (last_end + SESSION_GAP_SECONDS - item['start_offset']) if pending else 0.0
+                session = item.get('session')
+            start = base + item['start_offset']
+            end = base + item['end_offset']
+        else:
+            start = last_end
+            end = start + FALLBACK_CUE_SECONDS
+
+        start = max(start, last_start)
+        end = max(end, start + MIN_CUE_SECONDS)
+
+        if pending:
+            previous, previous_start, previous_end = pending
+            if start > previous_start:
+                previous_end = min(previous_end, start)
+            yield previous, previous_start, previous_end
+
+        pending = (item, start, end)
+        last_start = start
+        last_end = max(last_end, end)
+
+    if pending:
+        yield pending
@@ -0,0 +1,230 @@
+"""
+Bounded, Self-Expiring State Tables
+TTL maps and decaying counters for per-client security state
+
+Features:
+- TTLMap: key -> value with a default or per-entry TTL
+- ExpiringCounter: counts that expire a fixed time after the first hit, or
+  after the last hit (decay while a client stays quiet)
+- Capacity caps: the oldest entries are evicted first once a table is full
+- One background reaper for every table; expired entries are also dropped
+  lazily on access
+- Per-table memory/usage stats for monitoring
+"""
+
+import logging
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from threading import Lock, Thread
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Every store registers itself here so the reaper and stats can find it
+_stores: "weakref.WeakSet[TTLMap]" = weakref.WeakSet()
+_reaper: Optional[Thread] = None
+_reaper_lock = Lock()
+
+
+class TTLMap:
+    """Dict-like table whose entries expire; bounded by max_items (oldest evicted first)"""
+
+    def __init__(self, name: str, ttl_seconds: float, max_items: int = 10000, clock=time.monotonic):
+        """
+        Args:
+            name: Table name used in stats and logs
+            ttl_seconds: Default lifetime of an entry
+            max_items: Capacity; inserting beyond it evicts the oldest entries
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.name = name
+        self.ttl = ttl_seconds
+        self.max_items = max_items
+        self.clock = clock
+        self.entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()  # key -> (value, expires_at)
+        self.lock = Lock()
+        self.evictions = 0
+        self.expirations = 0
+        _stores.add(self)
+
+    # ── Mapping API ─────────────────────────────────────────
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.lock:
+            entry = self._live(key, self.clock())
+            return default if entry is None else entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Insert or replace key, restarting its lifetime"""
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (value, expires_at)
+            self._enforce_capacity()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def discard(self, key: Hashable):
+        self.pop(key)
+
+    def expires_in(self, key: Hashable) -> float:
+        """Seconds until key expires (0 if absent)"""
+        now = self.clock()
+        with self.lock:
+            entry = self._live(key, now)
+            return 0.0 if entry is None else entry[1] - now
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of live keys"""
+        now = self.clock()
+        with self.lock:
+            return [k for k, (_, expires_at) in self.entries.items() if expires_at > now]
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self.lock:
+            return self._live(key, self.clock()) is not None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.keys())
+
+    # ── Maintenance ─────────────────────────────────────────
+
+    def reap(self) -> int:
+        """Drop every expired entry. Returns how many were removed."""
+        now = self.clock()
+        with self.lock:
+            expired = [k for k, (_, expires_at) in self.entries.items() if expires_at <= now]
+            for key in expired:
+                del self.entries[key]
+            self.expirations += len(expired)
+            return len(expired)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            items = len(self.entries)
+            # Approximate: container plus one sampled entry scaled to the table size
+            approx_bytes = sys.getsizeof(self.entries)
+            if items:
+                key, (value, _) = next(iter(self.entries.items()))
+                approx_bytes += items * (sys.getsizeof(key) + sys.getsizeof(value) + 64)
+            return {
+                'name': self.name,
+                'items': items,
+                'max_items': self.max_items,
+                'ttl_seconds': self.ttl,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'approx_bytes': approx_bytes,
+            }
+
+    def _live(self, key: Hashable, now: float) -> Optional[Tuple[Any, float]]:
+        """Entry for key if not expired (caller holds the lock)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self.entries[key]
+            self.expirations += 1
+            return None
+        return entry
+
+    def _enforce_capacity(self):
+        while len(self.entries) > self.max_items:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+class ExpiringCounter(TTLMap):
+    """Per-key counters that reset once their TTL passes"""
+
+    def __init__(self, name: str, ttl_seconds: float, max_items: int = 10000,
+                 extend_on_hit: bool = False, clock=time.monotonic):
+        """
+        Args:
+            extend_on_hit: False = window fixed from the first hit;
+                           True = counter expires ttl_seconds after the latest hit
+        """
+        super().__init__(name, ttl_seconds, max_items=max_items, clock=clock)
+        self.extend_on_hit = extend_on_hit
+
+    def incr(self, key: Hashable, amount: int = 1) -> int:
+        """Add amount to key's counter and return the new value"""
+        now = self.clock()
+        with self.lock:
+            entry = self._live(key, now)
+            if entry is None:
+                count, expires_at = amount, now + self.ttl
+            else:
+                count = entry[0] + amount
+                expires_at = now + self.ttl if self.extend_on_hit else entry[1]
+                del self.entries[key]
+            self.entries[key] = (count, expires_at)
+            self._enforce_capacity()
+            return count
+
+    def decr(self, key: Hashable, amount: int = 1) -> int:
+        """Subtract amount; the key is removed once it reaches zero"""
+        now = self.clock()
+        with self.lock:
+            entry = self._live(key, now)
+            if entry is None:
+                return 0
+            count = entry[0] - amount
+            if count <= 0:
+                del self.entries[key]
+                return 0
+            self.entries[key] = (count, entry[1])
+            return count
+
+    def count(self, key: Hashable) -> int:
+        return self.get(key, 0)
+
+
+def register(store):
+    """Add a store with the same reap()/stats() interface to the shared reaper and stats"""
+    _stores.add(store)
+
+
+def all_stats() -> List[Dict]:
+    """Stats for every live store, sorted by name"""
+    return sorted((store.stats() for store in list(_stores)), key=lambda s: s['name'])
+
+
+def reap_all() -> int:
+    removed = 0
+    for store in list(_stores):
+        try:
+            removed += store.reap()
+        except Exception as e:
+            logger.error(f"❌ Reaping {store.name} failed: {e}")
+    return removed
+
+
+def start_reaper(interval_seconds: float = 60.0):
+    """Start the shared background reaper (idempotent)"""
+    global _reaper
+    with _reaper_lock:
+        if _reaper is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval_seconds)
+                removed = reap_all()
+                if removed:
+                    logger.debug(f"🧹 Reaped {removed} expired security state entries")
+
+        _reaper = Thread(target=run, daemon=True, name="state-reaper")
+        _reaper.start()
@@ -0,0 +1,111 @@
+"""
+Precompiled Response Header Policy
+Security and cache headers built once per route class, applied per response
+
+Features:
+- CSP and security headers compiled to final strings at startup (and on
+  config reload), never per request
+- One header set per route class: HTML, API, versioned static, unversioned
+  static, cached (ETag-revalidated) responses and everything else
+- Applied with a single headers.update() call
+- Atomic swap on rebuild: requests see either the old or the new header set
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Route classes
+HTML = 'html'
+API = 'api'
+STATIC_VERSIONED = 'static_versioned'
+STATIC = 'static'
+OTHER = 'other'
+REVALIDATE = 'revalidate'  # Served from the response cache: browsers may keep it but must revalidate
+ROUTE_CLASSES = (HTML, API, STATIC_VERSIONED, STATIC, OTHER, REVALIDATE)
+
+NO_CACHE_HEADERS = {
+    'Cache-Control': 'no-cache, no-store, must-revalidate, public, max-age=0',
+    'Pragma': 'no-cache',
+    'Expires': '0',
+}
+
+# Default cache behaviour per route class (user server; admin overrides static)
+DEFAULT_CACHE_HEADERS = {
+    HTML: NO_CACHE_HEADERS,
+    API: NO_CACHE_HEADERS,
+    STATIC_VERSIONED: {'Cache-Control': 'public, max-age=31536000, immutable'},  # 1 year
+    STATIC: {'Cache-Control': 'public, max-age=0, must-revalidate'},
+    OTHER: {},
+    REVALIDATE: {'Cache-Control': 'no-cache'},
+}
+
+
+def build_csp(directives: Dict[str, Iterable[str]]) -> str:
+    """Serialize CSP directives ({'default-src': ["'self'"], ...}) to a header value"""
+    return '; '.join(f"{name} {' '.join(sources)}" for name, sources in directives.items())
+
+
+def external_origins(external_url: Optional[str]) -> List[str]:
+    """HTTP and WebSocket origins for an external URL (CF Tunnel or reverse proxy)"""
+    if not external_url:
+        return []
+    if external_url.startswith('https://'):
+        host = external_url[len('https://'):].rstrip('/')
+        return [f"https://{host}", f"wss://{host}"]
+    if external_url.startswith('http://'):
+        host = external_url[len('http://'):].rstrip('/')
+        return [f"http://{host}", f"ws://{host}"]
+    return []
+
+
+def classify(path: str, content_type: Optional[str], versioned: bool) -> str:
+    """Route class of a response (HTML is checked first, like the old middleware)"""
+    if content_type and 'text/html' in content_type:
+        return HTML
+    if path.startswith('/api/'):
+        return API
+    if path.startswith('/static/'):
+        return STATIC_VERSIONED if versioned else STATIC
+    return OTHER
+
+
+class HeaderPolicy:
+    """Full response header set per route class, compiled ahead of time"""
+
+    def __init__(self, csp: Dict[str, Iterable[str]], security_headers: Optional[Dict[str, str]] = None,
+                 cache_headers: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Args:
+            csp: Content-Security-Policy directives
+            security_headers: Headers sent on every response (X-Frame-Options, ...)
+            cache_headers: Per route class cache headers (defaults to DEFAULT_CACHE_HEADERS)
+        """
+        self.headers: Dict[str, Dict[str, str]] = {}
+        self.csp = ''
+        self.rebuild(csp, security_headers, cache_headers)
+
+    def rebuild(self, csp: Dict[str, Iterable[str]], security_headers: Optional[Dict[str, str]] = None,
+                cache_headers: Optional[Dict[str, Dict[str, str]]] = None):
+        """Recompile every header set (startup and config reload)"""
+        csp_value = build_csp(csp)
+        common = dict(security_headers or {})
+        common['Content-Security-Policy'] = csp_value
+        cache_headers = cache_headers or DEFAULT_CACHE_HEADERS
+
+        compiled = {}
+        for route_class in ROUTE_CLASSES:
+            headers = dict(common)
+            headers.update(cache_headers.get(route_class, {}))
+            compiled[route_class] = headers
+
+        # Single assignment: concurrent requests see either the old or the new policy
+        self.headers = compiled
+        self.csp = csp_value
+        logger.debug(f"🛡️ Header policy compiled ({len(csp_value)} byte CSP)")
+
+    def apply(self, response, route_class: str):
+        """Set the precompiled headers for route_class on response"""
+        response.headers.update(self.headers[route_class])
+        return response
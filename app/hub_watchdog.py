@@ -0,0 +1,172 @@
+"""
+Event Loop Watchdog
+Detects calls that block the eventlet hub and records what was running
+
+Features:
+- A green heartbeat sleeps in short intervals on the hub; a real OS thread
+  (outside eventlet's scheduler) notices when a heartbeat is overdue
+- Past the threshold, the OS thread captures the stack of the hub thread,
+  i.e. whatever green thread is holding it (sync subprocess, requests retry
+  sleep, a large json encode, ...), while it is still blocking
+- One report per stall to a dedicated logger, with the innermost app frame
+  named as the likely culprit; the stall's full length is logged when the
+  hub resumes
+- Metrics: stall count and duration histogram, plus the lag gauge/histogram
+  of metrics.HubLagProbe (the heartbeat is a HubLagProbe)
+- Reports are rate limited, and the last few are kept for inspection
+"""
+
+import logging
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+try:
+    from . import metrics
+except ImportError:
+    from app import metrics
+
+try:
+    # The monitor must be a real OS thread and sleep for real, even when
+    # threading/time are monkey patched
+    from eventlet import patcher
+    _threading = patcher.original('threading')
+    _thread = patcher.original('_thread')
+    _real_sleep = patcher.original('time').sleep
+except ImportError:
+    import threading as _threading
+    import _thread
+    _real_sleep = time.sleep
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+THIS_FILE = os.path.abspath(__file__)
+STACK_LIMIT = 40   # Frames kept per report (innermost)
+
+
+def _is_app_frame(filename: str) -> bool:
+    path = os.path.abspath(filename)
+    return path.startswith(APP_ROOT) and 'site-packages' not in path and path != THIS_FILE
+
+
+def culprit(stack: List[traceback.FrameSummary]) -> str:
+    """The innermost frame in this project's code (else the innermost frame)"""
+    for frame in reversed(stack):
+        if _is_app_frame(frame.filename):
+            return f"{os.path.relpath(frame.filename, APP_ROOT)}:{frame.lineno} in {frame.name}"
+    if stack:
+        frame = stack[-1]
+        return f"{frame.filename}:{frame.lineno} in {frame.name}"
+    return 'unknown'
+
+
+class HubWatchdog:
+    """Heartbeat on the hub + OS-thread monitor that captures blocking stacks"""
+
+    def __init__(self, threshold_seconds: float = 0.25, interval_seconds: float = 0.05,
+                 report_logger: Optional[logging.Logger] = None, min_report_interval: float = 5.0,
+                 registry: metrics.Registry = metrics.REGISTRY, clock=time.monotonic):
+        """
+        Args:
+            threshold_seconds: Hub lag that counts as a blocking call
+            interval_seconds: Heartbeat sleep; also the lag probe's interval
+            report_logger: Where stall reports go (a dedicated file logger)
+            min_report_interval: At most one stack report per this many seconds
+            registry: Metrics registry for the stall counters
+        """
+        self.threshold = threshold_seconds
+        self.interval = interval_seconds
+        self.report_logger = report_logger or logger
+        self.min_report_interval = min_report_interval
+        self.clock = clock
+        self.probe = metrics.HubLagProbe(interval_seconds, registry=registry, clock=clock)
+        self.stalls = registry.counter('eventlet_blocking_stalls_total', 'Hub stalls longer than the watchdog threshold')
+        self.stall_seconds = registry.histogram(
+            'eventlet_blocking_stall_seconds', 'Length of hub stalls caught by the watchdog',
+            buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+        self.recent: Deque[Dict] = deque(maxlen=20)
+
+        self.hub_thread_id: Optional[int] = None
+        self.sleep_started: Optional[float] = None  # Set by the heartbeat before each sleep
+        self.reported_beat: Optional[float] = None  # Heartbeat whose stall was already seen by the monitor
+        self.logged_beat: Optional[float] = None    # ... and whose stack was written (not rate limited)
+        self.last_report_at = -min_report_interval
+        self.running = False
+
+    # Hub side ────────────────────────────────
+    def heartbeat(self, sleep: Callable[[float], None]):
+        """Green loop on the hub (start with socketio.start_background_task)"""
+        self.hub_thread_id = _thread.get_ident()
+        while self.running:
+            started = self.sleep_started = self.clock()
+            try:
+                lag = self.probe.sample(sleep)
+            except Exception as e:
+                logger.error(f"❌ Hub watchdog heartbeat error: {e}")
+                continue
+            if lag >= self.threshold:
+                self.stalls.inc()
+                self.stall_seconds.observe(lag)
+                if self.logged_beat == started:
+                    self.report_logger.warning(f"Hub resumed after blocking for {lag:.3f}s")
+
+    # Monitor side (real OS thread) ───────────
+    def check(self) -> Optional[Dict]:
+        """Capture the hub's stack if the current heartbeat is overdue (one report per stall)"""
+        started = self.sleep_started
+        if started is None or self.hub_thread_id is None or started == self.reported_beat:
+            return None
+        now = self.clock()
+        lag = now - started - self.interval
+        if lag < self.threshold:
+            return None
+        self.reported_beat = started
+        if now - self.last_report_at < self.min_report_interval:
+            return None
+        self.last_report_at = now
+        self.logged_beat = started
+
+        frame = sys._current_frames().get(self.hub_thread_id)
+        stack = traceback.extract_stack(frame, limit=STACK_LIMIT) if frame is not None else []
+        report = {
+            'at': time.time(),
+            'blocked_for': round(lag, 3),
+            'culprit': culprit(stack),
+            'stack': ''.join(traceback.format_list(stack)),
+        }
+        self.recent.append(report)
+        self.report_logger.warning(
+            f"Hub blocked for {lag:.3f}s (threshold {self.threshold:.3f}s), "
+            f"likely culprit {report['culprit']}\n{report['stack']}")
+        return report
+
+    def monitor(self):
+        poll = max(0.01, self.threshold / 4)
+        while self.running:
+            _real_sleep(poll)
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"❌ Hub watchdog monitor error: {e}")
+
+    # Lifecycle ───────────────────────────────
+    def start(self, sleep: Callable[[float], None], start_background_task: Callable):
+        """Start the green heartbeat and the OS monitor thread"""
+        self.running = True
+        start_background_task(self.heartbeat, sleep)
+        _threading.Thread(target=self.monitor, name='hub-watchdog', daemon=True).start()
+        logger.info(f"🐕 Hub watchdog started (threshold {self.threshold * 1000:.0f} ms)")
+
+    def stop(self):
+        self.running = False
+
+    def stats(self) -> Dict:
+        return {
+            'threshold_seconds': self.threshold,
+            'stalls': int(self.stalls.get()),
+            'recent': [{k: v for k, v in r.items() if k != 'stack'} for r in self.recent],
+        }
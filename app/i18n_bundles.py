@@ -0,0 +1,217 @@
+"""
+Per-Locale i18n Bundles
+Splits static/js/i18n.js into one small JSON bundle per UI language
+
+Features:
+- Reads the sharedI18n and sharedAiStatusLibrary object literals straight
+  out of i18n.js (still the single source of truth for translations)
+- Applies the same fallbacks as the client: missing keys inherit English,
+  every language gets a brand_admin entry, missing AI status libraries
+  use English
+- Bundles are content-hashed (/static/i18n/<lang>.<hash>.json) so they can
+  be cached immutably and served precompressed from the static manifest
+- No Flask dependency
+"""
+
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_DIR = 'i18n'
+HASH_LENGTH = 12
+CHINESE_VARIANTS = ('zh', 'yue', 'zh-tw')
+
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+
+class _LiteralParser:
+    """Parser for the JSON-like subset of JavaScript used by i18n.js
+
+    Accepts unquoted keys, single or double quoted strings, comments and
+    trailing commas.
+    """
+
+    def __init__(self, source: str, pos: int):
+        self.source = source
+        self.pos = pos
+
+    def error(self, message: str) -> ValueError:
+        line = self.source.count('\n', 0, self.pos) + 1
+        return ValueError(f"i18n.js line {line}: {message}")
+
+    def skip(self):
+        source = self.source
+        while self.pos < len(source):
+            char = source[self.pos]
+            if char.isspace():
+                self.pos += 1
+            elif source.startswith('//', self.pos):
+                end = source.find('\n', self.pos)
+                self.pos = len(source) if end < 0 else end + 1
+            elif source.startswith('/*', self.pos):
+                end = source.find('*/', self.pos + 2)
+                if end < 0:
+                    raise self.error("unterminated comment")
+                self.pos = end + 2
+            else:
+                return
+
+    def value(self) -> Any:
+        self.skip()
+        char = self.source[self.pos:self.pos + 1]
+        if char == '{':
+            return self.object()
+        if char == '[':
+            return self.array()
+        if char in ('"', "'"):
+            return self.string()
+        match = _NUMBER.match(self.source, self.pos)
+        if match:
+            self.pos = match.end()
+            text = match.group()
+            return float(text) if any(c in text for c in '.eE') else int(text)
+        match = _IDENTIFIER.match(self.source, self.pos)
+        if match and match.group() in ('true', 'false', 'null'):
+            self.pos = match.end()
+            return {'true': True, 'false': False, 'null': None}[match.group()]
+        raise self.error(f"unexpected {char!r}")
+
+    def object(self) -> Dict:
+        result = {}
+        self.pos += 1  # '{'
+        while True:
+            self.skip()
+            if self.source[self.pos] == '}':
+                self.pos += 1
+                return result
+            if self.source[self.pos] in ('"', "'"):
+                key = self.string()
+            else:
+                match = _IDENTIFIER.match(self.source, self.pos)
+                if not match:
+                    raise self.error("expected a key")
+                key = match.group()
+                self.pos = match.end()
+            self.skip()
+            if self.source[self.pos] != ':':
+                raise self.error(f"expected ':' after {key!r}")
+            self.pos += 1
+            result[key] = self.value()
+            self.separator('}')
+
+    def array(self) -> list:
+        result = []
+        self.pos += 1  # '['
+        while True:
+            self.skip()
+            if self.source[self.pos] == ']':
+                self.pos += 1
+                return result
+            result.append(self.value())
+            self.separator(']')
+
+    def separator(self, closing: str):
+        self.skip()
+        char = self.source[self.pos]
+        if char == ',':
+            self.pos += 1
+        elif char != closing:
+            raise self.error(f"expected ',' or {closing!r}")
+
+    def string(self) -> str:
+        source = self.source
+        quote = source[self.pos]
+        self.pos += 1
+        chunks = []
+        while True:
+            if self.pos >= len(source):
+                raise self.error("unterminated string")
+            char = source[self.pos]
+            if char == quote:
+                self.pos += 1
+                return ''.join(chunks)
+            if char == '\\':
+                escaped = source[self.pos + 1]
+                if escaped == 'u':
+                    chunks.append(chr(int(source[self.pos + 2:self.pos + 6], 16)))
+                    self.pos += 6
+                    continue
+                if escaped == 'x':
+                    chunks.append(chr(int(source[self.pos + 2:self.pos + 4], 16)))
+                    self.pos += 4
+                    continue
+                if escaped != '\n':  # Backslash-newline is a line continuation
+                    chunks.append(_ESCAPES.get(escaped, escaped))
+                self.pos += 2
+                continue
+            chunks.append(char)
+            self.pos += 1
+
+
+def extract_literal(source: str, name: str) -> Dict:
+    """Parse the object literal assigned to window.<name> in source"""
+    match = re.search(rf'window\.{re.escape(name)}\s*=\s*(?=\{{)', source)
+    if not match:
+        raise ValueError(f"window.{name} not found in i18n.js")
+    return _LiteralParser(source, match.end()).value()
+
+
+def build_bundles(i18n_js: str) -> Dict[str, Dict]:
+    """Per-language bundles {'lang', 'messages', 'aiStatus'} from the i18n.js source"""
+    messages = extract_literal(i18n_js, 'sharedI18n')
+    ai_status = extract_literal(i18n_js, 'sharedAiStatusLibrary')
+    english = messages.get('en', {})
+
+    bundles = {}
+    for lang, strings in messages.items():
+        # Every key falls back to English, like applyDisplayLanguage() does per lookup
+        merged = dict(english)
+        merged.update(strings)
+        if not strings.get('brand_admin'):
+            if lang in CHINESE_VARIANTS:
+                merged['brand_admin'] = strings.get('brand') or 'EzySpeech 管理控制台'
+            else:
+                merged['brand_admin'] = english.get('brand_admin') or 'EzySpeech Admin Controls'
+        bundles[lang] = {
+            'lang': lang,
+            'messages': merged,
+            'aiStatus': ai_status.get(lang) or ai_status.get('en', {}),
+        }
+    return bundles
+
+
+def encode_bundle(bundle: Dict) -> Tuple[str, bytes]:
+    """Compact UTF-8 JSON for a bundle and its content hash"""
+    data = json.dumps(bundle, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH], data
+
+
+def register_bundles(manifest, i18n_js_path: str, url_prefix: str = '/static') -> Dict[str, str]:
+    """Build every bundle, add it to the static manifest and return {lang: url}
+
+    Args:
+        manifest: static_assets.AssetManifest serving the static folder
+        i18n_js_path: Path to static/js/i18n.js
+        url_prefix: URL path the static folder is mounted at
+    """
+    with open(i18n_js_path, 'r', encoding='utf-8') as f:
+        bundles = build_bundles(f.read())
+
+    urls = {}
+    total = 0
+    for lang, bundle in bundles.items():
+        digest, data = encode_bundle(bundle)
+        filename = f"{BUNDLE_DIR}/{lang}.{digest}.json"
+        manifest.add(filename, data, 'application/json', fingerprinted=True)
+        urls[lang] = f"{url_prefix}/{filename}"
+        total += len(data)
+
+    logger.info(f"🌐 i18n bundles built: {len(urls)} languages, "
+                f"{total // max(len(urls), 1) // 1024} KB average")
+    return urls
@@ -0,0 +1,219 @@
+"""
+Caption Latency Tracing
+Per-stage timing of a caption from the admin's speech result to listener render
+
+Features:
+- A trace ID travels with each final caption: admin recognition result ->
+  server -> broadcast -> listener translation / TTS / render
+- Stages measured on one clock each: uplink (admin clock corrected to server
+  time via clock_sync), server handling, downlink (listener clock corrected),
+  and listener-side translate / tts / render durations
+- End to end = listener render time minus the admin's recognition time,
+  both on the server clock
+- p50/p95/p99 per stage and language over a sliding window of recent
+  samples, plus a metrics histogram for Prometheus-side aggregation
+- Pending traces live in a bounded TTL table; bad or implausible reports
+  (negative, > 1 minute, unknown trace, a second report from the same
+  listener for one caption) are dropped
+"""
+
+import math
+import re
+import time
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from . import expiring_store, metrics
+except ImportError:
+    from app import expiring_store, metrics
+
+STAGES = ('uplink', 'server', 'downlink', 'translate', 'tts', 'render', 'end_to_end')
+CLIENT_STAGES = ('translate', 'tts', 'render')
+QUANTILES = (0.5, 0.95, 0.99)
+ALL_LANGUAGES = 'all'
+OTHER_LANGUAGE = 'other'
+MAX_STAGE_SECONDS = 60.0   # Anything slower is a broken clock or a stuck tab, not latency
+MAX_REPORTERS_PER_TRACE = 256  # Listener reports kept per caption; plenty for the quantiles
+
+TRACE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+LANGUAGE_PATTERN = re.compile(r'^[A-Za-z]{2,3}(-[A-Za-z0-9]{2,8})?$')
+
+LATENCY_HISTOGRAM = metrics.histogram(
+    'caption_latency_seconds', 'Caption latency per stage', ('stage', 'language'),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 30.0))
+
+
+def valid_trace_id(trace_id) -> bool:
+    return isinstance(trace_id, str) and bool(TRACE_ID_PATTERN.match(trace_id))
+
+
+def _number(value) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value)
+
+
+class QuantileWindow:
+    """The most recent samples of one series; quantiles are computed on read"""
+
+    def __init__(self, size: int):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+
+    def quantiles(self) -> Dict[float, float]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {}
+        # Nearest-rank quantiles
+        return {q: ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))] for q in QUANTILES}
+
+
+class LatencyTracker:
+    """Open traces plus per-(stage, language) sample windows"""
+
+    def __init__(self, window: int = 1024, trace_ttl_seconds: float = 120.0, max_traces: int = 2000,
+                 max_languages: int = 32, clock=time.time):
+        """
+        Args:
+            window: Samples kept per stage and language for the quantiles
+            trace_ttl_seconds: How long listener reports are accepted for a caption
+            max_traces: Open traces kept (oldest evicted)
+            max_languages: Distinct language labels before new ones become 'other'
+            clock: Wall clock in seconds (client timestamps are epoch milliseconds)
+        """
+        self.window = window
+        self.max_languages = max_languages
+        self.clock = clock
+        self.lock = Lock()
+        self.traces = expiring_store.TTLMap('caption_traces', ttl_seconds=trace_ttl_seconds, max_items=max_traces)
+        self.series: Dict[Tuple[str, str], QuantileWindow] = {}
+        self.languages = set()
+        self.dropped = 0
+
+    def now_ms(self) -> float:
+        return self.clock() * 1000
+
+    def _language(self, language) -> str:
+        if not isinstance(language, str) or not LANGUAGE_PATTERN.match(language):
+            return OTHER_LANGUAGE
+        language = language.lower()
+        with self.lock:
+            if language not in self.languages:
+                if len(self.languages) >= self.max_languages:
+                    return OTHER_LANGUAGE
+                self.languages.add(language)
+        return language
+
+    def record(self, stage: str, language: str, seconds: float) -> bool:
+        """Add one sample (seconds); implausible values are dropped"""
+        if stage not in STAGES or not 0 <= seconds <= MAX_STAGE_SECONDS:
+            self.dropped += 1
+            return False
+        language = self._language(language)
+        with self.lock:
+            for key in ((stage, language), (stage, ALL_LANGUAGES)):
+                series = self.series.get(key)
+                if series is None:
+                    series = self.series[key] = QuantileWindow(self.window)
+                series.add(seconds)
+        LATENCY_HISTOGRAM.observe(seconds, stage, language)
+        return True
+
+    # Server side ─────────────────────────────
+    def start(self, trace_id, spoken_at_ms, language: str) -> Optional[float]:
+        """A final caption arrived; records uplink when the admin sent its recognition time"""
+        if not valid_trace_id(trace_id):
+            return None
+        received = self.now_ms()
+        spoken = _number(spoken_at_ms)
+        self.traces.set(trace_id, {'received': received, 'spoken': spoken, 'broadcast': None, 'language': language,
+                                   'reporters': set()})
+        if spoken is not None:
+            self.record('uplink', language, (received - spoken) / 1000)
+        return received
+
+    def broadcast(self, trace_id):
+        """The caption was handed to every listener socket"""
+        trace = self.traces.get(trace_id) if valid_trace_id(trace_id) else None
+        if trace is None:
+            return
+        trace['broadcast'] = self.now_ms()
+        self.record('server', trace['language'], (trace['broadcast'] - trace['received']) / 1000)
+
+    # Listener reports ────────────────────────
+    def client_report(self, report, reporter: Optional[str] = None) -> bool:
+        """
+        One listener's timings for one caption
+
+        report: {trace_id, language, received_at (server-clock ms),
+                 stages: {translate|tts|render: milliseconds after receipt}}
+        reporter: The listener's socket ID; only its first report per caption counts
+        """
+        if not isinstance(report, dict) or not valid_trace_id(report.get('trace_id')):
+            self.dropped += 1
+            return False
+        trace = self.traces.get(report['trace_id'])
+        if trace is None or trace['broadcast'] is None:
+            self.dropped += 1
+            return False
+        if reporter is not None:
+            with self.lock:
+                reporters = trace['reporters']
+                if reporter in reporters or len(reporters) >= MAX_REPORTERS_PER_TRACE:
+                    self.dropped += 1
+                    return False
+                reporters.add(reporter)
+
+        language = report.get('language') or trace['language']
+        received_at = _number(report.get('received_at'))
+        if received_at is not None:
+            self.record('downlink', language, (received_at - trace['broadcast']) / 1000)
+
+        stages = report.get('stages') if isinstance(report.get('stages'), dict) else {}
+        for stage in CLIENT_STAGES:
+            elapsed = _number(stages.get(stage))
+            if elapsed is not None:
+                self.record(stage, language, elapsed / 1000)
+
+        render = _number(stages.get('render'))
+        if received_at is not None and render is not None and trace['spoken'] is not None:
+            self.record('end_to_end', language, (received_at + render - trace['spoken']) / 1000)
+        return True
+
+    def drop(self, count: int = 1):
+        """Count reports rejected before they reached client_report (e.g. rate limited)"""
+        self.dropped += count
+
+    # Reading ─────────────────────────────────
+    def summary(self) -> Dict:
+        """{stage: {language: {count, p50, p95, p99}}} in milliseconds"""
+        with self.lock:
+            items = [(key, series.count, series.quantiles()) for key, series in self.series.items()]
+        result: Dict[str, Dict] = {}
+        for (stage, language), count, quantiles in sorted(items):
+            entry = {'count': count}
+            for q, value in quantiles.items():
+                entry[f"p{round(q * 100)}"] = round(value * 1000, 1)
+            result.setdefault(stage, {})[language] = entry
+        return {'stages': result, 'open_traces': len(self.traces), 'dropped_reports': self.dropped}
+
+    def families(self) -> Iterator[metrics.Family]:
+        """Windowed quantiles as a gauge family (the histogram covers all-time rates)"""
+        with self.lock:
+            items = [(key, series.quantiles()) for key, series in self.series.items()]
+        samples: List[Tuple[Tuple, float]] = []
+        for (stage, language), quantiles in items:
+            for q, value in quantiles.items():
+                samples.append(((stage, language, str(q)), value))
+        if samples:
+            yield metrics.Family('caption_latency_quantile_seconds', 'gauge',
+                                 'Caption latency quantiles over the recent sample window',
+                                 ('stage', 'language', 'quantile'), samples)
+        yield metrics.Family('caption_latency_dropped_reports', 'counter',
+                             'Listener latency reports rejected', (), [((), self.dropped)])
@@ -0,0 +1,396 @@
+"""
+Prometheus-Style Metrics
+Counters, gauges and histograms rendered in the Prometheus text format
+
+Features:
+- No client library needed: a small registry with labelled Counter, Gauge and
+  Histogram families; an update is one dict lookup and an add under a lock
+- Get-or-create registration, so modules can declare the metrics they own at
+  import time (translation cache, TTS pool, ...) and servers share them
+- Collectors: callbacks turned into gauge/counter families at scrape time, for
+  state that already has stats() (history size, stores, caches, admission)
+- Socket.IO instrumentation: events in (count + handler duration) and events
+  out (count, broadcast fan-out and duration) by wrapping socketio.on/emit
+- Eventlet hub lag probe: how late a periodic sleep wakes up
+- Scrape access: a bearer token when one is configured, otherwise only direct
+  (unproxied) scrapes from this host
+- No Flask dependency; the servers expose render() at /metrics
+"""
+
+import bisect
+import functools
+import hmac
+import logging
+import math
+import time
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+PREFIX = 'ezy_'
+
+# Request/handler latencies: 1 ms .. 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Broadcast recipients per emit
+FANOUT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1', '::ffff:127.0.0.1')
+FORWARDED_HEADERS = ('X-Forwarded-For', 'X-Real-IP', 'Forwarded')
+HTTP_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+
+def method_label(method: str) -> str:
+    """HTTP method as a label value; made-up verbs share 'other' so clients cannot add series"""
+    return method if method in HTTP_METHODS else 'other'
+
+
+def scrape_allowed(token: str, authorization: str, remote_addr: Optional[str], headers) -> Tuple[bool, int]:
+    """
+    (allowed, status if not) for a /metrics request
+
+    With a token configured the request must carry "Bearer <token>" (401).
+    Without one, only a scrape from this host that did not come through a
+    reverse proxy is served (403): a proxied request can look local, and
+    X-Forwarded-For can make any client look like 127.0.0.1 behind ProxyFix.
+    """
+    if token:
+        return hmac.compare_digest(authorization or '', f'Bearer {token}'), 401
+    direct = not any(headers.get(name) for name in FORWARDED_HEADERS)
+    return direct and remote_addr in LOOPBACK_ADDRESSES, 403
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _label_text(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class Metric:
+    """A metric family: one value (or histogram) per label combination"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = Lock()
+        self.values: Dict[Tuple, object] = {}
+        if not self.labelnames:
+            self.values[()] = self._initial()  # Unlabelled metrics are scraped as 0 before first use
+
+    def _initial(self):
+        return 0.0
+
+    def _key(self, labels: Sequence) -> Tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(value) for value in labels)
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            return [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}"
+                    for key, value in self.values.items()]
+
+
+class Counter(Metric):
+    type_name = 'counter'
+
+    def inc(self, *labels, amount: float = 1.0):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def get(self, *labels) -> float:
+        return self.values.get(self._key(labels), 0.0)
+
+
+class Gauge(Metric):
+    type_name = 'gauge'
+
+    def set(self, value: float, *labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = float(value)
+
+    def inc(self, *labels, amount: float = 1.0):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def get(self, *labels) -> float:
+        return self.values.get(self._key(labels), 0.0)
+
+
+class Histogram(Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _initial(self):
+        # [per-bucket counts (last = +Inf), sum, count]
+        return [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = self._initial()
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, *labels):
+        """Context manager observing the duration of its block"""
+        return _Timer(self, labels)
+
+    def count(self, *labels) -> int:
+        state = self.values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self.lock:
+            for key, (counts, total, count) in self.values.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                    cumulative += bucket_count
+                    lines.append(f"{self.name}_bucket{_label_text(self.labelnames + ('le',), key + (_format_value(float(bound)),))} {cumulative}")
+                labels = _label_text(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram: Histogram, labels: Tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+class Family(NamedTuple):
+    """Collector output: one metric family computed at scrape time"""
+    name: str
+    type_name: str             # 'gauge' or 'counter'
+    documentation: str
+    labelnames: Tuple[str, ...]
+    samples: List[Tuple[Tuple, float]]  # (label values, value)
+
+
+class Registry:
+    """Named metrics plus scrape-time collectors"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: Dict[str, Callable[[], Iterable[Family]]] = {}
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        name = PREFIX + name
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, name: str, collect: Callable[[], Iterable[Family]]):
+        """Add (or replace) a scrape-time collector"""
+        with self.lock:
+            self.collectors[name] = collect
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            metrics = list(self.metrics.values())
+            collectors = list(self.collectors.items())
+
+        for metric in metrics:
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(samples)
+
+        for collector_name, collect in collectors:
+            try:
+                families = list(collect())
+            except Exception as e:
+                # One broken collector must not take the whole scrape down
+                logger.error(f"❌ Metrics collector {collector_name} failed: {e}")
+                continue
+            for family in families:
+                name = PREFIX + family.name
+                lines.append(f"# HELP {name} {family.documentation}")
+                lines.append(f"# TYPE {name} {family.type_name}")
+                for labels, value in family.samples:
+                    lines.append(f"{name}{_label_text(family.labelnames, labels)} {_format_value(float(value))}")
+
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+register_collector = REGISTRY.register_collector
+render = REGISTRY.render
+
+
+def stats_families(prefix: str, documentation: str, rows: Iterable[Tuple[Tuple, Dict]],
+                   labelnames: Tuple[str, ...], fields: Dict[str, str]) -> List[Family]:
+    """
+    Turn stats() dicts into gauge families
+
+    Args:
+        prefix: Family name prefix (e.g. 'state_table')
+        documentation: Help text prefix
+        rows: (label values, stats dict) pairs
+        labelnames: Label names for the label values
+        fields: stats key -> family suffix; numeric values only
+    """
+    rows = list(rows)
+    families = []
+    for field, suffix in fields.items():
+        samples = [(labels, stats[field]) for labels, stats in rows
+                   if isinstance(stats.get(field), (int, float)) and not isinstance(stats.get(field), bool)]
+        if samples:
+            families.append(Family(f"{prefix}_{suffix}", 'gauge', f"{documentation} ({field})", labelnames, samples))
+    return families
+
+
+def instrument_socketio(socketio, audience: Callable[[], int], registry: Registry = REGISTRY):
+    """
+    Count and time Socket.IO traffic by wrapping socketio.on and socketio.emit
+
+    Must run before the @socketio.on handlers are declared. audience() returns
+    the number of connected sockets, used as the fan-out of a broadcast.
+    Replies sent with flask_socketio.emit() inside a handler are counted too
+    (scope "direct"): it looks up the SocketIO instance and calls its emit,
+    i.e. the wrapper. Acknowledgement return values are not events and are
+    not counted.
+    """
+    events_in = registry.counter('socketio_events_in_total', 'Socket.IO events received', ('event',))
+    handler_seconds = registry.histogram('socketio_handler_seconds', 'Socket.IO handler duration', ('event',))
+    events_out = registry.counter('socketio_events_out_total', 'Socket.IO events emitted', ('event', 'scope'))
+    fanout = registry.histogram('socketio_broadcast_recipients', 'Recipients per broadcast emit', ('event',),
+                                buckets=FANOUT_BUCKETS)
+    broadcast_seconds = registry.histogram('socketio_broadcast_seconds', 'Time to queue a broadcast to every recipient',
+                                           ('event',))
+
+    original_on = socketio.on
+    original_emit = socketio.emit
+
+    @functools.wraps(original_on)
+    def on(message, namespace=None):
+        register = original_on(message, namespace)
+
+        def decorator(handler):
+            @functools.wraps(handler)
+            def timed(*args, **kwargs):
+                events_in.inc(message)
+                started = time.perf_counter()
+                try:
+                    return handler(*args, **kwargs)
+                finally:
+                    handler_seconds.observe(time.perf_counter() - started, message)
+            register(timed)
+            return handler
+        return decorator
+
+    @functools.wraps(original_emit)
+    def emit(event, *args, **kwargs):
+        if kwargs.get('to') is not None or kwargs.get('room') is not None:
+            events_out.inc(event, 'direct')
+            return original_emit(event, *args, **kwargs)
+
+        skipped = kwargs.get('skip_sid')
+        skipped = len(skipped) if isinstance(skipped, (list, tuple, set)) else (1 if skipped else 0)
+        events_out.inc(event, 'broadcast')
+        started = time.perf_counter()
+        try:
+            return original_emit(event, *args, **kwargs)
+        finally:
+            broadcast_seconds.observe(time.perf_counter() - started, event)
+            fanout.observe(max(0, audience() - skipped), event)
+
+    socketio.on = on
+    socketio.emit = emit
+
+
+class HubLagProbe:
+    """Measures event loop lag: how much later than asked a short sleep returns"""
+
+    def __init__(self, interval_seconds: float = 0.5, registry: Registry = REGISTRY, clock=time.monotonic):
+        self.interval = interval_seconds
+        self.clock = clock
+        self.last_lag = registry.gauge('eventlet_hub_lag_seconds', 'Most recent event loop wake-up delay')
+        self.lag = registry.histogram('eventlet_hub_lag_histogram_seconds', 'Event loop wake-up delay',
+                                      buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+        self.running = False
+
+    def sample(self, sleep: Callable[[float], None]) -> float:
+        """Sleep one interval and record how late the wake-up was"""
+        started = self.clock()
+        sleep(self.interval)
+        lag = max(0.0, self.clock() - started - self.interval)
+        self.last_lag.set(lag)
+        self.lag.observe(lag)
+        return lag
+
+    def run(self, sleep: Callable[[float], None]):
+        """Probe forever (start with socketio.start_background_task(probe.run, socketio.sleep))"""
+        self.running = True
+        while self.running:
+            try:
+                self.sample(sleep)
+            except Exception as e:
+                logger.error(f"❌ Hub lag probe error: {e}")
+                sleep(self.interval)
+
+    def stop(self):
+        self.running = False
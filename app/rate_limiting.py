@@ -0,0 +1,153 @@
+"""
+Fixed-Memory Sliding-Window Rate Limiting
+Per-client request accounting that stays constant in size
+
+Features:
+- Bucketed ring per client: a window is split into a fixed number of
+  buckets, so each client costs the same few integers however busy it is
+- Weighted counts (a batch of N items counts as N)
+- Idle clients reaped periodically, so one-off listeners do not accumulate
+- Thread-safe, shared by TTS synthesis and translation limits
+"""
+
+import logging
+import time
+from threading import Lock
+from typing import Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _ClientWindow:
+    """Ring of per-bucket counts for one client"""
+
+    __slots__ = ('counts', 'head', 'total', 'last_seen')
+
+    def __init__(self, buckets: int, head: int, now: float):
+        self.counts = [0] * buckets
+        self.head = head        # Absolute bucket number of the newest slot
+        self.total = 0          # Sum of counts (kept incrementally)
+        self.last_seen = now
+
+
+class SlidingWindowLimiter:
+    """Sliding-window counter: at most `limit` units per `window_seconds` per key"""
+
+    def __init__(self, limit: int, window_seconds: float, buckets: int = 12,
+                 reap_interval: Optional[float] = None, clock=time.monotonic):
+        """
+        Args:
+            limit: Maximum units per key inside the window
+            window_seconds: Window length in seconds
+            buckets: Ring size; accuracy is window_seconds / buckets
+            reap_interval: Seconds between idle-client sweeps (default: one window)
+            clock: Monotonic time source (injectable for tests)
+        """
+        if limit <= 0 or window_seconds <= 0 or buckets <= 0:
+            raise ValueError("limit, window_seconds and buckets must be positive")
+
+        self.limit = limit
+        self.window = float(window_seconds)
+        self.buckets = buckets
+        self.bucket_seconds = self.window / buckets
+        self.reap_interval = reap_interval if reap_interval is not None else self.window
+        self.clock = clock
+        self.clients: Dict[Hashable, _ClientWindow] = {}
+        self.lock = Lock()
+        self._next_reap = clock() + self.reap_interval
+        self.rejected = 0
+
+    def hit(self, key: Hashable, cost: int = 1) -> Tuple[bool, int]:
+        """Record `cost` units for key if they fit in the window.
+
+        Returns:
+            (allowed, count) - count is the window total after this call
+        """
+        now = self.clock()
+        with self.lock:
+            if now >= self._next_reap:
+                self._reap(now)
+
+            state = self._advance(key, now)
+            if state.total + cost > self.limit:
+                self.rejected += 1
+                return False, state.total
+
+            state.counts[state.head % self.buckets] += cost
+            state.total += cost
+            return True, state.total
+
+    def count(self, key: Hashable) -> int:
+        """Units used by key in the current window (does not record a hit)"""
+        now = self.clock()
+        with self.lock:
+            if key not in self.clients:
+                return 0
+            return self._advance(key, now).total
+
+    def reset(self, key: Optional[Hashable] = None):
+        """Forget one key, or every key when key is None"""
+        with self.lock:
+            if key is None:
+                self.clients.clear()
+            else:
+                self.clients.pop(key, None)
+
+    def retry_after(self, key: Hashable) -> float:
+        """Seconds until the oldest non-empty bucket of key leaves the window"""
+        now = self.clock()
+        with self.lock:
+            state = self.clients.get(key)
+            if state is None or state.total == 0:
+                return 0.0
+            self._advance(key, now)
+            for age in range(self.buckets - 1, -1, -1):
+                if state.counts[(state.head - age) % self.buckets]:
+                    bucket_end = (state.head - age + self.buckets) * self.bucket_seconds
+                    return max(0.0, bucket_end - now)
+            return 0.0
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                'clients': len(self.clients),
+                'limit': self.limit,
+                'window_seconds': self.window,
+                'buckets': self.buckets,
+                'rejected': self.rejected,
+            }
+
+    def __len__(self):
+        return len(self.clients)
+
+    def _advance(self, key: Hashable, now: float) -> _ClientWindow:
+        """Rotate key's ring to the current bucket, zeroing buckets that expired"""
+        bucket = int(now // self.bucket_seconds)
+        state = self.clients.get(key)
+        if state is None:
+            state = self.clients[key] = _ClientWindow(self.buckets, bucket, now)
+            return state
+
+        elapsed = bucket - state.head
+        if elapsed >= self.buckets:
+            state.counts = [0] * self.buckets
+            state.total = 0
+        elif elapsed > 0:
+            for b in range(state.head + 1, bucket + 1):
+                slot = b % self.buckets
+                state.total -= state.counts[slot]
+                state.counts[slot] = 0
+        if elapsed > 0:
+            state.head = bucket
+        state.last_seen = now
+        return state
+
+    def _reap(self, now: float):
+        """Drop clients with no activity for a full window (caller holds the lock)"""
+        cutoff = now - self.window
+        idle = [key for key, state in self.clients.items() if state.last_seen <= cutoff]
+        for key in idle:
+            del self.clients[key]
+        self._next_reap = now + self.reap_interval
+        if idle:
+            logger.debug(f"🧹 Rate limiter reaped {len(idle)} idle clients ({len(self.clients)} active)")
@@ -0,0 +1,128 @@
+"""
+Route-Classified Request Middleware Pipeline
+Runs only the security checks a route class needs, and times each one
+
+Features:
+- Requests classified once by path: static, health, socket.io, api, page
+- Each stage declares the route classes it applies to; static assets and
+  health checks skip the expensive checks entirely
+- Per-stage counters: calls, rejections, total and max time
+- Per-route-class totals for the whole pipeline
+- No Flask dependency; stages are plain callables returning a response
+  (to short-circuit the request) or None
+"""
+
+import time
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Route classes
+STATIC = 'static'
+HEALTH = 'health'
+SOCKETIO = 'socketio'
+API = 'api'
+PAGE = 'page'
+ALL_ROUTES = frozenset((STATIC, HEALTH, SOCKETIO, API, PAGE))
+DYNAMIC_ROUTES = frozenset((SOCKETIO, API, PAGE))
+
+
+def classify_request(path: str, health_paths: Iterable[str] = ('/api/health', '/health')) -> str:
+    """Route class for a request path"""
+    if path.startswith('/static/') or path == '/favicon.ico':
+        return STATIC
+    if path in health_paths:
+        return HEALTH
+    if path.startswith('/socket.io'):
+        return SOCKETIO
+    if path.startswith('/api/'):
+        return API
+    return PAGE
+
+
+class StageCounter:
+    """Timing and outcome counters for one stage (or one route class)"""
+
+    __slots__ = ('calls', 'rejections', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.calls = 0
+        self.rejections = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int, rejected: bool):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if rejected:
+            self.rejections += 1
+
+    def as_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'rejections': self.rejections,
+            'total_ms': round(self.total_ns / 1e6, 3),
+            'avg_us': round(self.total_ns / self.calls / 1e3, 2) if self.calls else 0.0,
+            'max_us': round(self.max_ns / 1e3, 2),
+        }
+
+
+class RequestPipeline:
+    """Ordered security stages, each limited to the route classes that need it"""
+
+    def __init__(self, health_paths: Iterable[str] = ('/api/health', '/health')):
+        self.health_paths = frozenset(health_paths)
+        self.stages: List[Tuple[str, Callable, frozenset]] = []
+        self.plans: Dict[str, List[Tuple[str, Callable]]] = {}
+        self.stage_counters: Dict[str, StageCounter] = {}
+        self.route_counters: Dict[str, StageCounter] = {route: StageCounter() for route in ALL_ROUTES}
+        self.lock = Lock()
+        self._compile()
+
+    def stage(self, name: str, routes: Iterable[str] = ALL_ROUTES):
+        """Decorator registering func as the next stage for the given route classes"""
+        def decorator(func: Callable) -> Callable:
+            self.stages.append((name, func, frozenset(routes)))
+            self.stage_counters[name] = StageCounter()
+            self._compile()
+            return func
+        return decorator
+
+    def classify(self, path: str) -> str:
+        return classify_request(path, self.health_paths)
+
+    def run(self, path: str, route: Optional[str] = None):
+        """Run the stages for path's route class; returns the first non-None result"""
+        route = route or self.classify(path)
+        clock = time.perf_counter_ns
+        started = clock()
+        result = None
+
+        for name, func in self.plans[route]:
+            stage_start = clock()
+            result = func()
+            elapsed = clock() - stage_start
+            with self.lock:
+                self.stage_counters[name].record(elapsed, result is not None)
+            if result is not None:
+                break
+
+        with self.lock:
+            self.route_counters[route].record(clock() - started, result is not None)
+        return result
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                'stages': {name: counter.as_dict() for name, counter in self.stage_counters.items()},
+                'routes': {route: counter.as_dict() for route, counter in self.route_counters.items()},
+                'plan': {route: [name for name, _ in plan] for route, plan in self.plans.items()},
+            }
+
+    def _compile(self):
+        # Precompute the stage list per route class so run() does no filtering
+        self.plans = {
+            route: [(name, func) for name, func, routes in self.stages if route in routes]
+            for route in ALL_ROUTES
+        }
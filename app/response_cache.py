@@ -0,0 +1,85 @@
+"""
+Response Cache for Hot Public GETs
+Rendered pages and JSON bodies built once per content version, revalidated by ETag
+
+Features:
+- Entries keyed on (path, relevant query args, content version); bumping the
+  version (config epoch, voice catalog version, ...) makes old entries miss
+- Strong ETag per body, so repeat loads can be answered with 304
+- LRU bound on the number of entries; explicit clear() on invalidation
+- Hit / miss / 304 counters for monitoring
+- No Flask dependency; the server decorator builds the actual responses
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    """A response body ready to be re-sent"""
+    body: bytes
+    content_type: str
+    etag: str
+    created_at: float
+
+
+def body_etag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:20]
+
+
+class ResponseCache:
+    """LRU map of request key -> CachedResponse"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, body: bytes, content_type: str) -> CachedResponse:
+        entry = CachedResponse(body, content_type, body_etag(body), time.time())
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return entry
+
+    def record_not_modified(self):
+        with self.lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'bytes': sum(len(e.body) for e in self.entries.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
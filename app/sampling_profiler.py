@@ -0,0 +1,235 @@
+"""
+Sampling Profiler
+Time-boxed, low-overhead stack sampling of the running server process
+
+Features:
+- A real OS thread (outside eventlet's scheduler, like the hub watchdog)
+  reads sys._current_frames() every few milliseconds; nothing is installed
+  in the profiled code, so it is safe to start on a live server
+- Green-thread aware: under eventlet every green thread runs on the hub's OS
+  thread, so each sample of that thread is the green thread that held the hub
+  at that instant; samples where the hub was waiting for I/O are folded into
+  a single "[idle]" frame so busy time stands out
+- Output in the collapsed-stack format ("root;caller;callee count" per line)
+  read by flamegraph.pl, speedscope and most flame graph viewers
+- Bounded: one profile at a time, duration clamped to a maximum, stack depth
+  and distinct stacks capped, and the interval backs off when sampling costs
+  more than the overhead budget
+"""
+
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    # The sampler must be a real OS thread and sleep for real, even when
+    # threading/time are monkey patched
+    from eventlet import patcher
+    _threading = patcher.original('threading')
+    _thread = patcher.original('_thread')
+    _real_sleep = patcher.original('time').sleep
+except ImportError:
+    import threading as _threading
+    import _thread
+    _real_sleep = time.sleep
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+STDLIB_ROOT = os.path.abspath(sysconfig.get_paths()['stdlib'])
+IDLE_FRAME = '[idle]'
+OTHER_STACK = '[other stacks]'
+TRUNCATED_FRAME = '[truncated]'
+MAX_INTERVAL_SECONDS = 0.1  # Back-off ceiling when the overhead budget is exceeded
+
+
+def frame_label(code) -> str:
+    """function (path:first line), with paths relative to site-packages, the stdlib or the project"""
+    path = os.path.abspath(code.co_filename)
+    if 'site-packages' + os.sep in path:
+        path = path.split('site-packages' + os.sep, 1)[1]
+    elif path.startswith(STDLIB_ROOT + os.sep):
+        path = os.path.relpath(path, STDLIB_ROOT)
+    elif path.startswith(APP_ROOT + os.sep):
+        path = os.path.relpath(path, APP_ROOT)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(';', ':')
+
+
+def _is_hub_wait(code) -> bool:
+    # The hub greenlet blocked in poll/epoll/select: no green thread had work
+    return f"eventlet{os.sep}hubs{os.sep}" in code.co_filename
+
+
+class SamplingProfiler:
+    """One profile at a time; the last finished profile is kept for download"""
+
+    def __init__(self, max_duration_seconds: float = 60.0, default_interval_seconds: float = 0.005,
+                 max_overhead: float = 0.02, max_stacks: int = 10000, max_depth: int = 96,
+                 clock=time.monotonic):
+        """
+        Args:
+            max_duration_seconds: Longest profile a caller may request
+            default_interval_seconds: Time between samples (1 ms minimum)
+            max_overhead: Share of wall time sampling may take before the interval doubles
+            max_stacks: Distinct stacks kept; the rest are counted under OTHER_STACK
+            max_depth: Innermost frames kept per stack
+        """
+        self.max_duration = max_duration_seconds
+        self.default_interval = default_interval_seconds
+        self.max_overhead = max_overhead
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.clock = clock
+
+        self.lock = _threading.Lock()
+        self.running = False
+        self.stop_requested = False
+        self.hub_thread_id: Optional[int] = None
+        self.stacks: Counter = Counter()
+        self.current: Dict = {}
+        self.last: Optional[Dict] = None  # Finished profile: metadata + 'collapsed' text
+
+    # Sampling ────────────────────────────────
+    def _thread_names(self) -> Dict[int, str]:
+        # Threads started through the (possibly patched) threading module and the original one
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        names.update((thread.ident, thread.name) for thread in _threading.enumerate())
+        if self.hub_thread_id is not None:
+            names[self.hub_thread_id] = 'eventlet-hub'
+        return names
+
+    def _stack_key(self, root: str, frame) -> Tuple[str, bool]:
+        """(collapsed stack, idle) for one thread's current frame"""
+        if _is_hub_wait(frame.f_code):
+            return f"{root};{IDLE_FRAME}", True
+        labels: List[str] = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        if frame is not None:
+            labels.append(TRUNCATED_FRAME)
+        labels.append(root)
+        return ';'.join(reversed(labels)), False
+
+    def sample(self) -> int:
+        """Record one sample of every thread except the sampler; returns threads sampled"""
+        own = _thread.get_ident()
+        names = self._thread_names()
+        sampled = 0
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            key, idle = self._stack_key(names.get(thread_id, f"thread-{thread_id}"), frame)
+            if key not in self.stacks and len(self.stacks) >= self.max_stacks:
+                key = OTHER_STACK
+            self.stacks[key] += 1
+            self.current['samples'] += 1
+            self.current['idle_samples'] += idle
+            sampled += 1
+        return sampled
+
+    def _run(self, duration: float, interval: float):
+        started = self.clock()
+        deadline = started + duration
+        sampling_time = 0.0
+        try:
+            while not self.stop_requested and self.clock() < deadline:
+                before = time.thread_time()  # CPU spent sampling, not time spent waiting for the GIL
+                self.sample()
+                sampling_time += time.thread_time() - before
+                self.current['ticks'] += 1
+                elapsed = self.clock() - started
+                if elapsed > 0.5 and sampling_time / elapsed > self.max_overhead and interval < MAX_INTERVAL_SECONDS:
+                    interval = min(MAX_INTERVAL_SECONDS, interval * 2)
+                    self.current['interval_ms'] = round(interval * 1000, 2)
+                    logger.warning(f"⚠️ Profiler over its overhead budget, sampling every {interval * 1000:.0f} ms")
+                _real_sleep(interval)
+        except Exception as e:
+            logger.error(f"❌ Profiler sampling error: {e}")
+            self.current['error'] = str(e)
+        finally:
+            elapsed = self.clock() - started
+            self._finish(elapsed, sampling_time)
+
+    def _finish(self, elapsed: float, sampling_time: float):
+        collapsed = ''.join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+        finished = self.current
+        with self.lock:
+            finished.update({
+                'duration_seconds': round(elapsed, 3),
+                'overhead_percent': round(sampling_time / elapsed * 100, 2) if elapsed > 0 else 0.0,
+                'distinct_stacks': len(self.stacks),
+                'stopped_early': self.stop_requested,
+            })
+            self.last = dict(finished, collapsed=collapsed)
+            self.stacks = Counter()
+            self.running = False
+        logger.info(f"🔥 Profile finished: {finished['samples']} samples in {elapsed:.1f}s "
+                    f"({finished['overhead_percent']}% sampling overhead)")
+
+    # Control ─────────────────────────────────
+    def set_hub_thread(self, thread_id: Optional[int] = None):
+        """Mark the calling (or given) OS thread as the eventlet hub for labelling"""
+        self.hub_thread_id = thread_id if thread_id is not None else _thread.get_ident()
+
+    def start(self, duration_seconds: float, interval_seconds: Optional[float] = None,
+              requested_by: str = '') -> Tuple[bool, str]:
+        """Start a profile in the background; (False, reason) when one is already running"""
+        duration = min(max(1.0, float(duration_seconds)), self.max_duration)
+        interval = min(max(0.001, float(interval_seconds or self.default_interval)), MAX_INTERVAL_SECONDS)
+        with self.lock:
+            if self.running:
+                return False, 'A profile is already running'
+            self.running = True
+            self.stop_requested = False
+            self.stacks = Counter()
+            self.current = {
+                'started_at': time.time(),
+                'requested_duration_seconds': duration,
+                'interval_ms': round(interval * 1000, 2),
+                'requested_by': requested_by,
+                'samples': 0,
+                'idle_samples': 0,
+                'ticks': 0,
+            }
+        _threading.Thread(target=self._run, args=(duration, interval), name='sampling-profiler', daemon=True).start()
+        logger.info(f"🔥 Profiling for {duration:g}s every {interval * 1000:.1f} ms (requested by {requested_by or 'unknown'})")
+        return True, f"Profiling for {duration:g}s"
+
+    def stop(self) -> bool:
+        """Ask a running profile to finish now (its result is kept)"""
+        if not self.running:
+            return False
+        self.stop_requested = True
+        return True
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block (really) until the current profile finishes; for tests and scripts"""
+        deadline = None if timeout is None else self.clock() + timeout
+        while self.running:
+            if deadline is not None and self.clock() > deadline:
+                return False
+            _real_sleep(0.01)
+        return True
+
+    # Reading ─────────────────────────────────
+    def collapsed(self) -> Optional[str]:
+        return self.last['collapsed'] if self.last else None
+
+    def status(self) -> Dict:
+        with self.lock:
+            current = dict(self.current) if self.running else None
+            last = {k: v for k, v in self.last.items() if k != 'collapsed'} if self.last else None
+        if current is not None:
+            current['elapsed_seconds'] = round(time.time() - current['started_at'], 1)
+        return {
+            'running': self.running,
+            'current': current,
+            'last': last,
+            'max_duration_seconds': self.max_duration,
+        }
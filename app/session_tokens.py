@@ -0,0 +1,185 @@
+"""
+API Session Token Store
+Per-socket API tokens with a reverse index and timing-wheel expiry
+
+Features:
+- token -> session info, plus sid -> tokens reverse index, so revoking a
+  disconnected socket's tokens is O(tokens of that socket), not O(all tokens)
+- Expiry through a timing wheel: each token is filed under the tick it
+  expires in; advancing the wheel only touches tokens that are due
+- Capacity cap (oldest tokens evicted first) so memory stays bounded
+- Registered with the shared expiring_store reaper and stats
+"""
+
+import math
+import secrets
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, Hashable, List, Optional, Set
+
+try:
+    from . import expiring_store
+except ImportError:
+    from app import expiring_store
+
+
+class TimingWheel:
+    """Expiry wheel: O(1) schedule/cancel, advance() cost proportional to what is due"""
+
+    def __init__(self, tick_seconds: float = 1.0, clock=time.monotonic):
+        """
+        Args:
+            tick_seconds: Expiry granularity; keys expire up to one tick late
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.tick_seconds = tick_seconds
+        self.clock = clock
+        self.slots: Dict[int, Set[Hashable]] = {}  # tick number -> keys expiring in it
+        self.current = self._tick_of(clock())
+
+    def schedule(self, key: Hashable, expires_at: float) -> int:
+        """File key under the tick containing expires_at (monotonic). Returns the tick for cancel()."""
+        tick = max(math.ceil(expires_at / self.tick_seconds), self.current + 1)
+        self.slots.setdefault(tick, set()).add(key)
+        return tick
+
+    def cancel(self, key: Hashable, tick: int):
+        slot = self.slots.get(tick)
+        if slot is not None:
+            slot.discard(key)
+            if not slot:
+                del self.slots[tick]
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """Move the wheel to now and return every key that has come due"""
+        target = self._tick_of(self.clock() if now is None else now)
+        if target <= self.current:
+            return []
+
+        # After a long gap it is cheaper to check the occupied ticks than to walk every tick
+        if target - self.current > len(self.slots):
+            due_ticks = [tick for tick in self.slots if tick <= target]
+        else:
+            due_ticks = [tick for tick in range(self.current + 1, target + 1) if tick in self.slots]
+
+        due = []
+        for tick in due_ticks:
+            due.extend(self.slots.pop(tick))
+        self.current = target
+        return due
+
+    def __len__(self) -> int:
+        return sum(len(slot) for slot in self.slots.values())
+
+    def _tick_of(self, timestamp: float) -> int:
+        return math.floor(timestamp / self.tick_seconds)
+
+
+class SessionTokenStore:
+    """API session tokens issued to Socket.IO connections"""
+
+    def __init__(self, name: str = 'api_session_tokens', ttl_seconds: float = 24 * 3600,
+                 max_items: int = 50000, tick_seconds: float = 60.0, clock=time.monotonic):
+        """
+        Args:
+            name: Table name used in stats
+            ttl_seconds: Token lifetime
+            max_items: Capacity; issuing beyond it evicts the oldest tokens
+            tick_seconds: Timing wheel granularity
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.name = name
+        self.ttl = ttl_seconds
+        self.max_items = max_items
+        self.clock = clock
+        self.lock = Lock()
+        self.tokens: "OrderedDict[str, tuple[Dict, int]]" = OrderedDict()  # token -> (info, wheel tick)
+        self.by_sid: Dict[str, Set[str]] = {}
+        self.wheel = TimingWheel(tick_seconds, clock)
+        self.evictions = 0
+        self.expirations = 0
+        expiring_store.register(self)
+
+    def create(self, sid: str) -> str:
+        """Issue a new token for sid"""
+        token = secrets.token_urlsafe(32)
+        now = datetime.now()
+        info = {
+            'sid': sid,
+            'created_at': now,
+            'expires_at': now + timedelta(seconds=self.ttl),
+        }
+        with self.lock:
+            tick = self.wheel.schedule(token, self.clock() + self.ttl)
+            self.tokens[token] = (info, tick)
+            self.by_sid.setdefault(sid, set()).add(token)
+            while len(self.tokens) > self.max_items:
+                oldest = next(iter(self.tokens))
+                self._remove(oldest)
+                self.evictions += 1
+        return token
+
+    def validate(self, token: str) -> Optional[Dict]:
+        """Session info for a live token, or None"""
+        with self.lock:
+            entry = self.tokens.get(token)
+            if entry is None:
+                return None
+            info = entry[0]
+            if datetime.now() > info['expires_at']:
+                self._remove(token)
+                self.expirations += 1
+                return None
+            return info
+
+    def revoke_sid(self, sid: str) -> int:
+        """Drop every token issued to sid. Returns how many were removed."""
+        with self.lock:
+            tokens = list(self.by_sid.get(sid, ()))
+            for token in tokens:
+                self._remove(token)
+            return len(tokens)
+
+    def reap(self) -> int:
+        """Drop the tokens whose wheel tick has passed (called by the shared reaper)"""
+        with self.lock:
+            due = self.wheel.advance()
+            removed = 0
+            for token in due:
+                if token in self.tokens:
+                    self._remove(token, cancel=False)
+                    removed += 1
+            self.expirations += removed
+            return removed
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.tokens
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                'name': self.name,
+                'items': len(self.tokens),
+                'max_items': self.max_items,
+                'ttl_seconds': self.ttl,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'sids': len(self.by_sid),
+                'wheel_slots': len(self.wheel.slots),
+            }
+
+    def _remove(self, token: str, cancel: bool = True):
+        """Remove token from every index (caller holds the lock)"""
+        info, tick = self.tokens.pop(token)
+        if cancel:
+            self.wheel.cancel(token, tick)
+        tokens = self.by_sid.get(info['sid'])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self.by_sid[info['sid']]
@@ -13,6 +13,7 @@ let recognitionAttempts = 0;
 const MAX_SILENT_TIME = 15000;
 let lastSpeechTimestamp = Date.now();
 let currentTempId = null;     // Temporary ID for linking interim->final (per utterance)
+let serverClockOffset = 0;    // Server clock minus local clock (ms), for caption latency tracing
 
 /* ===================================
    Toast helper (additive, mirrors user.js)
@@ -192,11 +193,19 @@ function hideExportModal(event) {
 function __doExport(format) {
     hideExportModal();
     if (!format) return;
-    const exportUrl = `${SERVER_URL}/api/export/${format}?token=${encodeURIComponent(authToken)}`;
+    let exportUrl = `${SERVER_URL}/api/export/${format}?token=${encodeURIComponent(authToken)}`;
+    let filename = `transcriptions.${format}`;
+    // Subtitle formats can be exported as a translated track (from the server's translation cache)
+    const langInput = document.getElementById('exportSubtitleLang');
+    const lang = langInput ? langInput.value.trim() : '';
+    if (lang && (format === 'srt' || format === 'vtt')) {
+        exportUrl += `&lang=${encodeURIComponent(lang)}`;
+        filename = `transcriptions.${lang}.${format}`;
+    }
     const link = document.createElement('a');
     link.href = exportUrl;
     link.target = '_blank';
-    link.download = `transcriptions.${format}`;
+    link.download = filename;
     document.body.appendChild(link);
     link.click();
     document.body.removeChild(link);
@@ -298,6 +307,9 @@ document.addEventListener('DOMContentLoaded', async () => {
     setInterval(() => {
         refreshTTSCacheStats();
     }, 30000);
+
+    // Profiler: show the last profile, and resume polling if one is still running
+    refreshProfilerStatus().then(running => { if (running) pollProfilerStatus(); });
 });
 
 // Keyboard shortcuts
@@ -357,12 +369,14 @@ function connectWebSocket() {
         query: {
             client_id: clientId,  // Send persistent client ID to server
             type: 'admin'  // Identify as admin client
-        }
+        },
+        auth: (cb) => cb({token: authToken})  // Verified admins skip connection admission control
     });
 
     socket.on('connect', () => {
         console.log('✅ WebSocket connected - SID:', socket.id);
         updateStatus(true);
+        syncServerClock();
 
         if (authToken) {
             console.log('📤 Sending admin_connect...');
@@ -444,6 +458,12 @@ function connectWebSocket() {
         renderTranscriptions();
     });
 
+    socket.on('history_bulk_added', (data) => {
+        // One notification per bulk import: reload instead of receiving every item
+        console.log(`📥 Bulk import added ${data.count} items`);
+        fetchTranslationHistory();
+    });
+
     socket.on('items_deleted', (data) => {
         // Remove deleted items from translations array
         const idsToDelete = data.ids || [];
@@ -609,6 +629,7 @@ function setupRecognitionHandlers() {
     };
 
     recognition.onresult = (event) => {
+        const resultAt = Date.now();  // Start of the caption latency trace
         let interimTranscript = '';
 
         for (let i = event.resultIndex; i < event.results.length; i++) {
@@ -618,7 +639,7 @@ function setupRecognitionHandlers() {
             if (event.results[i].isFinal) {
                 console.log(`📤 SENDING FINAL: "${transcript}"`);
                 // Send final with same temp_id so user-side replaces the interim card
-                sendTranscription(transcript, confidence, true);
+                sendTranscription(transcript, confidence, true, resultAt);
                 currentTempId = null;  // Reset for next utterance
                 updateInterimDisplay('✓ Sent: ' + transcript.substring(0, 50) + '...', true);
                 setTimeout(() => {
@@ -654,7 +675,21 @@ function updateInterimDisplay(text, active) {
     display.className = active ? 'interim-display active' : 'interim-display inactive';
 }
 
-function sendTranscription(text, confidence, isFinal = true) {
+function syncServerClock() {
+    // Offset from the round-trip midpoint, so latency traces compare times on the server clock
+    const sentAt = Date.now();
+    socket.timeout(5000).emit('clock_sync', {}, (err, response) => {
+        if (err || !response || typeof response.server_time !== 'number') return;
+        const receivedAt = Date.now();
+        serverClockOffset = response.server_time - (sentAt + receivedAt) / 2;
+    });
+}
+
+function newTraceId() {
+    return 'tr_' + Date.now().toString(36) + '_' + Math.random().toString(36).substr(2, 8);
+}
+
+function sendTranscription(text, confidence, isFinal = true, resultAt = Date.now()) {
     if (!text || !socket || !socket.connected) {
         console.warn('⚠️ Cannot send - no text or no connection');
         return;
@@ -676,7 +711,10 @@ function sendTranscription(text, confidence, isFinal = true) {
         timestamp: new Date().toISOString(),
         confidence: confidence,
         is_final: isFinal,
-        temp_id: currentTempId
+        temp_id: currentTempId,
+        // Finals carry a trace so listeners can report how long the caption took to reach them
+        trace_id: isFinal ? newTraceId() : undefined,
+        spoken_at: isFinal ? resultAt + serverClockOffset : undefined
     });
 
     if (isFinal) {
@@ -1124,11 +1162,10 @@ function importTranslations(translationsToImport) {
 
     console.log(`📥 Importing ${translationsToImport.length} translations...`);
 
-    // Show progress
-    let imported = 0;
+    // Validate locally, then send in acknowledged chunks: the server ingests each
+    // chunk in one step and announces the whole import once (history_bulk_added)
+    const items = [];
     let failed = 0;
-
-    // Send each translation via socket
     for (const item of translationsToImport) {
         const validation = validateText(item.corrected);
         if (!validation.valid) {
@@ -1137,9 +1174,7 @@ function importTranslations(translationsToImport) {
             continue;
         }
 
-        // Emit import event to server
-        socket.emit('import_transcription', {
-            id: item.id,
+        items.push({
             original: item.original,
             corrected: item.corrected,
             timestamp: item.timestamp || new Date().toISOString(),
@@ -1147,18 +1182,108 @@ function importTranslations(translationsToImport) {
             language: item.language || 'imported',
             confidence: item.confidence || 0.95
         });
+    }
+
+    sendImportChunks(items)
+        .then(({ imported, rejected }) => {
+            failed += rejected;
+            showToast(`✅ Import completed! — ${imported} transcription(s) imported ${failed > 0 ? `${failed} skipped (validation failed)` : 'No errors'}`, 'success');
+            console.log(`✅ Import completed: ${imported}/${translationsToImport.length}`);
+        })
+        .catch((error) => {
+            showToast(`❌ Import stopped: ${error.message}`, 'danger');
+            console.error('Import error:', error);
+        })
+        .finally(() => fetchTranslationHistory());
+}
+
+const IMPORT_CHUNK_SIZE = 200;
+
+function emitImportChunk(payload) {
+    return new Promise((resolve, reject) => {
+        socket.timeout(30000).emit('import_transcription_batch', payload, (err, response) => {
+            if (err) {
+                reject(new Error('Server did not acknowledge the import chunk'));
+            } else if (!response || !response.success) {
+                reject(new Error((response && response.error) || 'Import chunk rejected'));
+            } else {
+                resolve(response);
+            }
+        });
+    });
+}
 
-        imported++;
+async function sendImportChunks(items) {
+    const importId = `${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
+    let imported = 0;
+    let rejected = 0;
+
+    // An empty final chunk still closes the import on the server
+    for (let start = 0; start === 0 || start < items.length; start += IMPORT_CHUNK_SIZE) {
+        const chunk = items.slice(start, start + IMPORT_CHUNK_SIZE);
+        const response = await emitImportChunk({
+            import_id: importId,
+            items: chunk,
+            final: start + IMPORT_CHUNK_SIZE >= items.length
+        });
+        imported += response.accepted;
+        rejected += response.rejected.length;
+        if (items.length > IMPORT_CHUNK_SIZE) {
+            console.log(`📥 Import progress: ${Math.min(start + IMPORT_CHUNK_SIZE, items.length)}/${items.length}`);
+        }
     }
 
-    showToast(`✅ Import completed! — ${imported} transcription(s) imported ${failed > 0 ? `${failed} skipped (validation failed)` : 'No errors'}`, 'danger');
-    
-    console.log(`✅ Import completed: ${imported}/${translationsToImport.length}`);
+    return { imported, rejected };
 }
 
 function startSystemMonitor() {
     updateSystemInfo();
     setInterval(updateSystemInfo, 2000);
+    updateLatencyInfo();
+    setInterval(updateLatencyInfo, 10000);
+}
+
+const LATENCY_STAGE_ORDER = ['uplink', 'server', 'downlink', 'translate', 'tts', 'render'];
+
+async function updateLatencyInfo() {
+    // Caption latency percentiles reported by sampled listeners (speech result -> listener render)
+    try {
+        const response = await fetch(`${SERVER_URL}/api/latency`, {
+            method: 'GET',
+            credentials: 'include',
+            headers: {
+                'Authorization': `Bearer ${authToken}`,
+                'Accept': 'application/json'
+            }
+        });
+        if (!response.ok) return;
+        const data = await response.json();
+        const stages = data.stages || {};
+        const fmt = (entry) => `p50 ${entry.p50} · p95 ${entry.p95} · p99 ${entry.p99} ms`;
+
+        const sysLatency = document.getElementById('sys-latency');
+        const endToEnd = stages.end_to_end && stages.end_to_end.all;
+        if (sysLatency) {
+            sysLatency.textContent = endToEnd ? `${fmt(endToEnd)} (n=${endToEnd.count})` : '–';
+        }
+
+        const sysStages = document.getElementById('sys-latency-stages');
+        if (sysStages) {
+            const lines = LATENCY_STAGE_ORDER
+                .filter(stage => stages[stage] && stages[stage].all)
+                .map(stage => `${stage}: ${fmt(stages[stage].all)}`);
+            // Per target language end-to-end, slowest p95 first
+            Object.entries((stages.end_to_end) || {})
+                .filter(([lang]) => lang !== 'all')
+                .sort((a, b) => b[1].p95 - a[1].p95)
+                .slice(0, 5)
+                .forEach(([lang, entry]) => lines.push(`${lang}: ${fmt(entry)}`));
+            sysStages.textContent = lines.join('\n');
+            sysStages.style.whiteSpace = 'pre-line';
+        }
+    } catch (error) {
+        console.error('Failed to fetch caption latency:', error);
+    }
 }
 
 async function updateSystemInfo() {
@@ -1358,6 +1483,114 @@ async function clearTTSCache() {
     }
 }
 
+/* ===================================
+   Sampling Profiler (user server)
+   =================================== */
+
+let profilerPollTimer = null;
+
+function renderProfilerStatus(data) {
+    const statusEl = document.getElementById('profilerStatus');
+    const startBtn = document.getElementById('profilerStartBtn');
+    const downloadBtn = document.getElementById('profilerDownloadBtn');
+    if (!statusEl) return;
+
+    if (data.running && data.current) {
+        const current = data.current;
+        statusEl.textContent = `Profiling… ${current.elapsed_seconds}/${current.requested_duration_seconds}s\n` +
+            `${current.samples} samples every ${current.interval_ms} ms`;
+    } else if (data.last) {
+        const last = data.last;
+        const busy = last.samples ? Math.round((1 - last.idle_samples / last.samples) * 100) : 0;
+        statusEl.textContent = `Last: ${new Date(last.started_at * 1000).toLocaleTimeString()} · ${last.duration_seconds}s\n` +
+            `${last.samples} samples · ${busy}% busy · overhead ${last.overhead_percent}%`;
+    } else {
+        statusEl.textContent = 'No profile yet';
+    }
+    if (startBtn) startBtn.disabled = !!data.running;
+    if (downloadBtn) downloadBtn.disabled = !data.last || !!data.running;
+}
+
+async function refreshProfilerStatus() {
+    try {
+        const response = await fetch('/api/profiler/status', {
+            credentials: 'include',
+            headers: { 'Accept': 'application/json' }
+        });
+        const data = await response.json();
+        if (!response.ok || !data.success) {
+            document.getElementById('profilerStatus').textContent = `❌ ${data.error || 'HTTP ' + response.status}`;
+            return false;
+        }
+        renderProfilerStatus(data);
+        return data.running;
+    } catch (error) {
+        console.error('❌ Failed to fetch profiler status:', error);
+        return false;
+    }
+}
+
+function pollProfilerStatus() {
+    clearInterval(profilerPollTimer);
+    profilerPollTimer = setInterval(async () => {
+        const running = await refreshProfilerStatus();
+        if (!running) {
+            clearInterval(profilerPollTimer);
+            profilerPollTimer = null;
+        }
+    }, 1000);
+}
+
+async function startProfiler() {
+    const duration = parseInt(document.getElementById('profilerDuration').value, 10) || 30;
+    try {
+        const response = await fetch('/api/profiler/start', {
+            method: 'POST',
+            credentials: 'include',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            },
+            body: JSON.stringify({ duration })
+        });
+        const data = await response.json();
+        if (!response.ok || !data.success) {
+            showToast(`❌ ${data.error || 'Could not start profiler (HTTP ' + response.status + ')'}`, 'danger');
+            return;
+        }
+        showToast(`🔥 ${data.message}`, 'success');
+        renderProfilerStatus(data);
+        pollProfilerStatus();
+    } catch (error) {
+        console.error('❌ Failed to start profiler:', error);
+        showToast(`❌ Error: ${error.message}`, 'danger');
+    }
+}
+
+async function downloadProfile() {
+    try {
+        const response = await fetch('/api/profiler/profile', { credentials: 'include' });
+        if (!response.ok) {
+            showToast(`❌ No profile to download (HTTP ${response.status})`, 'danger');
+            return;
+        }
+        const disposition = response.headers.get('Content-Disposition') || '';
+        const match = disposition.match(/filename=([^;]+)/);
+        const blob = await response.blob();
+        const url = URL.createObjectURL(blob);
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = match ? match[1].trim() : 'ezy-profile.folded';
+        document.body.appendChild(link);
+        link.click();
+        link.remove();
+        URL.revokeObjectURL(url);
+    } catch (error) {
+        console.error('❌ Failed to download profile:', error);
+        showToast(`❌ Error: ${error.message}`, 'danger');
+    }
+}
+
 console.log('✅ EzySpeechTranslate Admin Panel Ready');
 console.log('📝 Keyboard Shortcuts:');
 console.log('   Ctrl+R: Toggle recording');
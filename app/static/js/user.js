@@ -53,6 +53,18 @@ function initSocket() {
         socketRetryCount++;
         console.error(`❌ Socket.IO connection error (attempt ${socketRetryCount}):`, error);
 
+        // Server busy (connection surge): it refused us with a retry hint and won't auto-reconnect,
+        // so retry ourselves, with jitter so refused listeners don't all come back at once
+        if (error && error.data && error.data.retry_after) {
+            const delay = (error.data.retry_after * 1000) * (1 + Math.random() * 0.5);
+            console.warn(`⏳ Server busy, reconnecting in ${Math.round(delay)}ms`);
+            setConnectionStatus('waiting');
+            setTimeout(() => {
+                if (socket && !socket.connected) socket.connect();
+            }, delay);
+            return;
+        }
+
         // Don't show error for initial connection attempts - Socket.IO handles retries
         if (socketRetryCount > 3) {
             console.warn('Connection failed multiple times. Check server status and network settings.');
@@ -87,7 +99,7 @@ let ttsEngine = 'system';  // 'system' (Local) or 'edge' (Cloud)
 let edgeTTSVoices = [];     // Available Edge TTS voices
 
 // TTS Queue Management - prevents parallel playback and maintains order
-let ttsQueue = [];          // Queue of {text, isAutoPlay} waiting to be spoken
+let ttsQueue = [];          // Queue of {text, isAutoPlay, trace} waiting to be spoken
 let isTTSPlaying = false;   // Currently playing TTS
 let currentAudioElement = null;  // Current playing audio element for Edge TTS
 let currentUtterance = null;     // Current utterance for System TTS
@@ -95,8 +107,24 @@ let lastTTSClickText = '';  // Track last clicked TTS text for double-tap stop
 let lastTTSClickTime = 0;   // Track when user last clicked TTS button
 const TTS_DOUBLE_TAP_THRESHOLD = 500;  // 500ms window for double-tap detection
 
-// Use shared translations provided by /static/js/i18n.js
+// Edge TTS prefetch - queued captions are synthesized together via /api/tts/synthesize/batch
+const ttsPrefetchCache = new Map();  // text -> Promise<Blob|null>
+const TTS_PREFETCH_MAX_ITEMS = 10;
+let ttsAudioProfile = 'mp3';        // Edge TTS output profile, chosen from what server and browser support
+let ttsPlaybackTrace = null;        // Latency trace of the clip being started (reported when audio begins)
+
+// Caption latency tracing - a sample of captions report receive/translate/TTS/render timings
+let traceSampleRate = 0;            // Set by the server's ready event
+let serverClockOffset = 0;          // Server clock minus local clock (ms)
+const captionTraces = new Map();    // trace_id -> {language, receivedAt, started, stages, expected, timer}
+let latencyReports = [];
+let latencyFlushTimer = null;
+const LATENCY_FLUSH_MS = 3000;      // Reports are batched into one latency_report event
+const TRACE_MAX_AGE_MS = 30000;     // Report whatever was measured after this long
+
+// Shared translations; /static/js/i18n-runtime.js fills in the active language's bundle
 const i18n = window.sharedI18n || {};
+const hasDisplayLanguage = window.hasDisplayLanguage || (lang => !!lang && lang in i18n);
 let displayLanguage = localStorage.getItem('displayLanguage') || detectDisplayLanguageLocal();
 let displayMode = localStorage.getItem('displayMode') || 'translation';
 let targetLang = localStorage.getItem('targetLang') || 'en';
@@ -160,7 +188,7 @@ const translationCache = {};         // Cache translations locally for fallback
    ========================= */
 function loadSettings() {
     const savedDisplay = localStorage.getItem('displayLanguage');
-    if (savedDisplay && i18n[savedDisplay]) displayLanguage = savedDisplay;
+    if (hasDisplayLanguage(savedDisplay)) displayLanguage = savedDisplay;
 
     const displaySelect = document.getElementById('displayLanguage');
     if (displaySelect) displaySelect.value = displayLanguage;
@@ -367,6 +395,14 @@ function init() {
     loadSettings();
     applyDisplayLanguageLocal();
     applyDisplayMode();
+    // The display language's strings arrive as a lazily fetched bundle; re-render once they're in
+    if (window.i18nReady) {
+        window.i18nReady.then(() => {
+            applyDisplayLanguageLocal();
+            updateDisplayMode();
+            renderTranslations();
+        });
+    }
     // Don't load translations here - wait for WebSocket connection
     // so authToken is available
 
@@ -605,7 +641,7 @@ function detectDisplayLanguageLocal() {
     console.log('🌐 Browser language for UI detected:', browserLang);
 
     // Check for exact matches first
-    if (browserLang in i18n) {
+    if (hasDisplayLanguage(browserLang)) {
         console.log('✅ Exact language match found:', browserLang);
         return browserLang;
     }
@@ -702,7 +738,7 @@ async function changeDisplayLanguageLocal() {
     if (window.changeDisplayLanguage) {
         // Delegate rendering to the shared runtime (it will update the DOM)
         try {
-            window.changeDisplayLanguage(newLang);
+            await window.changeDisplayLanguage(newLang);
         } catch (e) {
             console.warn('shared changeDisplayLanguage failed', e);
             applyDisplayLanguageLocal();
@@ -761,12 +797,12 @@ function loadSettings() {
 
     // Load display language (be tolerant of variants like 'en-US')
     if (savedDisplayLanguage) {
-        if (i18n[savedDisplayLanguage]) {
+        if (hasDisplayLanguage(savedDisplayLanguage)) {
             displayLanguage = savedDisplayLanguage;
             console.log('✅ Using saved display language:', savedDisplayLanguage);
         } else {
             const base = savedDisplayLanguage.split('-')[0];
-            if (i18n[base]) {
+            if (hasDisplayLanguage(base)) {
                 displayLanguage = base;
                 console.log('✅ Using base of saved display language:', base);
             } else {
@@ -967,6 +1003,29 @@ function loadSystemVoices() {
     console.log('✅ Loaded ' + availableVoices.length + ' system voices, showing ' + voicesToShow.length + ' for ' + targetLang);
 }
 
+function chooseTTSAudioProfile(serverProfiles) {
+    // Pick the smallest audio format this browser can play; fall back to MP3
+    const audio = document.createElement('audio');
+    const connection = navigator.connection || {};
+    const slowLink = connection.saveData || /(^|-)(2g|3g)$/.test(connection.effectiveType || '');
+
+    const candidates = [
+        ['webm', 'audio/webm; codecs="opus"'],
+        ['opus', 'audio/ogg; codecs="opus"']
+    ];
+    for (const [profile, mimeType] of candidates) {
+        if (serverProfiles.includes(profile) && audio.canPlayType(mimeType) === 'probably') {
+            console.log('🎚️ Edge TTS audio profile:', profile);
+            return profile;
+        }
+    }
+    if (slowLink && serverProfiles.includes('mp3-low')) {
+        console.log('🎚️ Edge TTS audio profile: mp3-low (slow connection)');
+        return 'mp3-low';
+    }
+    return 'mp3';
+}
+
 async function loadEdgeTTSVoices(retryCount = 0, maxRetries = 5) {
     // Load Edge TTS voices from backend API with automatic retry
     const voiceSelect = document.getElementById('voiceSelect');
@@ -1031,6 +1090,7 @@ async function loadEdgeTTSVoices(retryCount = 0, maxRetries = 5) {
         }
         
         edgeTTSVoices = data.edge_voices || [];
+        ttsAudioProfile = chooseTTSAudioProfile(data.audio_profiles || []);
         
         voiceSelect.innerHTML = '';
         
@@ -1176,7 +1236,7 @@ function updateDisplayMode() {
         if (ttsSection) ttsSection.style.display = 'none';
 
         // Update title (use localized string when available)
-        if (mainTitleText) mainTitleText.textContent = (i18n[displayLanguage] && i18n[displayLanguage].liveTranscriptions) || i18n['en'].liveTranscriptions || 'Live Transcriptions';
+        if (mainTitleText) mainTitleText.textContent = (i18n[displayLanguage] && i18n[displayLanguage].liveTranscriptions) || (i18n['en'] && i18n['en'].liveTranscriptions) || 'Live Transcriptions';
 
         // Update empty state (use localized strings when available)
         if (emptyStateText) emptyStateText.textContent = (i18n[displayLanguage] && i18n[displayLanguage].waitingTranscriptions) || (i18n['en'] && i18n['en'].waitingTranscriptions) || 'Waiting for transcriptions...';
@@ -2090,7 +2150,7 @@ async function translateLongText(text, targetLang, translationLang) {
    Text-to-Speech Functions
    =================================== */
 
-function speakText(text, isAutoPlay = false) {
+function speakText(text, isAutoPlay = false, traceId = null) {
     // Validate and sanitize text before speaking
     const validation = validateText(text, 5000);
     if (!validation.valid) {
@@ -2102,11 +2162,11 @@ function speakText(text, isAutoPlay = false) {
     if (!cleanText) return;
 
     // Enqueue instead of playing directly
-    enqueueTTSPlayback(cleanText, isAutoPlay);
+    enqueueTTSPlayback(cleanText, isAutoPlay, traceId);
 }
 
 // ===== NEW: TTS Queue Management =====
-function enqueueTTSPlayback(text, isAutoPlay = false) {
+function enqueueTTSPlayback(text, isAutoPlay = false, traceId = null) {
     const now = Date.now();
     
     // Check if this is a double-tap on the same text (within 500ms)
@@ -2125,15 +2185,87 @@ function enqueueTTSPlayback(text, isAutoPlay = false) {
     }
     
     // Add to queue instead of playing immediately
-    ttsQueue.push({text, isAutoPlay});
+    ttsQueue.push({text, isAutoPlay, trace: traceId});
     console.log(`📻 Queued TTS (auto=${isAutoPlay}): ${text.substring(0, 50)}... Queue length: ${ttsQueue.length}`);
     
     // Start processing queue if nothing is currently playing
     if (!isTTSPlaying) {
         processTTSQueue();
+    } else if (ttsEngine === 'edge') {
+        // Something is playing: fetch upcoming clips in one batch request
+        prefetchEdgeTTS();
     }
 }
 
+function prefetchEdgeTTS() {
+    // Synthesize queued texts that have no audio yet in a single batch request
+    if (!apiSessionToken) return;
+
+    const texts = [];
+    for (const item of ttsQueue) {
+        if (!ttsPrefetchCache.has(item.text) && !texts.includes(item.text)) {
+            texts.push(item.text);
+        }
+        if (texts.length >= TTS_PREFETCH_MAX_ITEMS) break;
+    }
+    if (texts.length === 0) return;
+
+    const selectedVoiceValue = document.getElementById('voiceSelect').value;
+    const request = fetch('/api/tts/synthesize/batch', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${apiSessionToken}`
+        },
+        body: JSON.stringify({
+            lang: TTS_LANG_MAP[targetLang] || targetLang,
+            voice: selectedVoiceValue || null,
+            profile: ttsAudioProfile,
+            items: texts.map(function (text) { return {text: text}; })
+        })
+    }).then(function (response) {
+        if (!response.ok) throw new Error('HTTP ' + response.status);
+        return response.arrayBuffer();
+    }).then(parseTTSBatch).catch(function (e) {
+        console.warn('☁️ TTS prefetch failed:', e.message);
+        return [];
+    });
+
+    texts.forEach(function (text, index) {
+        ttsPrefetchCache.set(text, request.then(function (parts) {
+            const part = parts[index];
+            return part && part.meta.success ? part.blob : null;
+        }));
+    });
+    console.log(`☁️ Prefetching ${texts.length} TTS clip(s) in one batch`);
+}
+
+function parseTTSBatch(buffer) {
+    // Parts: [u32 header length][JSON header][u32 audio length][audio], big-endian
+    const view = new DataView(buffer);
+    const decoder = new TextDecoder();
+    const parts = [];
+    let offset = 0;
+    while (offset + 4 <= buffer.byteLength) {
+        const headerLength = view.getUint32(offset);
+        const meta = JSON.parse(decoder.decode(new Uint8Array(buffer, offset + 4, headerLength)));
+        offset += 4 + headerLength;
+        const audioLength = view.getUint32(offset);
+        const audio = new Uint8Array(buffer, offset + 4, audioLength);
+        offset += 4 + audioLength;
+        parts[meta.index] = {
+            meta: meta,
+            blob: audioLength > 0 ? new Blob([audio], {type: meta.content_type}) : null
+        };
+    }
+    return parts;
+}
+
+function markTTSPlaybackStarted() {
+    if (ttsPlaybackTrace) markCaptionTrace(ttsPlaybackTrace, 'tts');
+    ttsPlaybackTrace = null;
+}
+
 function processTTSQueue() {
     // Process next item in queue
     if (ttsQueue.length === 0) {
@@ -2151,6 +2283,7 @@ function processTTSQueue() {
     console.log(`📻 Playing from queue (auto=${item.isAutoPlay}): ${item.text.substring(0, 50)}...`);
     
     isTTSPlaying = true;
+    ttsPlaybackTrace = item.trace || null;
     
     if (ttsEngine === 'system') {
         speakTextSystem(item.text);
@@ -2163,6 +2296,7 @@ function clearTTSQueue() {
     // Clear all pending TTS and stop current playback
     console.log(`📻 Clearing TTS queue (${ttsQueue.length} items)`);
     ttsQueue = [];
+    ttsPrefetchCache.clear();
     isTTSPlaying = false;
     
     // Stop current playback
@@ -2219,6 +2353,8 @@ function speakTextSystem(text) {
         }
     }
 
+    utterance.onstart = markTTSPlaybackStarted;
+
     utterance.onend = function () {
         console.log('🖥️ System TTS finished');
         currentUtterance = null;
@@ -2241,6 +2377,17 @@ function speakTextSystem(text) {
 async function speakTextEdge(text) {
     // Use Edge TTS (Cloud-based)
     try {
+        // Use audio fetched by a batch prefetch when available
+        if (ttsPrefetchCache.has(text)) {
+            const prefetched = await ttsPrefetchCache.get(text);
+            ttsPrefetchCache.delete(text);
+            if (prefetched) {
+                console.log(`☁️ Using prefetched audio: size=${prefetched.size}`);
+                playEdgeTTSBlob(prefetched);
+                return;
+            }
+        }
+
         console.log('☁️ Sending text to Edge TTS...');
         
         // Check if token is available
@@ -2259,7 +2406,8 @@ async function speakTextEdge(text) {
             body: JSON.stringify({
                 text: text,
                 lang: TTS_LANG_MAP[targetLang] || targetLang,
-                voice: selectedVoiceValue || null
+                voice: selectedVoiceValue || null,
+                profile: ttsAudioProfile
             })
         });
         
@@ -2299,36 +2447,7 @@ async function speakTextEdge(text) {
         const audioBlob = await response.blob();
         console.log(`☁️ Audio blob: size=${audioBlob.size}, type=${audioBlob.type}`);
         
-        // Play audio
-        const audioUrl = URL.createObjectURL(audioBlob);
-        const audio = new Audio();
-        audio.src = audioUrl;
-        audio.volume = ttsVolume;
-        
-        currentAudioElement = audio;
-        
-        audio.onerror = function (e) {
-            console.error('☁️ Edge TTS playback error:', e);
-            isTTSPlaying = false;
-            processTTSQueue();
-        };
-        
-        audio.onended = function () {
-            console.log('☁️ Edge TTS finished');
-            URL.revokeObjectURL(audioUrl);
-            currentAudioElement = null;
-            isTTSPlaying = false;
-            // Process next in queue
-            processTTSQueue();
-        };
-        
-        audio.play().catch(function (e) {
-            console.error('☁️ Failed to play Edge TTS audio:', e);
-            isTTSPlaying = false;
-            processTTSQueue();
-        });
-        
-        console.log('☁️ Edge TTS audio playing...');
+        playEdgeTTSBlob(audioBlob);
     } catch (error) {
         console.error('☁️ Edge TTS error:', error);
         isTTSPlaying = false;
@@ -2337,6 +2456,41 @@ async function speakTextEdge(text) {
     }
 }
 
+function playEdgeTTSBlob(audioBlob) {
+    // Play audio
+    const audioUrl = URL.createObjectURL(audioBlob);
+    const audio = new Audio();
+    audio.src = audioUrl;
+    audio.volume = ttsVolume;
+    
+    currentAudioElement = audio;
+    
+    audio.onerror = function (e) {
+        console.error('☁️ Edge TTS playback error:', e);
+        isTTSPlaying = false;
+        processTTSQueue();
+    };
+    
+    audio.onplaying = markTTSPlaybackStarted;
+
+    audio.onended = function () {
+        console.log('☁️ Edge TTS finished');
+        URL.revokeObjectURL(audioUrl);
+        currentAudioElement = null;
+        isTTSPlaying = false;
+        // Process next in queue
+        processTTSQueue();
+    };
+    
+    audio.play().catch(function (e) {
+        console.error('☁️ Failed to play Edge TTS audio:', e);
+        isTTSPlaying = false;
+        processTTSQueue();
+    });
+    
+    console.log('☁️ Edge TTS audio playing...');
+}
+
 function toggleTTS() {
     ttsEnabled = !ttsEnabled;
     localStorage.setItem('ttsEnabled', ttsEnabled);
@@ -2653,6 +2807,47 @@ async function loadInitialTranslations() {
     }
 }
 
+async function syncTranslationsAfterBulkImport(data) {
+    // Catch up on a bulk import by cursor: fetch only items newer than the newest
+    // one we hold, render once, and let virtual scrolling translate what's visible
+    const cursor = translations.reduce((max, t) => (typeof t.id === 'number' && t.id > max ? t.id : max), -1);
+
+    // Nothing to anchor on, or the import is bigger than a page: the first page is all we'd show anyway
+    if (!apiSessionToken || cursor < 0 || (data.count || 0) > translationsLimit) {
+        await loadInitialTranslations();
+        return;
+    }
+
+    try {
+        const added = [];
+        let afterId = cursor;
+        let hasMore = true;
+        while (hasMore) {
+            const response = await fetch(
+                '/api/translations?after_id=' + afterId + '&limit=' + translationsLimit + '&api_token=' + encodeURIComponent(apiSessionToken)
+            );
+            if (!response.ok) {
+                console.warn('⚠️ Failed to sync bulk import: ' + response.status);
+                return;
+            }
+            const page = await response.json();
+            added.push(...(page.translations || []));
+            afterId = page.next_after_id;
+            translationsTotal = page.total || translationsTotal;
+            hasMore = page.has_more && (page.translations || []).length > 0;
+        }
+
+        // Server pages are oldest first; the list is newest first
+        const known = new Set(translations.map(t => t.id));
+        const fresh = added.filter(t => !known.has(t.id)).reverse();
+        translations.unshift(...fresh);
+        console.log(`📥 Synced ${fresh.length} imported translations (cursor ${cursor} → ${afterId})`);
+        await renderTranslations();
+    } catch (error) {
+        console.error('❌ Error syncing bulk import:', error);
+    }
+}
+
 async function loadMoreTranslations() {
     // Load next batch of translations
     if (isLoadingMore || !hasMoreTranslations) {
@@ -2732,6 +2927,8 @@ async function addTranslation(data) {
     const itemId = 'translation-' + data.id;
     if (displayMode !== 'transcription' && data.id) {
         translateInBackground(data, itemId);
+    } else {
+        markCaptionTrace(data.trace_id, 'render');
     }
 
     if (searchQuery) {
@@ -2756,7 +2953,7 @@ async function processPendingTranslations() {
         
         // Only speak the latest one
         if (ttsEnabled && i === 0 && data.translated) {
-            speakText(data.translated, true);
+            speakText(data.translated, true, data.trace_id);
         }
         
         // Small delay between items to avoid UI freeze and rate limits
@@ -3210,6 +3407,69 @@ function stopAIThinkingMachine(element) {
     element._thinkingMachine = false;
 }
 
+/* ===================================
+   Caption Latency Tracing
+   =================================== */
+
+function syncServerClock() {
+    // Offset from the round-trip midpoint, so reported times can be compared on the server clock
+    const sentAt = Date.now();
+    socket.timeout(5000).emit('clock_sync', {}, (err, response) => {
+        if (err || !response || typeof response.server_time !== 'number') return;
+        serverClockOffset = response.server_time - (sentAt + Date.now()) / 2;
+    });
+}
+
+function beginCaptionTrace(data) {
+    // Only a sample of listeners report each caption, to keep the ack traffic small
+    if (!data || !data.trace_id || !(Math.random() < traceSampleRate)) return;
+    const translating = displayMode !== 'transcription';
+    const expected = ['render'];
+    if (translating) expected.push('translate');
+    if (ttsEnabled) expected.push('tts');
+    captionTraces.set(data.trace_id, {
+        language: translating ? targetLang : (data.source_language || 'en'),
+        receivedAt: Date.now() + serverClockOffset,
+        started: performance.now(),
+        stages: {},
+        expected: expected,
+        timer: setTimeout(() => finishCaptionTrace(data.trace_id), TRACE_MAX_AGE_MS)
+    });
+}
+
+function markCaptionTrace(traceId, stage) {
+    const trace = traceId ? captionTraces.get(traceId) : null;
+    if (!trace || trace.stages[stage] !== undefined) return;
+    trace.stages[stage] = Math.round(performance.now() - trace.started);
+    if (trace.expected.every(s => trace.stages[s] !== undefined)) {
+        finishCaptionTrace(traceId);
+    }
+}
+
+function finishCaptionTrace(traceId) {
+    const trace = captionTraces.get(traceId);
+    if (!trace) return;
+    captionTraces.delete(traceId);
+    clearTimeout(trace.timer);
+    latencyReports.push({
+        trace_id: traceId,
+        language: trace.language,
+        received_at: Math.round(trace.receivedAt),
+        stages: trace.stages
+    });
+    if (!latencyFlushTimer) {
+        latencyFlushTimer = setTimeout(flushLatencyReports, LATENCY_FLUSH_MS);
+    }
+}
+
+function flushLatencyReports() {
+    latencyFlushTimer = null;
+    const reports = latencyReports.splice(0);
+    if (reports.length && socket && socket.connected) {
+        socket.emit('latency_report', {reports: reports});
+    }
+}
+
 async function translateInBackground(item, itemId, textEl) {
     // Translate asynchronously and update DOM when done
     try {
@@ -3236,6 +3496,7 @@ async function translateInBackground(item, itemId, textEl) {
         const translated = await translateText(item.corrected, lang);
         item.translated = translated || item.corrected;
         item.currentLang = lang;
+        markCaptionTrace(item.trace_id, 'translate');
         
         console.log('✅ Translation complete (' + item.translated.length + ' chars): ' + item.translated.substring(0, 100));
         
@@ -3268,6 +3529,7 @@ async function translateInBackground(item, itemId, textEl) {
                 // Clear current thinking text, then animate the translation
                 textEl.textContent = '';
                 animateTextChange(textEl, '', item.translated, 300);
+                markCaptionTrace(item.trace_id, 'render');
                 
                 textEl.setAttribute('data-original-text', item.translated);
                 textEl.classList.remove('translating');
@@ -3288,7 +3550,7 @@ async function translateInBackground(item, itemId, textEl) {
             // Auto-play translated text if TTS is enabled
             if (ttsEnabled && item.translated) {
                 console.log('🎯 Auto-playing translation via TTS');
-                speakText(item.translated, true);
+                speakText(item.translated, true, item.trace_id);
             }
         }
     } catch (e) {
@@ -3682,12 +3944,18 @@ function setupSocketEventListeners() {
     });
 
     socket.on('ready', async (data) => {
+        traceSampleRate = (data && data.trace_sample_rate) || 0;
+        if (traceSampleRate > 0) syncServerClock();
         // Server sent API token for session
         if (data && data.api_token) {
             apiSessionToken = data.api_token;
             // Save token to localStorage for persistence across page refreshes
             localStorage.setItem('apiSessionToken', apiSessionToken);
             console.log('🔐 API session token received and saved');
+            // During a connection surge the server spreads out first history fetches
+            if (data.history_delay_ms > 0) {
+                await new Promise(resolve => setTimeout(resolve, data.history_delay_ms));
+            }
             // Load translations with the new token
             await loadInitialTranslations();
         }
@@ -3805,6 +4073,7 @@ function setupSocketEventListeners() {
     });
 
     socket.on('new_translation', async (data) => {
+        beginCaptionTrace(data);
         // Check if an interim card exists for this temp_id — update in-place
         if (data.temp_id) {
             const list = document.getElementById('translationsList');
@@ -3895,6 +4164,7 @@ function setupSocketEventListeners() {
                     } else if (currentTextEl && displayMode === 'transcription') {
                         // In transcription mode, just show the final text
                         currentTextEl.textContent = data.corrected || data.original;
+                        markCaptionTrace(data.trace_id, 'render');
                         console.log('📝 Completed transcription displayed');
                     }
 
@@ -3918,7 +4188,7 @@ function setupSocketEventListeners() {
                     }
 
                     // Queue auto-TTS playback with isAutoPlay=true to maintain order
-                    if (ttsEnabled && data.translated) speakText(data.translated, true);
+                    if (ttsEnabled && data.translated) speakText(data.translated, true, data.trace_id);
                     return;
                 }
             }
@@ -3954,6 +4224,11 @@ function setupSocketEventListeners() {
         clearSearch();
     });
 
+    socket.on('history_bulk_added', (data) => {
+        console.log('Bulk import added:', data.count, 'items');
+        syncTranslationsAfterBulkImport(data);
+    });
+
     socket.on('items_deleted', (data) => {
         console.log('Items deleted:', data.ids);
         const idsToDelete = data.ids || [];
@@ -0,0 +1,312 @@
+"""
+Static Asset Manifest
+Content-hashed, precompressed static files served from memory
+
+Features:
+- One startup pass over the static folder: every file is read once, hashed
+  (SHA-256, first 12 hex chars) and recorded in a manifest
+- Template versioning is a dict lookup; no os.stat per render
+- Text assets (JS, CSS, JSON, SVG, HTML) stored pre-gzipped, and
+  pre-brotli'd when the optional `brotli` package is installed
+- Content-Encoding negotiated from Accept-Encoding (br > gzip > identity)
+  with a distinct ETag per encoding
+- Files above max_memory_bytes stay on disk and are sent with sendfile
+- watch() rescans the folder in the background: files replaced, added or
+  deleted on disk are picked up (only changed files are re-read), the
+  generation counter moves and on_change() callbacks run
+- Flask is only imported by AssetManifest.response(), the shared static view
+  both servers install
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import time
+from threading import Lock, Thread
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'image/svg+xml',
+)
+MIN_COMPRESS_BYTES = 512  # Smaller bodies don't gain enough to be worth a Content-Encoding
+HASH_LENGTH = 12
+
+
+class AssetBody(NamedTuple):
+    """One encoded representation of an asset, ready to send"""
+    data: bytes
+    encoding: Optional[str]  # None = identity
+    etag: str
+
+
+class StaticAsset:
+    """A static file held in memory with its precompressed variants"""
+
+    __slots__ = ('filename', 'mimetype', 'digest', 'size', 'identity', 'gzip', 'br')
+
+    def __init__(self, filename: str, data: bytes, mimetype: str, gzip_level: int = 9,
+                 brotli_quality: int = 11):
+        self.filename = filename
+        self.mimetype = mimetype
+        self.digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        self.size = len(data)
+        self.identity = AssetBody(data, None, self.digest)
+        self.gzip: Optional[AssetBody] = None
+        self.br: Optional[AssetBody] = None
+
+        if len(data) >= MIN_COMPRESS_BYTES and is_compressible(mimetype):
+            # mtime=0 keeps the gzip bytes (and so the ETag) identical across restarts
+            gzipped = gzip.compress(data, compresslevel=gzip_level, mtime=0)
+            if len(gzipped) < len(data):
+                self.gzip = AssetBody(gzipped, 'gzip', f"{self.digest}-gz")
+            if BROTLI_AVAILABLE:
+                compressed = brotli.compress(data, quality=brotli_quality)
+                if len(compressed) < len(data):
+                    self.br = AssetBody(compressed, 'br', f"{self.digest}-br")
+
+    def select(self, accept_encoding: str) -> AssetBody:
+        """Best representation for the client's Accept-Encoding header"""
+        accepted = parse_accept_encoding(accept_encoding)
+        if self.br is not None and 'br' in accepted:
+            return self.br
+        if self.gzip is not None and 'gzip' in accepted:
+            return self.gzip
+        return self.identity
+
+
+def is_compressible(mimetype: str) -> bool:
+    return mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+def parse_accept_encoding(header: str) -> frozenset:
+    """Codings the client accepts (q=0 entries excluded)"""
+    if not header:
+        return frozenset()
+    accepted = set()
+    for part in header.lower().split(','):
+        coding, _, params = part.strip().partition(';')
+        params = params.replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) == 0:
+                    continue  # q=0 means "not acceptable"
+            except ValueError:
+                pass
+        if coding:
+            accepted.add(coding.strip())
+    return frozenset(accepted)
+
+
+class AssetManifest:
+    """Content-hash manifest of a static folder with in-memory bodies"""
+
+    def __init__(self, static_dir: str, max_memory_bytes: int = 2 * 1024 * 1024):
+        """
+        Args:
+            static_dir: Folder to scan (the Flask static folder)
+            max_memory_bytes: Larger files are only hashed and served from disk
+        """
+        self.static_dir = static_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.assets: Dict[str, StaticAsset] = {}
+        self.versions: Dict[str, str] = {}
+        self.fingerprinted: frozenset = frozenset()  # Generated files with the hash in their name
+        self.generated: Dict[str, StaticAsset] = {}  # add()ed assets; they survive rebuilds and rescans
+        self.stamps: Dict[str, Tuple[int, int]] = {}  # filename -> (mtime_ns, size) of what is being served
+        self.generation = 0  # Moves on every change; part of the cache key of pages embedding ?v= hashes
+        self.listeners: List[Callable[[List[str]], None]] = []
+        self.lock = Lock()
+        self.scan_lock = Lock()
+        self.built_at = 0.0
+        self.build_ms = 0.0
+        self._watcher: Optional[Thread] = None
+
+    def build(self) -> 'AssetManifest':
+        """Scan, hash and compress every file, then swap the new manifest in"""
+        started = time.perf_counter()
+        self._scan(full=True)
+        self.built_at = time.time()
+        self.build_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"📦 Static manifest built: {len(self.versions)} files, {len(self.assets)} in memory "
+                    f"({self.build_ms:.0f} ms, brotli={'on' if BROTLI_AVAILABLE else 'off'})")
+        return self
+
+    def rescan(self) -> List[str]:
+        """Pick up files changed, added or deleted on disk since the last scan. Returns their names."""
+        changed = self._scan(full=False)
+        if changed:
+            logger.info(f"📦 Static manifest updated: {', '.join(changed[:5])}"
+                        f"{f' (+{len(changed) - 5} more)' if len(changed) > 5 else ''}")
+            for callback in list(self.listeners):
+                try:
+                    callback(changed)
+                except Exception as e:
+                    logger.error(f"❌ Static manifest listener {getattr(callback, '__name__', callback)} failed: {e}")
+        return changed
+
+    def on_change(self, callback: Callable[[List[str]], None]) -> Callable:
+        """Call callback(changed filenames) after a rescan that changed something (usable as a decorator)"""
+        self.listeners.append(callback)
+        return callback
+
+    def watch(self, interval: float = 5.0):
+        """Start a background thread that rescans the folder every interval seconds"""
+        if self._watcher is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.rescan()
+                except Exception as e:
+                    logger.error(f"❌ Static manifest watcher error: {e}")
+
+        self._watcher = Thread(target=run, daemon=True, name="static-watcher")
+        self._watcher.start()
+
+    def version(self, filename: str) -> str:
+        """Content hash used as the ?v= cache-busting value ("1" if unknown)"""
+        return self.versions.get(filename, "1")
+
+    def get(self, filename: str) -> Optional[StaticAsset]:
+        """In-memory asset, or None (unknown file or served from disk)"""
+        return self.assets.get(filename)
+
+    def is_fingerprinted(self, filename: str) -> bool:
+        """True if the filename itself carries the content hash (safe to cache immutably)"""
+        return filename in self.fingerprinted
+
+    def add(self, filename: str, data: bytes, mimetype: Optional[str] = None,
+            fingerprinted: bool = False) -> StaticAsset:
+        """Register a generated asset that doesn't exist on disk (kept across build() and rescan())"""
+        mimetype = mimetype or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        asset = StaticAsset(filename, data, mimetype)
+        with self.lock:
+            assets = dict(self.assets)
+            versions = dict(self.versions)
+            assets[filename] = asset
+            versions[filename] = asset.digest
+            self.generated = {**self.generated, filename: asset}
+            self.assets = assets
+            self.versions = versions
+            if fingerprinted:
+                self.fingerprinted = self.fingerprinted | {filename}
+            self.generation += 1
+        return asset
+
+    def response(self, filename: str):
+        """
+        Flask view for /static/<filename>: from memory, gzip/brotli encoded when accepted
+        Usage: app.view_functions['static'] = manifest.response
+        """
+        from flask import Response, current_app, request
+
+        asset = self.get(filename)
+        if asset is None:
+            # Large or unknown files: Flask sends them from disk (sendfile, 404 handling)
+            return current_app.send_static_file(filename)
+
+        body = asset.select(request.headers.get('Accept-Encoding', ''))
+        response = Response(body.data, mimetype=asset.mimetype)
+        if body.encoding:
+            response.headers['Content-Encoding'] = body.encoding
+        if asset.gzip or asset.br:
+            response.vary.add('Accept-Encoding')
+        response.set_etag(body.etag)
+        return response.make_conditional(request)
+
+    def stats(self) -> Dict:
+        assets = list(self.assets.values())
+        return {
+            'files': len(self.versions),
+            'in_memory': len(assets),
+            'identity_bytes': sum(a.size for a in assets),
+            'gzip_bytes': sum(len((a.gzip or a.identity).data) for a in assets),
+            'brotli_bytes': sum(len((a.br or a.gzip or a.identity).data) for a in assets),
+            'brotli_available': BROTLI_AVAILABLE,
+            'build_ms': round(self.build_ms, 1),
+            'generation': self.generation,
+        }
+
+    def _scan(self, full: bool) -> List[str]:
+        """Stat every file and (re)load the new or changed ones; full=True reloads everything"""
+        with self.scan_lock:
+            stamps: Dict[str, Tuple[int, int]] = {}
+            loaded: Dict[str, Tuple[Optional[StaticAsset], str]] = {}  # filename -> (asset or None if on disk, version)
+
+            for filename, path in self._walk():
+                try:
+                    st = os.stat(path)
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    if full or self.stamps.get(filename) != stamp:
+                        loaded[filename] = self._load(filename, path, st.st_size)
+                except OSError as e:
+                    logger.warning(f"⚠️ Skipping static file {filename}: {e}")
+                    continue
+                stamps[filename] = stamp
+
+            removed = [name for name in self.stamps if name not in stamps]
+            if not full and not loaded and not removed:
+                return []
+
+            with self.lock:
+                # Copy-on-write, then single assignments: lookups see either the old or the new manifest
+                assets = {} if full else dict(self.assets)
+                versions = {} if full else dict(self.versions)
+                for filename in removed:
+                    if filename not in self.generated:
+                        assets.pop(filename, None)
+                        versions.pop(filename, None)
+                for filename, (asset, version) in loaded.items():
+                    if asset is None:
+                        assets.pop(filename, None)  # Grew past max_memory_bytes: served from disk now
+                    else:
+                        assets[filename] = asset
+                    versions[filename] = version
+                for filename, asset in self.generated.items():
+                    assets.setdefault(filename, asset)
+                    versions.setdefault(filename, asset.digest)
+                self.assets = assets
+                self.versions = versions
+                self.stamps = stamps
+                self.generation += 1
+            return sorted(loaded) + sorted(removed)
+
+    def _walk(self) -> Iterable[Tuple[str, str]]:
+        for root, _, files in os.walk(self.static_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, self.static_dir).replace(os.sep, '/'), path
+
+    def _load(self, filename: str, path: str, size: int) -> Tuple[Optional[StaticAsset], str]:
+        if size > self.max_memory_bytes:
+            return None, self._hash_file(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        asset = StaticAsset(filename, data, mimetype)
+        return asset, asset.digest
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()[:HASH_LENGTH]
@@ -0,0 +1,206 @@
+"""
+Structured Logging
+Asynchronous, JSON and rate-limited log output for the servers
+
+Features:
+- Optional writer thread: the logger only gets a QueueHandler, and a
+  QueueListener on a real OS thread (outside eventlet's scheduler) runs the
+  file/console handlers, so disk and journald writes no longer happen on the
+  event loop; the caller only merges %-style args, the formatter (timestamps,
+  JSON encoding, tracebacks layout) runs on the writer thread
+- JSON lines: one object per record with time, level, logger, message, the
+  event name and any extra fields
+- Per-event sampling and rate limits for high-frequency INFO lines tagged
+  with extra={'event': ...}; WARNING and above always pass, and the number of
+  dropped records is attached to the next one that gets through
+- A bounded app queue (records are counted and dropped when the writer falls
+  behind) and an unbounded audit queue for the security logger
+"""
+
+import atexit
+import copy
+import json
+import logging
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
+
+try:
+    # The writer must be a real OS thread blocking on a real queue, even when
+    # threading/queue are monkey patched
+    from eventlet import patcher
+    _threading = patcher.original('threading')
+    _queue = patcher.original('queue')
+except ImportError:
+    import threading as _threading
+    import queue as _queue
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 10000  # App records waiting for the writer before new ones are dropped
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, extra fields, exc"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).astimezone().isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class EventRateLimiter(logging.Filter):
+    """
+    Caps records tagged with extra={'event': name} below WARNING
+
+    limits maps an event name to {'sample_every': n} (keep 1 record in n) or
+    {'per_second': r} (token bucket, bursts of up to max(1, r) records).
+    Untagged records and events without a limit always pass. The same
+    instance may sit on several handlers; each record is counted once.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict]] = None, clock=time.monotonic):
+        super().__init__()
+        self.clock = clock
+        self.lock = _threading.Lock()
+        self.sample_every: Dict[str, int] = {}
+        self.rates: Dict[str, float] = {}
+        self.tokens: Dict[str, List[float]] = {}  # event -> [tokens, last refill]
+        self.seen: Dict[str, int] = {}
+        self.dropped: Dict[str, int] = {}          # Since the last record of the event that passed
+        self.dropped_total: Dict[str, int] = {}
+        for event, rule in (limits or {}).items():
+            rule = rule or {}
+            if rule.get('sample_every'):
+                self.sample_every[event] = max(1, int(rule['sample_every']))
+            elif rule.get('per_second'):
+                self.rates[event] = float(rule['per_second'])
+
+    def _allow(self, event: str) -> bool:
+        if event in self.sample_every:
+            count = self.seen.get(event, 0)
+            self.seen[event] = count + 1
+            return count % self.sample_every[event] == 0
+        rate = self.rates[event]
+        burst = max(1.0, rate)
+        now = self.clock()
+        tokens, last = self.tokens.get(event, (burst, now))
+        tokens = min(burst, tokens + (now - last) * rate)
+        allowed = tokens >= 1.0
+        self.tokens[event] = [tokens - 1.0 if allowed else tokens, now]
+        return allowed
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, 'event', None)
+        if event is None or record.levelno >= logging.WARNING or (
+                event not in self.sample_every and event not in self.rates):
+            return True
+        # Shared by several handlers: decide once per record, not once per handler
+        decision = record.__dict__.get('_rate_limit_decision')
+        if decision is not None:
+            return decision
+        with self.lock:
+            allowed = self._allow(event)
+            if not allowed:
+                self.dropped[event] = self.dropped.get(event, 0) + 1
+                self.dropped_total[event] = self.dropped_total.get(event, 0) + 1
+                suppressed = 0
+            else:
+                suppressed = self.dropped.pop(event, 0)
+        record._rate_limit_decision = allowed
+        if suppressed:
+            record.suppressed = suppressed
+        return allowed
+
+    def stats(self) -> Dict[str, int]:
+        """Records dropped per event since startup"""
+        with self.lock:
+            return dict(self.dropped_total)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the writer thread and drops records when the queue is full"""
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the args now (they may change after the call returns) and render
+        # the traceback while it exists; timestamps/JSON/layout wait for the writer
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except _queue.Full:
+            self.dropped += 1
+
+
+class LogWriter(QueueListener):
+    """QueueListener whose thread is a named, real OS thread"""
+
+    def __init__(self, queue, *handlers, name: str = 'log-writer'):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.name = name
+
+    def start(self):
+        self._thread = _threading.Thread(target=self._monitor, name=self.name, daemon=True)
+        self._thread.start()
+
+
+def attach(target: logging.Logger, handlers: List[logging.Handler], fmt: str, json_format: bool = False,
+           use_queue: bool = False, event_filter: Optional[logging.Filter] = None,
+           queue_size: int = QUEUE_SIZE, name: str = 'log-writer') -> Optional[LogWriter]:
+    """
+    Add handlers to a logger, directly or behind a queue and writer thread
+
+    Args:
+        fmt: Text format (ignored with json_format)
+        use_queue: Run the handlers on a LogWriter thread; returns it (stopped and flushed at exit)
+        event_filter: Filter applied before formatting/queueing, e.g. an EventRateLimiter
+        queue_size: Queue bound (0 = unbounded, never drops)
+    """
+    formatter = JsonFormatter() if json_format else logging.Formatter(fmt)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if not use_queue:
+        for handler in handlers:
+            if event_filter is not None:
+                handler.addFilter(event_filter)
+            target.addHandler(handler)
+        return None
+
+    queue_handler = DeferredQueueHandler(_queue.Queue(queue_size))
+    if event_filter is not None:
+        queue_handler.addFilter(event_filter)
+    writer = LogWriter(queue_handler.queue, *handlers, name=name)
+    writer.start()
+    atexit.register(writer.stop)
+    target.addHandler(queue_handler)
+    return writer
@@ -0,0 +1,62 @@
+"""
+Text Sanitizer for Captions and API Input
+Single-pass removal of control characters and dangerous HTML/JS patterns
+
+Features:
+- All dangerous patterns precompiled into one case-insensitive alternation
+- Fast path: text without '<', ':' or '=' cannot match any pattern and
+  skips the scan entirely (the common case for spoken captions)
+- Re-scans until clean, so removing one pattern cannot splice together
+  another (e.g. "<scr<iframeipt>")
+- No Flask dependency; the server wrapper does the security logging
+"""
+
+import re
+from typing import Tuple
+
+CONTROL_CHARS = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+
+# Same patterns, in the same priority order, as the original per-pattern loop
+DANGEROUS_PATTERNS = (
+    r'<script[^>]*>.*?</script>',
+    r'javascript:',
+    r'on\w+\s*=',
+    r'<iframe',
+    r'<embed',
+    r'<object>',
+    r'data:text/html',
+)
+DANGEROUS = re.compile('|'.join(f'(?:{p})' for p in DANGEROUS_PATTERNS), re.IGNORECASE)
+
+def might_be_dangerous(text: str) -> bool:
+    """Cheap pre-check: every dangerous pattern contains '<', ':' or '='"""
+    return '<' in text or ':' in text or '=' in text
+
+
+def sanitize(text, max_length: int = 5000) -> Tuple[str, bool]:
+    """Sanitize text input.
+
+    Returns:
+        (clean_text, flagged) - flagged is True if a dangerous pattern was removed
+    """
+    if not text or not isinstance(text, str):
+        return "", False
+
+    # Remove control characters, then limit length
+    text = CONTROL_CHARS.sub('', text)[:max_length]
+
+    if not might_be_dangerous(text):
+        return text.strip(), False
+
+    # Every match is non-empty, so each pass that changes the text shortens it
+    flagged = False
+    while True:
+        cleaned = DANGEROUS.sub('', text)
+        if cleaned == text:
+            break
+        flagged = True
+        text = cleaned
+        if not might_be_dangerous(text):
+            break
+
+    return text.strip(), flagged
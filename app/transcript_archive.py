@@ -0,0 +1,134 @@
+"""
+Durable Transcript Archive
+SQLite copy of every caption, so history outlives the in-memory window and restarts
+
+Features:
+- Write-through from the live history: append, bulk append, correct, delete, clear
+- Items are kept after the in-memory history trims them; exports read from here
+- Streaming reads by keyset pagination (id > cursor), so iterating 100k rows
+  holds one batch in memory, never the whole table
+- Restart recovery: the newest items and the next free ID
+- WAL journal with synchronous=NORMAL: one small write per caption, readers
+  don't block the writer
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    item TEXT NOT NULL
+)
+"""
+
+
+class TranscriptArchive:
+    """Append-mostly SQLite table of caption items keyed by their history ID"""
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        """
+        Args:
+            path: SQLite database file (parent folder is created); ':memory:' for tests
+            batch_size: Rows fetched per query when streaming
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.lock = Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+        self.writes = 0
+        logger.info(f"🗄️ Transcript archive opened: {path} ({self.count()} items)")
+
+    def append(self, item: Dict):
+        self.append_many((item,))
+
+    def append_many(self, items: Iterable[Dict]):
+        """Insert items in one transaction (an existing ID is replaced)"""
+        now = time.time()
+        rows = [(item['id'], now, json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+                for item in items if isinstance(item.get('id'), int)]
+        if not rows:
+            return
+        with self.lock:
+            self.conn.execute("BEGIN")
+            self.conn.executemany("INSERT OR REPLACE INTO transcripts (id, created_at, item) VALUES (?, ?, ?)", rows)
+            self.conn.execute("COMMIT")
+            self.writes += len(rows)
+
+    def update(self, item: Dict):
+        """Store the new state of an item (e.g. after a correction)"""
+        if not isinstance(item.get('id'), int):
+            return
+        with self.lock:
+            self.conn.execute("UPDATE transcripts SET item = ? WHERE id = ?",
+                              (json.dumps(item, ensure_ascii=False, separators=(',', ':')), item['id']))
+            self.writes += 1
+
+    def delete(self, ids: Iterable[int]):
+        ids = [i for i in ids if isinstance(i, int)]
+        if not ids:
+            return
+        with self.lock:
+            self.conn.executemany("DELETE FROM transcripts WHERE id = ?", [(i,) for i in ids])
+            self.writes += len(ids)
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM transcripts")
+
+    def iter_items(self, after_id: int = -1) -> Iterator[Dict]:
+        """Every item in ID order, fetched batch_size rows at a time"""
+        cursor = after_id
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT id, item FROM transcripts WHERE id > ? ORDER BY id LIMIT ?",
+                    (cursor, self.batch_size)).fetchall()
+            if not rows:
+                return
+            for _, item in rows:
+                yield json.loads(item)
+            cursor = rows[-1][0]
+            if len(rows) < self.batch_size:
+                return
+
+    def recent(self, limit: int) -> List[Dict]:
+        """The newest `limit` items, oldest first (to refill the in-memory history)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT item FROM transcripts ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [json.loads(item) for (item,) in reversed(rows)]
+
+    def max_id(self) -> Optional[int]:
+        with self.lock:
+            return self.conn.execute("SELECT MAX(id) FROM transcripts").fetchone()[0]
+
+    def count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def stats(self) -> Dict:
+        size = os.path.getsize(self.path) if self.path != ':memory:' and os.path.exists(self.path) else 0
+        return {
+            'path': self.path,
+            'items': self.count(),
+            'writes': self.writes,
+            'file_bytes': size,
+        }
@@ -0,0 +1,163 @@
+"""
+Streaming Transcript Exporters
+JSON / TXT / CSV / SRT / WebVTT written as generators over an item iterator
+
+Features:
+- Output produced row by row and yielded in ~64 KB chunks; nothing is built
+  up front, so memory stays flat however many items are exported
+- CSV through the csv module (correct quoting of commas, quotes, newlines)
+- Compact JSON, streamed as one array
+- SRT and WebVTT cues timed from each caption's recorded start/end offsets
+  (see caption_timing.cue_times); times never overflow past one hour
+- On-the-fly gzip of any exporter's output
+- No Flask dependency; the server wraps the generator in a streamed response
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional
+
+try:
+    from . import text_sanitizer
+    from .caption_timing import cue_times
+except ImportError:
+    from app import text_sanitizer
+    from app.caption_timing import cue_times
+
+CHUNK_BYTES = 64 * 1024
+BOM = '\ufeff'  # Lets Windows/Excel identify the encoding
+
+
+def default_clean(text, max_length: int = 5000) -> str:
+    return text_sanitizer.sanitize(text, max_length)[0]
+
+
+def format_srt_time(seconds: float, separator: str = ',') -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600 * 1000)
+    minutes, millis = divmod(millis, 60 * 1000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def format_vtt_time(seconds: float) -> str:
+    return format_srt_time(seconds, '.')
+
+
+def _cue_text(text: str) -> str:
+    # A blank line would end the cue early, and "-->" would be read as a timing line
+    text = text.replace('-->', '->')
+    return '\n'.join(line for line in text.splitlines() if line.strip()) or ' '
+
+
+def _chunked(pieces: Iterable[str]) -> Iterator[bytes]:
+    """Join small string pieces into UTF-8 chunks of about CHUNK_BYTES"""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_BYTES:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def _json_pieces(items: Iterable[Dict], clean: Callable, language: Optional[str]) -> Iterator[str]:
+    yield '{"translations":['
+    separator = ''
+    for item in items:
+        yield separator
+        yield json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+        separator = ','
+    yield ']}'
+
+
+def _txt_pieces(items: Iterable[Dict], clean: Callable, language: Optional[str]) -> Iterator[str]:
+    yield BOM
+    yield f"EzySpeechTranslate Export\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+    yield "=" * 60 + "\n\n"
+    for item in items:
+        yield (f"[{item.get('id')}] {item.get('timestamp', '')}\n"
+               f"Original: {clean(item.get('original', ''), 500)}\n"
+               f"Corrected: {clean(item.get('corrected', ''), 500)}\n"
+               + "-" * 60 + "\n\n")
+
+
+def _csv_pieces(items: Iterable[Dict], clean: Callable, language: Optional[str]) -> Iterator[str]:
+    row_buffer = io.StringIO()
+    writer = csv.writer(row_buffer, lineterminator='\n')
+
+    def row(values) -> str:
+        writer.writerow(values)
+        text = row_buffer.getvalue()
+        row_buffer.seek(0)
+        row_buffer.truncate()
+        return text
+
+    yield BOM
+    yield row(['ID', 'Timestamp', 'Original', 'Corrected', 'Is_Corrected'])
+    for item in items:
+        yield row([
+            item.get('id'),
+            item.get('timestamp', ''),
+            clean(item.get('original', ''), 500),
+            clean(item.get('corrected', ''), 500),
+            'Yes' if item.get('is_corrected') else 'No',
+        ])
+
+
+def _srt_pieces(items: Iterable[Dict], clean: Callable, language: Optional[str]) -> Iterator[str]:
+    yield BOM
+    for index, (item, start, end) in enumerate(cue_times(items), 1):
+        yield (f"{index}\n{format_srt_time(start)} --> {format_srt_time(end)}\n"
+               f"{_cue_text(clean(item.get('corrected', ''), 500))}\n\n")
+
+
+def _vtt_pieces(items: Iterable[Dict], clean: Callable, language: Optional[str]) -> Iterator[str]:
+    yield "WEBVTT\n"
+    if language:
+        yield f"Language: {language}\n"
+    yield "\n"
+    for index, (item, start, end) in enumerate(cue_times(items), 1):
+        yield (f"{index}\n{format_vtt_time(start)} --> {format_vtt_time(end)}\n"
+               f"{_cue_text(clean(item.get('corrected', ''), 500))}\n\n")
+
+
+class ExportFormat(NamedTuple):
+    """How one export format is generated and served"""
+    pieces: Callable[[Iterable[Dict], Callable, Optional[str]], Iterator[str]]
+    content_type: str
+    filename: str
+
+
+FORMATS: Dict[str, ExportFormat] = {
+    'json': ExportFormat(_json_pieces, 'application/json; charset=utf-8', 'transcriptions.json'),
+    'txt': ExportFormat(_txt_pieces, 'text/plain; charset=utf-8', 'transcriptions.txt'),
+    'csv': ExportFormat(_csv_pieces, 'text/csv; charset=utf-8', 'transcriptions.csv'),
+    'srt': ExportFormat(_srt_pieces, 'text/plain; charset=utf-8', 'transcriptions.srt'),
+    'vtt': ExportFormat(_vtt_pieces, 'text/vtt; charset=utf-8', 'transcriptions.vtt'),
+}
+
+SUBTITLE_FORMATS = ('srt', 'vtt')
+
+
+def export_stream(export_format: str, items: Iterable[Dict], clean: Callable = default_clean,
+                  language: Optional[str] = None) -> Iterator[bytes]:
+    """UTF-8 byte chunks of items rendered in export_format (KeyError if unknown)"""
+    return _chunked(FORMATS[export_format].pieces(items, clean, language))
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a byte stream on the fly (wbits=31 writes the gzip header and trailer)"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
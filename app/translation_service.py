@@ -7,7 +7,7 @@ Features:
 - Request caching to avoid duplicate translations
 - Request queue with delays (prevent rate limiting)
 - Error recovery with exponential backoff
-- Support for multiple translation engines
+- Support for multiple translation engines (plus an offline mock for load tests)
 """
 
 import requests
@@ -21,8 +21,17 @@ from queue import Queue, Empty
 from threading import Thread, Lock
 import json
 
+try:
+    from . import metrics
+except ImportError:
+    from app import metrics
+
 logger = logging.getLogger(__name__)
 
+CACHE_LOOKUPS = metrics.counter('translation_cache_total', 'Translation cache lookups', ('result',))
+UPSTREAM_SECONDS = metrics.histogram('translation_upstream_seconds', 'Translation API request duration', ('outcome',))
+UPSTREAM_ERRORS = metrics.counter('translation_upstream_errors_total', 'Failed translation API requests', ('reason',))
+
 class TranslationCache:
     """Simple LRU cache for translations"""
     
@@ -45,12 +54,19 @@ class TranslationCache:
                 cached_text, timestamp = self.cache[key]
                 # Check if expired
                 if datetime.now() - timestamp < self.ttl:
-                    logger.info(f"📦 Cache hit for {target_lang}: {text[:50]}...")
+                    logger.info("📦 Cache hit for %s: %.50s...", target_lang, text, extra={'event': 'translation_cache_hit'})
                     return cached_text
                 else:
                     # Remove expired entry
                     del self.cache[key]
         return None
+
+    def peek(self, text: str, target_lang: str) -> Optional[str]:
+        """Cached translation without logging or evicting (bulk readers such as exports)"""
+        entry = self.cache.get(self._make_key(text, target_lang))
+        if entry and datetime.now() - entry[1] < self.ttl:
+            return entry[0]
+        return None
     
     def set(self, text: str, target_lang: str, translation: str):
         """Cache a translation"""
@@ -212,32 +228,41 @@ class GoogleTranslateService:
         if not text or not text.strip():
             return True, text, False
         
+        # Normalize language code (before the cache lookup: entries are stored under the normalized code)
+        target_lang = self.LANG_MAP.get(target_lang, target_lang)
+
         # Check cache first
         cached = self.cache.get(text, target_lang)
         if cached:
-            logger.debug(f"📦 Cache hit for {target_lang}: {text[:30]}...")
+            CACHE_LOOKUPS.inc('hit')
+            logger.debug("📦 Cache hit for %s: %.30s...", target_lang, text, extra={'event': 'translation_cache_hit'})
             return True, cached, True  # Return True for from_cache flag
-        
-        # Normalize language code
-        target_lang = self.LANG_MAP.get(target_lang, target_lang)
+        CACHE_LOOKUPS.inc('miss')
         
         # Attempt translation with retries
         for attempt in range(self.retry_attempts):
+            started = time.perf_counter()
             try:
                 result = self._translate_with_timeout(text, target_lang)
+                UPSTREAM_SECONDS.observe(time.perf_counter() - started, 'ok' if result else 'empty')
                 if result:
                     # Cache successful translation
                     self.cache.set(text, target_lang, result)
-                    logger.info(f"✅ Translated to {target_lang}: {text[:50]}... → {result[:50]}...")
+                    logger.info("✅ Translated to %s: %.50s... → %.50s...", target_lang, text, result, extra={'event': 'translation'})
                     return True, result, False  # Return False for from_cache (just created cache)
+                UPSTREAM_ERRORS.inc('empty')
             
             except requests.exceptions.Timeout:
+                UPSTREAM_SECONDS.observe(time.perf_counter() - started, 'error')
+                UPSTREAM_ERRORS.inc('timeout')
                 logger.warning(f"⏱️ Request timeout (attempt {attempt + 1}/{self.retry_attempts})")
                 wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
                 if attempt < self.retry_attempts - 1:
                     time.sleep(wait_time)
             
             except requests.exceptions.HTTPError as e:
+                UPSTREAM_SECONDS.observe(time.perf_counter() - started, 'error')
+                UPSTREAM_ERRORS.inc('rate_limited' if e.response.status_code == 429 else 'http_error')
                 if e.response.status_code == 429:  # Rate limited
                     logger.warning(f"⚠️ Rate limited (attempt {attempt + 1}/{self.retry_attempts})")
                     wait_time = (2 ** attempt) * 10  # Longer wait: 10s, 20s, 40s
@@ -248,6 +273,8 @@ class GoogleTranslateService:
                     raise
             
             except Exception as e:
+                UPSTREAM_SECONDS.observe(time.perf_counter() - started, 'error')
+                UPSTREAM_ERRORS.inc('error')
                 logger.error(f"❌ Translation error (attempt {attempt + 1}): {e}")
                 if attempt < self.retry_attempts - 1:
                     wait_time = 2 ** attempt
@@ -295,18 +322,45 @@ class GoogleTranslateService:
         
         return ''.join(result) if result else None
     
+    def cached_translation(self, text: str, target_lang: str) -> Optional[str]:
+        """Translation already in the cache, or None (never calls the translation API)"""
+        return self.cache.peek(text, self.LANG_MAP.get(target_lang, target_lang))
+
     def clear_cache(self):
         """Clear translation cache"""
         self.cache.clear()
         logger.info("🗑️ Translation cache cleared")
 
 
+class MockTranslateService(GoogleTranslateService):
+    """Offline engine for load tests: same cache/retry/metrics path, no network"""
+
+    def __init__(self, latency_seconds: float = 0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency_seconds
+
+    def _translate_with_timeout(self, text: str, target_lang: str, timeout: int = 10) -> Optional[str]:
+        time.sleep(self.latency)  # Stands in for the API round trip (green sleep under eventlet)
+        return f"[{target_lang}] {text}"
+
+
+ENGINES = {
+    'google': GoogleTranslateService,
+    'mock': MockTranslateService,
+}
+
 # Global instance
 _translation_service = None
 
-def get_translation_service() -> GoogleTranslateService:
-    """Get or create global translation service instance"""
+def get_translation_service(engine: Optional[str] = None) -> GoogleTranslateService:
+    """Get or create global translation service instance (engine: 'google' or 'mock', first call only)"""
     global _translation_service
     if _translation_service is None:
-        _translation_service = GoogleTranslateService()
+        if engine not in ENGINES:
+            if engine:
+                logger.warning(f"⚠️ Unknown translation engine '{engine}', using google")
+            engine = 'google'
+        _translation_service = ENGINES[engine]()
+        if engine != 'google':
+            logger.warning(f"🧪 Translation engine: {engine} (no real translations)")
     return _translation_service
@@ -0,0 +1,507 @@
+"""
+Edge TTS Synthesis Service with Caching and a Bounded Worker Pool
+
+Features:
+- Synthesis through the edge-tts CLI (keeps asyncio out of the eventlet hub)
+- Bounded concurrency: at most `max_concurrent` synthesis processes at once
+- Shared audio cache with TTL, item and size limits
+- Batch synthesis: cache hits answered immediately, misses run in parallel
+- Output profiles: native MP3, plus Opus/WebM/low-bitrate MP3 re-encoded
+  locally when ffmpeg is installed
+- Sentence chunking: long texts are synthesized per sentence in parallel,
+  cached per sentence and joined in order, so an edited caption only
+  re-synthesizes the sentences that changed
+- Offline mock engine (fixed-latency fake audio) for load tests
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import BoundedSemaphore, Event, Lock, Thread
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from . import metrics
+except ImportError:
+    from app import metrics
+
+logger = logging.getLogger(__name__)
+
+QUEUE_DEPTH = metrics.gauge('tts_queue_depth', 'Syntheses waiting for a worker slot')
+IN_FLIGHT = metrics.gauge('tts_in_flight', 'Synthesis/encoder processes running')
+SYNTHESIS_SECONDS = metrics.histogram('tts_synthesis_seconds', 'edge-tts / ffmpeg process duration', ('stage', 'outcome'))
+
+
+class AudioProfile:
+    """Audio output format offered to clients"""
+
+    __slots__ = ('name', 'mimetype', 'extension', 'encoder_args')
+
+    def __init__(self, name: str, mimetype: str, extension: str, encoder_args: Optional[List[str]] = None):
+        self.name = name
+        self.mimetype = mimetype
+        self.extension = extension
+        self.encoder_args = encoder_args  # ffmpeg output args; None = edge-tts native output
+
+
+DEFAULT_PROFILE = 'mp3'
+
+# edge-tts 6.x always returns 24 kHz / 48 kbit/s mono MP3; other profiles are
+# local re-encodes of that stream (speech-tuned, mono)
+AUDIO_PROFILES = {
+    'mp3': AudioProfile('mp3', 'audio/mpeg', 'mp3'),
+    'mp3-low': AudioProfile('mp3-low', 'audio/mpeg', 'mp3',
+                            ['-ac', '1', '-ar', '16000', '-c:a', 'libmp3lame', '-b:a', '24k', '-f', 'mp3']),
+    'opus': AudioProfile('opus', 'audio/ogg', 'ogg',
+                         ['-ac', '1', '-c:a', 'libopus', '-b:a', '20k', '-application', 'voip', '-f', 'ogg']),
+    'webm': AudioProfile('webm', 'audio/webm', 'webm',
+                         ['-ac', '1', '-c:a', 'libopus', '-b:a', '20k', '-application', 'voip', '-f', 'webm']),
+}
+
+# Sentence boundaries: Latin punctuation needs following whitespace, CJK full-width does not
+SENTENCE_BREAK = re.compile(r'(?<=[.!?;…])\s+|(?<=[。！？；])\s*')
+CLAUSE_BREAK = re.compile(r'(?<=[,，、:：])\s*|\s+')
+
+
+def split_sentences(text: str, min_chars: int = 60, max_chars: int = 400) -> List[str]:
+    """Split text into synthesis chunks on sentence boundaries.
+
+    Sentences shorter than min_chars are merged with the following ones (fewer,
+    more natural-sounding requests); sentences longer than max_chars are split
+    further on clause breaks or whitespace.
+    """
+    chunks = []
+    current = ''
+    for sentence in SENTENCE_BREAK.split(text.strip()):
+        if not sentence:
+            continue
+        for piece in _split_long(sentence, max_chars):
+            joined = f"{current} {piece}" if current and not _is_cjk_boundary(current) else current + piece
+            if current and len(joined) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = joined
+            if len(current) >= min_chars:
+                chunks.append(current)
+                current = ''
+    if current:
+        if chunks and len(chunks[-1]) + len(current) < max_chars:
+            last = chunks.pop()
+            current = last + current if _is_cjk_boundary(last) else f"{last} {current}"
+        chunks.append(current)
+    return chunks
+
+
+def _is_cjk_boundary(text: str) -> bool:
+    return text[-1] in '。！？；，、：'
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Break an over-long sentence at clause breaks/whitespace, hard-cutting as a last resort"""
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces = []
+    current = ''
+    for part in CLAUSE_BREAK.split(sentence):
+        if not part:
+            continue
+        if len(part) > max_chars:
+            if current:  # Keep reading order: what came before the long part goes first
+                pieces.append(current)
+                current = ''
+            while len(part) > max_chars:
+                pieces.append(part[:max_chars])
+                part = part[max_chars:]
+        if current and len(current) + len(part) + 1 > max_chars:
+            pieces.append(current)
+            current = part
+        else:
+            current = f"{current} {part}" if current and not _is_cjk_boundary(current) else current + part
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+class SynthesisCache:
+    """LRU cache of synthesized audio, bounded by item count, total bytes and TTL"""
+
+    def __init__(self, ttl_seconds: int = 3600, max_items: int = 1000, max_bytes: int = 1000 * 1024 * 1024):
+        self.ttl = ttl_seconds
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (audio_data, created_at)
+        self.total_bytes = 0
+        self.lock = Lock()
+
+    @staticmethod
+    def make_key(text: str, voice: Optional[str], profile: str = DEFAULT_PROFILE) -> str:
+        """Generate a stable cache key for synthesis requests"""
+        cache_input = f"{text}|{voice or 'default'}"
+        if profile != DEFAULT_PROFILE:
+            cache_input += f"|{profile}"
+        return hashlib.sha256(cache_input.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get cached audio if present and not expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            audio_data, created_at = entry
+            if time.time() - created_at >= self.ttl:
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return audio_data
+
+    def set(self, key: str, audio_data: bytes):
+        """Cache audio, evicting least recently used entries past the limits"""
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (audio_data, time.time())
+            self.total_bytes += len(audio_data)
+            while self.entries and (len(self.entries) > self.max_items or self.total_bytes > self.max_bytes):
+                self._remove(next(iter(self.entries)))
+
+    def clear(self) -> Tuple[int, int]:
+        """Clear all entries. Returns (items, bytes) freed."""
+        with self.lock:
+            freed = (len(self.entries), self.total_bytes)
+            self.entries.clear()
+            self.total_bytes = 0
+            return freed
+
+    def _remove(self, key: str):
+        audio_data, _ = self.entries.pop(key)
+        self.total_bytes -= len(audio_data)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SynthesisResult:
+    """Outcome of one synthesis request"""
+
+    __slots__ = ('audio', 'from_cache', 'error', 'status', 'profile')
+
+    def __init__(self, audio: Optional[bytes] = None, from_cache: bool = False,
+                 error: Optional[str] = None, status: int = 200, profile: str = DEFAULT_PROFILE):
+        self.audio = audio
+        self.from_cache = from_cache
+        self.error = error
+        self.status = status
+        self.profile = profile
+
+    @property
+    def mimetype(self) -> str:
+        return AUDIO_PROFILES[self.profile].mimetype
+
+    @property
+    def success(self) -> bool:
+        return self.audio is not None
+
+
+class EdgeTTSService:
+    """Edge TTS synthesis with caching and a bounded pool of CLI workers"""
+
+    def __init__(self, cache: Optional[SynthesisCache] = None, max_concurrent: int = 4, timeout: int = 30,
+                 encoder_path: Optional[str] = None, chunk_min_chars: int = 60, chunk_max_chars: int = 400):
+        """
+        Args:
+            cache: Audio cache shared by single and batch requests
+            max_concurrent: Maximum simultaneous synthesis/encoder processes
+            timeout: Per-synthesis timeout in seconds
+            encoder_path: ffmpeg binary for re-encoded profiles (auto-detected if None)
+            chunk_min_chars: Sentences shorter than this are merged before synthesis
+            chunk_max_chars: Longest chunk sent to edge-tts in one process
+        """
+        self.cache = cache or SynthesisCache()
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.slots = BoundedSemaphore(max_concurrent)
+        self.encoder_path = encoder_path or shutil.which('ffmpeg')
+        self.chunk_min_chars = chunk_min_chars
+        self.chunk_max_chars = chunk_max_chars
+
+    def set_max_concurrent(self, max_concurrent: int):
+        """Resize the worker pool (in-flight syntheses release the old semaphore)"""
+        if max_concurrent > 0 and max_concurrent != self.max_concurrent:
+            self.max_concurrent = max_concurrent
+            self.slots = BoundedSemaphore(max_concurrent)
+
+    @contextmanager
+    def _slot(self):
+        """Hold a worker slot, tracking how many callers wait for one"""
+        slots = self.slots
+        QUEUE_DEPTH.inc()
+        try:
+            slots.acquire()
+        finally:
+            QUEUE_DEPTH.dec()
+        IN_FLIGHT.inc()
+        try:
+            yield
+        finally:
+            IN_FLIGHT.dec()
+            slots.release()
+
+    def profiles(self) -> List[str]:
+        """Names of the output profiles this server can produce"""
+        return [name for name, profile in AUDIO_PROFILES.items()
+                if profile.encoder_args is None or self.encoder_path]
+
+    def resolve_profile(self, name: Optional[str]) -> str:
+        """Requested profile if it can be produced, else the native MP3 profile"""
+        if name in AUDIO_PROFILES and (AUDIO_PROFILES[name].encoder_args is None or self.encoder_path):
+            return name
+        return DEFAULT_PROFILE
+
+    def chunks(self, text: str) -> List[str]:
+        """Sentence chunks text is synthesized as"""
+        return split_sentences(text, self.chunk_min_chars, self.chunk_max_chars)
+
+    def cached(self, text: str, voice: str, profile: str = DEFAULT_PROFILE) -> Optional[bytes]:
+        """Return cached audio for (text, voice, profile), if any"""
+        audio_data = self.cache.get(SynthesisCache.make_key(text, voice, profile))
+        if audio_data is not None or profile != DEFAULT_PROFILE:
+            return audio_data
+
+        # MP3 is cached per sentence; a hit needs every chunk
+        chunks = self.chunks(text)
+        if len(chunks) < 2:
+            return None
+        parts = []
+        for chunk in chunks:
+            part = self.cache.get(SynthesisCache.make_key(chunk, voice))
+            if part is None:
+                return None
+            parts.append(part)
+        return b''.join(parts)
+
+    def synthesize(self, text: str, voice: str, profile: str = DEFAULT_PROFILE) -> SynthesisResult:
+        """Synthesize one text, using the cache when possible"""
+        if profile == DEFAULT_PROFILE:
+            chunks = self.chunks(text)
+            if len(chunks) > 1:
+                return self._synthesize_chunked(chunks, voice)
+
+        key = SynthesisCache.make_key(text, voice, profile)
+        audio_data = self.cache.get(key)
+        if audio_data is not None:
+            return SynthesisResult(audio_data, from_cache=True, profile=profile)
+
+        if profile != DEFAULT_PROFILE:
+            # Re-encode the native MP3 (itself cached, so switching profiles is cheap)
+            base = self.synthesize(text, voice, DEFAULT_PROFILE)
+            if not base.success:
+                return base
+            with self._slot():
+                encoded = self._transcode(base.audio, AUDIO_PROFILES[profile])
+            if encoded is None:
+                return base  # Fall back to MP3; result.profile tells the caller
+            self.cache.set(key, encoded)
+            return SynthesisResult(encoded, profile=profile)
+
+        with self._slot():
+            result = self._run_cli(text, voice)
+
+        if result.success:
+            self.cache.set(key, result.audio)
+            logger.info("✅ Synthesized: %d bytes, voice=%s", len(result.audio), voice, extra={'event': 'tts_synthesize'})
+        return result
+
+    def _synthesize_chunked(self, chunks: List[str], voice: str) -> SynthesisResult:
+        """Synthesize sentence chunks in parallel and join the MP3 frames in order.
+
+        edge-tts emits headerless MP3 frames, so byte concatenation is a valid stream.
+        """
+        jobs = []
+        for chunk in chunks:
+            audio_data = self.cache.get(SynthesisCache.make_key(chunk, voice))
+            if audio_data is not None:
+                jobs.append(SynthesisResult(audio_data, from_cache=True))
+            else:
+                jobs.append(self._submit(chunk, voice, DEFAULT_PROFILE))
+
+        parts = []
+        missed = 0
+        for job in jobs:
+            if not isinstance(job, SynthesisResult):
+                done, holder = job
+                done.wait()
+                job = holder[0]
+                missed += 1
+            if not job.success:
+                return job
+            parts.append(job.audio)
+
+        if missed:
+            logger.info("🧩 Chunked synthesis: %d/%d sentences synthesized, voice=%s", missed, len(chunks), voice,
+                        extra={'event': 'tts_synthesize'})
+        return SynthesisResult(b''.join(parts), from_cache=not missed)
+
+    def synthesize_many(self, items: List[Tuple[str, str]], profile: str = DEFAULT_PROFILE) -> Iterator[SynthesisResult]:
+        """Synthesize several (text, voice) items, yielding results in request order.
+
+        Cache hits are resolved up front; misses are submitted to the worker
+        pool together, so they run concurrently up to max_concurrent.
+        """
+        pending = []
+        for text, voice in items:
+            audio_data = self.cached(text, voice, profile)
+            if audio_data is not None:
+                pending.append(SynthesisResult(audio_data, from_cache=True, profile=profile))
+            else:
+                pending.append(self._submit(text, voice, profile))
+
+        def collect():
+            for job in pending:
+                if isinstance(job, SynthesisResult):
+                    yield job
+                    continue
+                done, holder = job
+                done.wait()
+                yield holder[0]
+
+        return collect()
+
+    def _submit(self, text: str, voice: str, profile: str):
+        """Start synthesis in a worker thread; the pool semaphore bounds concurrency"""
+        done = Event()
+        holder = [None]
+
+        def run():
+            try:
+                holder[0] = self.synthesize(text, voice, profile)
+            except Exception as e:
+                logger.error(f"❌ Batch synthesis error: {str(e)[:300]}")
+                holder[0] = SynthesisResult(error='Audio synthesis failed', status=500)
+            finally:
+                done.set()
+
+        Thread(target=run, daemon=True, name="tts-synth").start()
+        return done, holder
+
+    def _run_cli(self, text: str, voice: str) -> SynthesisResult:
+        """Run edge-tts CLI into a temporary file (bypasses eventlet/asyncio conflicts)"""
+        started = time.perf_counter()
+        result = self._run_cli_process(text, voice)
+        SYNTHESIS_SECONDS.observe(time.perf_counter() - started, 'synthesize', 'ok' if result.success else 'error')
+        return result
+
+    def _run_cli_process(self, text: str, voice: str) -> SynthesisResult:
+        logger.info("🔄 Synthesizing via CLI: len=%d, voice=%s", len(text), voice, extra={'event': 'tts_synthesize'})
+
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
+            tmp_path = f.name
+
+        try:
+            result = subprocess.run(
+                [
+                    sys.executable, '-m', 'edge_tts',
+                    '--voice', voice,
+                    '--text', text,
+                    '--write-media', tmp_path
+                ],
+                capture_output=True, text=True, timeout=self.timeout,
+                close_fds=True,
+                start_new_session=True
+            )
+
+            if result.returncode != 0:
+                logger.error(f"❌ edge-tts synthesis failed (rc={result.returncode}):\n{result.stderr}")
+                return SynthesisResult(error='Audio synthesis failed', status=500)
+
+            with open(tmp_path, 'rb') as f:
+                audio_data = f.read()
+
+        except subprocess.TimeoutExpired:
+            logger.error(f"❌ TTS synthesis timeout ({self.timeout}s)")
+            return SynthesisResult(error='Audio synthesis timeout', status=503)
+        except Exception as e:
+            logger.error(f"❌ Synthesis error: {str(e)[:300]}")
+            return SynthesisResult(error='Audio synthesis failed', status=500)
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except Exception:
+                pass
+
+        if not audio_data:
+            logger.error("❌ TTS synthesis returned empty audio")
+            return SynthesisResult(error='Audio synthesis failed - empty output', status=500)
+
+        return SynthesisResult(audio_data)
+
+    def _transcode(self, audio_data: bytes, profile: AudioProfile) -> Optional[bytes]:
+        """Re-encode MP3 audio with ffmpeg (stdin → stdout). Returns None on failure."""
+        started = time.perf_counter()
+        encoded = self._transcode_process(audio_data, profile)
+        SYNTHESIS_SECONDS.observe(time.perf_counter() - started, 'encode', 'ok' if encoded is not None else 'error')
+        return encoded
+
+    def _transcode_process(self, audio_data: bytes, profile: AudioProfile) -> Optional[bytes]:
+        try:
+            result = subprocess.run(
+                [self.encoder_path, '-hide_banner', '-loglevel', 'error',
+                 '-f', 'mp3', '-i', 'pipe:0'] + profile.encoder_args + ['pipe:1'],
+                input=audio_data, capture_output=True, timeout=self.timeout,
+                close_fds=True,
+                start_new_session=True
+            )
+            if result.returncode != 0 or not result.stdout:
+                logger.error(f"❌ ffmpeg {profile.name} encode failed (rc={result.returncode}): "
+                             f"{result.stderr.decode('utf-8', 'ignore')[:300]}")
+                return None
+            logger.debug(f"🎚️ Encoded {profile.name}: {len(audio_data)} → {len(result.stdout)} bytes")
+            return result.stdout
+        except Exception as e:
+            logger.error(f"❌ ffmpeg {profile.name} encode error: {str(e)[:300]}")
+            return None
+
+    def stats(self) -> Dict:
+        """Cache statistics for the admin panel"""
+        return {
+            'cache_items': len(self.cache),
+            'cache_size_mb': self.cache.total_bytes / (1024 * 1024),
+            'cache_ttl_seconds': self.cache.ttl,
+            'max_cache_size_mb': self.cache.max_bytes / (1024 * 1024),
+            'max_cache_items': self.cache.max_items,
+            'max_concurrent': self.max_concurrent,
+            'chunk_max_chars': self.chunk_max_chars,
+            'profiles': self.profiles(),
+        }
+
+
+# Voices the mock engine offers (edge-tts record format, see tts_voices.normalize_voice)
+MOCK_VOICES = [
+    {'ShortName': f'{locale}-MockNeural', 'FriendlyName': f'Mock {locale}', 'Locale': locale, 'Gender': 'Female'}
+    for locale in ('en-US', 'en-GB', 'es-ES', 'fr-FR', 'de-DE', 'it-IT', 'pt-BR', 'ru-RU',
+                   'zh-CN', 'zh-TW', 'ja-JP', 'ko-KR', 'ar-SA', 'hi-IN', 'vi-VN', 'th-TH')
+]
+
+
+class MockTTSService(EdgeTTSService):
+    """Offline engine for load tests: the pool, cache and chunking are real, synthesis is a sleep"""
+
+    def __init__(self, latency_seconds: float = 0.2, seconds_per_char: float = 0.002, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency_seconds
+        self.seconds_per_char = seconds_per_char
+
+    def _run_cli_process(self, text: str, voice: str) -> SynthesisResult:
+        time.sleep(self.latency + len(text) * self.seconds_per_char)
+        # ~1 KB of fake MP3 per 10 characters, deterministic per input
+        seed = hashlib.sha256(f"{voice}|{text}".encode()).digest()
+        return SynthesisResult(seed * max(1, len(text) * 100 // len(seed)))
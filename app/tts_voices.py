@@ -0,0 +1,213 @@
+"""
+Edge TTS Voice Catalog
+Indexed, atomically refreshed catalog of Edge TTS voices
+
+Features:
+- Voice list loaded once from the edge-tts library API (no CLI parsing)
+- O(1) lookups by ShortName, locale and base language
+- JSON snapshot on disk for fast cold start and offline boot
+- Background refresh that swaps the whole index in one assignment
+"""
+
+import json
+import logging
+import os
+import time
+from threading import Thread, Lock
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fields kept from the edge-tts voice records (everything else is dropped)
+VOICE_FIELDS = ('ShortName', 'FriendlyName', 'Locale', 'Gender')
+
+
+def normalize_voice(raw: Dict) -> Optional[Dict[str, str]]:
+    """Reduce an edge-tts voice record to the fields the server uses"""
+    if not isinstance(raw, dict):
+        return None
+
+    short_name = raw.get('ShortName') or raw.get('Name')
+    if not short_name or not isinstance(short_name, str):
+        return None
+
+    locale = raw.get('Locale')
+    if not locale:
+        # zh-CN-XiaoxiaoNeural → zh-CN
+        parts = short_name.split('-')
+        locale = f"{parts[0]}-{parts[1]}" if len(parts) >= 2 else ''
+
+    return {
+        'ShortName': short_name,
+        'FriendlyName': raw.get('FriendlyName') or short_name,
+        'Locale': locale,
+        'Gender': raw.get('Gender') or 'Unknown',
+    }
+
+
+class VoiceIndex:
+    """Immutable set of lookup tables built from one voice list"""
+
+    def __init__(self, voices: List[Dict[str, str]], loaded_at: float = 0.0):
+        self.voices = tuple(voices)
+        self.loaded_at = loaded_at
+        self.by_name = {}
+        self.by_locale = {}
+        self.by_language = {}
+
+        for voice in self.voices:
+            self.by_name[voice['ShortName']] = voice
+            locale = voice.get('Locale', '')
+            if not locale:
+                continue
+            self.by_locale.setdefault(locale, []).append(voice)
+            self.by_language.setdefault(locale.split('-')[0], []).append(voice)
+
+        self.locales = tuple(sorted(self.by_locale))
+
+    def __len__(self):
+        return len(self.voices)
+
+
+class VoiceCatalog:
+    """Edge TTS voice catalog with indexed lookups and background refresh"""
+
+    def __init__(self, loader: Callable[[], List[Dict]], snapshot_path: Optional[str] = None,
+                 max_age_seconds: int = 3600, retry_seconds: int = 60):
+        """
+        Args:
+            loader: Callable returning the raw voice list (blocking)
+            snapshot_path: JSON file used to persist the last good voice list
+            max_age_seconds: Age after which a background refresh is triggered
+            retry_seconds: Minimum delay between refresh attempts after a failure
+        """
+        self.loader = loader
+        self.snapshot_path = snapshot_path
+        self.max_age = max_age_seconds
+        self.retry_seconds = retry_seconds
+        self._index = VoiceIndex([])
+        self._lock = Lock()
+        self._refreshing = False
+        self._last_attempt = 0.0
+        self.version = 0
+
+    # ── Lookups ─────────────────────────────────────────────
+
+    @property
+    def index(self) -> VoiceIndex:
+        """Current index, triggering a background refresh when stale"""
+        index = self._index
+        if not index.voices or time.time() - index.loaded_at > self.max_age:
+            self.refresh_async()
+        return index
+
+    def voices(self) -> Tuple[Dict[str, str], ...]:
+        """All voices, in catalog order"""
+        return self.index.voices
+
+    def is_loaded(self) -> bool:
+        return bool(self._index.voices)
+
+    def __len__(self):
+        # Does not trigger a refresh (safe for logging and health checks)
+        return len(self._index)
+
+    def get(self, short_name: str) -> Optional[Dict[str, str]]:
+        """Look up a voice by ShortName"""
+        return self.index.by_name.get(short_name)
+
+    def for_locale(self, locale: str) -> List[Dict[str, str]]:
+        """Voices for an exact locale (e.g. 'en-US')"""
+        return self.index.by_locale.get(locale, [])
+
+    def for_language(self, language: str) -> List[Dict[str, str]]:
+        """Voices for a base language (e.g. 'en')"""
+        return self.index.by_language.get(language.split('-')[0], [])
+
+    def default_voice(self, lang: str) -> Optional[str]:
+        """First voice for the exact locale, falling back to the base language"""
+        index = self.index
+        candidates = index.by_locale.get(lang) or index.by_language.get(lang.split('-')[0])
+        return candidates[0]['ShortName'] if candidates else None
+
+    def filter_prefix(self, prefix: str) -> List[Dict[str, str]]:
+        """Voices whose locale starts with prefix (used by the voices API filter)"""
+        index = self.index
+        return [v for locale in index.locales if locale.startswith(prefix)
+                for v in index.by_locale[locale]]
+
+    # ── Loading ─────────────────────────────────────────────
+
+    def load_snapshot(self) -> bool:
+        """Load the persisted voice list, if any. Returns True on success."""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            voices = [v for v in map(normalize_voice, payload.get('voices', [])) if v]
+            if not voices:
+                return False
+            # Snapshot keeps its original timestamp, so an old file still triggers a refresh
+            self._swap(VoiceIndex(voices, loaded_at=float(payload.get('saved_at', 0))))
+            logger.info(f"📂 Loaded {len(voices)} Edge TTS voices from snapshot")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load voice snapshot {self.snapshot_path}: {e}")
+            return False
+
+    def refresh(self) -> bool:
+        """Reload voices from the library (blocking). Returns True on success."""
+        self._last_attempt = time.time()
+        try:
+            raw_voices = self.loader() or []
+            voices = [v for v in map(normalize_voice, raw_voices) if v]
+            if not voices:
+                logger.error("❌ Edge TTS voice list was empty")
+                return False
+
+            index = VoiceIndex(voices, loaded_at=time.time())
+            self._swap(index)
+            self._save_snapshot(index)
+            logger.info(f"✅ Cached {len(voices)} Edge TTS voices ({len(index.by_locale)} locales)")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Edge TTS voice refresh failed: {e}")
+            return False
+
+    def refresh_async(self):
+        """Start a background refresh unless one is running or one failed recently"""
+        with self._lock:
+            if self._refreshing or time.time() - self._last_attempt < self.retry_seconds:
+                return
+            self._refreshing = True
+            self._last_attempt = time.time()
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        Thread(target=run, daemon=True, name="tts-voice-refresh").start()
+
+    def _swap(self, index: VoiceIndex):
+        # Single reference assignment: readers see either the old or the new index
+        self._index = index
+        self.version += 1
+
+    def _save_snapshot(self, index: VoiceIndex):
+        if not self.snapshot_path:
+            return
+
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'saved_at': index.loaded_at, 'voices': list(index.voices)},
+                          f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            logger.warning(f"Could not write voice snapshot {self.snapshot_path}: {e}")
@@ -20,10 +20,9 @@ import eventlet.wsgi
 eventlet.monkey_patch(select=False, socket=False)
 import secrets
 import re
-from collections import defaultdict
 import time
 import io
-import subprocess
+import json
 import threading
 
 # ──────────────────────────────────────────
@@ -40,13 +39,15 @@ if BASE_DIR not in sys.path:
 try:
     # Try relative import (works when imported as module)
     from .oem_manager import init_oem_config
+    from . import header_policy, text_sanitizer, expiring_store, request_pipeline, static_assets, i18n_bundles, response_cache, admission_control, session_tokens, transcript_archive, transcript_export, caption_timing, metrics, hub_watchdog, latency_tracing, sampling_profiler, structured_logging
 except ImportError:
     # Fallback for direct script execution
     from app.oem_manager import init_oem_config
+    from app import header_policy, text_sanitizer, expiring_store, request_pipeline, static_assets, i18n_bundles, response_cache, admission_control, session_tokens, transcript_archive, transcript_export, caption_timing, metrics, hub_watchdog, latency_tracing, sampling_profiler, structured_logging
 
 # Now import Flask and other app modules
-from flask import Flask, render_template, request, jsonify, session, Response
-from flask_socketio import SocketIO, emit, disconnect
+from flask import Flask, render_template, request, jsonify, session, Response, stream_with_context
+from flask_socketio import SocketIO, emit, disconnect, ConnectionRefusedError
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -77,27 +78,9 @@ try:
 except ImportError as e:
     logging.getLogger("config_loader").warning(f"Secure loader not found ({e}), falling back to YAML config")
 
-    class ConfigFallback:
-        def __init__(self, config_path='config/config.yaml'):
-            try:
-                with open(config_path, 'r') as f:
-                    self.data = yaml.safe_load(f) or {}
-            except FileNotFoundError:
-                print(f"Error: Configuration file not found at {config_path}")
-                self.data = {}
-
-        def get(self, *keys, default=None):
-            val = self.data
-            for key in keys:
-                if isinstance(val, dict):
-                    val = val.get(key)
-                    if val is None:
-                        return default
-                else:
-                    return default
-            return val if val is not None else default
-
-    config_loader = ConfigFallback('config/config.yaml')
+    # Plain YAML (no secrets injection), same flattened snapshot and reload support
+    from config_snapshot import ReloadableConfig
+    config_loader = ReloadableConfig(os.path.join(CONFIG_DIR, 'config.yaml'))
 
     def get_config(*keys, default=None):
         return config_loader.get(*keys, default=default)
@@ -109,19 +92,28 @@ log_file = get_config('logging', 'file', default='logs/app.log')
 log_dir = os.path.dirname(log_file) or 'logs'
 os.makedirs(log_dir, exist_ok=True)
 
-logging.basicConfig(
-    level=get_config('logging', 'level', default='INFO'),
-    format=get_config('logging', 'format',
-                      default='%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
-    handlers=[
-        RotatingFileHandler(
-            log_file,
-            maxBytes=get_config('logging', 'max_bytes', default=10 * 1024 * 1024),
-            backupCount=get_config('logging', 'backup_count', default=5)
-        ),
-        logging.StreamHandler()
-    ]
-)
+LOG_ASYNC = bool(get_config('logging', 'async', default=False))
+LOG_JSON = bool(get_config('logging', 'json', default=False))
+log_rate_limiter = structured_logging.EventRateLimiter(get_config('logging', 'hot_events', default={}) or {})
+
+root_logger = logging.getLogger()
+if not root_logger.handlers:  # Like basicConfig: leave handlers an embedding process already installed
+    root_logger.setLevel(get_config('logging', 'level', default='INFO'))
+    structured_logging.attach(
+        root_logger,
+        [
+            RotatingFileHandler(
+                log_file,
+                maxBytes=get_config('logging', 'max_bytes', default=10 * 1024 * 1024),
+                backupCount=get_config('logging', 'backup_count', default=5)
+            ),
+            logging.StreamHandler()
+        ],
+        fmt=get_config('logging', 'format', default='%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+        json_format=LOG_JSON,
+        use_queue=LOG_ASYNC,
+        event_filter=log_rate_limiter,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -134,11 +126,23 @@ security_handler = RotatingFileHandler(
     maxBytes=10*1024*1024,
     backupCount=5
 )
-security_handler.setFormatter(logging.Formatter(
-    "%(asctime)s [SECURITY] %(message)s"
-))
-security_logger.addHandler(security_handler)
+# In async mode it is an audit stream of its own: own writer thread, unbounded queue, never sampled
+structured_logging.attach(security_logger, [security_handler], fmt="%(asctime)s [SECURITY] %(message)s",
+                          json_format=LOG_JSON, use_queue=LOG_ASYNC, queue_size=0, name='audit-writer')
 security_logger.setLevel(logging.WARNING)
+security_logger.propagate = not LOG_ASYNC
+
+# Hub watchdog reports (stacks of calls that blocked the event loop) get their own file
+blocking_logger = logging.getLogger('blocking')
+blocking_handler = RotatingFileHandler(
+    os.path.join(security_log_dir, 'blocking.log'),
+    maxBytes=10*1024*1024,
+    backupCount=3
+)
+blocking_handler.setFormatter(logging.Formatter("%(asctime)s [BLOCKING] %(message)s"))
+blocking_logger.addHandler(blocking_handler)
+blocking_logger.setLevel(logging.WARNING)
+blocking_logger.propagate = False
 
 # ──────────────────────────────────────────
 # Flask Initialization with Security
@@ -224,13 +228,15 @@ socketio = SocketIO(
     ping_interval=get_config('advanced', 'websocket', 'ping_interval', default=25),
     max_http_buffer_size=get_config('advanced', 'websocket', 'max_message_size', default=1048576)
 )
+# Count/time every Socket.IO event in and out (must wrap socketio.on before the handlers below)
+metrics.instrument_socketio(socketio, audience=lambda: len(sid_to_client_key))
 
 # ──────────────────────────────────────────
 # Protocol Configuration (HTTP/HTTPS)
 # ──────────────────────────────────────────
 USE_HTTPS = get_config('server', 'use_https', default=True)
 
-# Security Headers - only apply for HTTPS
+# Security Headers - CSP differs between HTTPS and HTTP mode
 if USE_HTTPS:
     csp = {
         'default-src': ["'self'"],
@@ -238,21 +244,9 @@ if USE_HTTPS:
         'style-src': ["'self'", "'unsafe-inline'", "https://fonts.googleapis.com"],
         'font-src': ["'self'", "https://fonts.gstatic.com"],
         'img-src': ["'self'", "data:", "https:"],
-        'connect-src': ["'self'", "wss:", "https:", "https://translate.googleapis.com"]
+        'connect-src': ["'self'", "wss:", "https:", "https://translate.googleapis.com"],
+        'media-src': ["'self'", "blob:"]  # Allow blob URLs for audio playback
     }
-
-    Talisman(
-        app,
-        force_https=True,
-        strict_transport_security=True,
-        strict_transport_security_max_age=31536000,
-        content_security_policy=csp,
-        feature_policy={
-            'geolocation': "'none'",
-            'camera': "'none'",
-            'microphone': "'none'"
-        }
-    )
 else:
     # For HTTP mode, allow HTTPS resources (CDN scripts) and ws connections
     csp = {
@@ -265,17 +259,42 @@ else:
         'media-src': ["'self'", "blob:"]  # Allow blob URLs for audio playback
     }
 
-    Talisman(
-        app,
-        force_https=False,
-        strict_transport_security=False,
-        content_security_policy=csp,
-        feature_policy={
-            'geolocation': "'none'",
-            'camera': "'none'",
-            'microphone': "'none'"
-        }
-    )
+SECURITY_HEADERS = {
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'SAMEORIGIN',
+    'X-XSS-Protection': '1; mode=block',
+    'Referrer-Policy': 'strict-origin-when-cross-origin',
+    'Permissions-Policy': 'geolocation=(), microphone=(), camera=(), browsing-topics=()',
+    'Feature-Policy': "geolocation 'none'; camera 'none'; microphone 'none'",
+}
+
+
+def build_header_policy_csp():
+    """CSP directives with the configured external URL added to connect-src"""
+    directives = {name: list(sources) for name, sources in csp.items()}
+    directives['connect-src'].extend(
+        header_policy.external_origins(get_config('server', 'external_url', default='')))
+    return directives
+
+
+# Response headers are compiled once here; the after_request hook only applies them
+response_header_policy = header_policy.HeaderPolicy(build_header_policy_csp(), SECURITY_HEADERS)
+
+# Talisman only handles HTTPS redirects, HSTS and session cookie flags; every
+# other security header comes from response_header_policy
+Talisman(
+    app,
+    force_https=USE_HTTPS,
+    strict_transport_security=USE_HTTPS,
+    strict_transport_security_max_age=31536000,
+    content_security_policy=None,
+    feature_policy={},
+    permissions_policy={},
+    document_policy={},
+    frame_options=None,
+    x_content_type_options=False,
+    referrer_policy=SECURITY_HEADERS['Referrer-Policy']
+)
 
 # Rate Limiting - check if enabled in config
 rate_limit_enabled = get_config('advanced', 'security', 'rate_limit_enabled', default=True)
@@ -303,12 +322,6 @@ else:
 # ──────────────────────────────────────────
 # Security: Attack Prevention
 # ──────────────────────────────────────────
-blocked_clients = set()  # Store blocked session keys, not IPs
-failed_login_attempts = defaultdict(list)  # Session key: [timestamps]
-rate_limit_violations = defaultdict(int)  # Session key: count
-suspicious_patterns = defaultdict(int)  # Session key: count
-blocked_since = {}  # Session key: timestamp when blocked
-
 MAX_LOGIN_ATTEMPTS = get_config('advanced', 'security', 'max_login_attempts', default=10)
 login_window_min = get_config('advanced', 'security', 'login_attempt_window_minutes', default=15)
 LOGIN_ATTEMPT_WINDOW = timedelta(minutes=login_window_min)
@@ -316,6 +329,23 @@ MAX_RATE_VIOLATIONS = get_config('advanced', 'security', 'max_rate_violations',
 MAX_SUSPICIOUS_PATTERNS = get_config('advanced', 'security', 'max_suspicious_patterns', default=20)  # NEW: Increased from hardcoded 5
 block_minutes = get_config('advanced', 'security', 'block_duration_minutes', default=60)
 BLOCK_DURATION = timedelta(minutes=block_minutes)
+violation_decay_min = get_config('advanced', 'security', 'violation_decay_minutes', default=60)
+MAX_TRACKED_CLIENTS = get_config('advanced', 'security', 'max_tracked_clients', default=10000)
+
+# Per-session security state: bounded tables whose entries expire on their own
+blocked_clients = expiring_store.TTLMap(  # Session key -> datetime when blocked
+    'blocked_clients', BLOCK_DURATION.total_seconds(), max_items=MAX_TRACKED_CLIENTS)
+failed_login_attempts = expiring_store.ExpiringCounter(  # Session key -> failures in the login window
+    'failed_login_attempts', LOGIN_ATTEMPT_WINDOW.total_seconds(), max_items=MAX_TRACKED_CLIENTS)
+rate_limit_violations = expiring_store.ExpiringCounter(  # Session key -> count, decays after a quiet period
+    'rate_limit_violations', violation_decay_min * 60, max_items=MAX_TRACKED_CLIENTS, extend_on_hit=True)
+suspicious_patterns = expiring_store.ExpiringCounter(  # Session key -> count, decays after a quiet period
+    'suspicious_patterns', violation_decay_min * 60, max_items=MAX_TRACKED_CLIENTS, extend_on_hit=True)
+
+def block_client(client_key, reason):
+    """Block a client/session for BLOCK_DURATION"""
+    blocked_clients.set(client_key, datetime.now())
+    security_logger.critical(f"CLIENT BLOCKED due to {reason}: {client_key}")
 
 def get_client_key():
     """Get unique client identifier for blocking (session-based, not IP-based).
@@ -328,34 +358,16 @@ def is_client_blocked(client_key=None):
     if client_key is None:
         client_key = get_client_key()
 
-    if client_key not in blocked_clients:
-        return False
-
-    # Check if block has expired
-    if client_key in blocked_since:
-        if datetime.now() - blocked_since[client_key] > BLOCK_DURATION:
-            blocked_clients.discard(client_key)
-            blocked_since.pop(client_key, None)
-            return False
-
-    return True
+    # Entries expire after BLOCK_DURATION
+    return client_key in blocked_clients
 
 def record_failed_login(client_key=None):
     """Record failed login attempt for a client/session"""
     if client_key is None:
         client_key = get_client_key()
 
-    now = datetime.now()
-    attempts = failed_login_attempts[client_key]
-
-    # Clean old attempts
-    attempts[:] = [t for t in attempts if now - t < LOGIN_ATTEMPT_WINDOW]
-    attempts.append(now)
-
-    if len(attempts) >= MAX_LOGIN_ATTEMPTS:
-        blocked_clients.add(client_key)
-        blocked_since[client_key] = now
-        security_logger.critical(f"CLIENT BLOCKED due to failed login attempts: {client_key}")
+    if failed_login_attempts.incr(client_key) >= MAX_LOGIN_ATTEMPTS:
+        block_client(client_key, "failed login attempts")
         return True
 
     return False
@@ -365,12 +377,8 @@ def record_rate_violation(client_key=None):
     if client_key is None:
         client_key = get_client_key()
 
-    rate_limit_violations[client_key] += 1
-
-    if rate_limit_violations[client_key] >= MAX_RATE_VIOLATIONS:
-        blocked_clients.add(client_key)
-        blocked_since[client_key] = datetime.now()
-        security_logger.critical(f"CLIENT BLOCKED due to rate limit violations: {client_key}")
+    if rate_limit_violations.incr(client_key) >= MAX_RATE_VIOLATIONS:
+        block_client(client_key, "rate limit violations")
         return True
 
     return False
@@ -380,13 +388,11 @@ def record_suspicious_activity(reason, client_key=None):
     if client_key is None:
         client_key = get_client_key()
 
-    suspicious_patterns[client_key] += 1
+    count = suspicious_patterns.incr(client_key)
     security_logger.warning(f"Suspicious activity from {client_key}: {reason}")
 
-    if suspicious_patterns[client_key] >= MAX_SUSPICIOUS_PATTERNS:
-        blocked_clients.add(client_key)
-        blocked_since[client_key] = datetime.now()
-        security_logger.critical(f"CLIENT BLOCKED due to suspicious patterns: {client_key}")
+    if count >= MAX_SUSPICIOUS_PATTERNS:
+        block_client(client_key, "suspicious patterns")
         return True
 
     return False
@@ -406,33 +412,15 @@ def check_client_access(f):
 # Security: Input Validation
 # ──────────────────────────────────────────
 def sanitize_text(text, max_length=5000):
-    """Sanitize text input"""
-    if not text or not isinstance(text, str):
-        return ""
-
-    # Remove control characters
-    text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
-
-    # Limit length
-    text = text[:max_length]
-
-    # Remove dangerous HTML/JS patterns
-    dangerous = [
-        r'<script[^>]*>.*?</script>',
-        r'javascript:',
-        r'on\w+\s*=',
-        r'<iframe',
-        r'<embed',
-        r'<object>',
-        r'data:text/html'
-    ]
-
-    for pattern in dangerous:
-        if re.search(pattern, text, re.IGNORECASE):
-            security_logger.warning(f"Dangerous pattern detected from {get_real_ip()}")
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-
-    return text.strip()
+    """Sanitize text input (control characters, length, dangerous HTML/JS patterns)"""
+    text, flagged = text_sanitizer.sanitize(text, max_length)
+    if flagged:
+        security_logger.warning(f"Dangerous pattern detected from {get_real_ip()}")
+    return text
+
+# Read on every socket event / token check; refreshed by the config reload hooks below
+AUTH_ENABLED = config_loader.get_bool('authentication', 'enabled', default=True)
+JWT_SECRET = get_config('authentication', 'jwt_secret', default='secret')
 
 def validate_jwt_token(token):
     """Validate JWT token securely"""
@@ -442,7 +430,7 @@ def validate_jwt_token(token):
     try:
         decoded = jwt.decode(
             token,
-            get_config('authentication', 'jwt_secret', default='secret'),
+            JWT_SECRET,
             algorithms=['HS256'],
             options={"verify_exp": True}
         )
@@ -463,8 +451,39 @@ next_translation_id = 0  # Global ID counter (never resets, always increments)
 connected_clients = set()          # all socket SIDs
 listener_clients = {}              # client_key -> latest SID  (user clients only, 1 per user)
 admin_sessions = {}                 # sid -> username (admin sessions)
-api_session_tokens = {}             # Maps token -> {sid, created_at, expires_at}
+api_session_tokens = session_tokens.SessionTokenStore(ttl_seconds=24 * 3600)  # token -> {sid, created_at, expires_at}, indexed by sid
 sid_to_client_key = {}              # Mapping: sid -> (client_key, client_type) for cleanup on disconnect
+caption_clock = caption_timing.CaptionClock()  # Session-relative start/end offsets for each caption
+caption_latency = latency_tracing.LatencyTracker()  # Per-stage speech -> listener render timings
+TRACE_SAMPLE_RATE = min(1.0, max(0.0, get_config('advanced', 'tracing', 'sample_rate', default=0.2)))
+MAX_LATENCY_REPORTS = 50  # Per latency_report event
+# On-demand sampling profiler (admin only); the main thread runs the eventlet hub
+profiler = sampling_profiler.SamplingProfiler(
+    max_duration_seconds=get_config('advanced', 'profiler', 'max_duration_seconds', default=60),
+    default_interval_seconds=get_config('advanced', 'profiler', 'interval_ms', default=5) / 1000)
+profiler.set_hub_thread()
+
+def open_transcript_archive():
+    """Durable SQLite copy of the history (database.enabled); None when disabled or unavailable"""
+    if not get_config('database', 'enabled', default=False):
+        return None
+    db_type = get_config('database', 'type', default='sqlite')
+    if db_type != 'sqlite':
+        logger.warning(f"⚠️ Database type '{db_type}' is not supported; transcript archive disabled")
+        return None
+    path = get_config('database', 'path', default='data/translations.db')
+    try:
+        return transcript_archive.TranscriptArchive(os.path.join(BASE_DIR, path))
+    except Exception as e:
+        logger.error(f"❌ Could not open transcript archive {path}: {e}")
+        return None
+
+archive = open_transcript_archive()
+if archive is not None:
+    # Pick up where the last run stopped: newest items in memory, IDs continue
+    translations_history = archive.recent(MAX_HISTORY_SIZE)
+    last_archived_id = archive.max_id()
+    next_translation_id = last_archived_id + 1 if last_archived_id is not None else 0
 
 def add_translation(data):
     """Add translation with size limit"""
@@ -476,88 +495,105 @@ def add_translation(data):
         next_translation_id += 1
 
     translations_history.append(data)
+    if archive is not None:
+        archive.append(data)
 
     # Limit history size - keep only the most recent entries
     if len(translations_history) > MAX_HISTORY_SIZE:
         translations_history = translations_history[-MAX_HISTORY_SIZE:]
         logger.info(f"History trimmed to {MAX_HISTORY_SIZE} items. Total IDs generated: {next_translation_id}")
 
+def add_translations_bulk(items):
+    """Add many translations at once: one contiguous ID range, one trim. Returns (first_id, last_id)."""
+    global translations_history, next_translation_id
+
+    first_id = next_translation_id
+    next_translation_id += len(items)
+    for offset, item in enumerate(items):
+        item['id'] = first_id + offset
+
+    translations_history.extend(items)
+    if archive is not None:
+        archive.append_many(items)
+
+    if len(translations_history) > MAX_HISTORY_SIZE:
+        translations_history = translations_history[-MAX_HISTORY_SIZE:]
+        logger.info(f"History trimmed to {MAX_HISTORY_SIZE} items. Total IDs generated: {next_translation_id}")
+
+    return first_id, next_translation_id - 1
+
 # ──────────────────────────────────────────
 # Middleware
 # ──────────────────────────────────────────
-@app.before_request
-def before_request():
-    """Security checks before each request - auto-assign client ID if needed"""
-    # Ensure every request has a unique client ID
+# Security checks per route class: static assets and health checks only get a client ID
+security_pipeline = request_pipeline.RequestPipeline(health_paths=('/api/health', '/metrics'))
+SQL_INJECTION_PATTERNS = ('union select', 'drop table', 'insert into', '--', ';--')
+
+@security_pipeline.stage('client_id')
+def assign_client_id():
+    """Ensure every request has a unique client ID"""
     client_id = request.cookies.get('_client_id')
     if not client_id:
         client_id = f"browser_{secrets.token_hex(16)}"
     request.client_id = client_id
 
-    client_key = f"client:{client_id}"
-
-    # Check client/session blocking
-    if is_client_blocked(client_key):
+@security_pipeline.stage('blocked_client', request_pipeline.DYNAMIC_ROUTES)
+def reject_blocked_client():
+    """Check client/session blocking"""
+    if is_client_blocked(f"client:{request.client_id}"):
         return jsonify({'error': 'Access denied - too many failed attempts'}), 403
 
-    # Check request size
+@security_pipeline.stage('request_size', request_pipeline.DYNAMIC_ROUTES)
+def reject_large_request():
     if request.content_length and request.content_length > app.config['MAX_CONTENT_LENGTH']:
-        security_logger.warning(f"Large request from {client_key}: {request.content_length}")
+        security_logger.warning(f"Large request from client:{request.client_id}: {request.content_length}")
         return jsonify({'error': 'Request too large'}), 413
 
-    # Check for path traversal
+@security_pipeline.stage('path_traversal', request_pipeline.DYNAMIC_ROUTES)
+def reject_path_traversal():
     if '../' in request.path or '..\\' in request.path:
-        record_suspicious_activity("Path traversal attempt", client_key)
+        record_suspicious_activity("Path traversal attempt", f"client:{request.client_id}")
         return jsonify({'error': 'Invalid request'}), 400
 
-    # Check for SQL injection patterns
-    sql_patterns = ['union select', 'drop table', 'insert into', '--', ';--']
+@security_pipeline.stage('sql_patterns', request_pipeline.DYNAMIC_ROUTES)
+def reject_sql_patterns():
+    if not request.query_string:
+        return None
     query_string = request.query_string.decode('utf-8', 'ignore').lower()
-    if any(pattern in query_string for pattern in sql_patterns):
-        record_suspicious_activity("SQL injection attempt", client_key)
+    if any(pattern in query_string for pattern in SQL_INJECTION_PATTERNS):
+        record_suspicious_activity("SQL injection attempt", f"client:{request.client_id}")
         return jsonify({'error': 'Invalid request'}), 400
 
+HTTP_REQUESTS = metrics.counter('http_requests_total', 'HTTP requests', ('route', 'method', 'status'))
+HTTP_SECONDS = metrics.histogram('http_request_duration_seconds', 'HTTP request duration (to first byte)', ('route', 'method'))
+
+@app.before_request
+def before_request():
+    """Security checks before each request - auto-assign client ID if needed"""
+    request.started_at = time.perf_counter()
+    return security_pipeline.run(request.path)
+
 @app.after_request
 def after_request(response):
-    """Add security headers and set client ID cookie"""
-    response.headers['X-Content-Type-Options'] = 'nosniff'
-    response.headers['X-Frame-Options'] = 'DENY'
-    response.headers['X-XSS-Protection'] = '1; mode=block'
-    response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-    response.headers['Permissions-Policy'] = 'geolocation=(), microphone=(), camera=()'
-    
-    # ✅ Content Security Policy - dynamically include external URL if configured
-    external_url = get_config('server', 'external_url', default='')
-    
-    # Build connect-src with local and external URLs
-    connect_src_list = ["'self'", "http://localhost:*", "http://127.0.0.1:*", 
-                       "ws://localhost:*", "ws://127.0.0.1:*",
-                       "https://cdnjs.cloudflare.com", "https://translate.googleapis.com", 
-                       "https://fonts.googleapis.com", "https://fonts.gstatic.com"]
-    
-    # Add external URL if configured (for CF Tunnel or reverse proxy)
-    if external_url:
-        # Add both https:// and wss:// versions
-        if external_url.startswith('https://'):
-            external_host = external_url.replace('https://', '').rstrip('/')
-            connect_src_list.append(f"https://{external_host}")
-            connect_src_list.append(f"wss://{external_host}")
-        elif external_url.startswith('http://'):
-            external_host = external_url.replace('http://', '').rstrip('/')
-            connect_src_list.append(f"http://{external_host}")
-            connect_src_list.append(f"ws://{external_host}")
-    
-    connect_src = ' '.join(connect_src_list)
-    
-    response.headers['Content-Security-Policy'] = (
-        "default-src 'self'; "
-        "script-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com; "
-        "style-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com https://fonts.googleapis.com; "
-        "media-src 'self' blob:; "
-        f"connect-src {connect_src}; "
-        "img-src 'self' data:; "
-        "font-src 'self' data: https://cdnjs.cloudflare.com https://fonts.gstatic.com"
-    )
+    """Apply the precompiled security/cache headers and set client ID cookie"""
+    if getattr(request, 'revalidate_response', False):
+        route_class = header_policy.REVALIDATE
+    else:
+        versioned = bool(request.args.get('v')) or static_manifest.is_fingerprinted(request.path[len('/static/'):])
+        route_class = header_policy.classify(request.path, response.content_type, versioned)
+    response_header_policy.apply(response, route_class)
+
+    # Static files keep an ETag for revalidation (send_file normally sets one)
+    if route_class in (header_policy.STATIC, header_policy.STATIC_VERSIONED) \
+            and response.status_code == 200 and not response.headers.get('ETag'):
+        response.add_etag()
+
+    # Route template (not the raw path) and known methods keep the label set bounded
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    method = metrics.method_label(request.method)
+    HTTP_REQUESTS.inc(route, method, response.status_code)
+    if hasattr(request, 'started_at'):
+        HTTP_SECONDS.observe(time.perf_counter() - request.started_at, route, method)
 
     # Set persistent client ID cookie if we generated a new one
     if hasattr(request, 'client_id') and not request.cookies.get('_client_id'):
@@ -576,33 +612,13 @@ def after_request(response):
 # Authentication with Security
 # ──────────────────────────────────────────
 
-def generate_api_session_token():
-    """Generate a temporary API session token"""
-    return secrets.token_urlsafe(32)
-
 def create_api_token(sid):
-    """Create a new API token for this WebSocket session"""
-    token = generate_api_session_token()
-    api_session_tokens[token] = {
-        'sid': sid,
-        'created_at': datetime.now(),
-        'expires_at': datetime.now() + timedelta(hours=24)  # Valid for 24 hours
-    }
-    return token
+    """Create a new API token for this WebSocket session (valid for 24 hours)"""
+    return api_session_tokens.create(sid)
 
 def validate_api_token(token):
     """Validate and return session info if token is valid"""
-    if token not in api_session_tokens:
-        return None
-    
-    session_info = api_session_tokens[token]
-    
-    # Check if expired
-    if datetime.now() > session_info['expires_at']:
-        del api_session_tokens[token]
-        return None
-    
-    return session_info
+    return api_session_tokens.validate(token)
 
 def require_api_token(f):
     """Decorator to validate API session token"""
@@ -640,7 +656,7 @@ def require_api_token(f):
 def require_auth(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        if not get_config('authentication', 'enabled', default=True):
+        if not AUTH_ENABLED:
             return f(*args, **kwargs)
 
         token = request.headers.get('Authorization', '').replace('Bearer ', '')
@@ -663,7 +679,7 @@ def require_admin_auth(f):
     """Decorator to require admin authentication (JWT token)"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        if not get_config('authentication', 'enabled', default=True):
+        if not AUTH_ENABLED:
             return f(*args, **kwargs)
 
         token = request.headers.get('Authorization', '').replace('Bearer ', '')
@@ -688,114 +704,108 @@ def require_admin_auth(f):
 
 def is_admin(sid):
     """Check if session is authenticated admin"""
-    if not get_config('authentication', 'enabled', default=True):
+    if not AUTH_ENABLED:
         return True
     return sid in admin_sessions
 
-# ──────────────────────────────────────────
-# Cache Control Middleware (prevent browser caching of JS/CSS)
-# ──────────────────────────────────────────
-@app.after_request
-def set_cache_headers(response):
-    """Set proper cache headers for static and dynamic content"""
-    # ✅ Ensure CSP is always present with external URL support
-    if 'Content-Security-Policy' not in response.headers:
-        external_url = get_config('server', 'external_url', default='')
-        
-        # Build connect-src with local and external URLs
-        connect_src_list = ["'self'", "http://localhost:*", "http://127.0.0.1:*", 
-                           "ws://localhost:*", "ws://127.0.0.1:*",
-                           "https://cdnjs.cloudflare.com", "https://translate.googleapis.com", 
-                           "https://fonts.googleapis.com", "https://fonts.gstatic.com"]
-        
-        # Add external URL if configured (for CF Tunnel or reverse proxy)
-        if external_url:
-            # Add both https:// and wss:// versions
-            if external_url.startswith('https://'):
-                external_host = external_url.replace('https://', '').rstrip('/')
-                connect_src_list.append(f"https://{external_host}")
-                connect_src_list.append(f"wss://{external_host}")
-            elif external_url.startswith('http://'):
-                external_host = external_url.replace('http://', '').rstrip('/')
-                connect_src_list.append(f"http://{external_host}")
-                connect_src_list.append(f"ws://{external_host}")
-        
-        connect_src = ' '.join(connect_src_list)
-        
-        response.headers['Content-Security-Policy'] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com; "
-            "style-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com https://fonts.googleapis.com; "
-            "media-src 'self' blob:; "
-            f"connect-src {connect_src}; "
-            "img-src 'self' data:; "
-            "font-src 'self' data: https://cdnjs.cloudflare.com https://fonts.gstatic.com"
-        )
-    
-    # Disable caching for HTML pages (always fetch fresh version)
-    if response.content_type and 'text/html' in response.content_type:
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, public, max-age=0'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-    
-    # Disable caching for API responses
-    elif request.path.startswith('/api/'):
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, public, max-age=0'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-    
-    # For static files (JS, CSS, images) - use versioning strategy
-    elif request.path.startswith('/static/'):
-        # If URL has version/hash parameter (?v=...), cache forever (immutable)
-        if request.args.get('v'):
-            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'  # 1 year
-        else:
-            # Without version, don't cache - forces browser to check for updates
-            # This handles unversioned requests during development/debugging
-            response.headers['Cache-Control'] = 'public, max-age=0, must-revalidate'
-        
-        # Add ETag for cache validation
-        if not response.headers.get('ETag'):
-            response.set_etag()
-    
-    return response
-
 # ──────────────────────────────────────────
 # Jinja2 Helpers - Static File Versioning
 # ──────────────────────────────────────────
+# Every static file is hashed (and text assets precompressed) at startup; files changed
+# on disk later are picked up by static_manifest.watch() (started in __main__)
+static_manifest = static_assets.AssetManifest(STATIC_DIR).build()
+
+# Per-language UI string bundles split out of js/i18n.js ({lang: url}); the user page loads only one
+try:
+    I18N_BUNDLE_URLS = i18n_bundles.register_bundles(static_manifest, os.path.join(STATIC_DIR, 'js', 'i18n.js'))
+except (OSError, ValueError) as e:
+    logger.error(f"❌ Failed to build i18n bundles: {e}")
+    I18N_BUNDLE_URLS = {}
+
+@static_manifest.on_change
+def on_static_files_changed(changed):
+    """Regenerate the i18n bundles when js/i18n.js is edited (old bundle URLs keep working)"""
+    global I18N_BUNDLE_URLS
+    if 'js/i18n.js' not in changed:
+        return
+    try:
+        I18N_BUNDLE_URLS = i18n_bundles.register_bundles(static_manifest, os.path.join(STATIC_DIR, 'js', 'i18n.js'))
+    except (OSError, ValueError) as e:
+        logger.error(f"❌ Failed to rebuild i18n bundles, keeping the previous ones: {e}")
+
 def get_static_file_version(filename):
     """
-    Get file modification time as version string for cache busting
+    Get the file's content hash as version string for cache busting (manifest lookup, no disk access)
     Usage in templates: {{ url_for('static', filename='css/user.css') }}?v={{ 'css/user.css' | static_version }}
     """
-    try:
-        filepath = os.path.join(STATIC_DIR, filename)
-        if os.path.exists(filepath):
-            mtime = os.path.getmtime(filepath)
-            return str(int(mtime))
-        else:
-            logger.warning(f"Static file not found for versioning: {filename}")
-            return "1"
-    except Exception as e:
-        logger.error(f"Error getting static file version for {filename}: {e}")
-        return "1"
+    return static_manifest.version(filename)
+
+# Served from memory, gzip/brotli encoded when the client accepts it
+app.view_functions['static'] = static_manifest.response
 
 # Register Jinja2 filter for static file versioning
 app.jinja_env.filters['static_version'] = get_static_file_version
 
+# ──────────────────────────────────────────
+# Response Cache - Hot Public GETs
+# ──────────────────────────────────────────
+# Pages and JSON that only change with the config, the static files they link to
+# (?v= hashes) or the voice catalog are built once per version; repeat loads with
+# a matching If-None-Match get a 304
+public_response_cache = response_cache.ResponseCache(
+    max_entries=get_config('advanced', 'performance', 'response_cache_entries', default=256))
+
+def config_version():
+    return config_loader.epoch, static_manifest.generation
+
+def cached_response(*arg_names, version=config_version):
+    """
+    Cache a view's 200 responses, keyed on the path, the named query args and version()
+    Usage: @cached_response('lang', version=lambda: (config_loader.epoch, voice_catalog.version))
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            key = (request.path, tuple(request.args.get(name, '') for name in arg_names), version())
+            entry = public_response_cache.get(key)
+            if entry is None:
+                response = app.make_response(f(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+                entry = public_response_cache.put(key, response.get_data(), response.content_type)
+
+            request.revalidate_response = True
+            if request.if_none_match.contains(entry.etag):
+                public_response_cache.record_not_modified()
+                response = Response(status=304)
+                response.set_etag(entry.etag)
+                return response
+            response = Response(entry.body, content_type=entry.content_type)
+            response.set_etag(entry.etag)
+            return response
+
+        return decorated
+    return decorator
+
+def voices_version():
+    voice_catalog.index  # Property access starts a background refresh when the catalog is stale
+    return config_loader.epoch, voice_catalog.version
+
 # ──────────────────────────────────────────
 # Routes with Protection
 # ──────────────────────────────────────────
 @app.route('/')
 @limiter.limit("60 per minute")
 @check_client_access
+@cached_response()
 def index():
     """Main client interface"""
-    return render_template('user.html')
+    return render_template('user.html', i18n_bundles=I18N_BUNDLE_URLS)
 
 @app.route('/captions')
 @limiter.limit("60 per minute")
 @check_client_access
+@cached_response()
 def captions():
     """OBS / streaming overlay — transparent caption renderer.
 
@@ -854,7 +864,7 @@ def login():
                 'iat': datetime.utcnow(),
                 'jti': secrets.token_hex(16)
             },
-            get_config('authentication', 'jwt_secret', default='secret'),
+            JWT_SECRET,
             algorithm='HS256'
         )
 
@@ -890,6 +900,7 @@ def get_runtime_config():
 @app.route('/api/oem-config', methods=['GET'])
 @limiter.limit("60 per minute")
 @check_client_access
+@cached_response()
 def get_oem_config():
     """Get OEM configuration for frontend"""
     return jsonify(app.config.get('OEM', {}))
@@ -904,6 +915,8 @@ def get_translations():
     Query parameters:
         offset (int): Starting index (default 0)
         limit (int): Number of items to return (default 100, max 1000)
+        after_id (int): Cursor mode - items with a larger ID, oldest first
+                        (used by clients to catch up after history_bulk_added)
     
     Response:
         {
@@ -924,6 +937,25 @@ def get_translations():
     # Validate parameters
     offset = max(0, min(offset, len(translations_history)))
     limit = max(1, min(limit, 1000))  # Max 1000 items per request
+
+    if request.args.get('after_id') is not None:
+        try:
+            after_id = int(request.args.get('after_id'))
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid after_id'}), 400
+        # Admin reordering can move items around, so filter by ID instead of bisecting
+        newer = sorted((t for t in translations_history
+                        if isinstance(t.get('id'), int) and t['id'] > after_id),
+                       key=lambda t: t['id'])
+        page = newer[:limit]
+        return jsonify({
+            'translations': page,
+            'after_id': after_id,
+            'next_after_id': page[-1]['id'] if page else after_id,
+            'limit': limit,
+            'total': len(translations_history),
+            'has_more': len(newer) > limit
+        })
     
     # Get total count
     total = len(translations_history)
@@ -953,6 +985,9 @@ def clear_translations():
     global translations_history, next_translation_id
     translations_history = []
     next_translation_id = 0  # Reset ID counter when clearing history
+    if archive is not None:
+        archive.clear()
+    caption_clock.reset()  # Subtitle timing restarts with the next caption
     socketio.emit('history_cleared')
     logger.info(f"Translation history cleared by {request.user.get('username')}")
     return jsonify({'success': True})
@@ -973,6 +1008,127 @@ def health_check():
         'translations': len(translations_history)
     })
 
+def collect_server_metrics():
+    """Scrape-time gauges for state that already keeps its own stats"""
+    users = sum(1 for _, client_type in list(sid_to_client_key.values()) if client_type == 'user')
+    yield metrics.Family('connected_clients', 'gauge', 'Connected Socket.IO clients', ('type',),
+                         [(('user',), users), (('admin',), len(sid_to_client_key) - users)])
+    yield metrics.Family('listeners', 'gauge', 'Distinct listener devices', (), [((), len(listener_clients))])
+    yield metrics.Family('history_items', 'gauge', 'Captions in the in-memory history', (), [((), len(translations_history))])
+    yield metrics.Family('history_next_id', 'counter', 'Caption IDs assigned', (), [((), next_translation_id)])
+    if archive is not None:
+        yield metrics.Family('archive_writes', 'counter', 'Rows written to the transcript archive', (), [((), archive.writes)])
+    yield metrics.Family('log_records_sampled_out', 'counter', 'Hot-path log records dropped by logging.hot_events', ('event',),
+                         [((event,), count) for event, count in sorted(log_rate_limiter.stats().items())])
+
+    yield from metrics.stats_families(
+        'state_table', 'Expiring state tables', [((s['name'],), s) for s in expiring_store.all_stats()],
+        ('table',), {'items': 'items', 'evictions': 'evictions', 'expirations': 'expirations'})
+    yield from metrics.stats_families(
+        'rate_limiter', 'Sliding-window limiters',
+        [(('tts_synthesis',), synthesis_limiter.stats()), (('translation_items',), translation_limiter.stats()),
+         (('latency_reports',), latency_report_limiter.stats())],
+        ('limiter',), {'clients': 'clients', 'rejected': 'rejected'})
+    yield from metrics.stats_families(
+        'response_cache', 'Public GET response cache', [((), public_response_cache.stats())], (),
+        {'entries': 'entries', 'hits': 'hits', 'misses': 'misses', 'not_modified': 'not_modified'})
+    yield from metrics.stats_families(
+        'connection_admission', 'Socket.IO connect admission', [((), connection_admission.stats())], (),
+        {'admitted': 'admitted', 'queued': 'queued', 'refused': 'refused', 'queue_seconds': 'queue_seconds'})
+    yield from metrics.stats_families(
+        'middleware_stage', 'Request pipeline stages',
+        [((name,), counter) for name, counter in security_pipeline.stats()['stages'].items()],
+        ('stage',), {'calls': 'calls', 'rejections': 'rejections', 'total_ms': 'total_ms'})
+    yield from metrics.stats_families(
+        'tts_cache', 'TTS audio cache', [((), tts_service.stats())], (), {'cache_items': 'items', 'cache_size_mb': 'mb'})
+
+metrics.register_collector('user_server', collect_server_metrics)
+metrics.register_collector('caption_latency', caption_latency.families)
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint (advanced.metrics.enabled; bearer token if advanced.metrics.token is set, else localhost only)"""
+    if not config_loader.get_bool('advanced', 'metrics', 'enabled', default=True):
+        return jsonify({'error': 'Not found'}), 404
+    allowed, status = metrics.scrape_allowed(config_loader.get_str('advanced', 'metrics', 'token', default=''),
+                                             request.headers.get('Authorization'), request.remote_addr, request.headers)
+    if not allowed:
+        return jsonify({'error': 'Unauthorized' if status == 401 else 'Forbidden'}), status
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+@app.route('/api/security/state-stats', methods=['GET'])
+@limiter.limit("30 per minute")
+@require_admin_auth
+def get_security_state_stats():
+    """Size and churn of the in-memory security/rate-limit tables"""
+    return jsonify({
+        'success': True,
+        'tables': expiring_store.all_stats(),
+        'rate_limiters': {
+            'tts_synthesis': synthesis_limiter.stats(),
+            'translation_items': translation_limiter.stats(),
+            'latency_reports': latency_report_limiter.stats(),
+        },
+        'middleware': security_pipeline.stats(),
+        'connection_admission': connection_admission.stats()
+    })
+
+@app.route('/api/latency', methods=['GET'])
+@limiter.limit("30 per minute")
+@require_admin_auth
+def get_caption_latency():
+    """Caption latency p50/p95/p99 (ms) per stage and language"""
+    return jsonify(dict(caption_latency.summary(), success=True, sample_rate=TRACE_SAMPLE_RATE))
+
+@app.route('/api/profiler/start', methods=['POST'])
+@limiter.limit("10 per minute")
+@require_admin_auth
+def start_profiler():
+    """Start a time-boxed sampling profile: {duration: seconds, interval_ms}"""
+    if not config_loader.get_bool('advanced', 'profiler', 'enabled', default=True):
+        return jsonify({'success': False, 'error': 'Profiler is disabled'}), 403
+
+    data = request.get_json(silent=True) or {}
+    try:
+        duration = float(data.get('duration', 30))
+        interval_ms = float(data['interval_ms']) if data.get('interval_ms') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Invalid duration or interval'}), 400
+
+    username = getattr(request, 'user', {}).get('username', 'admin')
+    started, message = profiler.start(duration, interval_ms / 1000 if interval_ms else None, requested_by=username)
+    if not started:
+        return jsonify({'success': False, 'error': message}), 409
+    security_logger.info(f"PROFILER_ACTION: started | Admin: {username} | Duration: {duration}s | IP: {get_real_ip()}")
+    return jsonify(dict(profiler.status(), success=True, message=message))
+
+@app.route('/api/profiler/stop', methods=['POST'])
+@limiter.limit("10 per minute")
+@require_admin_auth
+def stop_profiler():
+    """Finish the running profile early (the samples so far are kept)"""
+    return jsonify({'success': profiler.stop()})
+
+@app.route('/api/profiler/status', methods=['GET'])
+@limiter.limit("60 per minute")
+@require_admin_auth
+def get_profiler_status():
+    """Running profile progress and the last finished profile's summary"""
+    return jsonify(dict(profiler.status(), success=True))
+
+@app.route('/api/profiler/profile', methods=['GET'])
+@limiter.limit("10 per minute")
+@require_admin_auth
+def download_profile():
+    """Last finished profile as collapsed stacks (flamegraph.pl / speedscope input)"""
+    collapsed = profiler.collapsed()
+    if collapsed is None:
+        return jsonify({'success': False, 'error': 'No profile recorded yet'}), 404
+    started = datetime.fromtimestamp(profiler.status()['last']['started_at'])
+    return Response(collapsed, content_type='text/plain; charset=utf-8', headers={
+        'Content-Disposition': f"attachment; filename=ezy-profile-{started.strftime('%Y%m%d-%H%M%S')}.folded"
+    })
+
 @app.route('/api/history', methods=['GET'])
 @limiter.limit("60 per minute")
 @require_auth
@@ -984,85 +1140,65 @@ def get_history():
         'count': len(translations_history)
     })
 
+SUBTITLE_LANG_PATTERN = re.compile(r'^[A-Za-z]{2,3}(-[A-Za-z0-9]{2,8}){0,2}$')
+
+def translated_track(items, lang):
+    """Items with their caption text replaced by cached translations into lang"""
+    translation_service = get_translation_service()
+    total = missing = 0
+    for item in items:
+        total += 1
+        translated = translation_service.cached_translation(item.get('corrected', ''), lang)
+        if translated is None:
+            missing += 1
+            yield item
+        else:
+            yield dict(item, corrected=translated)
+    if missing:
+        logger.info(f"📝 Subtitle track '{lang}': {missing}/{total} lines not in the translation cache, kept source text")
+
 @app.route('/api/export/<export_format>', methods=['GET'])
 @limiter.limit("10 per minute")
 @require_auth
 @check_client_access
 def export_translations(export_format):
-    """Export translations with validation"""
-    allowed_formats = ['json', 'txt', 'csv', 'srt']
-
-    if export_format not in allowed_formats:
-        return jsonify({'error': f'Unsupported format'}), 400
-
-    # Limit export size
-    max_export = 5000
-    export_data = translations_history[-max_export:]
-
-    if export_format == 'json':
-        import json as json_module
-        output = json_module.dumps({'translations': export_data}, indent=2, ensure_ascii=False)
-        return output, 200, {
-            'Content-Type': 'application/json; charset=utf-8',
-            'Content-Disposition': 'attachment; filename="transcriptions.json"'
-        }
-
-    elif export_format == 'txt':
-        output = f"EzySpeechTranslate Export\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        output += "=" * 60 + "\n\n"
-
-        for item in export_data:
-            output += f"[{item['id']}] {item['timestamp']}\n"
-            output += f"Original: {sanitize_text(item['original'], 500)}\n"
-            output += f"Corrected: {sanitize_text(item['corrected'], 500)}\n"
-            output += "-" * 60 + "\n\n"
-
-        # Add UTF-8 BOM to ensure Windows/Excel correctly identifies encoding
-        output = '\ufeff' + output
-        return output, 200, {
-            'Content-Type': 'text/plain; charset=utf-8',
-            'Content-Disposition': 'attachment; filename="transcriptions.txt"'
-        }
-
-    elif export_format == 'csv':
-        output = "ID,Timestamp,Original,Corrected,Is_Corrected\n"
-
-        for item in export_data:
-            row = [
-                str(item['id']),
-                item['timestamp'],
-                f'"{sanitize_text(item["original"], 500).replace(chr(34), chr(34)*2)}"',
-                f'"{sanitize_text(item["corrected"], 500).replace(chr(34), chr(34)*2)}"',
-                'Yes' if item['is_corrected'] else 'No'
-            ]
-            output += ','.join(row) + '\n'
-
-        # Add UTF-8 BOM to ensure Windows/Excel correctly identifies encoding
-        output = '\ufeff' + output
-        return output, 200, {
-            'Content-Type': 'text/csv; charset=utf-8',
-            'Content-Disposition': 'attachment; filename="transcriptions.csv"'
-        }
+    """
+    Export translations, streamed
 
-    elif export_format == 'srt':
-        output = ""
-        for i, item in enumerate(export_data, 1):
-            start_seconds = (i - 1) * 5
-            end_seconds = i * 5
+    Covers the full archive when database.enabled, otherwise the in-memory
+    history. Gzipped on the fly when the client accepts it.
 
-            start_time = f"00:{start_seconds // 60:02d}:{start_seconds % 60:02d},000"
-            end_time = f"00:{end_seconds // 60:02d}:{end_seconds % 60:02d},000"
+    Query parameters:
+        lang (str): srt/vtt only - subtitle track in this language, taken from
+                    the translation cache (uncached lines keep the source text)
+    """
+    if export_format not in transcript_export.FORMATS:
+        return jsonify({'error': f'Unsupported format'}), 400
 
-            output += f"{i}\n"
-            output += f"{start_time} --> {end_time}\n"
-            output += f"{sanitize_text(item['corrected'], 500)}\n\n"
+    lang = request.args.get('lang', '').strip()
+    if lang and not SUBTITLE_LANG_PATTERN.match(lang):
+        return jsonify({'error': 'Invalid language'}), 400
+    if export_format not in transcript_export.SUBTITLE_FORMATS:
+        lang = ''
+
+    export = transcript_export.FORMATS[export_format]
+    # Snapshot the list so a concurrent trim/clear doesn't change what we iterate
+    items = archive.iter_items() if archive is not None else list(translations_history)
+    filename = export.filename
+    if lang:
+        items = translated_track(items, lang)
+        filename = filename.replace('.', f'.{lang}.', 1)
+    body = transcript_export.export_stream(export_format, items, clean=sanitize_text, language=lang or None)
+
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Vary': 'Accept-Encoding'
+    }
+    if 'gzip' in static_assets.parse_accept_encoding(request.headers.get('Accept-Encoding', '')):
+        body = transcript_export.gzip_stream(body)
+        headers['Content-Encoding'] = 'gzip'
 
-        # Add UTF-8 BOM to ensure Windows/Excel correctly identifies encoding
-        output = '\ufeff' + output
-        return output, 200, {
-            'Content-Type': 'text/plain; charset=utf-8',
-            'Content-Disposition': 'attachment; filename="transcriptions.srt"'
-        }
+    return Response(stream_with_context(body), content_type=export.content_type, headers=headers)
 
 # ──────────────────────────────────────────
 # Translation API with Rate Limiting and Caching
@@ -1072,13 +1208,19 @@ try:
 except ImportError:
     from app.translation_service import get_translation_service
 
+try:
+    from .tts_voices import VoiceCatalog
+    from .tts_service import EdgeTTSService, MockTTSService, MOCK_VOICES, SynthesisCache, AUDIO_PROFILES, DEFAULT_PROFILE as DEFAULT_AUDIO_PROFILE
+    from .rate_limiting import SlidingWindowLimiter
+except ImportError:
+    from app.tts_voices import VoiceCatalog
+    from app.tts_service import EdgeTTSService, MockTTSService, MOCK_VOICES, SynthesisCache, AUDIO_PROFILES, DEFAULT_PROFILE as DEFAULT_AUDIO_PROFILE
+    from app.rate_limiting import SlidingWindowLimiter
+
 # Import Edge TTS for cloud-based text-to-speech
 try:
     import edge_tts
     EDGE_TTS_AVAILABLE = True
-    # Cache for Edge TTS voices (will be populated on demand)
-    EDGE_TTS_VOICES_CACHE = None
-    EDGE_TTS_VOICES_CACHE_TIME = None
     
     # All valid Edge TTS language codes extracted from edge-tts library
     # These are the base language codes that can be used for voice selection
@@ -1103,43 +1245,97 @@ try:
         'zh-CN-liaoning', 'zh-CN-shaanxi'
     }
     
-    # Synthesis request cache (hash -> audio_data) to avoid duplicate requests
-    SYNTHESIS_REQUEST_CACHE = {}
-    SYNTHESIS_CACHE_TIME = {}
-    SYNTHESIS_CACHE_TTL = 3600  # 1 hour cache for identical requests
-    
-    # Client rate limiting tracking
-    CLIENT_SYNTHESIS_REQUESTS = defaultdict(list)  # client_id -> [(timestamp, request_hash), ...]
-    CLIENT_SYNTHESIS_LIMIT = 100  # Max synthesis requests per client per hour
-    
 except ImportError:
     logger.warning("edge-tts not installed. Cloud TTS will not be available. Install with: pip install edge-tts")
     EDGE_TTS_AVAILABLE = False
-    EDGE_TTS_VOICES_CACHE = None
-    EDGE_TTS_VOICES_CACHE_TIME = None
     VALID_EDGE_TTS_LANGS = set()
-    SYNTHESIS_REQUEST_CACHE = {}
-    SYNTHESIS_CACHE_TIME = {}
-    CLIENT_SYNTHESIS_REQUESTS = defaultdict(list)
 
 # ✅ Ensure all TTS-related globals are defined (fail-safe)
 # This prevents AttributeError if Edge TTS import fails partially
 if 'EDGE_TTS_AVAILABLE' not in globals():
     EDGE_TTS_AVAILABLE = False
-if 'SYNTHESIS_REQUEST_CACHE' not in globals():
-    SYNTHESIS_REQUEST_CACHE = {}
-if 'SYNTHESIS_CACHE_TIME' not in globals():
-    SYNTHESIS_CACHE_TIME = {}
-if 'SYNTHESIS_CACHE_TTL' not in globals():
-    SYNTHESIS_CACHE_TTL = 3600
-if 'CLIENT_SYNTHESIS_REQUESTS' not in globals():
-    CLIENT_SYNTHESIS_REQUESTS = defaultdict(list)
-if 'EDGE_TTS_VOICES_CACHE' not in globals():
-    EDGE_TTS_VOICES_CACHE = None
-if 'EDGE_TTS_VOICES_CACHE_TIME' not in globals():
-    EDGE_TTS_VOICES_CACHE_TIME = None
-
-logger.info(f"🔍 Edge TTS initialized - EDGE_TTS_AVAILABLE={EDGE_TTS_AVAILABLE}, Cache size: {len(SYNTHESIS_REQUEST_CACHE)} items")
+
+# Engines: 'mock' swaps the translation API / edge-tts for offline fakes (load tests).
+# Environment variables win over config so a harness can start the server without editing it.
+TRANSLATION_ENGINE = os.environ.get('EZY_TRANSLATION_ENGINE') or get_config('advanced', 'engines', 'translation', default='google')
+TTS_ENGINE = os.environ.get('EZY_TTS_ENGINE') or get_config('advanced', 'engines', 'tts', default='edge')
+get_translation_service(TRANSLATION_ENGINE)
+if TTS_ENGINE == 'mock':
+    logger.warning("🧪 TTS engine: mock (fake audio)")
+    EDGE_TTS_AVAILABLE = True
+    VALID_EDGE_TTS_LANGS = VALID_EDGE_TTS_LANGS | {voice['Locale'] for voice in MOCK_VOICES}
+
+# Per-client accounting: fixed-size sliding windows, idle clients reaped automatically
+CLIENT_SYNTHESIS_LIMIT = 100  # Max synthesis requests (cache misses) per client per hour
+synthesis_limiter = SlidingWindowLimiter(limit=CLIENT_SYNTHESIS_LIMIT, window_seconds=3600, buckets=12)
+CLIENT_TRANSLATION_ITEM_LIMIT = get_config('advanced', 'performance', 'translation_items_per_minute', default=300)
+translation_limiter = SlidingWindowLimiter(limit=CLIENT_TRANSLATION_ITEM_LIMIT, window_seconds=60, buckets=12)
+LATENCY_REPORTS_PER_MINUTE = 30  # latency_report events per socket (user.js flushes every 3 s)
+latency_report_limiter = SlidingWindowLimiter(limit=LATENCY_REPORTS_PER_MINUTE, window_seconds=60, buckets=6)
+
+# Base language -> first regional code, for O(1) fallback in validate_language_code()
+EDGE_TTS_BASE_LANGS = {}
+for _code in sorted(VALID_EDGE_TTS_LANGS):
+    EDGE_TTS_BASE_LANGS.setdefault(_code.split('-')[0], _code)
+
+
+def load_edge_tts_voices():
+    """Fetch the raw voice list through the edge-tts library API.
+
+    edge_tts.list_voices() is asyncio-based, so it runs in a native OS thread
+    (eventlet.tpool) where asyncio's unpatched select/socket work normally.
+    """
+    import asyncio
+    from eventlet import tpool
+    return tpool.execute(lambda: asyncio.run(edge_tts.list_voices()))
+
+
+# Voice catalog: persisted snapshot gives instant voices on boot, library refresh runs in background
+if TTS_ENGINE == 'mock':
+    voice_catalog = VoiceCatalog(loader=lambda: MOCK_VOICES, max_age_seconds=365 * 24 * 3600)
+    voice_catalog.refresh()
+else:
+    voice_catalog = VoiceCatalog(
+        loader=load_edge_tts_voices,
+        snapshot_path=os.path.join(BASE_DIR, 'data', 'edge_tts_voices.json'),
+        max_age_seconds=3600
+    )
+    if EDGE_TTS_AVAILABLE:
+        voice_catalog.load_snapshot()
+
+# Synthesis service: shared audio cache (1 hour TTL) and a bounded pool of CLI workers
+SYNTHESIS_CACHE_TTL = 3600
+tts_service = (MockTTSService if TTS_ENGINE == 'mock' else EdgeTTSService)(
+    cache=SynthesisCache(ttl_seconds=SYNTHESIS_CACHE_TTL, max_items=1000, max_bytes=1000 * 1024 * 1024),
+    max_concurrent=get_config('advanced', 'performance', 'tts_max_concurrent', default=4),
+    timeout=30
+)
+TTS_BATCH_MAX_ITEMS = 20
+
+logger.info(f"🔍 Edge TTS initialized - EDGE_TTS_AVAILABLE={EDGE_TTS_AVAILABLE}, Voices: {len(voice_catalog)}, Cache size: {len(tts_service.cache)} items")
+
+def check_client_translation_limit(item_count):
+    """Count translated items against the client's per-minute budget.
+
+    Returns a 429 response when over the limit, else None.
+    """
+    client_key = get_client_key()
+    is_allowed, current_count = translation_limiter.hit(client_key, cost=item_count)
+    if is_allowed:
+        return None
+
+    record_rate_violation(client_key)
+    retry_after = max(1, int(translation_limiter.retry_after(client_key) + 0.5))
+    logger.warning(f"⚠️ Client {client_key} exceeded translation limit "
+                   f"({current_count}+{item_count}/{CLIENT_TRANSLATION_ITEM_LIMIT} per minute)")
+    response = jsonify({
+        'success': False,
+        'error': f'Rate limit exceeded: {CLIENT_TRANSLATION_ITEM_LIMIT} items per minute',
+        'retry_after': retry_after
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
 
 @app.route('/api/translate', methods=['POST'])
 @limiter.limit("300 per minute")  # 5 requests per second per client (need headroom for bulk imports)
@@ -1186,6 +1382,10 @@ def translate_text():
             'error': 'Text too long (max 5000 characters)'
         }), 413
     
+    limit_response = check_client_translation_limit(1)
+    if limit_response:
+        return limit_response
+    
     try:
         # Get translation service instance
         translation_service = get_translation_service()
@@ -1260,6 +1460,11 @@ def translate_batch():
             'error': 'Batch too large (max 50 items)'
         }), 413
     
+    # Batches count per item, so they share the single-request budget
+    limit_response = check_client_translation_limit(len(texts))
+    if limit_response:
+        return limit_response
+    
     try:
         translation_service = get_translation_service()
         results = []
@@ -1317,107 +1522,11 @@ def clear_translation_cache():
 # Text-to-Speech API (Edge TTS - Cloud)
 # ──────────────────────────────────────────
 
-def fetch_edge_tts_voices_in_thread():
-    """Fetch Edge TTS voices via edge-tts CLI in a background OS thread"""
-    global EDGE_TTS_VOICES_CACHE, EDGE_TTS_VOICES_CACHE_TIME
-
-    if not EDGE_TTS_AVAILABLE:
-        logger.warning("⚠️ Edge TTS not available, skipping voice fetch")
-        return []
-
-    try:
-        logger.info("⏳ Fetching Edge TTS voices via CLI...")
-
-        result = subprocess.run(
-            [sys.executable, '-m', 'edge_tts', '--list-voices'],
-            capture_output=True, text=True, timeout=60,
-            close_fds=True,
-            start_new_session=True
-        )
-
-        if result.returncode != 0:
-            logger.error(f"❌ edge-tts --list-voices failed (rc={result.returncode}): {result.stderr}")
-            EDGE_TTS_VOICES_CACHE_TIME = None
-            return []
-
-        if not result.stdout or not result.stdout.strip():
-            logger.error("❌ edge-tts --list-voices returned empty output")
-            EDGE_TTS_VOICES_CACHE_TIME = None
-            return []
-
-        voices = []
-        current = {}
-        for line in result.stdout.splitlines():
-            line = line.strip()
-            if not line:
-                if current.get('ShortName'):
-                    voices.append(current)
-                current = {}
-            elif ':' in line:
-                key, _, val = line.partition(':')
-                key = key.strip()
-                val = val.strip()
-                if key == 'Name':
-                    current['ShortName'] = val
-                    current['FriendlyName'] = val
-                    # 从 Name 提取 Locale
-                    # zh-CN-XiaoxiaoNeural        → zh-CN
-                    # zh-CN-liaoning-XiaobeiNeural → zh-CN
-                    parts = val.split('-')
-                    if len(parts) >= 2:
-                        current['Locale'] = f"{parts[0]}-{parts[1]}"
-                elif key == 'Gender':
-                    current['Gender'] = val
-        # 处理最后一条（文件末尾无空行时）
-        if current.get('ShortName'):
-            voices.append(current)
-
-        if not voices:
-            logger.error("❌ No voices parsed from CLI output")
-            EDGE_TTS_VOICES_CACHE_TIME = None
-            return []
-
-        logger.info(f"✅ Cached {len(voices)} Edge TTS voices via CLI")
-        if voices:
-            logger.info(f"🔍 First voice sample: {voices[0]}")
-        EDGE_TTS_VOICES_CACHE = voices
-        EDGE_TTS_VOICES_CACHE_TIME = datetime.now()
-        return voices
-
-    except subprocess.TimeoutExpired:
-        logger.error("❌ edge-tts --list-voices timeout (60s)")
-        EDGE_TTS_VOICES_CACHE_TIME = None
-        return []
-    except Exception as e:
-        logger.error(f"❌ fetch voices error: {e}", exc_info=True)
-        EDGE_TTS_VOICES_CACHE_TIME = None
-        return []
-
-
 def get_cached_edge_tts_voices():
-    """Get voices from cache, trigger background fetch if needed"""
-    global EDGE_TTS_VOICES_CACHE, EDGE_TTS_VOICES_CACHE_TIME
-
+    """Get voices from the catalog, triggering a background refresh if stale"""
     if not EDGE_TTS_AVAILABLE:
         return []
-
-    # 有缓存且未过期（1小时）
-    if EDGE_TTS_VOICES_CACHE is not None:
-        if EDGE_TTS_VOICES_CACHE_TIME and (datetime.now() - EDGE_TTS_VOICES_CACHE_TIME).seconds < 3600:
-            return EDGE_TTS_VOICES_CACHE
-
-    # 首次：设占位时间防止并发重复触发，然后后台拉取
-    if EDGE_TTS_VOICES_CACHE_TIME is None:
-        EDGE_TTS_VOICES_CACHE_TIME = datetime.now()
-        logger.info("📥 Fetching Edge TTS voices in background OS thread...")
-        import threading
-        threading.Thread(
-            target=fetch_edge_tts_voices_in_thread,
-            daemon=True,
-            name="tts-voice-fetch"
-        ).start()
-
-    return EDGE_TTS_VOICES_CACHE or []
+    return voice_catalog.voices()
 
 
 # ──────────────────────────────────────────
@@ -1430,58 +1539,97 @@ def validate_language_code(lang_code):
         return False, "Invalid language code format"
 
     if lang_code not in VALID_EDGE_TTS_LANGS:
-        base_lang = lang_code.split('-')[0]
-        matching = [l for l in VALID_EDGE_TTS_LANGS if l.startswith(base_lang + '-')]
-        if matching:
-            return True, f"Language code '{lang_code}' not found. Using '{matching[0]}' instead."
+        fallback = EDGE_TTS_BASE_LANGS.get(lang_code.split('-')[0])
+        if fallback:
+            return True, f"Language code '{lang_code}' not found. Using '{fallback}' instead."
         return False, f"Unsupported language code: '{lang_code}'."
 
     return True, None
 
 
-def validate_voice_name(voice_name, available_voices):
+VOICE_NAME_PATTERN = re.compile(r'^[a-z]{2}-[A-Z]{2}(-[a-zA-Z0-9]+)*Neural$')
+
+
+def validate_voice_name(voice_name):
     """Validate if the voice name is available and safe."""
     if not voice_name or not isinstance(voice_name, str):
         return True, None, None
 
-    if not re.match(r'^[a-z]{2}-[A-Z]{2}(-[a-zA-Z0-9]+)*Neural$', voice_name):
+    if not VOICE_NAME_PATTERN.match(voice_name):
         return False, f"Invalid voice format: {voice_name}", None
 
-    if available_voices:
-        voice_exists = any(v.get('ShortName') == voice_name for v in available_voices)
-        if not voice_exists:
-            return False, f"Voice '{voice_name}' is not available", None
+    if voice_catalog.is_loaded() and voice_catalog.get(voice_name) is None:
+        return False, f"Voice '{voice_name}' is not available", None
 
     return True, None, voice_name
 
 
-def check_client_synthesis_limit(client_id, request_hash):
+def check_client_synthesis_limit(client_id):
     """Check if client has exceeded synthesis rate limit (100 per hour)."""
-    global CLIENT_SYNTHESIS_REQUESTS
+    is_allowed, current_count = synthesis_limiter.hit(client_id)
+    if not is_allowed:
+        logger.warning(f"⚠️ Client {client_id} exceeded synthesis limit ({current_count}/{CLIENT_SYNTHESIS_LIMIT})")
+        return False, f"Rate limit exceeded: {current_count}/{CLIENT_SYNTHESIS_LIMIT} per hour", current_count
 
-    current_time = time.time()
-    one_hour_ago = current_time - 3600
+    return True, None, current_count
 
-    if client_id in CLIENT_SYNTHESIS_REQUESTS:
-        CLIENT_SYNTHESIS_REQUESTS[client_id] = [
-            (ts, rh) for ts, rh in CLIENT_SYNTHESIS_REQUESTS[client_id]
-            if ts > one_hour_ago
-        ]
 
-    current_count = len(CLIENT_SYNTHESIS_REQUESTS[client_id])
+def resolve_tts_voice(lang, voice):
+    """Validate lang/voice and pick the voice to synthesize with.
 
-    if current_count >= CLIENT_SYNTHESIS_LIMIT:
-        logger.warning(f"⚠️ Client {client_id} exceeded synthesis limit ({current_count}/{CLIENT_SYNTHESIS_LIMIT})")
-        return False, f"Rate limit exceeded: {current_count}/{CLIENT_SYNTHESIS_LIMIT} per hour", current_count
+    Returns:
+        (voice, error, status) - voice is None when error is set
+    """
+    is_valid_lang, lang_error = validate_language_code(lang)
+    if not is_valid_lang:
+        return None, lang_error, 400
+
+    is_valid_voice, voice_error, validated_voice = validate_voice_name(voice)
+    if not is_valid_voice:
+        return None, voice_error, 400
+
+    # 选 voice：优先用请求指定的，否则找该语言第一个，找不到就报错
+    if not validated_voice:
+        if not voice_catalog.is_loaded():
+            get_cached_edge_tts_voices()  # kick off a background load
+            return None, 'Voices not yet loaded, please retry in a moment', 503
+
+        # 宽松匹配，例如 zh 匹配 zh-CN
+        validated_voice = voice_catalog.default_voice(lang)
+        if not validated_voice:
+            logger.error(f"No voice for lang={lang}, available locales sample: {list(voice_catalog.index.locales[:20])}")
+            return None, f'No voices available for language: {lang}', 400
+        logger.debug(f"Using default voice for {lang}: {validated_voice}")
+
+    return validated_voice, None, 200
 
-    CLIENT_SYNTHESIS_REQUESTS[client_id].append((current_time, request_hash))
-    return True, None, current_count + 1
+
+def get_tts_client_id():
+    """Per-session identifier used for synthesis rate accounting"""
+    session_info = getattr(request, 'session_info', {})
+    sid = session_info.get('sid') or request.client_id or get_remote_address()
+    return f"tts_{sid}"
 
 
-def get_synthesis_cache_key(text, voice):
-    """Generate a stable cache key for synthesis requests."""
-    cache_input = f"{text}|{voice or 'default'}"
-    return hashlib.sha256(cache_input.encode()).hexdigest()
+def tts_audio_response(audio_data, from_cache, profile=DEFAULT_AUDIO_PROFILE):
+    """Build the audio response for a single synthesis"""
+    audio_profile = AUDIO_PROFILES[profile]
+    return Response(
+        audio_data,
+        mimetype=audio_profile.mimetype,
+        status=200,
+        headers={
+            'Content-Type': audio_profile.mimetype,
+            'Content-Length': str(len(audio_data)),
+            'Content-Disposition': f'inline; filename="speech.{audio_profile.extension}"',
+            'X-TTS-Profile': profile,
+            'Cache-Control': 'no-cache, no-store, must-revalidate',
+            'Pragma': 'no-cache',
+            'Expires': '0',
+            'X-Cache': 'HIT' if from_cache else 'MISS',
+            'X-Content-Type-Options': 'nosniff'
+        }
+    )
 
 
 @app.route('/api/tts/synthesize', methods=['POST'])
@@ -1498,13 +1646,13 @@ def synthesize_tts():
     except Exception:
         return jsonify({'success': False, 'error': 'Invalid JSON'}), 400
 
-    session_info = getattr(request, 'session_info', {})
-    sid = session_info.get('sid') or request.client_id or get_remote_address()
-    client_id = f"tts_{sid}"
+    client_id = get_tts_client_id()
 
     text = sanitize_text(data.get('text', ''), max_length=5000)
     lang = sanitize_text(data.get('lang', 'en-US'), max_length=20)
     voice = sanitize_text(data.get('voice', ''), max_length=100)
+    # Unknown/unavailable profiles fall back to MP3 (see X-TTS-Profile response header)
+    profile = tts_service.resolve_profile(data.get('profile'))
 
     if not text:
         return jsonify({'success': False, 'error': 'Text is required'}), 400
@@ -1512,136 +1660,139 @@ def synthesize_tts():
     if len(text) > 5000:
         return jsonify({'success': False, 'error': 'Text too long (max 5000 chars)'}), 400
 
-    is_valid_lang, lang_error = validate_language_code(lang)
-    if not is_valid_lang:
-        return jsonify({'success': False, 'error': lang_error}), 400
-
-    available_voices = get_cached_edge_tts_voices()
-    is_valid_voice, voice_error, validated_voice = validate_voice_name(voice, available_voices)
-    if not is_valid_voice:
-        return jsonify({'success': False, 'error': voice_error}), 400
-
-    # 选 voice：优先用请求指定的，否则找该语言第一个，找不到就报错
-    if not validated_voice:
-        if available_voices:
-            lang_voices = [v for v in available_voices if v.get('Locale', '') == lang]
-            if not lang_voices:
-                # 宽松匹配，例如 zh 匹配 zh-CN
-                base = lang.split('-')[0]
-                lang_voices = [v for v in available_voices if v.get('Locale', '').startswith(base + '-')]
-            if lang_voices:
-                validated_voice = lang_voices[0].get('ShortName')
-                logger.info(f"Using default voice for {lang}: {validated_voice}")
-            else:
-                available_locales = list(set(v.get('Locale', '') for v in available_voices[:20]))
-                logger.error(f"No voice for lang={lang}, available locales sample: {available_locales}")
-                return jsonify({'success': False, 'error': f'No voices available for language: {lang}'}), 400
-        else:
-            return jsonify({'success': False, 'error': 'Voices not yet loaded, please retry in a moment'}), 503
+    validated_voice, voice_error, status = resolve_tts_voice(lang, voice)
+    if voice_error:
+        return jsonify({'success': False, 'error': voice_error}), status
 
     # 检查缓存
-    cache_key = get_synthesis_cache_key(text, validated_voice)
-    if cache_key in SYNTHESIS_REQUEST_CACHE:
-        cache_time = SYNTHESIS_CACHE_TIME.get(cache_key, 0)
-        if time.time() - cache_time < SYNTHESIS_CACHE_TTL:
-            logger.info(f"🔄 Cache hit (client: {client_id})")
-            audio_data = SYNTHESIS_REQUEST_CACHE[cache_key]
-            return Response(
-                audio_data,
-                mimetype='audio/mpeg',
-                status=200,
-                headers={
-                    'Content-Type': 'audio/mpeg',
-                    'Content-Length': str(len(audio_data)),
-                    'Content-Disposition': 'inline; filename="speech.mp3"',
-                    'Cache-Control': 'no-cache, no-store, must-revalidate',
-                    'Pragma': 'no-cache',
-                    'Expires': '0',
-                    'X-Cache': 'HIT',
-                    'X-Content-Type-Options': 'nosniff'
-                }
-            )
+    audio_data = tts_service.cached(text, validated_voice, profile)
+    if audio_data is not None:
+        logger.debug("🔄 Cache hit (client: %s)", client_id, extra={'event': 'tts_cache_hit'})
+        return tts_audio_response(audio_data, from_cache=True, profile=profile)
 
-    is_allowed, rate_limit_error, request_count = check_client_synthesis_limit(client_id, cache_key)
+    is_allowed, rate_limit_error, request_count = check_client_synthesis_limit(client_id)
     if not is_allowed:
         return jsonify({'success': False, 'error': rate_limit_error}), 429
 
-    # 合成：用 CLI 写到临时文件，完全绕开 eventlet/asyncio 冲突
-    try:
-        logger.info(f"🔄 Synthesizing via CLI: len={len(text)}, voice={validated_voice}")
+    result = tts_service.synthesize(text, validated_voice, profile)
+    if not result.success:
+        return jsonify({'success': False, 'error': result.error}), result.status
 
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
-            tmp_path = f.name
+    return tts_audio_response(result.audio, from_cache=result.from_cache, profile=result.profile)
 
-        try:
-            result = subprocess.run(
-                [
-                    sys.executable, '-m', 'edge_tts',
-                    '--voice', validated_voice,
-                    '--text', text,
-                    '--write-media', tmp_path
-                ],
-                capture_output=True, text=True, timeout=30,
-                close_fds=True,
-                start_new_session=True
-            )
 
-            if result.returncode != 0:
-                logger.error(f"❌ edge-tts synthesis failed (rc={result.returncode}):\n{result.stderr}")
-                return jsonify({'success': False, 'error': 'Audio synthesis failed'}), 500
+def encode_tts_batch_part(meta, audio_data=b''):
+    """Encode one batch part: [u32 header length][JSON header][u32 audio length][audio]"""
+    header = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+    return b''.join((
+        len(header).to_bytes(4, 'big'), header,
+        len(audio_data).to_bytes(4, 'big'), audio_data
+    ))
 
-            with open(tmp_path, 'rb') as f:
-                audio_data = f.read()
 
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except Exception:
-                pass
+@app.route('/api/tts/synthesize/batch', methods=['POST'])
+@limiter.limit("60 per minute")
+@require_api_token
+@check_client_access
+def synthesize_tts_batch():
+    """
+    Synthesize several segments in one request
 
-    except subprocess.TimeoutExpired:
-        logger.error("❌ TTS synthesis timeout (30s)")
-        return jsonify({'success': False, 'error': 'Audio synthesis timeout'}), 503
-    except Exception as e:
-        logger.error(f"❌ Synthesis error: {str(e)[:300]}")
-        return jsonify({'success': False, 'error': 'Audio synthesis failed'}), 500
+    Request:
+        {
+            "items": [{"text": "...", "lang": "zh-CN", "voice": "..."}, ...],
+            "lang": "zh-CN",   # default for items without lang
+            "voice": "...",    # default for items without voice
+            "profile": "opus"  # output profile for all items (default mp3)
+        }
+
+    Response (application/vnd.ezyspeech.tts-batch), one part per item in request order:
+        [u32 big-endian header length][JSON header][u32 big-endian audio length][audio bytes]
+
+        header: {"index": 0, "success": true, "status": 200, "cache": "HIT",
+                 "voice": "...", "profile": "mp3", "content_type": "audio/mpeg", "error": null}
 
-    if not audio_data or len(audio_data) == 0:
-        logger.error("❌ TTS synthesis returned empty audio")
-        return jsonify({'success': False, 'error': 'Audio synthesis failed - empty output'}), 500
+    Misses are synthesized concurrently under the TTS pool limit; parts are
+    streamed as soon as every earlier part is ready.
+    """
+    if not EDGE_TTS_AVAILABLE:
+        return jsonify({'success': False, 'error': 'Edge TTS not available'}), 503
+
+    try:
+        data = request.get_json() or {}
+    except Exception:
+        return jsonify({'success': False, 'error': 'Invalid JSON'}), 400
 
-    logger.info(f"✅ Synthesized: {len(audio_data)} bytes, voice={validated_voice}")
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'error': 'Invalid request: expected items (list)'}), 400
+
+    if len(items) > TTS_BATCH_MAX_ITEMS:
+        return jsonify({'success': False, 'error': f'Batch too large (max {TTS_BATCH_MAX_ITEMS} items)'}), 413
+
+    client_id = get_tts_client_id()
+    default_lang = data.get('lang', 'en-US')
+    default_voice = data.get('voice', '')
+    profile = tts_service.resolve_profile(data.get('profile'))
+
+    # Validate every item up front; only valid items go to the synthesis pool
+    parts = []      # index -> (meta, None) for failures, or (meta, position in jobs)
+    jobs = []       # (text, voice) to synthesize
+    for index, item in enumerate(items):
+        item = item if isinstance(item, dict) else {}
+        text = sanitize_text(item.get('text', ''), max_length=5000)
+        lang = sanitize_text(item.get('lang') or default_lang, max_length=20)
+        voice = sanitize_text(item.get('voice') or default_voice or '', max_length=100)
+        meta = {'index': index, 'success': False, 'status': 400, 'cache': None, 'voice': None,
+                'profile': profile, 'content_type': AUDIO_PROFILES[profile].mimetype, 'error': None}
+
+        if not text:
+            meta['error'] = 'Text is required'
+            parts.append((meta, None))
+            continue
+
+        validated_voice, voice_error, status = resolve_tts_voice(lang, voice)
+        if voice_error:
+            meta.update(error=voice_error, status=status)
+            parts.append((meta, None))
+            continue
+
+        meta['voice'] = validated_voice
+        if tts_service.cached(text, validated_voice, profile) is None:
+            # Only misses count against the per-client synthesis limit (same as single requests)
+            is_allowed, rate_limit_error, _ = check_client_synthesis_limit(client_id)
+            if not is_allowed:
+                meta.update(error=rate_limit_error, status=429)
+                parts.append((meta, None))
+                continue
 
-    # 写缓存
-    SYNTHESIS_REQUEST_CACHE[cache_key] = audio_data
-    SYNTHESIS_CACHE_TIME[cache_key] = time.time()
-    cache_size_mb = sum(len(v) for v in SYNTHESIS_REQUEST_CACHE.values()) / (1024 * 1024)
-    logger.info(f"💾 Cache: {len(SYNTHESIS_REQUEST_CACHE)} items, {cache_size_mb:.2f}MB")
+        parts.append((meta, len(jobs)))
+        jobs.append((text, validated_voice))
 
-    # 超限清理
-    if cache_size_mb > 1000:
-        oldest_key = min(SYNTHESIS_CACHE_TIME.keys(), key=lambda k: SYNTHESIS_CACHE_TIME[k])
-        del SYNTHESIS_REQUEST_CACHE[oldest_key]
-        del SYNTHESIS_CACHE_TIME[oldest_key]
+    results = tts_service.synthesize_many(jobs, profile)
+    logger.info("🔄 TTS batch: %d items, %d to synthesize (client: %s)", len(items), len(jobs), client_id,
+                extra={'event': 'tts_batch'})
 
-    if len(SYNTHESIS_REQUEST_CACHE) > 1000:
-        oldest_key = min(SYNTHESIS_CACHE_TIME.keys(), key=lambda k: SYNTHESIS_CACHE_TIME[k])
-        del SYNTHESIS_REQUEST_CACHE[oldest_key]
-        del SYNTHESIS_CACHE_TIME[oldest_key]
+    def generate():
+        for meta, job_index in parts:
+            if job_index is None:
+                yield encode_tts_batch_part(meta)
+                continue
+            result = next(results)
+            meta.update(success=result.success, status=result.status, error=result.error,
+                        cache='HIT' if result.from_cache else 'MISS',
+                        profile=result.profile, content_type=result.mimetype)
+            yield encode_tts_batch_part(meta, result.audio or b'')
 
     return Response(
-        audio_data,
-        mimetype='audio/mpeg',
+        generate(),
+        mimetype='application/vnd.ezyspeech.tts-batch',
         status=200,
         headers={
-            'Content-Type': 'audio/mpeg',
-            'Content-Length': str(len(audio_data)),
-            'Content-Disposition': 'inline; filename="speech.mp3"',
             'Cache-Control': 'no-cache, no-store, must-revalidate',
             'Pragma': 'no-cache',
             'Expires': '0',
-            'X-Cache': 'MISS',
+            'X-TTS-Batch-Count': str(len(parts)),
             'X-Content-Type-Options': 'nosniff'
         }
     )
@@ -1650,6 +1801,7 @@ def synthesize_tts():
 @app.route('/api/tts/voices', methods=['GET'])
 @limiter.limit("30 per minute")
 @check_client_access
+@cached_response('lang', version=voices_version)
 def get_tts_voices():
     """Get available TTS voices from Edge TTS"""
     if not EDGE_TTS_AVAILABLE:
@@ -1679,7 +1831,7 @@ def get_tts_voices():
         logger.info(f"Retrieved {len(voices)} voices from cache")
 
         if lang_filter:
-            voices = [v for v in voices if v.get('Locale', '').startswith(lang_filter)]
+            voices = voice_catalog.filter_prefix(lang_filter)
             logger.info(f"After language filter ({lang_filter}): {len(voices)} voices")
 
         formatted_voices = []
@@ -1699,7 +1851,8 @@ def get_tts_voices():
         return jsonify({
             'success': True,
             'edge_voices': formatted_voices,
-            'edge_tts_available': True
+            'edge_tts_available': True,
+            'audio_profiles': tts_service.profiles()
         })
 
     except Exception as e:
@@ -1719,16 +1872,11 @@ def get_supported_languages():
     """Get all supported language codes for Edge TTS."""
     try:
         voices = get_cached_edge_tts_voices()
-
-        languages = set()
-        for voice in voices:
-            locale = voice.get('Locale', '')
-            if locale:
-                languages.add(locale)
+        languages = voice_catalog.index.locales if voices else ()
 
         return jsonify({
             'success': True,
-            'supported_languages': sorted(list(languages)),
+            'supported_languages': list(languages),
             'total_languages': len(languages),
             'total_voices': len(voices) if voices else 0,
             'edge_tts_available': EDGE_TTS_AVAILABLE
@@ -1744,28 +1892,18 @@ def get_supported_languages():
 def get_tts_cache_stats():
     """Get TTS synthesis cache statistics"""
     try:
-        if not isinstance(SYNTHESIS_REQUEST_CACHE, dict):
-            return jsonify({
-                'success': True,
-                'cache_items': 0,
-                'cache_size_mb': 0,
-                'cache_ttl_seconds': SYNTHESIS_CACHE_TTL,
-                'max_cache_size_mb': 1000,
-                'max_cache_items': 1000,
-                'message': 'TTS cache not initialized'
-            })
-
-        cache_size_bytes = sum(len(v) for v in SYNTHESIS_REQUEST_CACHE.values())
-        cache_size_mb = cache_size_bytes / (1024 * 1024)
+        stats = tts_service.stats()
+        cache_size_mb = stats['cache_size_mb']
 
         return jsonify({
             'success': True,
-            'cache_items': len(SYNTHESIS_REQUEST_CACHE),
+            'cache_items': stats['cache_items'],
             'cache_size_mb': round(cache_size_mb, 2),
-            'cache_ttl_seconds': SYNTHESIS_CACHE_TTL,
-            'max_cache_size_mb': 1000,
-            'max_cache_items': 1000,
-            'message': f'TTS cache using {cache_size_mb:.2f}MB with {len(SYNTHESIS_REQUEST_CACHE)} items'
+            'cache_ttl_seconds': stats['cache_ttl_seconds'],
+            'max_cache_size_mb': round(stats['max_cache_size_mb']),
+            'max_cache_items': stats['max_cache_items'],
+            'audio_profiles': stats['profiles'],
+            'message': f"TTS cache using {cache_size_mb:.2f}MB with {stats['cache_items']} items"
         })
 
     except Exception as e:
@@ -1783,16 +1921,10 @@ def get_tts_cache_stats():
 def clear_tts_cache():
     """Clear all TTS synthesis cache"""
     try:
-        global SYNTHESIS_REQUEST_CACHE, SYNTHESIS_CACHE_TIME
-
-        cleared_items = len(SYNTHESIS_REQUEST_CACHE)
-        freed_bytes = sum(len(v) for v in SYNTHESIS_REQUEST_CACHE.values())
+        cleared_items, freed_bytes = tts_service.cache.clear()
         freed_mb = freed_bytes / (1024 * 1024)
         source_ip = get_real_ip()
 
-        SYNTHESIS_REQUEST_CACHE.clear()
-        SYNTHESIS_CACHE_TIME.clear()
-
         logger.info(f"🗑️ TTS cache cleared: {cleared_items} items, {freed_mb:.2f}MB freed from {source_ip}")
         security_logger.info(f"TTS_ACTION: cache_cleared | Items: {cleared_items} | Freed: {freed_mb:.2f}MB | IP: {source_ip}")
 
@@ -1809,8 +1941,17 @@ def clear_tts_cache():
 # ──────────────────────────────────────────
 # WebSocket Events with Security
 # ──────────────────────────────────────────
+# Listener connections are admitted at a steady rate; a surge beyond the burst waits in a
+# short queue, then gets refused with a retry_after hint
+connection_admission = admission_control.AdmissionController(
+    rate_per_second=get_config('advanced', 'performance', 'connect_rate_per_second', default=50),
+    burst=get_config('advanced', 'performance', 'connect_burst', default=100),
+    max_wait_seconds=get_config('advanced', 'performance', 'connect_queue_seconds', default=5),
+    stagger_seconds=get_config('advanced', 'performance', 'history_stagger_seconds', default=3)
+)
+
 @socketio.on('connect')
-def handle_connect():
+def handle_connect(auth=None):
     """Handle client connection with validation"""
     # Priority: Get client_id from query params (sent by client), then cookies
     client_id = request.args.get('client_id')
@@ -1829,13 +1970,29 @@ def handle_connect():
     client_key = f"client:{client_id}"
     client_ip = get_real_ip()
 
-    logger.info(f"Socket.IO connect attempt from {client_ip} (Client: {client_id}, Type: {client_type}, SID: {request.sid})")
+    logger.info("Socket.IO connect attempt from %s (Client: %s, Type: %s, SID: %s)", client_ip, client_id, client_type,
+                request.sid, extra={'event': 'socket_connect'})
 
     if is_client_blocked(client_key):
         security_logger.warning(f"Blocked client attempted WebSocket: {client_key}")
         logger.error(f"Connection rejected: Client {client_key} is blocked")
         return False
 
+    # Admission control - a verified admin skips it so the transcription stream never queues behind listeners
+    history_delay = 0.0
+    is_verified_admin = client_type == 'admin' and isinstance(auth, dict) and validate_jwt_token(auth.get('token'))
+    if not is_verified_admin:
+        admission = connection_admission.admit()
+        if not admission.admitted:
+            logger.warning(f"Connection refused under load: {client_key} (retry in {admission.retry_after}s)")
+            # Reaches the client as connect_error {message: 'server_busy', data: {retry_after}}
+            raise ConnectionRefusedError('server_busy', {'retry_after': admission.retry_after})
+        if admission.wait:
+            socketio.sleep(admission.wait)  # Yields to other greenlets while queued
+            if not socketio.server.manager.is_connected(request.sid, '/'):
+                return False  # Client gave up while queued
+        history_delay = admission.stagger
+
     # Only count user-type clients as listeners (not admin)
     if client_type == 'user':
         # If this client_key already has an old SID, evict it (handles page refresh)
@@ -1849,12 +2006,13 @@ def handle_connect():
         client_id_full = f"{client_key}:{request.sid}"
         connected_clients.add(client_id_full)
         listener_clients[client_key] = request.sid  # Only keep latest SID per user
-        logger.info(f"User client connected: {client_ip} (Client: {client_id}, SID: {request.sid}, Total listeners: {len(listener_clients)})")
+        logger.info("User client connected: %s (Client: %s, SID: %s, Total listeners: %d)", client_ip, client_id,
+                    request.sid, len(listener_clients), extra={'event': 'socket_connect'})
     elif client_type == 'admin':
         # Admin clients still need to be tracked, but not as listeners
         client_id_full = f"{client_key}:{request.sid}"
         connected_clients.add(client_id_full)
-        logger.info(f"Admin client connected: {client_ip} (Client: {client_id}, SID: {request.sid})")
+        logger.info("Admin client connected: %s (Client: %s, SID: %s)", client_ip, client_id, request.sid)
     
     # Store mapping for reliable cleanup on disconnect
     sid_to_client_key[request.sid] = (client_key, client_type)
@@ -1866,15 +2024,18 @@ def handle_connect():
     emit('ready', {
         'status': 'connected',
         'message': 'Use /api/translations to fetch paginated history',
-        'api_token': api_token
+        'api_token': api_token,
+        'history_delay_ms': int(history_delay * 1000),  # Stagger first history fetches during a surge
+        'trace_sample_rate': TRACE_SAMPLE_RATE  # Share of captions this listener reports latency for
     })
 
     return True
 
 @socketio.on('disconnect')
-def handle_disconnect(sid=None):
+def handle_disconnect(reason=None):
     """Handle client disconnection - find and clean up client info"""
-    sid_used = sid if sid is not None else request.sid
+    # python-socketio 5.12+ passes the disconnect reason, not the SID
+    sid_used = request.sid
     
     # Use stored mapping to find client_key and type reliably
     mapping = sid_to_client_key.pop(sid_used, None)
@@ -1888,25 +2049,23 @@ def handle_disconnect(sid=None):
             # (avoids removing a newer connection when a stale disconnect fires late)
             if listener_clients.get(client_key) == sid_used:
                 del listener_clients[client_key]
-            logger.info(f"User client disconnected: SID {sid_used} from {client_key} (Total listeners: {len(listener_clients)})")
+            logger.info("User client disconnected: SID %s from %s (Total listeners: %d)", sid_used, client_key,
+                        len(listener_clients), extra={'event': 'socket_disconnect'})
         else:
-            logger.info(f"Admin client disconnected: SID {sid_used} from {client_key}")
+            logger.info("Admin client disconnected: SID %s from %s", sid_used, client_key)
     else:
         logger.warning(f"Disconnect: Unknown client mapping for SID {sid_used}")
     
-    # Always try to remove from connected_clients
+    # The mapping gives the exact connected_clients key, no scan needed
     connected_clients.discard(sid_used)
-    for key in list(connected_clients):
-        if key.endswith(f":{sid_used}"):
-            connected_clients.discard(key)
-            break
+    if mapping:
+        connected_clients.discard(f"{mapping[0]}:{sid_used}")
     
     admin_sessions.pop(sid_used, None)
+    finish_bulk_import(sid_used)  # Items already ingested still need announcing
     
-    # Clean up API tokens associated with this SID
-    tokens_to_remove = [t for t, info in api_session_tokens.items() if info['sid'] == sid_used]
-    for token in tokens_to_remove:
-        del api_session_tokens[token]
+    # Clean up API tokens associated with this SID (sid -> tokens index)
+    api_session_tokens.revoke_sid(sid_used)
 
 @socketio.on('admin_connect')
 def handle_admin_connect(data):
@@ -1917,7 +2076,7 @@ def handle_admin_connect(data):
 
     token = data.get('token')
 
-    if not get_config('authentication', 'enabled', default=True):
+    if not AUTH_ENABLED:
         admin_sessions[request.sid] = 'admin'
         # Send translation history to admin
         emit('history', translations_history)
@@ -1963,6 +2122,8 @@ def handle_new_transcription(data):
     temp_id = data.get('temp_id')  # Temporary ID to link interim->final results
     
     if not is_final:
+        caption_clock.interim(temp_id)  # First sighting of this utterance = its subtitle start
+
         # Send interim result ONLY to listeners (non-admin users)
         # Emit to all listener SIDs (exclude admins naturally)
         interim_data = {
@@ -1975,7 +2136,7 @@ def handle_new_transcription(data):
         }
         # Broadcast to all non-admin clients
         socketio.emit('realtime_transcription', interim_data, skip_sid=[request.sid])
-        logger.info(f"[INTERIM] {len(raw_text)} chars (temp_id: {temp_id})")
+        logger.info("[INTERIM] %d chars (temp_id: %s)", len(raw_text), temp_id, extra={'event': 'interim'})
     else:
         # Send final result with translation
         translation_data = {
@@ -1989,13 +2150,39 @@ def handle_new_transcription(data):
             'source_language': data.get('language', 'en')[:10],
             'confidence': data.get('confidence')
         }
+        translation_data.update(caption_clock.final(temp_id, raw_text))
+
+        trace_id = data.get('trace_id')
+        caption_latency.start(trace_id, data.get('spoken_at'), translation_data['source_language'])
 
         add_translation(translation_data)
-        # Emit to listeners (non-admin users)
-        socketio.emit('new_translation', translation_data, skip_sid=[request.sid])
+        # Emit to listeners (non-admin users); the trace ID rides along but is not stored in history
+        listener_data = dict(translation_data, trace_id=trace_id) if latency_tracing.valid_trace_id(trace_id) else translation_data
+        socketio.emit('new_translation', listener_data, skip_sid=[request.sid])
+        caption_latency.broadcast(trace_id)
         # Emit to admin only (the one who sent the transcription)
         emit('transcription_confirmed', translation_data)
-        logger.info(f"[FINAL] ID={translation_data.get('id')}")
+        logger.info("[FINAL] ID=%s", translation_data.get('id'))
+
+@socketio.on('clock_sync')
+def handle_clock_sync(data=None):
+    """Server time for the client's clock offset estimate (ack callback, so the client knows the round trip)"""
+    return {'server_time': caption_latency.now_ms()}
+
+@socketio.on('latency_report')
+def handle_latency_report(data):
+    """Listener timings for sampled captions: {reports: [{trace_id, language, received_at, stages}]}"""
+    if request.sid not in sid_to_client_key or not isinstance(data, dict):
+        return
+    reports = data.get('reports')
+    if not isinstance(reports, list):
+        return
+    reports = reports[:MAX_LATENCY_REPORTS]
+    if not latency_report_limiter.hit(request.sid)[0]:
+        caption_latency.drop(len(reports))
+        return
+    for report in reports:
+        caption_latency.client_report(report, reporter=request.sid)
 
 @socketio.on('correct_translation')
 def handle_correct_translation(data):
@@ -2033,6 +2220,8 @@ def handle_correct_translation(data):
 
     target_item['corrected'] = corrected_text
     target_item['is_corrected'] = True
+    if archive is not None:
+        archive.update(target_item)
 
     socketio.emit('translation_corrected', target_item)
     logger.info(f"✏️ [CORRECTED] ID {translation_id}")
@@ -2049,45 +2238,77 @@ def handle_clear_history():
     global translations_history, next_translation_id
     translations_history = []
     next_translation_id = 0  # Reset ID counter when clearing history
+    if archive is not None:
+        archive.clear()
+    caption_clock.reset()  # Subtitle timing restarts with the next caption
     socketio.emit('history_cleared')
     logger.info(f"[CLEARED] History by {admin_sessions.get(request.sid)}")
 
-@socketio.on('import_transcription')
-def handle_import_transcription(data):
-    """Handle import of transcriptions from JSON file"""
-    if not is_admin(request.sid):
-        emit('error', {'message': 'Unauthorized'})
-        disconnect()
-        return
+IMPORT_CHUNK_MAX_ITEMS = 500
+bulk_imports = {}  # sid -> {'import_id', 'count', 'first_id', 'last_id'} until the final chunk
 
-    if not data or not isinstance(data, dict):
-        emit('error', {'message': 'Invalid data'})
-        return
+def build_import_entry(data):
+    """Validate and sanitize one imported item (raises ValueError with a client-facing message)"""
+    if not isinstance(data, dict):
+        raise ValueError('Invalid data')
 
-    # Validate required fields
-    required_fields = ['original', 'corrected']
-    for field in required_fields:
+    for field in ('original', 'corrected'):
         if field not in data:
-            emit('error', {'message': f'Missing required field: {field}'})
-            return
+            raise ValueError(f'Missing required field: {field}')
 
-    # Sanitize and prepare import data
-    translation_data = {
-        'id': data.get('id'),  # Use provided ID if available
+    language = data.get('language', 'imported')
+    entry = {
+        'id': None,
         'timestamp': data.get('timestamp', datetime.now().strftime('%H:%M:%S')),
         'original': sanitize_text(data.get('original', ''), max_length=5000),
         'corrected': sanitize_text(data.get('corrected', ''), max_length=5000),
         'translated': data.get('translated'),
         'is_corrected': data.get('is_corrected', False),
-        'source_language': data.get('language', 'imported')[:10],
+        'source_language': (language if isinstance(language, str) else 'imported')[:10],
         'confidence': data.get('confidence', 0.95)
     }
 
     # Validate after sanitization
-    if not translation_data['original'] or not translation_data['corrected']:
-        emit('error', {'message': 'Original and corrected text cannot be empty'})
+    if not entry['original'] or not entry['corrected']:
+        raise ValueError('Original and corrected text cannot be empty')
+    return entry
+
+def finish_bulk_import(sid):
+    """Announce a finished (or abandoned) bulk import with one compact notification"""
+    state = bulk_imports.pop(sid, None)
+    if not state or not state['count']:
+        return
+    # Clients fetch /api/translations?after_id=<first_id - 1> instead of receiving every item
+    socketio.emit('history_bulk_added', {
+        'count': state['count'],
+        'first_id': state['first_id'],
+        'last_id': state['last_id'],
+        'total': len(translations_history)
+    })
+    logger.info(f"[IMPORTED] {state['count']} items, IDs {state['first_id']}-{state['last_id']} "
+                f"(import {state['import_id']})")
+
+@socketio.on('import_transcription')
+def handle_import_transcription(data):
+    """Handle import of transcriptions from JSON file"""
+    if not is_admin(request.sid):
+        emit('error', {'message': 'Unauthorized'})
+        disconnect()
         return
 
+    if not data or not isinstance(data, dict):
+        emit('error', {'message': 'Invalid data'})
+        return
+
+    try:
+        translation_data = build_import_entry(data)
+    except ValueError as e:
+        emit('error', {'message': str(e)})
+        return
+    if archive is None:
+        translation_data['id'] = data.get('id')  # Use provided ID if available
+    # With the archive on, a re-imported export must not replace the archived caption with that ID: a new ID is assigned
+
     # Add to history
     add_translation(translation_data)
 
@@ -2095,6 +2316,62 @@ def handle_import_transcription(data):
     socketio.emit('new_translation', translation_data)
     logger.info(f"[IMPORTED] ID={translation_data['id']} from {admin_sessions.get(request.sid)}")
 
+@socketio.on('import_transcription_batch')
+def handle_import_transcription_batch(data):
+    """
+    Bulk import in chunks, acknowledged one at a time
+
+    Payload: {'import_id': str, 'items': [...], 'final': bool}
+    Ack:     {'success', 'accepted', 'rejected': [{'index', 'error'}], 'first_id', 'last_id'}
+
+    Items are validated and added to history per chunk; listeners get a single
+    history_bulk_added notification once the final chunk is in.
+    """
+    if not is_admin(request.sid):
+        emit('error', {'message': 'Unauthorized'})
+        disconnect()
+        return {'success': False, 'error': 'Unauthorized'}
+
+    if not data or not isinstance(data, dict) or not isinstance(data.get('items'), list):
+        return {'success': False, 'error': 'Invalid data'}
+
+    items = data['items']
+    if len(items) > IMPORT_CHUNK_MAX_ITEMS:
+        return {'success': False, 'error': f'Too many items in one chunk (max {IMPORT_CHUNK_MAX_ITEMS})'}
+
+    import_id = str(data.get('import_id', ''))[:64]
+    state = bulk_imports.get(request.sid)
+    if state is None or state['import_id'] != import_id:
+        finish_bulk_import(request.sid)  # A new import supersedes an unfinished one
+        state = bulk_imports[request.sid] = {'import_id': import_id, 'count': 0, 'first_id': None, 'last_id': None}
+
+    entries = []
+    rejected = []
+    for index, item in enumerate(items):
+        try:
+            entries.append(build_import_entry(item))
+        except ValueError as e:
+            rejected.append({'index': index, 'error': str(e)})
+
+    first_id = last_id = None
+    if entries:
+        first_id, last_id = add_translations_bulk(entries)
+        state['count'] += len(entries)
+        state['last_id'] = last_id
+        if state['first_id'] is None:
+            state['first_id'] = first_id
+
+    if data.get('final'):
+        finish_bulk_import(request.sid)
+
+    return {
+        'success': True,
+        'accepted': len(entries),
+        'rejected': rejected,
+        'first_id': first_id,
+        'last_id': last_id
+    }
+
 @socketio.on('delete_items')
 def handle_delete_items(data):
     """Handle deletion of multiple items with authorization"""
@@ -2122,6 +2399,8 @@ def handle_delete_items(data):
     original_count = len(translations_history)
     translations_history = [item for item in translations_history if item.get('id') not in item_ids]
     deleted_count = original_count - len(translations_history)
+    if archive is not None:
+        archive.delete(item_ids)  # Also removes items already trimmed from memory
 
     # Broadcast deletion to all connected clients
     socketio.emit('items_deleted', {'ids': item_ids})
@@ -2153,26 +2432,119 @@ def internal_error(error):
     logger.error(f"Internal error: {error}")
     return jsonify({'error': 'Internal error'}), 500
 
+# ──────────────────────────────────────────
+# Config Hot Reload (SIGHUP or config.yaml change)
+# ──────────────────────────────────────────
+# Host/port/HTTPS, the Flask secret key and Flask-Limiter route limits still need a restart.
+
+@config_loader.subscribe
+def on_config_reload(snapshot, changed):
+    logging.getLogger().setLevel(snapshot.get_str('logging', 'level', default='INFO').upper())
+    public_response_cache.clear()  # Entries are keyed on the old epoch; free them now
+
+
+@config_loader.subscribe_to('oem')
+def on_oem_config_reload(snapshot, changed):
+    init_oem_config(app, get_config)
+    # A request racing the reload may have cached the old OEM config under the new epoch
+    public_response_cache.clear()
+    logger.info("🎨 OEM configuration reloaded")
+
+
+@config_loader.subscribe_to('authentication')
+def on_auth_config_reload(snapshot, changed):
+    global AUTH_ENABLED, JWT_SECRET
+    AUTH_ENABLED = snapshot.get_bool('authentication', 'enabled', default=True)
+    JWT_SECRET = snapshot.get('authentication', 'jwt_secret', default='secret')
+    security_logger.warning(f"Authentication config reloaded (enabled={AUTH_ENABLED})")
+
+
+@config_loader.subscribe_to('advanced', 'security')
+def on_security_config_reload(snapshot, changed):
+    global MAX_LOGIN_ATTEMPTS, LOGIN_ATTEMPT_WINDOW, MAX_RATE_VIOLATIONS, MAX_SUSPICIOUS_PATTERNS, BLOCK_DURATION
+    MAX_LOGIN_ATTEMPTS = snapshot.get_int('advanced', 'security', 'max_login_attempts', default=10)
+    LOGIN_ATTEMPT_WINDOW = timedelta(minutes=snapshot.get_float('advanced', 'security', 'login_attempt_window_minutes', default=15))
+    MAX_RATE_VIOLATIONS = snapshot.get_int('advanced', 'security', 'max_rate_violations', default=100)
+    MAX_SUSPICIOUS_PATTERNS = snapshot.get_int('advanced', 'security', 'max_suspicious_patterns', default=20)
+    BLOCK_DURATION = timedelta(minutes=snapshot.get_float('advanced', 'security', 'block_duration_minutes', default=60))
+    blocked_clients.ttl = BLOCK_DURATION.total_seconds()  # Applies to new blocks
+    failed_login_attempts.ttl = LOGIN_ATTEMPT_WINDOW.total_seconds()
+    decay_seconds = snapshot.get_float('advanced', 'security', 'violation_decay_minutes', default=60) * 60
+    max_tracked = snapshot.get_int('advanced', 'security', 'max_tracked_clients', default=10000)
+    for table in (blocked_clients, failed_login_attempts, rate_limit_violations, suspicious_patterns):
+        table.max_items = max_tracked
+    rate_limit_violations.ttl = suspicious_patterns.ttl = decay_seconds
+
+    if any(key[:3] == ('advanced', 'security', 'cors_origins') for key in changed):
+        origins = snapshot.get('advanced', 'security', 'cors_origins')
+        socketio.server.eio.cors_allowed_origins = '*' if origins is None or origins == '*' else (
+            [origins] if isinstance(origins, str) else list(origins))
+        logger.info(f"🔄 Socket.IO CORS origins: {socketio.server.eio.cors_allowed_origins}")
+
+
+@config_loader.subscribe_to('advanced', 'performance')
+def on_performance_config_reload(snapshot, changed):
+    global MAX_HISTORY_SIZE, translations_history
+    MAX_HISTORY_SIZE = snapshot.get_int('advanced', 'performance', 'cache_size', default=1000)
+    if len(translations_history) > MAX_HISTORY_SIZE:
+        translations_history = translations_history[-MAX_HISTORY_SIZE:]
+    translation_limiter.limit = snapshot.get_int('advanced', 'performance', 'translation_items_per_minute', default=300)
+    tts_service.set_max_concurrent(snapshot.get_int('advanced', 'performance', 'tts_max_concurrent', default=4))
+    connection_admission.configure(
+        rate_per_second=snapshot.get_float('advanced', 'performance', 'connect_rate_per_second', default=50),
+        burst=snapshot.get_int('advanced', 'performance', 'connect_burst', default=100),
+        max_wait_seconds=snapshot.get_float('advanced', 'performance', 'connect_queue_seconds', default=5),
+        stagger_seconds=snapshot.get_float('advanced', 'performance', 'history_stagger_seconds', default=3)
+    )
+    logger.info(f"🔄 Limits: history={MAX_HISTORY_SIZE}, translation items/min={translation_limiter.limit}, "
+                f"tts concurrency={tts_service.max_concurrent}")
+
+
+@config_loader.subscribe_to('server', 'external_url')
+def on_external_url_reload(snapshot, changed):
+    response_header_policy.rebuild(build_header_policy_csp(), SECURITY_HEADERS)
+
+
 # ──────────────────────────────────────────
 # Server Start (HTTP or HTTPS)
 # ──────────────────────────────────────────
 if __name__ == '__main__':
     logger.info("Starting EzySpeechTranslate Backend Server...")
 
-    auth_enabled = get_config('authentication', 'enabled', default=True)
-    logger.info(f"Authentication: {'Enabled' if auth_enabled else 'Disabled'}")
+    logger.info(f"Authentication: {'Enabled' if AUTH_ENABLED else 'Disabled'}")
 
-    host = get_config('server', 'host', default='0.0.0.0')
-    port = get_config('server', 'port', default=1915)
+    host = os.environ.get('EZY_SERVER_HOST') or get_config('server', 'host', default='0.0.0.0')
+    port = int(os.environ.get('EZY_SERVER_PORT') or get_config('server', 'port', default=1915))
     use_https = get_config('server', 'use_https', default=True)
 
     logger.info(f"Protocol: {'HTTPS' if use_https else 'HTTP'}")
     logger.info(f"Security logging: logs/security.log")
 
-    # Initialize Edge TTS voice cache in background (non-blocking)
+    # Expire stale security state in the background (lookups also expire lazily)
+    expiring_store.start_reaper(interval_seconds=60)
+
+    # Event loop lag for /metrics; the watchdog also captures the stack of anything blocking the hub
+    if config_loader.get_bool('advanced', 'watchdog', 'enabled', default=True):
+        hub_monitor = hub_watchdog.HubWatchdog(
+            threshold_seconds=config_loader.get_int('advanced', 'watchdog', 'threshold_ms', default=250) / 1000,
+            report_logger=blocking_logger)
+        hub_monitor.start(socketio.sleep, socketio.start_background_task)
+        logger.info("Blocking-call reports: logs/blocking.log")
+    else:
+        socketio.start_background_task(metrics.HubLagProbe().run, socketio.sleep)
+
+    # Config hot reload: `kill -HUP <pid>`, or automatically when config.yaml changes
+    config_loader.install_sighup_handler()
+    if config_loader.get_bool('advanced', 'config_reload', 'watch_file', default=True):
+        config_loader.watch(interval=config_loader.get_float('advanced', 'config_reload', 'interval_seconds', default=2.0))
+    # Static files replaced on disk (e.g. an OEM logo) are served without a restart
+    if config_loader.get_bool('advanced', 'static_assets', 'watch', default=True):
+        static_manifest.watch(interval=config_loader.get_float('advanced', 'static_assets', 'interval_seconds', default=5.0))
+
+    # Refresh Edge TTS voice catalog in background (non-blocking, snapshot serves meanwhile)
     if EDGE_TTS_AVAILABLE:
-        logger.info("🎙️ Pre-loading Edge TTS voices in background...")
-        threading.Thread(target=fetch_edge_tts_voices_in_thread, daemon=True, name="tts-voice-preload").start()
+        logger.info("🎙️ Refreshing Edge TTS voice catalog in background...")
+        voice_catalog.refresh_async()
 
     for directory in ['logs']:
         os.makedirs(directory, exist_ok=True)
@@ -0,0 +1,255 @@
+"""
+Flattened Configuration Snapshots with Hot Reload
+
+Features:
+- config.yaml compiled once into a flat dict keyed by key-path tuples, so
+  get('a', 'b', 'c') is a single dict lookup instead of a nested walk
+- Typed accessors (get_bool / get_int / get_float / get_str / get_list)
+- Atomic reload: a new snapshot is built off to the side and swapped in with
+  one assignment; a broken, missing or empty file keeps the previous snapshot
+- Reload on SIGHUP or when the file's mtime changes
+- Subscribers notified with the set of changed key paths
+"""
+
+import copy
+import logging
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger("config_loader")
+
+KeyPath = Tuple[str, ...]
+
+_TRUE_STRINGS = {'1', 'true', 'yes', 'on'}
+_FALSE_STRINGS = {'0', 'false', 'no', 'off'}
+_MISSING = object()
+
+
+def _flatten(node: Any, prefix: KeyPath, flat: Dict[KeyPath, Any], leaves: Dict[KeyPath, Any]):
+    flat[prefix] = node
+    if isinstance(node, dict):
+        for key, value in node.items():
+            _flatten(value, prefix + (key,), flat, leaves)
+    else:
+        leaves[prefix] = node
+
+
+class ConfigSnapshot:
+    """Immutable, flattened view of one configuration load"""
+
+    __slots__ = ('data', 'flat', 'leaves', 'epoch', 'loaded_at')
+
+    def __init__(self, data: Dict, epoch: int = 0):
+        # Deep copy so later edits to the source dict cannot leak into the snapshot;
+        # dict values returned by get() are shared and must be treated as read-only
+        self.data = copy.deepcopy(data) if isinstance(data, dict) else {}
+        self.flat: Dict[KeyPath, Any] = {}
+        self.leaves: Dict[KeyPath, Any] = {}
+        _flatten(self.data, (), self.flat, self.leaves)
+        self.epoch = epoch
+        self.loaded_at = time.time()
+
+    def get(self, *keys, default=None):
+        """Value at the key path, or default if missing or None"""
+        value = self.flat.get(keys)
+        return default if value is None else value
+
+    def get_bool(self, *keys, default: bool = False) -> bool:
+        value = self.flat.get(keys)
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return bool(value)
+        if isinstance(value, str):
+            lowered = value.strip().lower()
+            if lowered in _TRUE_STRINGS:
+                return True
+            if lowered in _FALSE_STRINGS:
+                return False
+        return default
+
+    def get_int(self, *keys, default: int = 0) -> int:
+        value = self.flat.get(keys)
+        if value is None or isinstance(value, bool):
+            return default
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, *keys, default: float = 0.0) -> float:
+        value = self.flat.get(keys)
+        if value is None or isinstance(value, bool):
+            return default
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_str(self, *keys, default: str = '') -> str:
+        value = self.flat.get(keys)
+        return default if value is None or isinstance(value, dict) else str(value)
+
+    def get_list(self, *keys, default: Optional[List] = None) -> List:
+        value = self.flat.get(keys)
+        if value is None:
+            return list(default or [])
+        if isinstance(value, (list, tuple)):
+            return list(value)
+        return [value]
+
+    def diff(self, other: 'ConfigSnapshot') -> FrozenSet[KeyPath]:
+        """Leaf key paths whose value differs between the two snapshots"""
+        keys = self.leaves.keys() | other.leaves.keys()
+        return frozenset(k for k in keys if self.leaves.get(k, _MISSING) != other.leaves.get(k, _MISSING))
+
+
+class ReloadableConfig:
+    """YAML configuration served from atomically swapped ConfigSnapshots"""
+
+    def __init__(self, config_path='config/config.yaml'):
+        self.config_path = Path(config_path)
+        self._subscribers: List[Tuple[KeyPath, Callable]] = []
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._mtime = self._stat_mtime()
+        self.snapshot = ConfigSnapshot(self._read(), epoch=0)
+
+    # ── Loading ─────────────────────────────────────────────
+
+    def _read(self, strict: bool = False) -> Dict:
+        """Load the raw nested config (subclasses add decrypted secrets)"""
+        return self._load_yaml(strict)
+
+    def _load_yaml(self, strict: bool = False) -> Dict:
+        """config.yaml as a dict; strict (reloads) raises for a missing or empty file instead of returning {}"""
+        try:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f)
+        except FileNotFoundError:
+            if strict:
+                raise
+            print(f"Error: Configuration file not found at {self.config_path}")
+            return {}
+        if not data or not isinstance(data, dict):
+            if strict:
+                # Typically caught mid-save (editors that truncate, or rename and replace)
+                raise ValueError(f"{self.config_path} is empty or not a mapping")
+            return {}
+        return data
+
+    def _stat_mtime(self) -> float:
+        try:
+            return os.stat(self.config_path).st_mtime
+        except OSError:
+            return 0.0
+
+    @property
+    def data(self) -> Dict:
+        return self.snapshot.data
+
+    @property
+    def epoch(self) -> int:
+        return self.snapshot.epoch
+
+    # ── Access ──────────────────────────────────────────────
+
+    def get(self, *keys, default=None):
+        """Safely retrieves a configuration value using nested keys."""
+        value = self.snapshot.flat.get(keys)
+        return default if value is None else value
+
+    def get_bool(self, *keys, default: bool = False) -> bool:
+        return self.snapshot.get_bool(*keys, default=default)
+
+    def get_int(self, *keys, default: int = 0) -> int:
+        return self.snapshot.get_int(*keys, default=default)
+
+    def get_float(self, *keys, default: float = 0.0) -> float:
+        return self.snapshot.get_float(*keys, default=default)
+
+    def get_str(self, *keys, default: str = '') -> str:
+        return self.snapshot.get_str(*keys, default=default)
+
+    def get_list(self, *keys, default: Optional[List] = None) -> List:
+        return self.snapshot.get_list(*keys, default=default)
+
+    # ── Reload ──────────────────────────────────────────────
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot, FrozenSet[KeyPath]], None], *prefix: str):
+        """Call callback(snapshot, changed_keys) after a reload that changes keys under prefix.
+
+        With no prefix the callback fires on every reload that changes anything.
+        """
+        self._subscribers.append((tuple(prefix), callback))
+        return callback
+
+    def subscribe_to(self, *prefix: str):
+        """Decorator form of subscribe() for a key prefix"""
+        def decorator(callback):
+            return self.subscribe(callback, *prefix)
+        return decorator
+
+    def reload(self) -> bool:
+        """Re-read the config file and swap in the new snapshot. Returns True if anything changed."""
+        with self._reload_lock:
+            self._mtime = self._stat_mtime()
+            try:
+                data = self._read(strict=True)  # Missing/empty file: keep serving the previous snapshot
+            except Exception as e:
+                logger.error(f"❌ Config reload failed, keeping previous config: {e}")
+                return False
+
+            old = self.snapshot
+            new = ConfigSnapshot(data, epoch=old.epoch + 1)
+            changed = new.diff(old)
+            if not changed:
+                logger.info("🔄 Config reloaded: no changes")
+                return False
+
+            self.snapshot = new  # Single assignment: readers see old or new, never a mix
+            logger.info(f"🔄 Config reloaded (epoch {new.epoch}): {len(changed)} keys changed")
+
+        for prefix, callback in list(self._subscribers):
+            if prefix and not any(key[:len(prefix)] == prefix for key in changed):
+                continue
+            try:
+                callback(new, changed)
+            except Exception as e:
+                logger.error(f"❌ Config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+        return True
+
+    def install_sighup_handler(self) -> bool:
+        """Reload on SIGHUP (POSIX, main thread only). Returns True if installed."""
+        if not hasattr(signal, 'SIGHUP') or threading.current_thread() is not threading.main_thread():
+            return False
+
+        def on_sighup(signum, frame):
+            # Don't do file IO inside the signal handler
+            threading.Thread(target=self.reload, daemon=True, name="config-reload").start()
+
+        signal.signal(signal.SIGHUP, on_sighup)
+        return True
+
+    def watch(self, interval: float = 2.0):
+        """Start a background thread that reloads when the file's mtime changes"""
+        if self._watcher is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    if self._stat_mtime() != self._mtime:
+                        self.reload()
+                except Exception as e:
+                    logger.error(f"❌ Config watcher error: {e}")
+
+        self._watcher = threading.Thread(target=run, daemon=True, name="config-watcher")
+        self._watcher.start()
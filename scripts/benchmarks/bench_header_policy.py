@@ -0,0 +1,136 @@
+"""
+Response Header Overhead Benchmark
+Compares the old per-request CSP building with the precompiled header policy
+
+Usage:
+    python scripts/benchmarks/bench_header_policy.py [--iterations 20000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from flask import Flask, Response, request
+
+from app import header_policy
+
+EXTERNAL_URL = 'https://captions.example.com'
+
+CSP = {
+    'default-src': ["'self'"],
+    'script-src': ["'self'", "'unsafe-inline'", "https://cdnjs.cloudflare.com", "https:"],
+    'style-src': ["'self'", "'unsafe-inline'", "https://fonts.googleapis.com"],
+    'font-src': ["'self'", "https://fonts.gstatic.com"],
+    'img-src': ["'self'", "data:", "https:"],
+    'connect-src': ["'self'", "ws:", "wss:", "https:", "https://translate.googleapis.com"],
+    'media-src': ["'self'", "blob:"],
+}
+
+SECURITY_HEADERS = {
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'SAMEORIGIN',
+    'X-XSS-Protection': '1; mode=block',
+    'Referrer-Policy': 'strict-origin-when-cross-origin',
+    'Permissions-Policy': 'geolocation=(), microphone=(), camera=(), browsing-topics=()',
+    'Feature-Policy': "geolocation 'none'; camera 'none'; microphone 'none'",
+}
+
+
+def legacy_headers(response):
+    """The previous after_request + set_cache_headers + Talisman work, per response"""
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    response.headers['X-Frame-Options'] = 'DENY'
+    response.headers['X-XSS-Protection'] = '1; mode=block'
+    response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
+    response.headers['Permissions-Policy'] = 'geolocation=(), microphone=(), camera=()'
+
+    for _ in range(2):  # after_request and set_cache_headers both built the CSP
+        external_url = EXTERNAL_URL
+        connect_src_list = ["'self'", "http://localhost:*", "http://127.0.0.1:*",
+                            "ws://localhost:*", "ws://127.0.0.1:*",
+                            "https://cdnjs.cloudflare.com", "https://translate.googleapis.com",
+                            "https://fonts.googleapis.com", "https://fonts.gstatic.com"]
+        if external_url.startswith('https://'):
+            external_host = external_url.replace('https://', '').rstrip('/')
+            connect_src_list.append(f"https://{external_host}")
+            connect_src_list.append(f"wss://{external_host}")
+        connect_src = ' '.join(connect_src_list)
+        if 'Content-Security-Policy' not in response.headers or _ == 0:
+            response.headers['Content-Security-Policy'] = (
+                "default-src 'self'; "
+                "script-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com; "
+                "style-src 'self' 'unsafe-inline' https://cdnjs.cloudflare.com https://fonts.googleapis.com; "
+                "media-src 'self' blob:; "
+                f"connect-src {connect_src}; "
+                "img-src 'self' data:; "
+                "font-src 'self' data: https://cdnjs.cloudflare.com https://fonts.gstatic.com"
+            )
+
+    if response.content_type and 'text/html' in response.content_type:
+        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, public, max-age=0'
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
+    elif request.path.startswith('/api/'):
+        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, public, max-age=0'
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
+    elif request.path.startswith('/static/'):
+        if request.args.get('v'):
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        else:
+            response.headers['Cache-Control'] = 'public, max-age=0, must-revalidate'
+
+    # Talisman: re-parse the CSP dict and feature policy on every response
+    response.headers['Feature-Policy'] = '; '.join(
+        f"{k} {v}" for k, v in {'geolocation': "'none'", 'camera': "'none'", 'microphone': "'none'"}.items())
+    response.headers['Permissions-Policy'] = 'browsing-topics=()'
+    response.headers['X-Frame-Options'] = 'SAMEORIGIN'
+    response.headers['Content-Security-Policy'] = '; '.join(
+        f"{k} {' '.join(v)}" for k, v in CSP.items())
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    csp = {k: list(v) for k, v in CSP.items()}
+    csp['connect-src'].extend(header_policy.external_origins(EXTERNAL_URL))
+    policy = header_policy.HeaderPolicy(csp, SECURITY_HEADERS)
+
+    cases = [
+        ('html', '/', 'text/html; charset=utf-8'),
+        ('api', '/api/health', 'application/json'),
+        ('static?v', '/static/js/user.js?v=1', 'text/javascript'),
+        ('static', '/static/js/user.js', 'text/javascript'),
+    ]
+
+    print(f"{'route':<10} {'legacy µs':>10} {'policy µs':>10} {'speedup':>8}")
+    for name, path, content_type in cases:
+        with app.test_request_context(path):
+            def legacy():
+                legacy_headers(Response('', content_type=content_type))
+
+            def compiled():
+                response = Response('', content_type=content_type)
+                route_class = header_policy.classify(request.path, response.content_type, bool(request.args.get('v')))
+                policy.apply(response, route_class)
+
+            def baseline():
+                Response('', content_type=content_type)
+
+            base = min(timeit.repeat(baseline, number=args.iterations, repeat=3))
+            old = min(timeit.repeat(legacy, number=args.iterations, repeat=3)) - base
+            new = min(timeit.repeat(compiled, number=args.iterations, repeat=3)) - base
+            print(f"{name:<10} {old / args.iterations * 1e6:>10.2f} {new / args.iterations * 1e6:>10.2f} "
+                  f"{old / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
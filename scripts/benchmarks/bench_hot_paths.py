@@ -0,0 +1,241 @@
+"""
+Server Hot Path Benchmark Suite
+Per-call timings of the user server's hot paths at several history sizes
+
+Runs against the real server module (loaded like the tests load it, with
+logging disabled, auth off and no archive), so the numbers include the same
+locks, logging checks and Flask plumbing a live request goes through:
+
+- sanitize_text, JWT validation, TranslationCache get/set
+- add_translation with trimming at the history cap, correction lookup and
+  delete_items (Socket.IO handlers via the test client)
+- /api/translations paging (offset and after_id cursor), the before/after
+  request middleware (security pipeline, CSP and cache headers)
+- every transcript export format, Socket.IO packet encoding of one caption
+  and of the history sent to an admin on connect
+
+Each case is timed with timeit (autoranged calls per round, --repeat rounds).
+--output writes a JSON report with a fixed layout and sorted keys; compare two
+reports with compare_benchmarks.py.
+
+Usage:
+    python scripts/benchmarks/bench_hot_paths.py [--sizes 1000 10000 100000] [--output bench.json]
+    python scripts/benchmarks/bench_hot_paths.py --filter export --sizes 10000
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+SCHEMA_VERSION = 1
+CAPTION = "Good morning everyone, and welcome to today's service. Please open your books to chapter three."
+LONG_CAPTION = "This is a long caption row exported to a file after the meeting. " * 40
+
+
+class Case(NamedTuple):
+    """One timed call; size is the history length it runs against (None if independent)"""
+    name: str
+    size: Optional[int]
+    run: Callable[[], object]
+
+    @property
+    def key(self) -> str:
+        return self.name if self.size is None else f"{self.name}@{self.size}"
+
+
+def load_server():
+    logging.disable(logging.CRITICAL)
+    spec = importlib.util.spec_from_file_location('bench_user_server', os.path.join(PROJECT_ROOT, 'app', 'user', 'server.py'))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    server.AUTH_ENABLED = False
+    server.archive = None
+    if hasattr(server.limiter, 'enabled'):
+        server.limiter.enabled = False
+    return server
+
+
+def make_item(i: int) -> Dict:
+    return {
+        'id': i,
+        'temp_id': f"temp-{i}",
+        'timestamp': f"{(i // 3600) % 24:02d}:{(i // 60) % 60:02d}:{i % 60:02d}",
+        'original': f"Caption number {i}, with a \"quoted\" phrase and some more words",
+        'corrected': f"Caption number {i}, corrected by the operator before it was shown",
+        'translated': None,
+        'is_corrected': i % 3 == 0,
+        'source_language': 'en',
+        'confidence': 0.95,
+        'session': 'bench',
+        'start_offset': i * 3.0,
+        'end_offset': i * 3.0 + 2.5,
+    }
+
+
+# ──────────────────────────────────────────
+# Cases
+# ──────────────────────────────────────────
+def fixed_cases(server) -> List[Case]:
+    """Hot paths whose cost does not depend on the history length"""
+    import jwt
+    from flask import Response
+    from socketio import packet
+
+    from app.translation_service import TranslationCache
+
+    cache = TranslationCache(max_size=1000)
+    for i in range(1000):
+        cache.set(f"cached {i}", 'es', f"traducido {i}")
+    counter = iter(range(10 ** 9))
+
+    token = jwt.encode({'username': 'admin', 'exp': datetime.utcnow() + timedelta(hours=1),
+                        'iat': datetime.utcnow(), 'jti': 'bench'}, server.JWT_SECRET, algorithm='HS256')
+
+    # One pushed request context reused by the middleware cases
+    context = server.app.test_request_context('/api/translations', headers={'Cookie': '_client_id=bench'})
+    context.push()
+
+    def after_request():
+        return server.after_request(Response('{}', content_type='application/json'))
+
+    item = make_item(1)
+    return [
+        Case('sanitize_text', None, lambda: server.sanitize_text(CAPTION)),
+        Case('sanitize_text_long', None, lambda: server.sanitize_text(LONG_CAPTION)),
+        Case('jwt_validate', None, lambda: server.validate_jwt_token(token)),
+        Case('translation_cache_get_hit', None, lambda: cache.get('cached 500', 'es')),
+        Case('translation_cache_get_miss', None, lambda: cache.get('not cached', 'es')),
+        Case('translation_cache_set_full', None, lambda: cache.set(f"new {next(counter)}", 'es', 'nuevo')),
+        Case('middleware_before_request', None, server.before_request),
+        Case('middleware_after_request', None, after_request),
+        Case('socketio_encode_caption', None, lambda: packet.Packet(packet.EVENT, data=['new_translation', item]).encode()),
+    ]
+
+
+def history_cases(server, size: int) -> List[Case]:
+    """Hot paths that scan, copy or serialize the history; the history is reset to size items first"""
+    from socketio import packet
+
+    from app import transcript_export
+
+    server.translations_history = [make_item(i) for i in range(10, size + 10)]
+    server.next_translation_id = size + 10
+    server.MAX_HISTORY_SIZE = size
+
+    admin = server.socketio.test_client(server.app, query_string='type=admin&client_id=bench-admin')
+    admin.emit('admin_connect', {})
+    admin.get_received()
+    http = server.app.test_client()
+    http.set_cookie('_client_id', 'bench-listener')
+    auth = {'Authorization': f"Bearer {server.create_api_token('bench-listener-sid')}"}
+    middle_id = size // 2 + 10
+    absent_ids = list(range(10))  # Older than the history: a full scan that deletes nothing, so the size stays put
+
+    def add_translation():
+        server.add_translation({'id': None, 'original': CAPTION, 'corrected': CAPTION, 'is_corrected': False})
+
+    def correct():
+        admin.emit('correct_translation', {'id': middle_id, 'corrected_text': CAPTION})
+        admin.get_received()
+
+    def delete():
+        admin.emit('delete_items', {'ids': absent_ids})
+        admin.get_received()
+
+    def export(export_format):
+        return lambda: sum(len(chunk) for chunk in transcript_export.export_stream(export_format, server.translations_history))
+
+    cases = [
+        Case('correct_translation_lookup', size, correct),
+        Case('delete_items_scan', size, delete),
+        Case('get_translations_page', size, lambda: http.get(f"/api/translations?offset={size // 2}&limit=100", headers=auth)),
+        Case('get_translations_after_id', size, lambda: http.get(f"/api/translations?after_id={size - 40}&limit=100", headers=auth)),
+        Case('socketio_encode_history', size, lambda: packet.Packet(packet.EVENT, data=['history', server.translations_history]).encode()),
+    ]
+    cases += [Case(f"export_{name}", size, export(name)) for name in sorted(transcript_export.FORMATS)]
+    # Last: it replaces the history with bare items as it trims
+    cases.append(Case('add_translation_trim', size, add_translation))
+    return cases
+
+
+# ──────────────────────────────────────────
+# Timing and report
+# ──────────────────────────────────────────
+def measure(run: Callable, repeat: int) -> Dict:
+    """Seconds per call over repeat rounds of an autoranged call count (>= 0.2 s per round)"""
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'calls_per_round': number,
+        'rounds': repeat,
+        'min_us': round(min(per_call) * 1e6, 3),
+        'median_us': round(statistics.median(per_call) * 1e6, 3),
+        'max_us': round(max(per_call) * 1e6, 3),
+        'stdev_us': round(statistics.stdev(per_call) * 1e6, 3) if len(per_call) > 1 else 0.0,
+    }
+
+
+def run_suite(sizes: List[int], repeat: int, name_filter: Optional[str] = None, progress=print) -> Dict:
+    server = load_server()
+    results = {}
+
+    def run_cases(cases):
+        for case in cases:
+            if name_filter and name_filter not in case.name:
+                continue
+            result = measure(case.run, repeat)
+            results[case.key] = dict(name=case.name, size=case.size, **result)
+            progress(f"{case.key:<40} {result['median_us']:>14.2f} {result['min_us']:>14.2f}")
+
+    progress(f"{'case':<40} {'median us/call':>14} {'min us/call':>14}")
+    run_cases(fixed_cases(server))
+    for size in sizes:
+        run_cases(history_cases(server, size))
+
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+        },
+        'parameters': {'sizes': sizes, 'repeat': repeat, 'filter': name_filter},
+        'results': results,
+    }
+
+
+def main(argv=None) -> Dict:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="History lengths")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed rounds per case")
+    parser.add_argument('--filter', help="Only cases whose name contains this")
+    parser.add_argument('--output', help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.repeat, args.filter)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nReport written to {args.output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Transcript Export Memory Benchmark
+Peak memory and time of the streaming exporters vs building the whole body
+
+The legacy path loads every item into a list and concatenates the output
+string before sending it; the streaming path iterates a SQLite archive in
+batches and yields 64 KB chunks (optionally gzipped). Peak memory of the
+streaming path should stay flat as the item count grows.
+
+Usage:
+    python scripts/benchmarks/bench_transcript_export.py [--items 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from app.transcript_archive import TranscriptArchive
+from app.transcript_export import default_clean, export_stream, gzip_stream
+
+
+def legacy_csv(items):
+    """The string-concatenation exporter export_stream() replaced"""
+    output = "ID,Timestamp,Original,Corrected,Is_Corrected\n"
+    for item in items:
+        row = [
+            str(item['id']),
+            item['timestamp'],
+            f'"{default_clean(item["original"], 500).replace(chr(34), chr(34)*2)}"',
+            f'"{default_clean(item["corrected"], 500).replace(chr(34), chr(34)*2)}"',
+            'Yes' if item['is_corrected'] else 'No'
+        ]
+        output += ','.join(row) + '\n'
+    return ('\ufeff' + output).encode('utf-8')
+
+
+def make_item(i):
+    return {
+        'id': i,
+        'timestamp': f"{(i // 3600) % 24:02d}:{(i // 60) % 60:02d}:{i % 60:02d}",
+        'original': f"Caption number {i}, with a \"quoted\" phrase and some more words to export",
+        'corrected': f"Caption number {i}, corrected by the operator before it was shown",
+        'translated': None,
+        'is_corrected': i % 3 == 0,
+        'source_language': 'en',
+        'confidence': 0.95,
+    }
+
+
+def measure(run):
+    """(seconds, peak MB, bytes produced) for one export run"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    produced = run()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), produced
+
+
+def drain(chunks):
+    return sum(len(chunk) for chunk in chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'exporter':<16} {'seconds':>8} {'peak MB':>8} {'output MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.items:
+            archive = TranscriptArchive(os.path.join(tmp, f"bench_{count}.db"))
+            batch = []
+            for i in range(count):
+                batch.append(make_item(i))
+                if len(batch) == 5000:
+                    archive.append_many(batch)
+                    batch = []
+            archive.append_many(batch)
+
+            runs = {
+                'legacy csv': lambda: len(legacy_csv(list(archive.iter_items()))),
+                'stream csv': lambda: drain(export_stream('csv', archive.iter_items())),
+                'stream csv+gzip': lambda: drain(gzip_stream(export_stream('csv', archive.iter_items()))),
+                'stream json': lambda: drain(export_stream('json', archive.iter_items())),
+                'stream srt': lambda: drain(export_stream('srt', archive.iter_items())),
+            }
+            for name, run in runs.items():
+                seconds, peak, produced = measure(run)
+                print(f"{count:>8} {name:<16} {seconds:>8.2f} {peak:>8.1f} {produced / (1024 * 1024):>10.1f}")
+            archive.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark Report Comparison
+Per-case change between two bench_hot_paths.py JSON reports
+
+A case counts as slower/faster when its time moved by more than --threshold
+percent. Cases present in only one report are listed separately. With
+--fail-on-regression the exit status is 1 when any case got slower, so a CI
+job can gate on it.
+
+Usage:
+    python scripts/benchmarks/compare_benchmarks.py base.json new.json [--threshold 10] [--stat median_us]
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+STATS = ('median_us', 'min_us')
+
+
+def load_report(path: str) -> Dict:
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    if not isinstance(report.get('results'), dict):
+        raise ValueError(f"{path} is not a benchmark report (no 'results')")
+    return report
+
+
+def compare(base: Dict, new: Dict, stat: str = 'median_us', threshold: float = 10.0) -> Dict[str, List[Dict]]:
+    """{'slower': [...], 'faster': [...], 'unchanged': [...], 'added': [keys], 'removed': [keys]}"""
+    base_results, new_results = base['results'], new['results']
+    comparison = {'slower': [], 'faster': [], 'unchanged': [],
+                  'added': sorted(set(new_results) - set(base_results)),
+                  'removed': sorted(set(base_results) - set(new_results))}
+    for key in sorted(set(base_results) & set(new_results)):
+        before, after = base_results[key][stat], new_results[key][stat]
+        change = (after - before) / before * 100 if before else 0.0
+        row = {'case': key, 'base': before, 'new': after, 'change_percent': round(change, 1)}
+        if change > threshold:
+            comparison['slower'].append(row)
+        elif change < -threshold:
+            comparison['faster'].append(row)
+        else:
+            comparison['unchanged'].append(row)
+    return comparison
+
+
+def print_comparison(comparison: Dict, stat: str, threshold: float):
+    rows = sorted(comparison['slower'] + comparison['faster'] + comparison['unchanged'], key=lambda r: r['case'])
+    print(f"{'case':<40} {'base ' + stat:>16} {'new ' + stat:>16} {'change':>9}")
+    for row in rows:
+        mark = 'slower' if row in comparison['slower'] else 'faster' if row in comparison['faster'] else ''
+        print(f"{row['case']:<40} {row['base']:>16.2f} {row['new']:>16.2f} {row['change_percent']:>+8.1f}% {mark}")
+    for label in ('added', 'removed'):
+        if comparison[label]:
+            print(f"\n{label}: {', '.join(comparison[label])}")
+    print(f"\n{len(comparison['slower'])} slower, {len(comparison['faster'])} faster, "
+          f"{len(comparison['unchanged'])} within ±{threshold:g}%")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('base')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10.0, help="Percent change treated as noise")
+    parser.add_argument('--stat', choices=STATS, default='median_us')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--json', action='store_true', help="Print the comparison as JSON")
+    args = parser.parse_args(argv)
+
+    base, new = load_report(args.base), load_report(args.new)
+    if base['environment'] != new['environment']:
+        print("Note: the reports come from different environments", file=sys.stderr)
+    comparison = compare(base, new, args.stat, args.threshold)
+    if args.json:
+        print(json.dumps(comparison, indent=2, sort_keys=True))
+    else:
+        print_comparison(comparison, args.stat, args.threshold)
+    return 1 if args.fail_on_regression and comparison['slower'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
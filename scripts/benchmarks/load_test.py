@@ -0,0 +1,465 @@
+"""
+Headless Load Test
+One simulated admin speaker and N Socket.IO listeners against the user server
+
+The admin emits interim results every ~0.3 s while a sentence is "spoken" at a
+realistic words-per-minute rate, then the final caption with a trace ID. Each
+listener connects like a browser (client_id cookie + query), waits for its API
+token, fetches history, and for every final caption requests a translation
+and (for a share of listeners) TTS audio.
+
+By default a user server is started on a free port with the mock translation
+and TTS engines (EZY_TRANSLATION_ENGINE / EZY_TTS_ENGINE=mock), so the run is
+offline and measures the server rather than Google or Edge. --url targets a
+server that is already running (its engines are whatever it was started with).
+
+Reported: delivery latency of interim/final captions, HTTP latency per API,
+throughput, errors, and the server's CPU and RSS (sampled from /proc, or psutil
+when installed). --output writes the report as JSON for comparing runs.
+
+Usage:
+    python scripts/benchmarks/load_test.py [--listeners 50] [--duration 60] [--output report.json]
+    python scripts/benchmarks/load_test.py --url http://127.0.0.1:1915 --listeners 200
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import aiohttp
+import socketio
+import yaml
+
+QUANTILES = (0.5, 0.95, 0.99)
+LISTENER_LANGUAGES = (('es', 'es-ES'), ('fr', 'fr-FR'), ('de', 'de-DE'), ('zh-CN', 'zh-CN'), ('ja', 'ja-JP'))
+WORDS = ("the quarterly results show steady growth across every region and the team expects "
+         "another strong year as new products reach customers in more markets while costs stay "
+         "under control thanks to careful planning and a lot of hard work from everyone here today").split()
+
+
+def load_config() -> Dict:
+    try:
+        with open(os.path.join(PROJECT_ROOT, 'config', 'config.yaml'), encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError):
+        return {}
+
+
+def summarize(values: List[float]) -> Dict:
+    """count / mean / nearest-rank quantiles / max, in milliseconds (values are seconds)"""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+    summary = {'count': len(ordered), 'mean': round(sum(ordered) / len(ordered) * 1000, 2)}
+    for q in QUANTILES:
+        rank = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        summary[f"p{round(q * 100)}"] = round(ordered[rank] * 1000, 2)
+    summary['max'] = round(ordered[-1] * 1000, 2)
+    return summary
+
+
+class Recorder:
+    """Latency samples, counters and errors shared by every simulated client"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def latency(self, name: str, seconds: float):
+        self.latencies[name].append(seconds)
+
+    def count(self, name: str, amount: int = 1):
+        self.counts[name] += amount
+
+    def error(self, name: str):
+        self.errors[name] += 1
+
+
+class ProcessSampler:
+    """CPU % and RSS of one process, sampled once a second (psutil if installed, else /proc)"""
+
+    def __init__(self, pid: int, interval: float = 1.0):
+        self.pid = pid
+        self.interval = interval
+        self.cpu_percent: List[float] = []
+        self.rss_mb: List[float] = []
+        try:
+            import psutil
+            self.process = psutil.Process(pid)
+        except Exception:
+            self.process = None
+        self.ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+    def available(self) -> bool:
+        return self.process is not None or os.path.exists(f"/proc/{self.pid}/stat")
+
+    def _cpu_seconds(self) -> float:
+        if self.process is not None:
+            times = self.process.cpu_times()
+            return times.user + times.system
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.ticks  # utime + stime
+
+    def _rss_bytes(self) -> int:
+        if self.process is not None:
+            return self.process.memory_info().rss
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    async def run(self, stop: asyncio.Event):
+        if not self.available():
+            return
+        last_cpu, last_at = self._cpu_seconds(), time.monotonic()
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                cpu, now = self._cpu_seconds(), time.monotonic()
+                self.cpu_percent.append((cpu - last_cpu) / (now - last_at) * 100)
+                self.rss_mb.append(self._rss_bytes() / (1024 * 1024))
+                last_cpu, last_at = cpu, now
+            except (OSError, ValueError, IndexError):
+                return  # Process gone
+
+    def report(self) -> Dict:
+        if not self.cpu_percent:
+            return {'available': False}
+        return {
+            'available': True,
+            'samples': len(self.cpu_percent),
+            'cpu_percent': {'mean': round(sum(self.cpu_percent) / len(self.cpu_percent), 1),
+                            'max': round(max(self.cpu_percent), 1)},
+            'rss_mb': {'start': round(self.rss_mb[0], 1), 'end': round(self.rss_mb[-1], 1),
+                       'max': round(max(self.rss_mb), 1)},
+        }
+
+
+# ──────────────────────────────────────────
+# Server under test
+# ──────────────────────────────────────────
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """User server with the offline engines, output discarded"""
+    env = dict(os.environ, EZY_TRANSLATION_ENGINE='mock', EZY_TTS_ENGINE='mock',
+               EZY_SERVER_HOST='127.0.0.1', EZY_SERVER_PORT=str(port))
+    return subprocess.Popen([sys.executable, os.path.join(PROJECT_ROOT, 'app', 'user', 'server.py')],
+                            cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_up(session: aiohttp.ClientSession, url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with session.get(f"{url}/api/health") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Server at {url} did not come up within {timeout:.0f}s")
+        await asyncio.sleep(0.25)
+
+
+async def login(session: aiohttp.ClientSession, url: str, username: str, password: str) -> Optional[str]:
+    """Admin JWT, or None (fine when authentication is disabled)"""
+    try:
+        async with session.post(f"{url}/api/login", json={'username': username, 'password': password},
+                                cookies={'_client_id': 'loadtest-admin'}) as response:
+            body = await response.json(content_type=None)
+            return body.get('token') if response.status == 200 else None
+    except aiohttp.ClientError:
+        return None
+
+
+# ──────────────────────────────────────────
+# Simulated clients
+# ──────────────────────────────────────────
+class Admin:
+    """Speaks sentences at wpm, with interim results every interim_interval seconds"""
+
+    def __init__(self, url: str, token: Optional[str], recorder: Recorder, wpm: int, interim_interval: float):
+        self.url = url
+        self.token = token
+        self.recorder = recorder
+        self.word_seconds = 60.0 / wpm
+        self.interim_interval = interim_interval
+        self.sent: Dict[str, float] = {}  # interim "temp_id|text" / final trace_id -> perf_counter when emitted
+        self.client = socketio.AsyncClient(reconnection=False, ssl_verify=False)
+        self.connected = asyncio.Event()
+        self.client.on('admin_connected', self.on_admin_connected)
+        self.client.on('transcription_confirmed', self.on_confirmed)
+
+    async def on_admin_connected(self, data):
+        if data.get('success'):
+            self.connected.set()
+        else:
+            self.recorder.error(f"admin_connect: {data.get('error')}")
+
+    async def on_confirmed(self, data):
+        sent = self.sent.get(f"confirm|{data.get('temp_id')}")
+        if sent is not None:
+            self.recorder.latency('admin_final_confirmed', time.perf_counter() - sent)
+
+    async def connect(self):
+        await self.client.connect(f"{self.url}?type=admin&client_id=loadtest-admin",
+                                  headers={'Cookie': '_client_id=loadtest-admin'},
+                                  auth={'token': self.token} if self.token else None,
+                                  transports=['websocket'])
+        await self.client.emit('admin_connect', {'token': self.token})
+        await asyncio.wait_for(self.connected.wait(), 10)
+
+    async def speak(self, stop: asyncio.Event):
+        rng = random.Random(1)
+        while not stop.is_set():
+            words = [rng.choice(WORDS) for _ in range(rng.randint(6, 16))]
+            temp_id = f"temp-{uuid.uuid4().hex[:12]}"
+            started = time.perf_counter()
+            last_interim = started
+            for count in range(1, len(words) + 1):
+                await asyncio.sleep(self.word_seconds)
+                if time.perf_counter() - last_interim >= self.interim_interval and count < len(words):
+                    text = ' '.join(words[:count])
+                    self.sent[f"{temp_id}|{text}"] = last_interim = time.perf_counter()
+                    await self.client.emit('new_transcription', {'text': text, 'is_final': False,
+                                                                 'temp_id': temp_id, 'language': 'en'})
+                    self.recorder.count('interims_sent')
+            trace_id = uuid.uuid4().hex
+            self.sent[trace_id] = self.sent[f"confirm|{temp_id}"] = time.perf_counter()
+            await self.client.emit('new_transcription', {
+                'text': ' '.join(words).capitalize() + '.', 'is_final': True, 'temp_id': temp_id,
+                'language': 'en', 'confidence': 0.95, 'trace_id': trace_id, 'spoken_at': time.time() * 1000})
+            self.recorder.count('finals_sent')
+            await asyncio.sleep(self.word_seconds * 2)  # Pause between sentences
+
+
+class Listener:
+    """One browser tab: subscribe, fetch history, translate (and maybe speak) every caption"""
+
+    def __init__(self, index: int, url: str, admin: Admin, recorder: Recorder,
+                 session: aiohttp.ClientSession, use_tts: bool):
+        self.client_id = f"loadtest-{index:04d}"
+        self.url = url
+        self.admin = admin
+        self.recorder = recorder
+        self.session = session
+        self.use_tts = use_tts
+        self.language, self.locale = LISTENER_LANGUAGES[index % len(LISTENER_LANGUAGES)]
+        self.api_token: Optional[str] = None
+        self.ready = asyncio.Event()
+        self.tasks = set()
+        self.client = socketio.AsyncClient(reconnection=False, ssl_verify=False)
+        self.client.on('ready', self.on_ready)
+        self.client.on('realtime_transcription', self.on_interim)
+        self.client.on('new_translation', self.on_final)
+
+    async def on_ready(self, data):
+        self.api_token = data.get('api_token')
+        self.ready.set()
+
+    async def on_interim(self, data):
+        sent = self.admin.sent.get(f"{data.get('temp_id')}|{data.get('text')}")
+        if sent is not None:
+            self.recorder.latency('interim_delivery', time.perf_counter() - sent)
+        self.recorder.count('interims_received')
+
+    async def on_final(self, data):
+        sent = self.admin.sent.get(data.get('trace_id'))
+        if sent is not None:
+            self.recorder.latency('final_delivery', time.perf_counter() - sent)
+        self.recorder.count('finals_received')
+        task = asyncio.ensure_future(self.follow_up(data.get('corrected') or data.get('original') or ''))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def request(self, name: str, method: str, path: str, **kwargs) -> Optional[bytes]:
+        started = time.perf_counter()
+        try:
+            async with self.session.request(method, f"{self.url}{path}",
+                                            cookies={'_client_id': self.client_id}, **kwargs) as response:
+                body = await response.read()
+            self.recorder.count('http_requests')
+            if response.status != 200:
+                self.recorder.error(f"{name} HTTP {response.status}")
+                return None
+            self.recorder.latency(name, time.perf_counter() - started)
+            return body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.recorder.error(f"{name} {type(e).__name__}")
+            return None
+
+    async def follow_up(self, text: str):
+        if not text:
+            return
+        await self.request('http_translate', 'POST', '/api/translate',
+                           json={'text': text, 'target_lang': self.language})
+        if self.use_tts and self.api_token:
+            audio = await self.request('http_tts', 'POST', '/api/tts/synthesize',
+                                       json={'text': text, 'lang': self.locale},
+                                       headers={'Authorization': f"Bearer {self.api_token}"})
+            if audio is not None:
+                self.recorder.count('tts_bytes', len(audio))
+
+    async def run(self, stop: asyncio.Event):
+        started = time.perf_counter()
+        try:
+            await self.client.connect(f"{self.url}?type=user&client_id={self.client_id}",
+                                      headers={'Cookie': f"_client_id={self.client_id}"},
+                                      transports=['websocket'], wait_timeout=30)
+            await asyncio.wait_for(self.ready.wait(), 30)
+        except (socketio.exceptions.ConnectionError, asyncio.TimeoutError) as e:
+            self.recorder.error(f"connect {type(e).__name__}")
+            return
+        self.recorder.latency('connect', time.perf_counter() - started)
+        self.recorder.count('listeners_connected')
+        await self.request('http_history', 'GET', '/api/translations', params={'limit': 50},
+                           headers={'Authorization': f"Bearer {self.api_token}"})
+        await stop.wait()
+        if self.tasks:
+            await asyncio.wait(list(self.tasks), timeout=10)
+        await self.client.disconnect()
+
+
+# ──────────────────────────────────────────
+# Run
+# ──────────────────────────────────────────
+async def run_load(args) -> Dict:
+    process = None
+    url = args.url
+    if not url:
+        port = free_port()
+        process = start_server(port)
+        scheme = 'https' if (args.config.get('server') or {}).get('use_https') else 'http'
+        url = f"{scheme}://127.0.0.1:{port}"
+    url = url.rstrip('/')
+
+    recorder = Recorder()
+    sampler = ProcessSampler(process.pid if process else args.pid) if (process or args.pid) else None
+    stop = asyncio.Event()
+    connector = aiohttp.TCPConnector(limit=0, ssl=False)
+    timeout = aiohttp.ClientTimeout(total=30)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await wait_until_up(session, url)
+            token = await login(session, url, args.username, args.password)
+            admin = Admin(url, token, recorder, args.wpm, args.interim_interval)
+            await admin.connect()
+
+            sampler_task = asyncio.ensure_future(sampler.run(stop)) if sampler else None
+            listeners = [Listener(i, url, admin, recorder, session, use_tts=i < args.listeners * args.tts_share)
+                         for i in range(args.listeners)]
+            listener_tasks = []
+            for listener in listeners:
+                listener_tasks.append(asyncio.ensure_future(listener.run(stop)))
+                await asyncio.sleep(args.ramp / max(1, args.listeners))
+
+            started = time.perf_counter()
+            speaker = asyncio.ensure_future(admin.speak(stop))
+            await asyncio.sleep(args.duration)
+            stop.set()
+            elapsed = time.perf_counter() - started
+            speaker.cancel()
+            await asyncio.gather(speaker, return_exceptions=True)
+            await asyncio.gather(*listener_tasks, return_exceptions=True)
+            if sampler_task:
+                await sampler_task
+            await admin.client.disconnect()
+    finally:
+        if process:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    counts = dict(recorder.counts)
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'host': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'target': {'url': url, 'spawned': process is not None,
+                   'engines': 'mock' if process is not None else 'as configured'},
+        'parameters': {'listeners': args.listeners, 'duration_seconds': args.duration, 'wpm': args.wpm,
+                       'interim_interval_seconds': args.interim_interval, 'tts_share': args.tts_share,
+                       'ramp_seconds': args.ramp},
+        'elapsed_seconds': round(elapsed, 2),
+        'counts': counts,
+        'throughput_per_second': {
+            'captions_sent': round(counts.get('finals_sent', 0) / elapsed, 2),
+            'events_delivered': round((counts.get('finals_received', 0) + counts.get('interims_received', 0)) / elapsed, 2),
+            'http_requests': round(counts.get('http_requests', 0) / elapsed, 2),
+        },
+        'latency_ms': {name: summarize(values) for name, values in sorted(recorder.latencies.items())},
+        'errors': dict(recorder.errors),
+        'server_process': sampler.report() if sampler else {'available': False},
+    }
+
+
+def print_report(report: Dict):
+    print(f"\n{report['parameters']['listeners']} listeners, {report['elapsed_seconds']}s against "
+          f"{report['target']['url']} ({report['target']['engines']} engines)")
+    print(f"\n{'latency':<24} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+    for name, s in report['latency_ms'].items():
+        if s['count']:
+            print(f"{name:<24} {s['count']:>7} {s['p50']:>8.1f} {s['p95']:>8.1f} {s['p99']:>8.1f} {s['max']:>8.1f}")
+    print("\nthroughput/s: " + ', '.join(f"{k}={v}" for k, v in report['throughput_per_second'].items()))
+    process = report['server_process']
+    if process.get('available'):
+        print(f"server: CPU mean {process['cpu_percent']['mean']}% max {process['cpu_percent']['max']}%, "
+              f"RSS max {process['rss_mb']['max']} MB (start {process['rss_mb']['start']} MB)")
+    print(f"errors: {report['errors'] or 'none'}")
+
+
+def main(argv=None) -> Dict:
+    config = load_config()
+    auth = config.get('authentication') or {}
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help="Existing user server (default: start one with mock engines)")
+    parser.add_argument('--pid', type=int, help="PID of the --url server, for CPU/RSS sampling")
+    parser.add_argument('--listeners', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=60.0, help="Seconds of speech after all listeners joined")
+    parser.add_argument('--ramp', type=float, default=5.0, help="Seconds over which listeners connect")
+    parser.add_argument('--wpm', type=int, default=150, help="Admin speaking rate")
+    parser.add_argument('--interim-interval', type=float, default=0.3)
+    parser.add_argument('--tts-share', type=float, default=0.25, help="Fraction of listeners with TTS enabled")
+    parser.add_argument('--username', default=auth.get('admin_username', 'admin'))
+    parser.add_argument('--password', default=auth.get('admin_password', 'admin123'))
+    parser.add_argument('--output', help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    args.config = config
+
+    report = asyncio.run(run_load(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Shared fixtures: the user and admin servers, loaded once per test session
+
+Executing a server module runs its module-level setup (loggers, metrics
+collectors, background services), so every test file shares one copy.
+Tests that change module state do it through monkeypatch.
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+
+def load_server(name, relative_path):
+    pytest.importorskip('flask_socketio')
+    spec = importlib.util.spec_from_file_location(name, os.path.join(PROJECT_ROOT, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    logging.disable(logging.CRITICAL)  # Startup banners and service warnings
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        logging.disable(logging.NOTSET)
+    module.AUTH_ENABLED = False
+    return module
+
+
+@pytest.fixture(scope='session')
+def user_server():
+    return load_server('test_user_server', os.path.join('app', 'user', 'server.py'))
+
+
+@pytest.fixture(scope='session')
+def admin_server():
+    return load_server('test_admin_server', os.path.join('app', 'admin', 'server.py'))
@@ -0,0 +1,184 @@
+"""
+Connection surge tests for app.admission_control
+
+Synthetic storms against AdmissionController: a fake clock for the exact
+admission math, and an eventlet run showing queued connections don't stall
+other greenlets (the admin's transcription stream).
+
+Run with: python -m pytest scripts/tests/test_admission_control.py
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app.admission_control import AdmissionController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def make_controller(clock, **kwargs):
+    options = dict(rate_per_second=50, burst=100, max_wait_seconds=5, stagger_seconds=3,
+                   clock=clock, rng=lambda: 0.999)
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+def test_calm_connections_are_admitted_immediately_without_stagger():
+    clock = FakeClock()
+    controller = make_controller(clock, rng=lambda: 0.5)
+    admission = controller.admit()
+    assert admission.admitted and admission.wait == 0
+    # Bucket essentially full: no reason to delay the history fetch
+    assert admission.stagger < 0.05
+
+
+def test_burst_then_queue_then_refuse():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    results = [controller.admit() for _ in range(600)]  # Everyone scans the QR code in the same instant
+
+    immediate = [a for a in results if a.admitted and a.wait == 0]
+    queued = [a for a in results if a.admitted and a.wait > 0]
+    refused = [a for a in results if not a.admitted]
+
+    assert len(immediate) == 100                      # The burst
+    assert len(queued) == 50 * 5                      # rate x max wait
+    assert len(refused) == 600 - 100 - 250
+    assert max(a.wait for a in queued) <= 5.0
+    # Queue waits are the reserved slots, one every 1/rate seconds
+    assert [round(a.wait, 3) for a in queued[:3]] == [0.02, 0.04, 0.06]
+    assert all(a.retry_after > 0 for a in refused)
+    assert controller.stats()['refused'] == len(refused)
+
+
+def test_stagger_hint_is_bounded_and_grows_with_load():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    staggers = [controller.admit().stagger for _ in range(200)]
+    assert all(0 <= s <= 3.0 for s in staggers)
+    assert staggers[0] < staggers[50] < staggers[99]
+    assert staggers[150] == pytest.approx(3.0, abs=0.01)  # Burst used up: full window
+
+
+def test_refused_client_fits_in_queue_when_it_retries_after_the_hint():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    refused = None
+    for _ in range(1000):
+        admission = controller.admit()
+        if not admission.admitted:
+            refused = admission
+            break
+    assert refused is not None
+
+    clock.advance(refused.retry_after)
+    retry = controller.admit()
+    assert retry.admitted and retry.wait <= 5.0
+
+
+def test_sustained_rate_is_never_exceeded():
+    clock = FakeClock()
+    controller = make_controller(clock, max_wait_seconds=0)
+    admitted = 0
+    # 30 seconds of 500 attempts per second
+    for _ in range(30 * 100):
+        for _ in range(5):
+            if controller.admit().admitted:
+                admitted += 1
+        clock.advance(0.01)
+    assert admitted <= 100 + 50 * 30 + 1
+
+
+def test_configure_caps_balance_at_new_burst():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    controller.configure(rate_per_second=10, burst=5, max_wait_seconds=1, stagger_seconds=0)
+    results = [controller.admit() for _ in range(20)]
+    assert sum(1 for a in results if a.admitted and a.wait == 0) == 5
+    assert sum(1 for a in results if a.admitted and a.wait > 0) == 10
+    assert all(a.stagger == 0 for a in results)
+
+
+def test_surge_queue_does_not_stall_admin_stream():
+    """500 listeners connect at once while the admin streams a caption every 20 ms"""
+    eventlet = pytest.importorskip("eventlet")
+
+    controller = AdmissionController(rate_per_second=400, burst=100, max_wait_seconds=0.5, stagger_seconds=1)
+    outcomes = {'admitted': 0, 'refused': 0}
+    caption_gaps = []
+    surge_done = eventlet.event.Event()
+
+    def listener():
+        admission = controller.admit()
+        if not admission.admitted:
+            outcomes['refused'] += 1
+            return
+        if admission.wait:
+            eventlet.sleep(admission.wait)  # What handle_connect does with socketio.sleep
+        outcomes['admitted'] += 1
+
+    def admin_stream():
+        last = eventlet.hubs.get_hub().clock()
+        while not surge_done.ready():
+            eventlet.sleep(0.02)
+            now = eventlet.hubs.get_hub().clock()
+            caption_gaps.append(now - last)
+            last = now
+
+    stream = eventlet.spawn(admin_stream)
+    pool = eventlet.GreenPool(1000)
+    for _ in range(500):
+        pool.spawn_n(listener)
+    pool.waitall()
+    surge_done.send()
+    stream.wait()
+
+    assert outcomes['admitted'] + outcomes['refused'] == 500
+    assert 100 + 400 * 0.5 - 5 <= outcomes['admitted'] <= 100 + 400 * 0.5 + 5
+    assert len(caption_gaps) >= 10
+    # The admin's 20 ms cadence survives the storm (generous bound for slow CI machines)
+    assert max(caption_gaps) < 0.2
+
+
+# ──────────────────────────────────────────
+# Through the user server's connect handler
+# ──────────────────────────────────────────
+def test_full_server_refuses_connect_with_retry_after(user_server, monkeypatch):
+    from socketio import packet
+
+    clock = FakeClock()
+    monkeypatch.setattr(user_server, 'connection_admission',
+                        make_controller(clock, rate_per_second=1, burst=1, max_wait_seconds=0))
+
+    sent = []
+
+    class RecordingPacket(user_server.socketio.server.packet_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            sent.append(self)
+
+    monkeypatch.setattr(user_server.socketio.server, 'packet_class', RecordingPacket)
+
+    first = user_server.socketio.test_client(user_server.app, query_string='type=user&client_id=surge-1')
+    assert first.is_connected()
+
+    refused = user_server.socketio.test_client(user_server.app, query_string='type=user&client_id=surge-2')
+    assert not refused.is_connected()
+    connect_errors = [pkt.data for pkt in sent if pkt.packet_type == packet.CONNECT_ERROR]
+    # What user.js reads as error.data.retry_after, not the generic "Connection rejected"
+    assert connect_errors == [{'message': 'server_busy', 'data': {'retry_after': 2.0}}]
+    first.disconnect()
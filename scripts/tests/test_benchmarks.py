@@ -0,0 +1,63 @@
+"""
+Benchmark suite tests for scripts/benchmarks/bench_hot_paths.py and compare_benchmarks.py
+
+Run with: python -m pytest scripts/tests/test_benchmarks.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+BENCHMARKS = os.path.join(PROJECT_ROOT, "scripts", "benchmarks")
+sys.path.insert(0, BENCHMARKS)
+
+import pytest
+
+import compare_benchmarks
+
+
+def report(**medians):
+    return {'environment': {}, 'results': {key: {'median_us': value, 'min_us': value} for key, value in medians.items()}}
+
+
+def test_compare_classifies_changes_beyond_the_threshold():
+    base = report(a=100.0, b=100.0, c=100.0, gone=1.0)
+    new = report(a=125.0, b=70.0, c=105.0, fresh=1.0)
+
+    comparison = compare_benchmarks.compare(base, new, threshold=10)
+    assert [row['case'] for row in comparison['slower']] == ['a']
+    assert [row['case'] for row in comparison['faster']] == ['b']
+    assert [row['case'] for row in comparison['unchanged']] == ['c']
+    assert comparison['slower'][0]['change_percent'] == 25.0
+    assert comparison['added'] == ['fresh'] and comparison['removed'] == ['gone']
+
+
+def test_fail_on_regression_exit_status(tmp_path, capsys):
+    base, new = tmp_path / 'base.json', tmp_path / 'new.json'
+    base.write_text(json.dumps(report(a=100.0)))
+    new.write_text(json.dumps(report(a=150.0)))
+
+    assert compare_benchmarks.main([str(base), str(new)]) == 0
+    assert compare_benchmarks.main([str(base), str(new), '--fail-on-regression']) == 1
+    assert compare_benchmarks.main([str(base), str(base), '--fail-on-regression']) == 0
+    assert 'slower' in capsys.readouterr().out
+
+
+def test_suite_writes_a_stable_report(tmp_path):
+    pytest.importorskip('flask_socketio')
+    output = tmp_path / 'bench.json'
+
+    # Own process: the suite loads (and monkey patches for) the server module
+    subprocess.run([sys.executable, os.path.join(BENCHMARKS, 'bench_hot_paths.py'), '--sizes', '100', '200',
+                    '--repeat', '2', '--filter', 'get_translations', '--output', str(output)],
+                   check=True, timeout=120, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    result = json.loads(output.read_text())
+    assert result['schema_version'] == 1
+    assert sorted(result['results']) == ['get_translations_after_id@100', 'get_translations_after_id@200',
+                                         'get_translations_page@100', 'get_translations_page@200']
+    page = result['results']['get_translations_page@200']
+    assert page['name'] == 'get_translations_page' and page['size'] == 200 and page['rounds'] == 2
+    assert 0 < page['min_us'] <= page['median_us'] <= page['max_us']
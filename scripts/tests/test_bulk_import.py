@@ -0,0 +1,116 @@
+"""
+Bulk import tests for the import_transcription_batch handler and /api/translations?after_id paging
+
+Run with: python -m pytest scripts/tests/test_bulk_import.py
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+
+@pytest.fixture
+def server(user_server, monkeypatch):
+    monkeypatch.setattr(user_server, 'archive', None)
+    monkeypatch.setattr(user_server, 'translations_history', [])
+    monkeypatch.setattr(user_server, 'next_translation_id', 1000)
+    monkeypatch.setattr(user_server.limiter, 'enabled', False)
+    return user_server
+
+
+@pytest.fixture
+def announced(server, monkeypatch):
+    """history_bulk_added payloads broadcast by the server (the test client does not see broadcasts)"""
+    payloads = []
+    original_emit = server.socketio.emit
+
+    def emit(event, *args, **kwargs):
+        if event == 'history_bulk_added':
+            payloads.append(args[0])
+        return original_emit(event, *args, **kwargs)
+
+    monkeypatch.setattr(server.socketio, 'emit', emit)
+    return payloads
+
+
+@pytest.fixture
+def admin(server):
+    client = server.socketio.test_client(server.app, query_string='type=admin&client_id=bulk-admin')
+    client.emit('admin_connect', {})
+    yield client
+    if client.is_connected():
+        client.disconnect()
+
+
+def item(i):
+    return {'original': f"line {i}", 'corrected': f"line {i}"}
+
+
+def send_chunk(admin, items, final=False, import_id='imp-1'):
+    return admin.emit('import_transcription_batch', {'import_id': import_id, 'items': items, 'final': final},
+                      callback=True)
+
+
+def test_chunks_are_acknowledged_and_announced_once_on_the_final_chunk(server, admin, announced):
+    ack = send_chunk(admin, [item(1), {'original': 'no corrected field'}, item(2)])
+    assert ack['success'] and ack['accepted'] == 2
+    assert [r['index'] for r in ack['rejected']] == [1] and 'corrected' in ack['rejected'][0]['error']
+    assert (ack['first_id'], ack['last_id']) == (1000, 1001)
+    assert announced == []
+
+    ack = send_chunk(admin, [item(3), item(4), item(5)], final=True)
+    assert (ack['accepted'], ack['first_id'], ack['last_id']) == (3, 1002, 1004)
+    assert announced == [{'count': 5, 'first_id': 1000, 'last_id': 1004, 'total': 5}]
+    assert [t['id'] for t in server.translations_history] == list(range(1000, 1005))
+
+
+def test_abandoned_import_is_announced_when_the_admin_disconnects(server, admin, announced):
+    send_chunk(admin, [item(1), item(2)])
+    admin.disconnect()
+    assert announced == [{'count': 2, 'first_id': 1000, 'last_id': 1001, 'total': 2}]
+
+
+def test_new_import_supersedes_an_unfinished_one(server, admin, announced):
+    send_chunk(admin, [item(1)], import_id='first')
+    send_chunk(admin, [item(2)], import_id='second', final=True)
+    assert [(n['count'], n['first_id']) for n in announced] == [(1, 1000), (1, 1001)]
+
+
+def test_invalid_chunks_are_refused(server, admin, announced, monkeypatch):
+    too_many = [item(i) for i in range(server.IMPORT_CHUNK_MAX_ITEMS + 1)]
+    assert not send_chunk(admin, too_many)['success']
+    assert admin.emit('import_transcription_batch', {'items': 'nope'}, callback=True) == \
+        {'success': False, 'error': 'Invalid data'}
+
+    monkeypatch.setattr(server, 'AUTH_ENABLED', True)  # admin_connect above never logged in
+    assert send_chunk(admin, [item(1)], final=True) == {'success': False, 'error': 'Unauthorized'}
+    assert server.translations_history == [] and announced == []
+
+
+def test_after_id_paging(server):
+    server.translations_history = [{'id': i, 'original': f"line {i}", 'corrected': f"line {i}"} for i in range(1, 251)]
+    server.translations_history[10], server.translations_history[20] = \
+        server.translations_history[20], server.translations_history[10]  # Admin reordering
+
+    http = server.app.test_client()
+    http.set_cookie('_client_id', 'bulk-reader')
+    headers = {'Authorization': f"Bearer {server.create_api_token('bulk-reader-sid')}"}
+
+    seen = []
+    cursor = 0
+    while True:
+        page = http.get(f"/api/translations?after_id={cursor}&limit=100", headers=headers).get_json()
+        seen += [t['id'] for t in page['translations']]
+        cursor = page['next_after_id']
+        if not page['has_more']:
+            break
+    assert seen == list(range(1, 251))
+    assert page['total'] == 250 and cursor == 250
+
+    empty = http.get("/api/translations?after_id=250", headers=headers).get_json()
+    assert empty['translations'] == [] and not empty['has_more'] and empty['next_after_id'] == 250
+    assert http.get("/api/translations?after_id=abc", headers=headers).status_code == 400
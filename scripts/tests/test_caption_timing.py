@@ -0,0 +1,130 @@
+"""
+Caption timing tests for app.caption_timing and the subtitle cue output of app.transcript_export
+
+Run with: python -m pytest scripts/tests/test_caption_timing.py
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app import caption_timing, transcript_export
+from app.caption_timing import CaptionClock, cue_times
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def cue(item_id, start=None, end=None, session='s1', text=None):
+    item = {'id': item_id, 'corrected': text or f"caption {item_id}"}
+    if start is not None:
+        item.update(start_offset=start, end_offset=end, session=session)
+    return item
+
+
+def spans(items):
+    return [(item['id'], start, end) for item, start, end in cue_times(items)]
+
+
+# ──────────────────────────────────────────
+# CaptionClock
+# ──────────────────────────────────────────
+def test_final_spans_from_first_interim_to_final():
+    clock = FakeClock()
+    timing = CaptionClock(clock=clock)
+    assert timing.interim('t1') == 0.0  # The first caption starts the session
+    clock.now = 101.5
+    assert timing.interim('t1') == 1.5  # Later interims keep the first-seen time
+    clock.now = 103.0
+    result = timing.final('t1', 'hello there')
+    assert result['start_offset'] == 0.0 and result['end_offset'] == 3.0 and result['session']
+
+
+def test_final_without_interim_gets_length_based_start_after_previous_end():
+    clock = FakeClock()
+    timing = CaptionClock(clock=clock)
+    timing.interim('t1')
+    clock.now = 103.0
+    timing.final('t1', 'first')
+
+    clock.now = 104.0
+    pasted = timing.final(None, 'x' * 50)  # 50 chars * 0.06 s = 3 s, but never before the previous end
+    assert (pasted['start_offset'], pasted['end_offset']) == (3.0, 4.0)
+
+    clock.now = 120.0
+    short = timing.final(None, 'hi')  # Clamped to the minimum cue length
+    assert (short['start_offset'], short['end_offset']) == (19.0, 20.0)
+
+    clock.now = 200.0
+    long = timing.final('never-seen', 'y' * 500)  # Capped estimate
+    assert long['end_offset'] - long['start_offset'] == caption_timing.MAX_ESTIMATED_SECONDS
+
+
+def test_reset_starts_a_new_session():
+    clock = FakeClock()
+    timing = CaptionClock(clock=clock)
+    timing.interim('t1')
+    clock.now = 150.0
+    timing.reset()
+    clock.now = 160.0
+    timing.interim('t2')
+    clock.now = 162.0
+    assert timing.final('t2', 'after clear')['start_offset'] == 0.0
+
+
+def test_estimate_duration_bounds():
+    assert caption_timing.estimate_duration('') == caption_timing.MIN_CUE_SECONDS
+    assert caption_timing.estimate_duration('a' * 50) == pytest.approx(3.0)
+    assert caption_timing.estimate_duration('a' * 10000) == caption_timing.MAX_ESTIMATED_SECONDS
+
+
+# ──────────────────────────────────────────
+# cue_times
+# ──────────────────────────────────────────
+def test_overlapping_cue_is_clipped_to_the_next_start():
+    assert spans([cue(1, 0.0, 3.0), cue(2, 2.0, 5.0)]) == [(1, 0.0, 2.0), (2, 2.0, 5.0)]
+
+
+def test_untimed_items_follow_the_previous_cue():
+    fallback = caption_timing.FALLBACK_CUE_SECONDS
+    assert spans([cue(1, 0.0, 3.0), cue(2), cue(3)]) == [
+        (1, 0.0, 3.0), (2, 3.0, 3.0 + fallback), (3, 3.0 + fallback, 3.0 + 2 * fallback)]
+    assert spans([cue(1)]) == [(1, 0.0, fallback)]
+
+
+def test_sessions_are_stitched_end_to_end_with_a_gap():
+    gap = caption_timing.SESSION_GAP_SECONDS
+    result = spans([cue(1, 0.0, 3.0), cue(2, 4.0, 6.0), cue(3, 0.5, 2.0, session='s2')])
+    assert result == [(1, 0.0, 3.0), (2, 4.0, 6.0), (3, 6.0 + gap, 6.0 + gap + 1.5)]
+
+
+def test_cues_stay_monotonic_and_at_least_the_minimum_length():
+    result = spans([cue(1, 5.0, 6.0), cue(2, 1.0, 1.2)])  # Out of order, too short
+    assert result[1][1] == 5.0 and result[1][2] - result[1][1] == caption_timing.MIN_CUE_SECONDS
+    starts = [start for _, start, _ in result]
+    assert starts == sorted(starts)
+
+
+# ──────────────────────────────────────────
+# Cue text and WebVTT output
+# ──────────────────────────────────────────
+def test_cue_text_has_no_blank_lines_or_arrows():
+    assert transcript_export._cue_text('a --> b\n\n  \nc') == 'a -> b\nc'
+    assert transcript_export._cue_text('\n\n') == ' '
+
+
+def test_vtt_output():
+    items = [cue(1, 0.0, 2.5, text='Hello'), cue(2, 61.0, 62.0, text='line one\n\nline --> two')]
+    text = b''.join(transcript_export.export_stream('vtt', items, clean=lambda value, max_length: value)).decode()
+    assert text == ("WEBVTT\n\n"
+                    "1\n00:00:00.000 --> 00:00:02.500\nHello\n\n"
+                    "2\n00:01:01.000 --> 00:01:02.000\nline one\nline -> two\n\n")
@@ -0,0 +1,117 @@
+"""
+Config hot-reload tests for config_snapshot.ReloadableConfig (and SecureConfig)
+
+Run with: python -m pytest scripts/tests/test_config_snapshot.py
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from config_snapshot import ConfigSnapshot, ReloadableConfig
+
+BASE = """
+server:
+  port: 1915
+  debug: "off"
+logging:
+  level: INFO
+advanced:
+  performance:
+    cache_size: 1000
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text(BASE, encoding='utf-8')
+    return path
+
+
+def test_typed_accessors_and_defaults():
+    snapshot = ConfigSnapshot({'a': {'flag': 'yes', 'count': '12', 'ratio': 1, 'items': 'one', 'none': None}})
+    assert snapshot.get_bool('a', 'flag') is True
+    assert snapshot.get_int('a', 'count') == 12 and snapshot.get_int('a', 'missing', default=7) == 7
+    assert snapshot.get_float('a', 'ratio') == 1.0
+    assert snapshot.get_list('a', 'items') == ['one']
+    assert snapshot.get('a', 'none', default='fallback') == 'fallback'
+    assert snapshot.get_str('a', default='x') == 'x'  # A section is not a string
+
+
+def test_diff_reports_changed_added_and_removed_leaves():
+    old = ConfigSnapshot({'a': {'b': 1, 'c': 2}, 'gone': True})
+    new = ConfigSnapshot({'a': {'b': 1, 'c': 3}, 'fresh': 'x'})
+    assert new.diff(old) == {('a', 'c'), ('gone',), ('fresh',)}
+    assert old.diff(ConfigSnapshot({'a': {'b': 1, 'c': 2}, 'gone': True})) == frozenset()
+
+
+def test_reload_swaps_snapshot_and_notifies_matching_subscribers(config_file):
+    config = ReloadableConfig(config_file)
+    calls = {'all': [], 'logging': [], 'advanced': []}
+
+    config.subscribe(lambda snapshot, changed: calls['all'].append(changed))
+    config.subscribe(lambda snapshot, changed: calls['logging'].append(snapshot.get('logging', 'level')), 'logging')
+
+    @config.subscribe_to('advanced')
+    def on_advanced(snapshot, changed):
+        calls['advanced'].append(changed)
+
+    assert not config.reload()  # Nothing changed
+    config_file.write_text(BASE.replace('level: INFO', 'level: WARNING'), encoding='utf-8')
+    assert config.reload()
+
+    assert config.epoch == 1 and config.get('logging', 'level') == 'WARNING'
+    assert calls['all'] == [{('logging', 'level')}]
+    assert calls['logging'] == ['WARNING'] and calls['advanced'] == []
+
+
+def test_failing_subscriber_does_not_block_the_others(config_file):
+    config = ReloadableConfig(config_file)
+    seen = []
+
+    def broken(snapshot, changed):
+        raise RuntimeError('subscriber bug')
+
+    config.subscribe(broken)
+    config.subscribe(lambda snapshot, changed: seen.append(snapshot.epoch))
+    config_file.write_text(BASE.replace('1915', '1916'), encoding='utf-8')
+    assert config.reload() and seen == [1]
+
+
+@pytest.mark.parametrize('replacement', [None, '', '# saving...\n', 'server: [unclosed\n', '- just a list\n'])
+def test_missing_empty_or_broken_file_keeps_previous_snapshot(config_file, replacement):
+    config = ReloadableConfig(config_file)
+    notified = []
+    config.subscribe(lambda snapshot, changed: notified.append(changed))
+
+    if replacement is None:
+        config_file.unlink()  # Mid rename-and-replace save, or deleted
+    else:
+        config_file.write_text(replacement, encoding='utf-8')
+
+    assert not config.reload()
+    assert config.epoch == 0 and config.get_int('server', 'port') == 1915 and notified == []
+
+    config_file.write_text(BASE.replace('1915', '2000'), encoding='utf-8')
+    assert config.reload() and config.get_int('server', 'port') == 2000
+
+
+def test_missing_file_at_startup_still_starts_with_defaults(tmp_path):
+    config = ReloadableConfig(tmp_path / 'absent.yaml')
+    assert config.data == {} and config.get('server', 'port', default=1915) == 1915
+
+
+def test_secure_config_reload_keeps_snapshot_when_file_is_missing(config_file):
+    pytest.importorskip('cryptography')
+    from secure_loader import SecureConfig
+
+    config = SecureConfig(config_file, secrets_path=config_file.parent / 'secrets.key')
+    assert config.get_int('server', 'port') == 1915
+    config_file.unlink()
+    assert not config.reload()
+    assert config.get_int('server', 'port') == 1915
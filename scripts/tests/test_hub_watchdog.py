@@ -0,0 +1,168 @@
+"""
+Event loop watchdog tests for app.hub_watchdog
+
+Run with: python -m pytest scripts/tests/test_hub_watchdog.py
+"""
+
+import os
+import sys
+import traceback
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app import hub_watchdog, metrics
+from app.hub_watchdog import HubWatchdog
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def watchdog(clock):
+    return HubWatchdog(threshold_seconds=0.25, interval_seconds=0.05, report_logger=RecordingLogger(),
+                       min_report_interval=5.0, registry=metrics.Registry(), clock=clock)
+
+
+def blocking_call(release):
+    release.wait(10)  # Stands in for a sync call holding the hub
+
+
+@pytest.fixture
+def blocked_thread(watchdog):
+    """A real OS thread (other suites monkey patch threading) parked in blocking_call, registered as the hub thread"""
+    release = hub_watchdog._threading.Event()
+    thread = hub_watchdog._threading.Thread(target=blocking_call, args=(release,), daemon=True)
+    thread.start()
+    watchdog.hub_thread_id = thread.ident
+    yield thread
+    release.set()
+    thread.join()
+
+
+def beat(watchdog, clock):
+    """The heartbeat going to sleep now"""
+    watchdog.sleep_started = clock.now
+
+
+def frame(filename, lineno, name):
+    return traceback.FrameSummary(filename, lineno, name)
+
+
+# ──────────────────────────────────────────
+# culprit
+# ──────────────────────────────────────────
+def test_culprit_is_the_innermost_project_frame():
+    app_file = os.path.join(PROJECT_ROOT, 'app', 'user', 'server.py')
+    stack = [
+        frame(os.path.join(PROJECT_ROOT, 'app', 'tts_service.py'), 10, 'outer'),
+        frame(app_file, 42, 'handle_export'),
+        frame('/usr/lib/python3.11/site-packages/requests/sessions.py', 500, 'send'),
+        frame('/usr/lib/python3.11/socket.py', 700, 'recv_into'),
+    ]
+    assert hub_watchdog.culprit(stack) == f"{os.path.join('app', 'user', 'server.py')}:42 in handle_export"
+
+
+def test_culprit_skips_the_watchdog_and_falls_back_to_the_innermost_frame():
+    watchdog_file = os.path.join(PROJECT_ROOT, 'app', 'hub_watchdog.py')
+    stack = [frame('/usr/lib/python3.11/json/encoder.py', 200, 'encode'), frame(watchdog_file, 1, 'check')]
+    assert hub_watchdog.culprit(stack) == f"{watchdog_file}:1 in check"
+    assert hub_watchdog.culprit([frame('/usr/lib/python3.11/json/encoder.py', 200, 'encode')]) == \
+        '/usr/lib/python3.11/json/encoder.py:200 in encode'
+    assert hub_watchdog.culprit([]) == 'unknown'
+
+
+# ──────────────────────────────────────────
+# check (monitor side)
+# ──────────────────────────────────────────
+def test_overdue_heartbeat_reports_the_blocking_stack_once(watchdog, clock, blocked_thread):
+    beat(watchdog, clock)
+    clock.now += 0.05 + 0.2  # Lag 0.2s: under the threshold
+    assert watchdog.check() is None
+
+    clock.now += 0.1
+    report = watchdog.check()
+    assert report['blocked_for'] == pytest.approx(0.3)
+    assert report['culprit'].startswith(os.path.join('scripts', 'tests', 'test_hub_watchdog.py'))
+    assert report['culprit'].endswith('in blocking_call') and 'blocking_call' in report['stack']
+    assert len(watchdog.report_logger.warnings) == 1 and 'likely culprit' in watchdog.report_logger.warnings[0]
+
+    clock.now += 1.0
+    assert watchdog.check() is None  # Same stall, already reported
+    assert watchdog.logged_beat == watchdog.sleep_started
+
+
+def test_nothing_to_check_before_the_heartbeat_runs(watchdog, clock):
+    clock.now += 10
+    assert watchdog.check() is None
+    beat(watchdog, clock)
+    clock.now += 10
+    assert watchdog.check() is None  # Hub thread not known yet
+
+
+def test_reports_are_rate_limited(watchdog, clock, blocked_thread):
+    beat(watchdog, clock)
+    clock.now += 1.0
+    assert watchdog.check() is not None
+
+    beat(watchdog, clock)  # A second stall within min_report_interval
+    clock.now += 1.0
+    assert watchdog.check() is None
+    assert watchdog.reported_beat == watchdog.sleep_started and watchdog.logged_beat != watchdog.sleep_started
+
+    clock.now += 5.0
+    assert watchdog.check() is None  # That stall was seen; it is not reported late
+
+    beat(watchdog, clock)
+    clock.now += 1.0
+    assert watchdog.check() is not None
+    assert len(watchdog.recent) == 2 and len(watchdog.report_logger.warnings) == 2
+
+
+# ──────────────────────────────────────────
+# heartbeat (hub side)
+# ──────────────────────────────────────────
+def test_heartbeat_counts_stalls_and_logs_when_a_reported_one_ends(watchdog, clock):
+    lags = [0.01, 0.6, 0.4]
+
+    def sleep(seconds):
+        if watchdog.sleep_started is not None and len(lags) == 2:
+            watchdog.logged_beat = watchdog.sleep_started  # The monitor reported the 0.6s stall
+        clock.now += seconds + lags.pop(0)
+        if not lags:
+            watchdog.running = False
+
+    watchdog.running = True
+    watchdog.heartbeat(sleep)
+
+    assert watchdog.stats()['stalls'] == 2
+    assert watchdog.report_logger.warnings == ['Hub resumed after blocking for 0.600s']
+    assert watchdog.hub_thread_id == hub_watchdog._thread.get_ident()
+
+
+def test_stats_leave_out_stacks(watchdog, clock, blocked_thread):
+    beat(watchdog, clock)
+    clock.now += 1.0
+    watchdog.check()
+    recent = watchdog.stats()['recent']
+    assert len(recent) == 1 and 'stack' not in recent[0] and 'culprit' in recent[0]
@@ -0,0 +1,163 @@
+"""
+Caption latency tests for app.latency_tracing
+
+Run with: python -m pytest scripts/tests/test_latency_tracing.py
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app.latency_tracing import ALL_LANGUAGES, OTHER_LANGUAGE, LatencyTracker, QuantileWindow
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1700000000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def tracker(clock):
+    return LatencyTracker(window=100, clock=clock)
+
+
+def stage(tracker, name, language=ALL_LANGUAGES):
+    return tracker.summary()['stages'][name][language]
+
+
+def test_nearest_rank_quantiles():
+    window = QuantileWindow(100)
+    for value in range(100, 0, -1):
+        window.add(value / 1000)
+    assert window.quantiles() == {0.5: 0.05, 0.95: 0.095, 0.99: 0.099}
+    assert QuantileWindow(10).quantiles() == {}
+
+    single = QuantileWindow(10)
+    single.add(0.3)
+    assert set(single.quantiles().values()) == {0.3}
+
+
+def test_window_keeps_only_recent_samples_but_counts_all(clock):
+    small = LatencyTracker(window=3, clock=clock)
+    for seconds in (9.0, 9.0, 9.0, 0.1, 0.2, 0.3):
+        small.record('render', 'es', seconds)
+    assert stage(small, 'render', 'es') == {'count': 6, 'p50': 200.0, 'p95': 300.0, 'p99': 300.0}
+
+
+def test_trace_derives_every_stage_on_the_server_clock(tracker, clock):
+    spoken_ms = clock.now * 1000 - 400  # Admin recognised the speech 400 ms before the server got it
+    tracker.start('t1', spoken_ms, 'en')
+    clock.now += 0.05
+    tracker.broadcast('t1')
+
+    received_at = clock.now * 1000 + 120
+    assert tracker.client_report({'trace_id': 't1', 'language': 'es', 'received_at': received_at,
+                                  'stages': {'translate': 300, 'tts': 500, 'render': 700}})
+
+    assert stage(tracker, 'uplink', 'en')['p50'] == 400.0
+    assert stage(tracker, 'server', 'en')['p50'] == pytest.approx(50.0)
+    assert stage(tracker, 'downlink', 'es')['p50'] == 120.0
+    assert stage(tracker, 'translate', 'es')['p50'] == 300.0
+    assert stage(tracker, 'render', 'es')['p50'] == 700.0
+    # 400 uplink + 50 server + 120 downlink + 700 render
+    assert stage(tracker, 'end_to_end', 'es')['p50'] == pytest.approx(1270.0)
+    assert stage(tracker, 'end_to_end')['count'] == 1
+
+
+def test_end_to_end_needs_the_admin_time_and_a_render(tracker, clock):
+    tracker.start('t1', None, 'en')
+    tracker.broadcast('t1')
+    tracker.client_report({'trace_id': 't1', 'received_at': clock.now * 1000, 'stages': {'render': 10}})
+    tracker.start('t2', clock.now * 1000, 'en')
+    tracker.broadcast('t2')
+    tracker.client_report({'trace_id': 't2', 'received_at': clock.now * 1000, 'stages': {'translate': 10}})
+
+    stages = tracker.summary()['stages']
+    assert 'end_to_end' not in stages and 'uplink' in stages
+    assert stages['downlink']['en']['count'] == 2  # Falls back to the trace language
+
+
+@pytest.mark.parametrize('report', [
+    None,
+    {'trace_id': 'bad id!'},
+    {'trace_id': 'unknown'},
+    {'trace_id': 'not-broadcast'},
+])
+def test_unusable_reports_are_dropped(tracker, report):
+    tracker.start('not-broadcast', None, 'en')
+    assert not tracker.client_report(report)
+    assert tracker.summary()['dropped_reports'] == 1 and tracker.summary()['stages'] == {}
+
+
+def test_implausible_timings_are_dropped(tracker, clock):
+    tracker.start('t1', None, 'en')
+    tracker.broadcast('t1')
+    early = clock.now * 1000 - 5000  # Listener clock ahead of the server: negative downlink
+    assert tracker.client_report({'trace_id': 't1', 'received_at': early,
+                                  'stages': {'translate': 61000, 'tts': float('nan'), 'render': True}})
+
+    assert set(tracker.summary()['stages']) == {'server'}
+    assert tracker.summary()['dropped_reports'] == 2  # Negative downlink and the > 1 minute translate
+    assert not tracker.record('unknown_stage', 'en', 0.1)
+    assert tracker.start('bad id!', None, 'en') is None
+
+
+def test_unknown_and_excess_languages_fold_into_other(clock):
+    tracker = LatencyTracker(max_languages=2, clock=clock)
+    for language in ('en', 'ES', 'fr', '<script>'):
+        tracker.record('render', language, 0.1)
+    assert set(tracker.summary()['stages']['render']) == {'en', 'es', OTHER_LANGUAGE, ALL_LANGUAGES}
+    assert stage(tracker, 'render', OTHER_LANGUAGE)['count'] == 2
+
+
+def test_one_report_per_listener_and_caption(tracker, clock, monkeypatch):
+    tracker.start('t1', None, 'en')
+    tracker.broadcast('t1')
+    report = {'trace_id': 't1', 'received_at': clock.now * 1000, 'stages': {'render': 10}}
+    assert tracker.client_report(report, reporter='sid-1')
+    assert not tracker.client_report(dict(report), reporter='sid-1')  # Replayed
+    assert tracker.client_report(report, reporter='sid-2')
+    assert stage(tracker, 'render')['count'] == 2 and tracker.summary()['dropped_reports'] == 1
+
+    monkeypatch.setattr('app.latency_tracing.MAX_REPORTERS_PER_TRACE', 2)
+    assert not tracker.client_report(report, reporter='sid-3')
+    assert tracker.summary()['dropped_reports'] == 2
+
+
+# ──────────────────────────────────────────
+# latency_report through the user server
+# ──────────────────────────────────────────
+def test_latency_report_event_is_limited_per_socket(user_server, clock, monkeypatch):
+    from app.rate_limiting import SlidingWindowLimiter
+
+    tracker = LatencyTracker(clock=clock)
+    monkeypatch.setattr(user_server, 'caption_latency', tracker)
+    monkeypatch.setattr(user_server, 'latency_report_limiter',
+                        SlidingWindowLimiter(limit=2, window_seconds=60, clock=clock))
+    for trace_id in ('t1', 't2', 't3'):
+        tracker.start(trace_id, None, 'en')
+        tracker.broadcast(trace_id)
+
+    def report(trace_id):
+        return {'trace_id': trace_id, 'received_at': clock.now * 1000, 'stages': {'render': 10}}
+
+    listener = user_server.socketio.test_client(user_server.app, query_string='type=user&client_id=latency-listener')
+    listener.emit('latency_report', {'reports': [report('t1'), report('t1')]})  # Same caption twice
+    listener.emit('latency_report', {'reports': [report('t2')]})
+    listener.emit('latency_report', {'reports': [report('t3'), report('t3')]})  # Over the event limit
+    listener.disconnect()
+
+    assert stage(tracker, 'render')['count'] == 2
+    assert tracker.summary()['dropped_reports'] == 3
@@ -0,0 +1,209 @@
+"""
+Metrics tests for app.metrics and the /metrics endpoints
+
+Registry rendering in the Prometheus text format, Socket.IO instrumentation,
+and a scrape of both servers running on a real eventlet WSGI listener.
+
+Run with: python -m pytest scripts/tests/test_metrics.py
+"""
+
+import os
+import re
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app import metrics
+
+
+def sample(text, name, labels=''):
+    """Value of one sample line in a scrape, or None"""
+    match = re.search(rf'^{re.escape(name + labels)} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_counter_gauge_and_histogram_render_in_text_format():
+    registry = metrics.Registry()
+    hits = registry.counter('cache_total', 'Cache lookups', ('result',))
+    depth = registry.gauge('queue_depth', 'Queued jobs')
+    latency = registry.histogram('work_seconds', 'Work duration', buckets=(0.1, 1.0))
+
+    hits.inc('hit')
+    hits.inc('hit')
+    hits.inc('miss')
+    depth.set(3)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = registry.render()
+    assert '# TYPE ezy_cache_total counter' in text
+    assert sample(text, 'ezy_cache_total', '{result="hit"}') == 2
+    assert sample(text, 'ezy_cache_total', '{result="miss"}') == 1
+    assert sample(text, 'ezy_queue_depth') == 3
+    assert sample(text, 'ezy_work_seconds_bucket', '{le="0.1"}') == 1
+    assert sample(text, 'ezy_work_seconds_bucket', '{le="1"}') == 2
+    assert sample(text, 'ezy_work_seconds_bucket', '{le="+Inf"}') == 3
+    assert sample(text, 'ezy_work_seconds_count') == 3
+    assert sample(text, 'ezy_work_seconds_sum') == pytest.approx(5.55)
+
+
+def test_registration_is_get_or_create_and_rejects_conflicts():
+    registry = metrics.Registry()
+    assert registry.counter('events_total', 'Events', ('kind',)) is registry.counter('events_total', 'Events', ('kind',))
+    with pytest.raises(ValueError):
+        registry.gauge('events_total', 'Events', ('kind',))
+    with pytest.raises(ValueError):
+        registry.counter('events_total', 'Events').inc('a', 'b')
+
+
+def test_label_values_are_escaped():
+    registry = metrics.Registry()
+    registry.counter('odd_total', 'Odd labels', ('path',)).inc('a"b\\c\nd')
+    assert 'ezy_odd_total{path="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_broken_collector_does_not_break_the_scrape():
+    registry = metrics.Registry()
+    registry.gauge('alive', 'Still rendered').set(1)
+    registry.register_collector('broken', lambda: 1 / 0)
+    registry.register_collector('sizes', lambda: [metrics.Family('items', 'gauge', 'Items', ('table',), [(('a',), 4)])])
+
+    text = registry.render()
+    assert sample(text, 'ezy_alive') == 1
+    assert sample(text, 'ezy_items', '{table="a"}') == 4
+
+
+def test_hub_lag_probe_records_late_wakeups():
+    registry = metrics.Registry()
+    now = [0.0]
+    probe = metrics.HubLagProbe(interval_seconds=0.5, registry=registry, clock=lambda: now[0])
+
+    def late_sleep(seconds):
+        now[0] += seconds + 0.2
+
+    assert probe.sample(late_sleep) == pytest.approx(0.2)
+    text = registry.render()
+    assert sample(text, 'ezy_eventlet_hub_lag_seconds') == pytest.approx(0.2)
+    assert sample(text, 'ezy_eventlet_hub_lag_histogram_seconds_count') == 1
+
+
+# ──────────────────────────────────────────
+# Scraping the running servers
+# ──────────────────────────────────────────
+def scrape(app, path='/metrics', headers=None):
+    """Serve app on an ephemeral port with eventlet and GET path over real HTTP"""
+    eventlet = pytest.importorskip('eventlet')
+    import eventlet.wsgi
+    from eventlet.green.urllib import error, request
+
+    listener = eventlet.listen(('127.0.0.1', 0))
+    server = eventlet.spawn(eventlet.wsgi.server, listener, app, log_output=False)
+    try:
+        url = f"http://127.0.0.1:{listener.getsockname()[1]}{path}"
+        try:
+            with request.urlopen(request.Request(url, headers=headers or {}), timeout=10) as response:
+                return response.status, response.headers.get('Content-Type'), response.read().decode('utf-8')
+        except error.HTTPError as e:
+            return e.code, e.headers.get('Content-Type'), e.read().decode('utf-8')
+    finally:
+        server.kill()
+        listener.close()
+
+
+def test_user_server_scrape_reports_http_socketio_and_state(user_server):
+    app = user_server.app
+    listener = user_server.socketio.test_client(app, query_string='client_id=metrics-listener')
+    admin = user_server.socketio.test_client(app, query_string='type=admin&client_id=metrics-admin')
+    admin.emit('admin_connect', {})
+    admin.emit('new_transcription', {'text': 'Metrics caption', 'is_final': True})
+    app.test_client().get('/api/health')
+    translator = user_server.get_translation_service()
+    translator.cache.set('Metrics caption', 'es', 'Subtítulo de métricas')
+    assert translator.translate('Metrics caption', 'es') == (True, 'Subtítulo de métricas', True)
+
+    status, content_type, text = scrape(app)
+    assert status == 200
+    assert content_type.startswith('text/plain')
+
+    assert sample(text, 'ezy_http_requests_total', '{route="/api/health",method="GET",status="200"}') >= 1
+    assert sample(text, 'ezy_http_request_duration_seconds_count', '{route="/api/health",method="GET"}') >= 1
+    assert sample(text, 'ezy_socketio_events_in_total', '{event="new_transcription"}') == 1
+    assert sample(text, 'ezy_socketio_handler_seconds_count', '{event="new_transcription"}') == 1
+    assert sample(text, 'ezy_socketio_events_out_total', '{event="new_translation",scope="broadcast"}') >= 1
+    assert sample(text, 'ezy_socketio_broadcast_recipients_count', '{event="new_translation"}') >= 1
+    assert sample(text, 'ezy_connected_clients', '{type="user"}') == 1
+    assert sample(text, 'ezy_connected_clients', '{type="admin"}') == 1
+    assert sample(text, 'ezy_history_items') >= 1
+    assert sample(text, 'ezy_tts_queue_depth') == 0
+    assert sample(text, 'ezy_translation_cache_total', '{result="hit"}') >= 1
+
+    listener.disconnect()
+    admin.disconnect()
+
+
+def test_user_server_metrics_token(user_server, monkeypatch):
+    original = user_server.config_loader.get_str
+
+    def with_token(*keys, default=''):
+        return 's3cret' if keys == ('advanced', 'metrics', 'token') else original(*keys, default=default)
+
+    monkeypatch.setattr(user_server.config_loader, 'get_str', with_token)
+    assert scrape(user_server.app)[0] == 401
+    assert scrape(user_server.app, headers={'Authorization': 'Bearer wrong'})[0] == 401
+    assert scrape(user_server.app, headers={'Authorization': 'Bearer s3cret'})[0] == 200
+
+
+def test_scrape_allowed_policy():
+    assert metrics.scrape_allowed('', None, '127.0.0.1', {}) == (True, 403)
+    assert metrics.scrape_allowed('', None, '::1', {}) == (True, 403)
+    assert metrics.scrape_allowed('', None, '203.0.113.9', {}) == (False, 403)
+    # Proxied (possibly spoofed to look local through ProxyFix)
+    assert metrics.scrape_allowed('', None, '127.0.0.1', {'X-Forwarded-For': '127.0.0.1'}) == (False, 403)
+    assert metrics.scrape_allowed('tok', 'Bearer tok', '203.0.113.9', {'X-Forwarded-For': '1.2.3.4'}) == (True, 401)
+    assert metrics.scrape_allowed('tok', None, '127.0.0.1', {}) == (False, 401)
+
+
+def test_user_server_metrics_refuses_remote_scrapes_without_token(user_server):
+    client = user_server.app.test_client()
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '203.0.113.9'}).status_code == 403
+    assert client.get('/metrics', headers={'X-Forwarded-For': '127.0.0.1'}).status_code == 403
+    assert client.get('/metrics').status_code == 200  # Direct from localhost
+
+
+def test_made_up_http_methods_share_one_label_value(user_server):
+    def methods():
+        return {key[1] for metric in (user_server.HTTP_REQUESTS, user_server.HTTP_SECONDS) for key in metric.values}
+
+    client = user_server.app.test_client()
+    before = methods()
+    for i in range(5):
+        assert client.open('/api/health', method=f"M{i}X").status_code == 405
+    assert client.get('/api/health').status_code == 200
+
+    assert methods() - before <= {'other'} and 'GET' in methods()
+    assert sample(metrics.render(), 'ezy_http_requests_total', '{route="unmatched",method="other",status="405"}') >= 5
+
+
+def test_handler_replies_through_flask_socketio_emit_are_counted(user_server):
+    def direct(event):
+        return sample(metrics.render(), 'ezy_socketio_events_out_total', f'{{event="{event}",scope="direct"}}') or 0
+
+    before = direct('admin_connected')
+    admin = user_server.socketio.test_client(user_server.app, query_string='type=admin&client_id=metrics-reply')
+    admin.emit('admin_connect', {})  # Answered with flask_socketio.emit('admin_connected', ...)
+    assert direct('admin_connected') == before + 1
+    admin.disconnect()
+
+
+def test_admin_server_scrape(admin_server):
+    admin_server.app.test_client().get('/health')
+
+    status, _, text = scrape(admin_server.app)
+    assert status == 200
+    assert sample(text, 'ezy_http_requests_total', '{route="/health",method="GET",status="200"}') >= 1
+    assert sample(text, 'ezy_middleware_stage_calls', '{stage="suspicious_url"}') is not None
+    assert sample(text, 'ezy_static_assets_files') > 0
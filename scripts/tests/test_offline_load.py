@@ -0,0 +1,64 @@
+"""
+Load test harness tests for scripts/benchmarks/load_test.py
+
+The offline mock engines, the report helpers, and a short end-to-end run
+against a spawned user server.
+
+Run with: python -m pytest scripts/tests/test_offline_load.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "benchmarks"))
+
+import pytest
+
+
+def test_mock_translation_engine_is_offline_and_cached():
+    from app.translation_service import MockTranslateService
+    service = MockTranslateService(latency_seconds=0)
+    assert service.translate('Good morning', 'es') == (True, '[es] Good morning', False)
+    assert service.translate('Good morning', 'es') == (True, '[es] Good morning', True)
+
+
+def test_mock_tts_engine_returns_deterministic_audio():
+    from app.tts_service import MOCK_VOICES, MockTTSService
+    service = MockTTSService(latency_seconds=0, seconds_per_char=0)
+    voice = MOCK_VOICES[0]['ShortName']
+    first = service.synthesize('Hello there', voice)
+    assert first.success and len(first.audio) > 0
+    assert service.synthesize('Hello there', voice).audio == first.audio
+
+
+def test_summarize_reports_nearest_rank_percentiles_in_ms():
+    load_test = pytest.importorskip('load_test')
+    summary = load_test.summarize([i / 1000 for i in range(1, 101)])
+    assert summary['count'] == 100
+    assert (summary['p50'], summary['p95'], summary['p99'], summary['max']) == (50, 95, 99, 100)
+    assert load_test.summarize([]) == {'count': 0}
+
+
+def test_short_run_against_mock_server(tmp_path):
+    pytest.importorskip('aiohttp')
+    pytest.importorskip('socketio')
+    output = tmp_path / 'report.json'
+
+    # Own process: the servers loaded by other tests have monkey patched this one
+    subprocess.run([sys.executable, os.path.join(PROJECT_ROOT, 'scripts', 'benchmarks', 'load_test.py'),
+                    '--listeners', '3', '--duration', '6', '--ramp', '0.5', '--wpm', '240',
+                    '--tts-share', '1', '--output', str(output)],
+                   check=True, timeout=120, stdout=subprocess.DEVNULL)
+
+    report = json.loads(output.read_text())
+    assert report['target']['spawned'] and report['target']['engines'] == 'mock'
+    assert report['counts']['listeners_connected'] == 3
+    assert report['counts']['finals_sent'] >= 1
+    assert report['counts']['finals_received'] == 3 * report['counts']['finals_sent']
+    for name in ('connect', 'final_delivery', 'interim_delivery', 'http_history', 'http_translate', 'http_tts'):
+        assert report['latency_ms'][name]['count'] > 0, name
+    assert report['errors'] == {}
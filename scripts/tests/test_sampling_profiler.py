@@ -0,0 +1,152 @@
+"""
+Sampling profiler tests for app.sampling_profiler and the /api/profiler endpoints
+
+Run with: python -m pytest scripts/tests/test_sampling_profiler.py
+"""
+
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app import sampling_profiler
+
+
+def spin_until(event):
+    while not event.is_set():
+        sum(range(200))
+
+
+@pytest.fixture
+def busy_thread():
+    # A real OS thread even after other tests loaded (and monkey patched for) the servers
+    threading = sampling_profiler._threading
+    done = threading.Event()
+    thread = threading.Thread(target=spin_until, args=(done,), name='busy-worker', daemon=True)
+    thread.start()
+    yield thread
+    done.set()
+    thread.join()
+
+
+def parse_collapsed(text):
+    stacks = {}
+    for line in text.splitlines():
+        stack, count = line.rsplit(' ', 1)
+        stacks[stack] = int(count)
+    return stacks
+
+
+def test_profile_records_collapsed_stacks_of_other_threads(busy_thread):
+    profiler = sampling_profiler.SamplingProfiler()
+    started, _ = profiler.start(duration_seconds=1, interval_seconds=0.002)
+    assert started
+    assert profiler.wait(timeout=5)
+
+    stacks = parse_collapsed(profiler.collapsed())
+    busy = [stack for stack in stacks if stack.startswith('busy-worker;') and 'spin_until (' in stack]
+    assert busy and sum(stacks[stack] for stack in busy) > 10
+    assert not any('sampling-profiler;' in stack for stack in stacks)  # The sampler skips itself
+    last = profiler.status()['last']
+    assert last['samples'] == sum(stacks.values())
+    assert 0 <= last['overhead_percent'] < 100
+
+
+def test_one_profile_at_a_time_and_duration_is_clamped():
+    profiler = sampling_profiler.SamplingProfiler(max_duration_seconds=2)
+    assert profiler.start(duration_seconds=3600)[0]
+    assert profiler.status()['current']['requested_duration_seconds'] == 2
+    started, reason = profiler.start(duration_seconds=1)
+    assert not started and 'already running' in reason
+    assert profiler.stop()
+    assert profiler.wait(timeout=5)
+    assert profiler.status()['last']['stopped_early']
+
+
+def test_distinct_stacks_and_depth_are_capped(busy_thread):
+    profiler = sampling_profiler.SamplingProfiler(max_stacks=1, max_depth=2)
+    profiler.current = {'samples': 0, 'idle_samples': 0}
+    for _ in range(20):
+        profiler.sample()
+
+    assert len(profiler.stacks) <= 2  # One real stack plus the overflow bucket
+    for stack in profiler.stacks:
+        if stack != sampling_profiler.OTHER_STACK:
+            assert len(stack.split(';')) <= 4  # root + 2 frames + truncation marker
+
+
+def test_hub_wait_is_folded_into_idle():
+    profiler = sampling_profiler.SamplingProfiler()
+    namespace = {}
+    exec(compile('import sys\ndef wait():\n    return sys._getframe()\n',
+                 os.path.join('site-packages', 'eventlet', 'hubs', 'poll.py'), 'exec'), namespace)
+    key, idle = profiler._stack_key('eventlet-hub', namespace['wait']())
+    assert idle and key == f"eventlet-hub;{sampling_profiler.IDLE_FRAME}"
+
+
+# ──────────────────────────────────────────
+# Endpoints
+# ──────────────────────────────────────────
+def test_profiler_endpoints(user_server):
+    client = user_server.app.test_client()
+    assert client.get('/api/profiler/profile').status_code in (200, 404)
+
+    response = client.post('/api/profiler/start', json={'duration': 1, 'interval_ms': 2})
+    assert response.status_code == 200 and response.get_json()['running']
+    assert client.post('/api/profiler/start', json={'duration': 1}).status_code == 409
+    assert user_server.profiler.wait(timeout=5)
+
+    status = client.get('/api/profiler/status').get_json()
+    assert not status['running'] and status['last']['samples'] > 0
+
+    download = client.get('/api/profiler/profile')
+    assert download.status_code == 200
+    assert 'attachment; filename=ezy-profile-' in download.headers['Content-Disposition']
+    assert parse_collapsed(download.get_data(as_text=True))
+
+    assert client.post('/api/profiler/start', json={'duration': 'soon'}).status_code == 400
+
+
+def test_profiler_requires_admin_token(user_server, monkeypatch):
+    monkeypatch.setattr(user_server, 'AUTH_ENABLED', True)
+    client = user_server.app.test_client()
+    assert client.post('/api/profiler/start', json={'duration': 1}).status_code == 401
+    assert client.get('/api/profiler/profile').status_code == 401
+
+
+def test_admin_server_proxies_with_an_admin_token(user_server, admin_server, monkeypatch):
+    monkeypatch.setattr(user_server, 'AUTH_ENABLED', True)
+    monkeypatch.setattr(user_server, 'JWT_SECRET', admin_server.JWT_SECRET)
+    user_client = user_server.app.test_client()
+    calls = []
+
+    class Relayed:
+        def __init__(self, response):
+            self.status_code = response.status_code
+            self.headers = response.headers
+            self.content = response.get_data()
+
+        def json(self):
+            return json.loads(self.content)
+
+    def relay(method, url, headers=None, json=None, **kwargs):
+        calls.append((method, url, headers))
+        path = url.split('://', 1)[1].split('/', 1)[1]
+        return Relayed(user_client.open('/' + path, method=method, headers=headers, json=json))
+
+    monkeypatch.setattr(admin_server.requests, 'request', relay)
+    client = admin_server.app.test_client()
+
+    response = client.post('/api/profiler/start', json={'duration': 1, 'interval_ms': 2})
+    assert response.status_code == 200 and response.get_json()['success']
+    assert calls[0][0] == 'POST' and calls[0][1].endswith('/api/profiler/start')
+    assert calls[0][2]['Authorization'].startswith('Bearer ')
+    assert user_server.profiler.wait(timeout=5)
+
+    assert client.get('/api/profiler/status').get_json()['last']['samples'] > 0
+    download = client.get('/api/profiler/profile')
+    assert download.status_code == 200 and download.headers['Content-Disposition'].startswith('attachment')
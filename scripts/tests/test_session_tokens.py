@@ -0,0 +1,156 @@
+"""
+Session token tests for app.session_tokens (TimingWheel and SessionTokenStore)
+
+Run with: python -m pytest scripts/tests/test_session_tokens.py
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app.session_tokens import SessionTokenStore, TimingWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_store(clock, **kwargs):
+    kwargs.setdefault('ttl_seconds', 60)
+    kwargs.setdefault('tick_seconds', 1.0)
+    return SessionTokenStore(name='test_tokens', clock=clock, **kwargs)
+
+
+def assert_indexes_consistent(store):
+    """Every token is in by_sid under its own sid and filed in the wheel under its tick"""
+    indexed = set()
+    for sid, tokens in store.by_sid.items():
+        assert tokens, f"empty by_sid entry for {sid}"
+        for token in tokens:
+            assert store.tokens[token][0]['sid'] == sid
+        indexed |= tokens
+    assert indexed == set(store.tokens)
+    for token, (info, tick) in store.tokens.items():
+        assert token in store.wheel.slots[tick]
+    assert len(store.wheel) == len(store.tokens)
+
+
+# ──────────────────────────────────────────
+# TimingWheel
+# ──────────────────────────────────────────
+def test_keys_come_due_in_their_tick_and_not_before(clock):
+    wheel = TimingWheel(tick_seconds=1.0, clock=clock)
+    wheel.schedule('a', 1002.5)
+    wheel.schedule('b', 1005.0)
+    clock.now = 1002.0
+    assert wheel.advance() == []
+    clock.now = 1003.0
+    assert wheel.advance() == ['a']
+    assert wheel.advance() == []  # Already handed out
+    clock.now = 1005.0
+    assert wheel.advance() == ['b'] and len(wheel) == 0
+
+
+def test_past_expiry_is_scheduled_for_the_next_tick(clock):
+    wheel = TimingWheel(tick_seconds=1.0, clock=clock)
+    wheel.schedule('late', 10.0)
+    assert wheel.advance(now=1000.5) == []  # Same tick as construction
+    assert wheel.advance(now=1001.0) == ['late']
+
+
+@pytest.mark.parametrize('gap', [3, 10 ** 7])
+def test_advance_across_a_gap_returns_everything_due(clock, gap):
+    """Short gaps walk every tick; long ones only check the occupied slots"""
+    wheel = TimingWheel(tick_seconds=1.0, clock=clock)
+    for i in range(5):
+        wheel.schedule(i, 1001.0 + i * 0.5)
+    wheel.schedule('far', 1000.0 + gap + 100)
+
+    clock.now = 1000.0 + gap
+    assert sorted(wheel.advance()) == [i for i in range(5) if 1001 + i * 0.5 <= clock.now]
+    assert wheel.current == 1000 + gap
+    clock.now += 100
+    assert 'far' in wheel.advance()
+
+
+def test_cancel_removes_key_and_empty_slot(clock):
+    wheel = TimingWheel(tick_seconds=1.0, clock=clock)
+    tick = wheel.schedule('a', 1002.0)
+    wheel.schedule('b', 1002.0)
+    wheel.cancel('a', tick)
+    assert wheel.slots[tick] == {'b'}
+    wheel.cancel('b', tick)
+    wheel.cancel('b', tick)  # Cancelling twice, or a tick that is gone, is harmless
+    assert tick not in wheel.slots
+    clock.now = 1010.0
+    assert wheel.advance() == []
+
+
+# ──────────────────────────────────────────
+# SessionTokenStore
+# ──────────────────────────────────────────
+def test_revoke_sid_drops_only_that_sockets_tokens(clock):
+    store = make_store(clock)
+    mine = {store.create('sid-1') for _ in range(3)}
+    theirs = store.create('sid-2')
+
+    assert store.revoke_sid('sid-1') == 3
+    assert not any(token in store for token in mine) and theirs in store
+    assert 'sid-1' not in store.by_sid
+    assert store.revoke_sid('sid-1') == 0
+    assert_indexes_consistent(store)
+
+
+def test_capacity_evicts_the_oldest_tokens_from_every_index(clock):
+    store = make_store(clock, max_items=3)
+    first = store.create('sid-1')
+    second = store.create('sid-2')
+    store.create('sid-2')
+    store.create('sid-3')
+    store.create('sid-3')
+
+    assert first not in store and second not in store and len(store) == 3
+    assert store.evictions == 2 and 'sid-1' not in store.by_sid
+    assert_indexes_consistent(store)
+
+
+def test_reap_expires_due_tokens_and_keeps_indexes_in_step(clock):
+    store = make_store(clock, ttl_seconds=60)
+    old = store.create('sid-1')
+    clock.now += 30
+    young = store.create('sid-1')
+    store.create('sid-2')
+    revoked = store.create('sid-3')
+    store.revoke_sid('sid-3')
+
+    clock.now += 31  # Past the first token's expiry only
+    assert store.reap() == 1
+    assert old not in store and young in store and revoked not in store
+    assert store.by_sid['sid-1'] == {young} and store.expirations == 1
+    assert_indexes_consistent(store)
+
+    clock.now += 10 ** 6  # Long idle gap
+    assert store.reap() == 2 and len(store) == 0 and store.by_sid == {}
+    assert store.stats()['wheel_slots'] == 0
+
+
+def test_validate_returns_info_for_live_tokens(clock):
+    store = make_store(clock)
+    token = store.create('sid-1')
+    assert store.validate(token)['sid'] == 'sid-1'
+    assert store.validate('unknown') is None
+    store.revoke_sid('sid-1')
+    assert store.validate(token) is None
@@ -0,0 +1,105 @@
+"""
+Static asset tests for app.static_assets (manifest and the shared static view)
+
+Run with: python -m pytest scripts/tests/test_static_assets.py
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app.static_assets import AssetManifest
+
+
+@pytest.fixture
+def client(tmp_path):
+    flask = pytest.importorskip('flask')
+    (tmp_path / 'js').mkdir()
+    (tmp_path / 'js' / 'app.js').write_text('console.log("hello");\n' * 60, encoding='utf-8')
+    (tmp_path / 'big.bin').write_bytes(b'\0' * 4096)
+
+    app = flask.Flask(__name__, static_folder=str(tmp_path), static_url_path='/static')
+    manifest = AssetManifest(str(tmp_path), max_memory_bytes=2048).build()
+    app.view_functions['static'] = manifest.response
+    return app.test_client(), manifest
+
+
+def test_view_negotiates_encoding_and_revalidates(client):
+    http, manifest = client
+    response = http.get('/static/js/app.js', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200 and response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.headers['ETag'].strip('"') == f"{manifest.version('js/app.js')}-gz"
+
+    again = http.get('/static/js/app.js', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304
+
+    plain = http.get('/static/js/app.js')
+    assert 'Content-Encoding' not in plain.headers and plain.data.startswith(b'console.log')
+
+
+def test_view_falls_back_to_disk_for_large_and_unknown_files(client):
+    http, manifest = client
+    assert manifest.get('big.bin') is None
+    assert http.get('/static/big.bin').data == b'\0' * 4096
+    assert http.get('/static/missing.js').status_code == 404
+
+
+def test_rescan_picks_up_replaced_added_and_deleted_files(tmp_path):
+    (tmp_path / 'logo.svg').write_text('<svg>old</svg>', encoding='utf-8')
+    (tmp_path / 'gone.css').write_text('body {}', encoding='utf-8')
+    manifest = AssetManifest(str(tmp_path)).build()
+    manifest.add('i18n/en.abc.json', b'{}', 'application/json', fingerprinted=True)
+    seen = []
+    manifest.on_change(seen.append)
+    old_version, generation = manifest.version('logo.svg'), manifest.generation
+
+    assert manifest.rescan() == [] and manifest.generation == generation  # Nothing changed
+
+    (tmp_path / 'logo.svg').write_text('<svg>new logo</svg>', encoding='utf-8')
+    (tmp_path / 'new.js').write_text('var x;', encoding='utf-8')
+    (tmp_path / 'gone.css').unlink()
+    assert manifest.rescan() == ['logo.svg', 'new.js', 'gone.css']
+    assert seen == [['logo.svg', 'new.js', 'gone.css']] and manifest.generation > generation
+
+    assert manifest.version('logo.svg') != old_version
+    assert manifest.get('logo.svg').identity.data == b'<svg>new logo</svg>'
+    assert manifest.get('new.js') is not None
+    assert manifest.get('gone.css') is None and manifest.version('gone.css') == '1'
+    # Generated assets have no file on disk and survive rescans and rebuilds
+    assert manifest.get('i18n/en.abc.json') is not None
+    manifest.build()
+    assert manifest.get('i18n/en.abc.json') is not None and manifest.is_fingerprinted('i18n/en.abc.json')
+
+
+def test_rescan_notices_same_size_rewrites_and_files_growing_past_the_memory_cap(tmp_path):
+    path = tmp_path / 'app.js'
+    path.write_bytes(b'a' * 100)
+    manifest = AssetManifest(str(tmp_path), max_memory_bytes=1000).build()
+
+    path.write_bytes(b'b' * 100)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert manifest.rescan() == ['app.js'] and manifest.get('app.js').identity.data == b'b' * 100
+
+    path.write_bytes(b'c' * 5000)
+    assert manifest.rescan() == ['app.js']
+    assert manifest.get('app.js') is None and manifest.version('app.js') == manifest._hash_file(str(path))
+
+
+def test_failing_listener_does_not_stop_the_others(tmp_path):
+    (tmp_path / 'a.css').write_text('a', encoding='utf-8')
+    manifest = AssetManifest(str(tmp_path)).build()
+    seen = []
+
+    @manifest.on_change
+    def broken(changed):
+        raise RuntimeError('listener bug')
+
+    manifest.on_change(seen.append)
+    (tmp_path / 'a.css').write_text('changed', encoding='utf-8')
+    assert manifest.rescan() == ['a.css'] and seen == [['a.css']]
@@ -0,0 +1,142 @@
+"""
+Structured logging tests for app.structured_logging
+
+Run with: python -m pytest scripts/tests/test_structured_logging.py
+"""
+
+import json
+import logging
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app import structured_logging
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Collect(logging.Handler):
+    """Records the formatted line and the OS thread that wrote it"""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        self.threads.append(structured_logging._threading.current_thread().name)
+
+
+@pytest.fixture
+def test_logger():
+    log = logging.getLogger('structured-logging-test')
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    yield log
+    for handler in list(log.handlers):
+        log.removeHandler(handler)
+
+
+def record(message='hello %s', args=('world',), level=logging.INFO, **extra):
+    entry = logging.LogRecord('app.test', level, __file__, 1, message, args, None)
+    entry.__dict__.update(extra)
+    return entry
+
+
+def test_json_formatter_includes_extra_fields_and_exceptions():
+    formatter = structured_logging.JsonFormatter()
+    line = json.loads(formatter.format(record(event='interim', suppressed=3)))
+    assert line['msg'] == 'hello world' and line['level'] == 'INFO' and line['logger'] == 'app.test'
+    assert line['event'] == 'interim' and line['suppressed'] == 3
+    assert 'T' in line['ts']
+
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        failed = logging.LogRecord('app.test', logging.ERROR, __file__, 1, 'failed', (), sys.exc_info())
+    assert 'ValueError: boom' in json.loads(formatter.format(failed))['exc']
+
+
+def test_sample_every_keeps_one_in_n_and_reports_suppressed():
+    limiter = structured_logging.EventRateLimiter({'interim': {'sample_every': 3}})
+    passed = [r for r in (record(event='interim') for _ in range(7)) if limiter.filter(r)]
+    assert len(passed) == 3
+    assert not hasattr(passed[0], 'suppressed') and passed[1].suppressed == 2
+    assert limiter.stats() == {'interim': 4}
+    assert limiter.filter(record(event='untracked')) and limiter.filter(record())
+
+
+def test_per_second_is_a_token_bucket_and_warnings_always_pass():
+    clock = FakeClock()
+    limiter = structured_logging.EventRateLimiter({'socket_connect': {'per_second': 2}}, clock=clock)
+    assert [limiter.filter(record(event='socket_connect')) for _ in range(4)] == [True, True, False, False]
+    assert limiter.filter(record(event='socket_connect', level=logging.WARNING))
+
+    clock.now = 0.5  # One token refilled
+    refilled = record(event='socket_connect')
+    assert limiter.filter(refilled) and refilled.suppressed == 2
+    assert not limiter.filter(record(event='socket_connect'))
+
+
+def test_sync_mode_with_two_handlers_counts_each_record_once(test_logger):
+    file_handler, console_handler = Collect(), Collect()
+    limiter = structured_logging.EventRateLimiter({'interim': {'sample_every': 10}})
+    structured_logging.attach(test_logger, [file_handler, console_handler], fmt='%(message)s', event_filter=limiter)
+    for i in range(100):
+        test_logger.info('interim %d', i, extra={'event': 'interim'})
+
+    assert file_handler.lines == console_handler.lines == [f"interim {i}" for i in range(0, 100, 10)]
+    assert limiter.stats() == {'interim': 90}
+
+
+def test_queue_mode_writes_on_the_writer_thread(test_logger):
+    handler = Collect()
+    writer = structured_logging.attach(test_logger, [handler], fmt='%(levelname)s %(message)s',
+                                       use_queue=True, name='test-log-writer')
+    try:
+        test_logger.info('caption %d of %s', 1, 'session')
+        try:
+            raise RuntimeError('lost')
+        except RuntimeError:
+            test_logger.exception('failed')
+    finally:
+        writer.stop()
+        structured_logging.atexit.unregister(writer.stop)
+
+    assert handler.lines[0] == 'INFO caption 1 of session'
+    assert handler.lines[1].startswith('ERROR failed') and 'RuntimeError: lost' in handler.lines[1]
+    assert handler.threads == ['test-log-writer', 'test-log-writer']
+
+
+def test_dropped_records_are_never_formatted(test_logger, monkeypatch):
+    handler = Collect()
+    structured_logging.attach(test_logger, [handler], fmt='%(message)s', json_format=True,
+                              event_filter=structured_logging.EventRateLimiter({'hot': {'sample_every': 100}}))
+    formatted = []
+    format_record = structured_logging.JsonFormatter.format
+    monkeypatch.setattr(structured_logging.JsonFormatter, 'format',
+                        lambda self, entry: formatted.append(entry) or format_record(self, entry))
+    for i in range(50):
+        test_logger.info('hot path %d', i, extra={'event': 'hot'})
+    test_logger.debug('below level %d', 0)
+
+    assert len(formatted) == 1
+    assert [json.loads(line)['msg'] for line in handler.lines] == ['hot path 0']
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = structured_logging.DeferredQueueHandler(structured_logging._queue.Queue(1))
+    handler.handle(record())
+    handler.handle(record())
+    assert handler.queue.qsize() == 1 and handler.dropped == 1
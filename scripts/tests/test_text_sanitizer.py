@@ -0,0 +1,135 @@
+"""
+Parity tests for app.text_sanitizer against the original sanitize_text loop
+
+Run with: python -m pytest scripts/tests/test_text_sanitizer.py
+"""
+
+import os
+import random
+import re
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app.text_sanitizer import DANGEROUS, sanitize
+
+
+def legacy_sanitize(text, max_length=5000):
+    """The per-pattern implementation sanitize() replaced (logging removed)"""
+    if not text or not isinstance(text, str):
+        return "", False
+
+    text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
+    text = text[:max_length]
+
+    dangerous = [
+        r'<script[^>]*>.*?</script>',
+        r'javascript:',
+        r'on\w+\s*=',
+        r'<iframe',
+        r'<embed',
+        r'<object>',
+        r'data:text/html'
+    ]
+
+    flagged = False
+    for pattern in dangerous:
+        if re.search(pattern, text, re.IGNORECASE):
+            flagged = True
+            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+
+    return text.strip(), flagged
+
+
+CAPTIONS = [
+    "Good morning everyone, and welcome to today's service.",
+    "Please turn to page 42 = chapter three.",
+    "The time is 10:30 and we will begin shortly.",
+    "欢迎大家来到今天的聚会，我们马上开始。",
+    "今天的主题是：信心与盼望。",
+    "お知らせ：次の会議は午後三時からです。",
+    "오늘 모임에 오신 것을 환영합니다.",
+    "  padded caption with trailing space   ",
+    "tab\tseparated\nand newline",
+    "control\x00chars\x07removed\x1f",
+    "",
+]
+
+ATTACKS = [
+    "<script>alert(1)</script>hello",
+    "<SCRIPT src=x>bad()</SCRIPT> world",
+    "click javascript:alert(1)",
+    '<img src=x onerror=alert(1)>',
+    "<a ONCLICK = 'x'>link</a>",
+    "<iframe src=evil>",
+    "<embed src=x>",
+    "<object>payload",
+    "data:text/html;base64,AAAA",
+    "online = offline",
+    "Station: 3, platform = 4",
+    "<script>one</script> and <script>two</script>",
+    "<script>\nmultiline</script>",
+    "中文<script>alert('x')</script>字幕",
+]
+
+SPLICED = [
+    "<scr<iframeipt>alert(1)</script>",
+    "java<embed>script:alert(1)",
+    "on<script>x</script>click=alert(1)",
+    "<ifr<iframeame src=x>",
+]
+
+
+@pytest.mark.parametrize("text", CAPTIONS + ATTACKS)
+def test_matches_legacy(text):
+    assert sanitize(text) == legacy_sanitize(text)
+
+
+@pytest.mark.parametrize("text", CAPTIONS + ATTACKS + SPLICED)
+def test_output_is_clean(text):
+    cleaned, _ = sanitize(text)
+    assert not DANGEROUS.search(cleaned)
+
+
+@pytest.mark.parametrize("text", SPLICED)
+def test_spliced_patterns_removed(text):
+    # The old loop could leave a pattern assembled by an earlier removal
+    legacy, _ = legacy_sanitize(text)
+    cleaned, flagged = sanitize(text)
+    assert flagged
+    assert not DANGEROUS.search(cleaned)
+    if not DANGEROUS.search(legacy):
+        assert cleaned == legacy
+
+
+@pytest.mark.parametrize("text", CAPTIONS[:7])
+def test_plain_captions_not_flagged(text):
+    assert sanitize(text)[1] is False
+
+
+def test_max_length_applied_before_scan():
+    text = "a" * 10 + "<script>x</script>"
+    assert sanitize(text, max_length=10) == ("a" * 10, False)
+    assert sanitize(text, max_length=12) == legacy_sanitize(text, max_length=12)
+
+
+@pytest.mark.parametrize("value", [None, 123, b"bytes", ["list"]])
+def test_non_string_input(value):
+    assert sanitize(value) == ("", False)
+
+
+def test_random_fragments_match_legacy_when_legacy_is_clean():
+    fragments = ["<", ">", ":", "=", " ", "on", "click", "script", "</script>", "<script>",
+                 "javascript", "data:text/html", "<iframe", "<object>", "文字", "x", "\x00", "ON"]
+    rng = random.Random(1234)
+    for _ in range(5000):
+        text = ''.join(rng.choice(fragments) for _ in range(rng.randint(0, 12)))
+        legacy, legacy_flagged = legacy_sanitize(text)
+        cleaned, flagged = sanitize(text)
+        assert not DANGEROUS.search(cleaned), text
+        if not DANGEROUS.search(legacy):
+            assert cleaned == legacy, text
+            assert flagged == legacy_flagged, text
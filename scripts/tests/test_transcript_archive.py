@@ -0,0 +1,130 @@
+"""
+Transcript archive and export tests for app.transcript_archive and app.transcript_export
+
+Run with: python -m pytest scripts/tests/test_transcript_archive.py
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from app import transcript_export
+from app.transcript_archive import TranscriptArchive
+
+
+def make_item(i, **fields):
+    item = {'id': i, 'timestamp': '10:00:00', 'original': f"original {i}", 'corrected': f"corrected {i}",
+            'is_corrected': False}
+    item.update(fields)
+    return item
+
+
+def export_text(export_format, items, **kwargs):
+    return b''.join(transcript_export.export_stream(export_format, items, **kwargs)).decode('utf-8')
+
+
+@pytest.fixture
+def archive():
+    store = TranscriptArchive(':memory:', batch_size=3)
+    yield store
+    store.close()
+
+
+# ──────────────────────────────────────────
+# Archive
+# ──────────────────────────────────────────
+def test_append_update_delete_and_recover(archive):
+    archive.append_many([make_item(i) for i in range(1, 11)])
+    archive.append({'id': 'not-an-int', 'original': 'skipped'})
+    archive.update(make_item(4, corrected='fixed', is_corrected=True))
+    archive.delete([2, 3, 'x'])
+
+    assert archive.count() == 8 and archive.max_id() == 10
+    assert [item['id'] for item in archive.recent(3)] == [8, 9, 10]
+    assert archive.recent(20)[1]['corrected'] == 'fixed'
+
+
+def test_iter_items_streams_in_batches_and_resumes_after_id(archive):
+    archive.append_many([make_item(i) for i in range(1, 11)])
+    assert [item['id'] for item in archive.iter_items()] == list(range(1, 11))
+    assert [item['id'] for item in archive.iter_items(after_id=7)] == [8, 9, 10]
+
+    archive.clear()
+    assert list(archive.iter_items()) == [] and archive.max_id() is None
+
+
+def test_archive_survives_reopen(tmp_path):
+    path = str(tmp_path / 'archive' / 'transcripts.db')
+    first = TranscriptArchive(path)
+    first.append_many([make_item(i, original='café “quoted”') for i in range(1, 4)])
+    first.close()
+
+    reopened = TranscriptArchive(path)
+    assert reopened.max_id() == 3 and reopened.recent(1)[0]['original'] == 'café “quoted”'
+    assert reopened.stats()['file_bytes'] > 0
+    reopened.close()
+
+
+# ──────────────────────────────────────────
+# Exporters
+# ──────────────────────────────────────────
+def test_csv_quotes_commas_quotes_and_newlines():
+    tricky = 'Hello, "world"\nsecond line'
+    text = export_text('csv', [make_item(1, original=tricky, corrected=tricky, is_corrected=True)],
+                       clean=lambda value, max_length: value)
+    assert text.startswith(transcript_export.BOM)
+    rows = list(csv.reader(io.StringIO(text[1:])))
+    assert rows[0] == ['ID', 'Timestamp', 'Original', 'Corrected', 'Is_Corrected']
+    assert rows[1] == ['1', '10:00:00', tricky, tricky, 'Yes']
+
+
+def test_json_export_is_one_valid_array_across_chunks(monkeypatch):
+    monkeypatch.setattr(transcript_export, 'CHUNK_BYTES', 64)
+    items = [make_item(i) for i in range(50)]
+    chunks = list(transcript_export.export_stream('json', items))
+    assert len(chunks) > 1
+    assert json.loads(b''.join(chunks))['translations'] == items
+
+
+def test_srt_and_vtt_times_past_one_hour():
+    items = [make_item(1, start_offset=3725.5, end_offset=3728.25, session='s')]
+    srt = export_text('srt', items)
+    assert '01:02:05,500 --> 01:02:08,250' in srt
+    vtt = export_text('vtt', items, language='es')
+    assert vtt.startswith('WEBVTT\nLanguage: es\n\n') and '01:02:05.500 --> 01:02:08.250' in vtt
+    assert transcript_export.format_srt_time(10 * 3600 + 0.0004) == '10:00:00,000'
+
+
+def test_gzip_stream_round_trip():
+    items = [make_item(i) for i in range(2000)]
+    plain = b''.join(transcript_export.export_stream('txt', items))
+    compressed = b''.join(transcript_export.gzip_stream(transcript_export.export_stream('txt', items)))
+    assert gzip.decompress(compressed) == plain
+    assert len(compressed) < len(plain)
+
+
+# ──────────────────────────────────────────
+# Server imports with the archive on
+# ──────────────────────────────────────────
+def test_reimport_does_not_overwrite_archived_caption(user_server, archive, monkeypatch):
+    monkeypatch.setattr(user_server, 'archive', archive)
+    monkeypatch.setattr(user_server, 'translations_history', [])
+    monkeypatch.setattr(user_server, 'next_translation_id', 100)
+    archive.append(make_item(5, corrected='archived caption'))
+
+    admin = user_server.socketio.test_client(user_server.app, query_string='type=admin&client_id=archive-admin')
+    admin.emit('admin_connect', {})
+    admin.emit('import_transcription', {'id': 5, 'original': 'old export', 'corrected': 'old export'})
+    admin.disconnect()
+
+    assert [item['id'] for item in archive.iter_items()] == [5, 100]
+    assert archive.recent(2)[0]['corrected'] == 'archived caption'
+    assert user_server.translations_history[-1]['id'] == 100
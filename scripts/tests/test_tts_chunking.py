@@ -0,0 +1,67 @@
+"""
+Sentence chunking tests for app.tts_service.split_sentences / _split_long
+
+Run with: python -m pytest scripts/tests/test_tts_chunking.py
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+LATIN = ("Good morning everyone. Welcome to today's service! Please open your books to chapter three; "
+         "we will read it together, slowly, and then discuss it. Are there any questions? ")
+CJK = "今天天气很好。我们去公园散步吧！请大家打开书本，翻到第三章；我们一起慢慢地读。有问题吗？"
+
+
+@pytest.fixture(scope='module')
+def tts():
+    # Imported lazily: collecting this file must not import edge-tts/asyncio before the servers monkey patch
+    from app import tts_service
+    return tts_service
+
+
+def words(chunks):
+    return ' '.join(chunks).split()
+
+
+def test_split_long_flushes_pending_text_before_a_hard_cut(tts):
+    assert tts._split_long('short clause, ' + 'x' * 30, 20) == ['short clause,', 'x' * 20, 'x' * 10]
+
+
+@pytest.mark.parametrize('max_chars', [20, 35, 80])
+def test_split_long_keeps_order_and_max_length(tts, max_chars):
+    sentence = 'first part, second part, ' + 'y' * 90 + ' third part: fourth part'
+    pieces = tts._split_long(sentence, max_chars)
+    assert all(len(piece) <= max_chars for piece in pieces)
+    assert ''.join(''.join(pieces).split()) == ''.join(sentence.split())
+
+
+def test_split_sentences_merges_short_sentences_in_order(tts):
+    chunks = tts.split_sentences(LATIN * 3, min_chars=60, max_chars=120)
+    assert words(chunks) == (LATIN * 3).split()
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert all(len(chunk) >= 60 for chunk in chunks[:-1])
+
+
+def test_split_sentences_handles_unbroken_runs(tts):
+    text = 'Intro. ' + 'z' * 1000 + ' outro.'
+    chunks = tts.split_sentences(text, min_chars=10, max_chars=100)
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert words(chunks)[0] == 'Intro.' and words(chunks)[-1] == 'outro.'
+    assert ''.join(words(chunks)) == ''.join(text.split())
+
+
+def test_split_sentences_cjk_without_spaces(tts):
+    chunks = tts.split_sentences(CJK * 4, min_chars=10, max_chars=30)
+    assert ''.join(chunks) == CJK * 4  # No spaces inserted between CJK sentences
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert all(chunk[-1] in '。！？；，' for chunk in chunks)
+
+
+def test_short_text_is_one_chunk(tts):
+    assert tts.split_sentences('  Hello there.  ') == ['Hello there.']
+    assert tts.split_sentences('') == []
@@ -1,5 +1,4 @@
 import os
-import yaml
 import json
 import hashlib
 import base64
@@ -8,6 +7,8 @@ import socket
 import getpass
 from pathlib import Path
 
+from config_snapshot import ReloadableConfig
+
 
 class MachineBoundEncryption:
     """Simple Key Decryption Utility"""
@@ -61,29 +62,33 @@ class FernetSecrets:
         return f.encrypt(value.encode()).decode()
 
 
-class SecureConfig:
-    """Secure Configuration Loader - Loads config and injects decrypted secrets."""
+class SecureConfig(ReloadableConfig):
+    """Secure Configuration Loader - Loads config and injects decrypted secrets.
+
+    Values are served from a flattened snapshot (see config_snapshot); reload()
+    re-reads both config.yaml and secrets.key.
+    """
     
     def __init__(self, config_path='config/config.yaml', secrets_path=None):
-        self.config_path = Path(config_path)
+        config_path = Path(config_path)
         # Default secrets file lives beside config.yaml unless overridden
         if secrets_path is None:
             # Use `secrets.key` (JSON) as the canonical secrets file (contains Fernet key + tokens)
-            self.secrets_key_path = self.config_path.parent / 'secrets.key'
+            self.secrets_key_path = config_path.parent / 'secrets.key'
         else:
             self.secrets_key_path = Path(secrets_path)
-        self.data = {}
-        self._load_config()
+        self._raw = {}
+        super().__init__(config_path)
+
+    def _read(self, strict=False):
+        """Loads config.yaml and injects the decrypted secrets."""
+        self._load_config(strict)
         self._load_secrets()
+        return self._raw
     
-    def _load_config(self):
-        """Loads the YAML configuration."""
-        try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.data = yaml.safe_load(f) or {}
-        except FileNotFoundError:
-            print(f"Error: Configuration file not found at {self.config_path}")
-            self.data = {}
+    def _load_config(self, strict=False):
+        """Loads the YAML configuration (strict: raise on a missing/empty file, see ReloadableConfig.reload)."""
+        self._raw = self._load_yaml(strict)
     
     def _load_secrets(self):
         """Loads and decrypts secrets from the machine-bound file."""
@@ -174,34 +179,22 @@ class SecureConfig:
 
             # Inject into config
             if admin_password:
-                if 'authentication' not in self.data:
-                    self.data['authentication'] = {}
-                self.data['authentication']['admin_password'] = admin_password
+                if 'authentication' not in self._raw:
+                    self._raw['authentication'] = {}
+                self._raw['authentication']['admin_password'] = admin_password
                 print(f"✓ Injected decrypted admin_password into config")
 
             if jwt_secret:
-                if 'authentication' not in self.data:
-                    self.data['authentication'] = {}
-                self.data['authentication']['jwt_secret'] = jwt_secret
+                if 'authentication' not in self._raw:
+                    self._raw['authentication'] = {}
+                self._raw['authentication']['jwt_secret'] = jwt_secret
                 print(f"✓ Injected decrypted jwt_secret into config")
 
             if server_secret_key:
-                if 'server' not in self.data:
-                    self.data['server'] = {}
-                self.data['server']['secret_key'] = server_secret_key
+                if 'server' not in self._raw:
+                    self._raw['server'] = {}
+                self._raw['server']['secret_key'] = server_secret_key
                 print(f"✓ Injected decrypted server_secret_key into config")
             
         except Exception as e:
             print(f"Warning: Failed to load secrets: {e}")
-    
-    def get(self, *keys, default=None):
-        """Safely retrieves a configuration value using nested keys."""
-        val = self.data
-        for key in keys:
-            if isinstance(val, dict):
-                val = val.get(key)
-                if val is None:
-                    return default
-            else:
-                return default
-        return val if val is not None else default
\ No newline at end of file